@@ -21,8 +21,6 @@ import sys
 import time
 import traceback
 
-import jinja2
-import jinja2.meta
 import jsonschema
 from oslo_config import cfg
 import requests
@@ -40,6 +38,7 @@ from rally.deployment import engine as deploy_engine
 from rally import exceptions
 from rally.task import engine
 from rally.task import exporter as texporter
+from rally.task import worker
 from rally.verification import context as vcontext
 from rally.verification import manager as vmanager
 from rally.verification import reporter as vreporter
@@ -288,6 +287,10 @@ class _Task(APIGroup):
                 return False
             return True
 
+        # NOTE: jinja2 is imported here, since it takes a noticeable part of
+        #   the startup time of the CLI and most commands don't need it.
+        import jinja2
+        import jinja2.meta
         # NOTE(boris-42): We have to import builtins to get the full list of
         #                 builtin functions (e.g. range()). Unfortunately,
         #                 __builtins__ doesn't return them (when it is not
@@ -505,6 +508,16 @@ class _Task(APIGroup):
             objects.Task.delete_by_uuid(
                 task_uuid, status=consts.TaskStatus.FINISHED)
 
+    def run_worker(self, hostname=None, max_jobs=None):
+        """Run a worker which executes jobs of distributed workloads.
+
+        :param hostname: unique name of the worker. Defaults to the host name
+                         and the process id
+        :param max_jobs: number of jobs to execute before exit. The worker
+                         works until it is interrupted by default.
+        """
+        worker.Worker(hostname=hostname).run(max_jobs=max_jobs)
+
     def import_results(self, deployment, task_results, tags=None):
         """Import json results of a task into database."""
         deployment = objects.Deployment.get(deployment)
@@ -531,11 +544,13 @@ class _Task(APIGroup):
                     results_chunk = workload["data"][:chunk_size]
                     workload["data"] = workload["data"][chunk_size:]
                     results_chunk.sort(key=lambda x: x["timestamp"])
-                    workload_obj.add_workload_data(workload_data_count,
-                                                   {"raw": results_chunk})
+                    workload_obj.add_workload_data(
+                        workload_data_count, {"raw": results_chunk},
+                        codec=CONF.raw_result_chunk_codec)
                     workload_data_count += 1
-                workload_obj.add_workload_data(workload_data_count,
-                                               {"raw": workload["data"]})
+                workload_obj.add_workload_data(
+                    workload_data_count, {"raw": workload["data"]},
+                    codec=CONF.raw_result_chunk_codec)
                 workload_obj.set_results(
                     sla_results=workload["sla_results"].get("sla"),
                     hooks_results=workload["hooks"],
@@ -1103,3 +1103,21 @@ class TaskCommands(object):
             print(_("ERROR: Invalid file name passed: %s") % task_file,
                   file=sys.stderr)
             return 1
+
+    @cliutils.args("--hostname", dest="hostname", type=str, required=False,
+                   help="Unique name of the worker. Defaults to the host "
+                        "name and the process id.")
+    @plugins.ensure_plugins_are_loaded
+    def worker(self, api, hostname=None):
+        """Run a worker which executes distributed workloads.
+
+        The worker executes iterations of workloads which use `distributed`
+        runner and are started by any Rally sharing the same database.
+
+        :param hostname: unique name of the worker
+        """
+        print(_("Worker is started. Press Ctrl+C to stop it."))
+        try:
+            api.task.run_worker(hostname=hostname)
+        except KeyboardInterrupt:
+            print(_("Worker is stopped."))
@@ -14,7 +14,10 @@
 #    under the License.
 
 import collections
+import heapq
+import itertools
 import threading
+import time
 
 from rally.common.i18n import _LW
 from rally.common import logging
@@ -23,35 +26,171 @@ from rally.common import logging
 LOG = logging.getLogger(__name__)
 
 
-def _consumer(consume, queue):
+class TokenBucket(object):
+    """Limits the rate of jobs.
+
+    Tokens are added to the bucket at the given rate while there are less
+    than burst of them. Each job takes a token and waits for it if the bucket
+    is empty.
+    """
+
+    def __init__(self, rate, burst=1):
+        """TokenBucket constructor.
+
+        :param rate: number of tokens added per second
+        :param burst: maximum number of tokens in the bucket
+        """
+        self.rate = float(rate)
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated_at = time.time()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, wait for it if the bucket is empty."""
+        while True:
+            with self._lock:
+                now = time.time()
+                self._tokens = min(
+                    self.burst,
+                    self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+_RATE_LIMITERS = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(name, rate, burst=1):
+    """Return the rate limiter shared by all brokers of the service.
+
+    :param name: name of the service, e.g. "keystone"
+    :param rate: maximum number of jobs per second, there is no limit if it
+                 is not positive
+    :param burst: maximum number of jobs started at once
+    :returns: TokenBucket instance or None if there is no limit
+    """
+    if not rate or rate <= 0:
+        return None
+    with _RATE_LIMITERS_LOCK:
+        key = (name, rate, burst)
+        if key not in _RATE_LIMITERS:
+            _RATE_LIMITERS[key] = TokenBucket(rate, burst)
+        return _RATE_LIMITERS[key]
+
+
+class _JobQueue(object):
+    """Queue of jobs which is consumed while it is filled.
+
+    Failed jobs are put back to the queue with a delay which doubles with
+    each attempt. The queue counts published, consumed, retried and failed
+    jobs.
+    """
+
+    def __init__(self, retries=0, retry_interval=1.0):
+        self.retries = retries
+        self.retry_interval = retry_interval
+        self.publishing = True
+        self.stats = {"published": 0, "consumed": 0, "retried": 0,
+                      "failed": 0}
+        self._cond = threading.Condition()
+        # jobs are stored as (attempt, job)
+        self._jobs = collections.deque()
+        # jobs to retry are stored as (retry_at, seq, attempt, job)
+        self._delayed = []
+        self._seq = itertools.count()
+        self._in_progress = 0
+
+    def __len__(self):
+        with self._cond:
+            return len(self._jobs) + len(self._delayed)
+
+    def append(self, job):
+        """Publish a job."""
+        with self._cond:
+            self._jobs.append((0, job))
+            self.stats["published"] += 1
+            self._cond.notify()
+
+    def finish_publishing(self):
+        with self._cond:
+            self.publishing = False
+            self._cond.notify_all()
+
+    def get(self):
+        """Wait for a job.
+
+        :returns: (attempt, job) or None when there are no more jobs
+        """
+        with self._cond:
+            while True:
+                now = time.time()
+                if self._delayed and self._delayed[0][0] <= now:
+                    self._in_progress += 1
+                    return heapq.heappop(self._delayed)[2:]
+                if self._jobs:
+                    self._in_progress += 1
+                    return self._jobs.popleft()
+                if not (self.publishing or self._delayed
+                        or self._in_progress):
+                    return None
+                # NOTE: jobs which are in progress may be retried, so the
+                #   consumer waits for them as well
+                self._cond.wait(
+                    self._delayed[0][0] - now if self._delayed else None)
+
+    def done(self, attempt, job, failed=False):
+        """Mark the job as done, retry it later if it failed."""
+        with self._cond:
+            self._in_progress -= 1
+            if not failed:
+                self.stats["consumed"] += 1
+            elif attempt < self.retries:
+                self.stats["retried"] += 1
+                heapq.heappush(self._delayed, (
+                    time.time() + self.retry_interval * 2 ** attempt,
+                    next(self._seq), attempt + 1, job))
+            else:
+                self.stats["failed"] += 1
+            self._cond.notify_all()
+
+
+def _consumer(consume, queue, rate_limiter=None):
     """Infinity worker that consumes tasks from queue.
 
     :param consume: method that consumes an object removed from the queue
-    :param queue: deque object to popleft() objects from
+    :param queue: _JobQueue object to get() objects from
+    :param rate_limiter: TokenBucket which limits the rate of consume() calls
     """
     cache = {}
     while True:
-        if not queue:
+        item = queue.get()
+        if item is None:
             break
-        else:
-            try:
-                args = queue.popleft()
-            except IndexError:
-                # consumed by other thread
-                continue
+        attempt, args = item
+        if rate_limiter:
+            rate_limiter.acquire()
         try:
             consume(cache, args)
         except Exception as e:
             LOG.warning(_LW("Failed to consume a task from the queue: %s") % e)
             if logging.is_debug():
                 LOG.exception(e)
+            queue.done(attempt, args, failed=True)
+        else:
+            queue.done(attempt, args)
 
 
 def _publisher(publish, queue):
     """Calls a publish method that fills queue with jobs.
 
     :param publish: method that fills the queue
-    :param queue: deque object to be filled by the publish() method
+    :param queue: _JobQueue object to be filled by the publish() method
     """
     try:
         publish(queue)
@@ -59,28 +198,49 @@ def _publisher(publish, queue):
         LOG.warning(_LW("Failed to publish a task to the queue: %s") % e)
         if logging.is_debug():
             LOG.exception(e)
+    finally:
+        queue.finish_publishing()
 
 
-def run(publish, consume, consumers_count=1):
+def run(publish, consume, consumers_count=1, rate_limiter=None, retries=0,
+        retry_interval=1.0):
     """Run broker.
 
     publish() put to queue, consume() process one element from queue.
 
-    When publish() is finished and elements from queue are processed process
+    Consumers process elements while publish() is still running. When
+    publish() is finished and elements from queue are processed process
     is finished all consumers threads are cleaned.
 
     :param publish: Function that puts values to the queue
     :param consume: Function that processes a single value from the queue
     :param consumers_count: Number of consumers
+    :param rate_limiter: TokenBucket which limits the rate of consume() calls
+                         (see get_rate_limiter)
+    :param retries: Number of times to retry a value which consume() failed
+                    to process
+    :param retry_interval: Delay before the first retry in seconds, it is
+                           doubled for each next retry
+    :returns: dict with numbers of published, consumed, retried and failed
+              values
     """
-    queue = collections.deque()
-    _publisher(publish, queue)
+    started_at = time.time()
+    queue = _JobQueue(retries=retries, retry_interval=retry_interval)
 
     consumers = []
     for i in range(consumers_count):
-        consumer = threading.Thread(target=_consumer, args=(consume, queue))
+        consumer = threading.Thread(target=_consumer,
+                                    args=(consume, queue, rate_limiter))
         consumer.start()
         consumers.append(consumer)
 
+    _publisher(publish, queue)
+
     for consumer in consumers:
         consumer.join()
+
+    LOG.debug("Broker is finished in %(duration).2f s: %(published)d "
+              "published, %(consumed)d consumed, %(retried)d retried and "
+              "%(failed)d failed values",
+              dict(queue.stats, duration=time.time() - started_at))
+    return queue.stats
@@ -238,22 +238,26 @@ def workload_get(workload_uuid):
     return get_impl().workload_get(workload_uuid)
 
 
-def workload_data_create(task_uuid, workload_uuid, chunk_order, data):
+def workload_data_create(task_uuid, workload_uuid, chunk_order, data,
+                         codec=None):
     """Create a workload data.
 
     :param task_uuid: string with UUID of Task instance.
     :param workload_uuid: string with UUID of Workload instance.
     :param chunk_order: ordinal index of workload data.
     :param data: dict with record values on the workload data.
+    :param codec: name of codec to store raw results with. See
+                  rally.common.db.sqlalchemy.chunk_codec for available ones
     :returns: a dict with data on the workload data.
     """
     return get_impl().workload_data_create(task_uuid, workload_uuid,
-                                           chunk_order, data)
+                                           chunk_order, data, codec=codec)
 
 
 def workload_set_results(workload_uuid, subtask_uuid, task_uuid, load_duration,
                          full_duration, start_time, sla_results,
-                         hooks_results=None):
+                         hooks_results=None, statistics=None,
+                         context_execution=None):
     """Set workload results.
 
     :param workload_uuid: string with UUID of Workload instance.
@@ -265,6 +269,12 @@ def workload_set_results(workload_uuid, subtask_uuid, task_uuid, load_duration,
     :param start_time: a timestamp of load start
     :param sla_results: a list with Workload's SLA results
     :param hooks_results: a list with Workload's Hooks results
+    :param statistics: a dict with statistics of Workload's iterations (see
+        rally.task.processing.statistics.WorkloadStatistics.to_dict). They
+        are calculated from all stored iterations if it is not specified
+    :param context_execution: a dict with timings and errors of setup and
+        cleanup of Workload's contexts by their full names (see
+        rally.task.context.ContextManager.execution)
     :returns: a dict with data on the workload.
     """
     return get_impl().workload_set_results(workload_uuid=workload_uuid,
@@ -274,7 +284,9 @@ def workload_set_results(workload_uuid, subtask_uuid, task_uuid, load_duration,
                                            full_duration=full_duration,
                                            start_time=start_time,
                                            sla_results=sla_results,
-                                           hooks_results=hooks_results)
+                                           hooks_results=hooks_results,
+                                           statistics=statistics,
+                                           context_execution=context_execution)
 
 
 def deployment_create(values):
@@ -518,3 +530,99 @@ def update_worker(hostname):
     :raises WorkerNotFound: if worker not found
     """
     get_impl().update_worker(hostname)
+
+
+def worker_job_create(workload_uuid, first_iteration, times, job):
+    """Create a job with a range of workload iterations for workers.
+
+    :param workload_uuid: UUID of the workload
+    :param first_iteration: number of the first iteration in the range
+    :param times: number of iterations in the range
+    :param job: serialized data which is required to execute the iterations
+    :returns: a dict with the job data
+    """
+    return get_impl().worker_job_create(workload_uuid, first_iteration,
+                                        times, job)
+
+
+def worker_job_get(job_uuid):
+    """Get a worker job without the job and results data.
+
+    :param job_uuid: UUID of the job
+    :raises ResourceNotFound: if the job does not exist
+    :returns: a dict with the job data
+    """
+    return get_impl().worker_job_get(job_uuid)
+
+
+def worker_job_list(workload_uuid, status=None, with_results=False):
+    """Get a list of jobs of the workload.
+
+    :param workload_uuid: UUID of the workload
+    :param status: status to filter the jobs by
+    :param with_results: whether to load results of the jobs or not
+    :returns: a list of dicts with jobs data ordered by creation
+    """
+    return get_impl().worker_job_list(workload_uuid, status=status,
+                                      with_results=with_results)
+
+
+def worker_job_claim(hostname):
+    """Take the oldest pending job and mark it as running by the worker.
+
+    :param hostname: The hostname of the worker service
+    :returns: a dict with the job data (including the job field) or None
+              if there is no pending jobs
+    """
+    return get_impl().worker_job_claim(hostname)
+
+
+def worker_job_release(job_uuid, hostname):
+    """Return a running job back to the pending state.
+
+    :param job_uuid: UUID of the job
+    :param hostname: The hostname of the worker which runs the job
+    :returns: True if the job is released, False if the job is not running
+              by the worker anymore
+    """
+    return get_impl().worker_job_release(job_uuid, hostname)
+
+
+def worker_job_finish(job_uuid, hostname, results):
+    """Store results of a running or aborted job.
+
+    :param job_uuid: UUID of the job
+    :param hostname: The hostname of the worker which runs the job
+    :param results: serialized results of the job
+    :returns: True if results are stored, False if the job is not running
+              by the worker anymore
+    """
+    return get_impl().worker_job_finish(job_uuid, hostname, results)
+
+
+def worker_jobs_abort(workload_uuid):
+    """Abort all unfinished jobs of the workload.
+
+    Pending jobs are deleted, running ones are marked as aborted, so workers
+    are able to stop them and send partial results.
+
+    :param workload_uuid: UUID of the workload
+    """
+    get_impl().worker_jobs_abort(workload_uuid)
+
+
+def worker_job_delete(job_uuid):
+    """Delete a job.
+
+    :param job_uuid: UUID of the job
+    :raises ResourceNotFound: if the job does not exist
+    """
+    get_impl().worker_job_delete(job_uuid)
+
+
+def worker_jobs_delete(workload_uuid):
+    """Delete all jobs of the workload whatever their statuses are.
+
+    :param workload_uuid: UUID of the workload
+    """
+    get_impl().worker_jobs_delete(workload_uuid)
@@ -33,12 +33,14 @@ import six
 from sqlalchemy import or_
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm import load_only as sa_loadonly
+from sqlalchemy.orm import undefer
 
+from rally.common.db.sqlalchemy import chunk_codec
 from rally.common.db.sqlalchemy import models
 from rally.common.i18n import _
 from rally import consts
 from rally import exceptions
-from rally.task.processing import charts
+from rally.task.processing import statistics as wstatistics
 
 
 CONF = cfg.CONF
@@ -54,6 +56,7 @@ def serialize_data(data):
     if isinstance(data, (six.integer_types,
                          six.string_types,
                          six.text_type,
+                         six.binary_type,
                          dt.date,
                          dt.time,
                          float,
@@ -252,7 +255,8 @@ class Connection(object):
                        order_by(models.WorkloadData.chunk_order.asc()))
 
         return sorted([raw for workload_data in results
-                       for raw in workload_data.chunk_data["raw"]],
+                       for raw in chunk_codec.decode(
+                           workload_data.chunk_data)],
                       key=lambda x: x["timestamp"])
 
     @serialize
@@ -428,7 +432,7 @@ class Connection(object):
     @serialize
     def workload_get(self, workload_uuid):
         return self.model_query(models.Workload).filter_by(
-            uuid=workload_uuid).first()
+            uuid=workload_uuid).options(undefer("context_execution")).first()
 
     @serialize
     def workload_create(self, task_uuid, subtask_uuid, name, description,
@@ -452,7 +456,7 @@ class Connection(object):
 
     @serialize
     def workload_data_create(self, task_uuid, workload_uuid, chunk_order,
-                             data):
+                             data, codec=None):
         workload_data = models.WorkloadData(task_uuid=task_uuid,
                                             workload_uuid=workload_uuid)
 
@@ -483,16 +487,18 @@ class Connection(object):
         if finished_at == 0:
             finished_at = now
 
+        chunk_data, chunk_size, compressed_chunk_size = chunk_codec.encode(
+            raw_data, codec)
+
         workload_data.update({
             "task_uuid": task_uuid,
             "workload_uuid": workload_uuid,
             "chunk_order": chunk_order,
             "iteration_count": iter_count,
             "failed_iteration_count": failed_iter_count,
-            "chunk_data": {"raw": raw_data},
-            # TODO(ikhudoshyn)
-            "chunk_size": 0,
-            "compressed_chunk_size": 0,
+            "chunk_data": chunk_data,
+            "chunk_size": chunk_size,
+            "compressed_chunk_size": compressed_chunk_size,
             "started_at": dt.datetime.fromtimestamp(started_at),
             "finished_at": dt.datetime.fromtimestamp(finished_at)
         })
@@ -502,34 +508,18 @@ class Connection(object):
     @serialize
     def workload_set_results(self, workload_uuid, subtask_uuid, task_uuid,
                              load_duration, full_duration, start_time,
-                             sla_results, hooks_results):
+                             sla_results, hooks_results, statistics=None,
+                             context_execution=None):
         session = get_session()
         with session.begin():
-            workload_results = self._task_workload_data_get_all(workload_uuid)
-
-            iter_count = len(workload_results)
-
-            failed_iter_count = 0
-            max_duration = None
-            min_duration = None
-
-            for d in workload_results:
-                if d.get("error"):
-                    failed_iter_count += 1
-
-                duration = d.get("duration", 0)
-
-                if max_duration is None or duration > max_duration:
-                    max_duration = duration
-
-                if min_duration is None or min_duration > duration:
-                    min_duration = duration
-
-            durations_stat = charts.MainStatsTable(
-                {"total_iteration_count": iter_count})
-
-            for itr in workload_results:
-                durations_stat.add_iteration(itr)
+            if statistics is None:
+                workload_results = self._task_workload_data_get_all(
+                    workload_uuid)
+                workload_stats = wstatistics.WorkloadStatistics(
+                    len(workload_results))
+                for itr in workload_results:
+                    workload_stats.add_iteration(itr)
+                statistics = workload_stats.to_dict()
 
             sla = sla_results or []
             # NOTE(ikhudoshyn): we call it 'pass_sla'
@@ -541,16 +531,18 @@ class Connection(object):
                 uuid=workload_uuid).update(
                 {
                     "sla_results": {"sla": sla},
-                    "context_execution": {},
+                    "context_execution": context_execution or {},
                     "hooks": hooks_results or [],
                     "load_duration": load_duration,
                     "full_duration": full_duration,
-                    "min_duration": min_duration,
-                    "max_duration": max_duration,
-                    "total_iteration_count": iter_count,
-                    "failed_iteration_count": failed_iter_count,
+                    "min_duration": statistics["min_duration"],
+                    "max_duration": statistics["max_duration"],
+                    "total_iteration_count": statistics[
+                        "total_iteration_count"],
+                    "failed_iteration_count": statistics[
+                        "failed_iteration_count"],
                     "start_time": start_time,
-                    "statistics": {"durations": durations_stat.to_dict()},
+                    "statistics": {"durations": statistics["durations"]},
                     "pass_sla": success}
             )
             task_values = {
@@ -821,3 +813,92 @@ class Connection(object):
                  update({"updated_at": timeutils.utcnow()}))
         if count == 0:
             raise exceptions.WorkerNotFound(worker=hostname)
+
+    @serialize
+    def worker_job_create(self, workload_uuid, first_iteration, times, job):
+        worker_job = models.WorkerJob()
+        worker_job.update({"workload_uuid": workload_uuid,
+                           "first_iteration": first_iteration,
+                           "times": times,
+                           "job": job})
+        worker_job.save()
+        return worker_job
+
+    @serialize
+    def worker_job_get(self, job_uuid):
+        try:
+            return (self.model_query(models.WorkerJob).
+                    filter_by(uuid=job_uuid).one())
+        except NoResultFound:
+            raise exceptions.ResourceNotFound(id=job_uuid)
+
+    @serialize
+    def worker_job_list(self, workload_uuid, status=None,
+                        with_results=False):
+        query = self.model_query(models.WorkerJob).filter_by(
+            workload_uuid=workload_uuid)
+        if status is not None:
+            query = query.filter_by(status=status)
+        if with_results:
+            query = query.options(undefer("results"))
+        return query.order_by(models.WorkerJob.id).all()
+
+    @serialize
+    def worker_job_claim(self, hostname):
+        candidates = (self.model_query(models.WorkerJob).
+                      filter_by(status=consts.WorkerJobStatus.PENDING).
+                      order_by(models.WorkerJob.id).
+                      with_entities(models.WorkerJob.id).limit(10).all())
+        for (job_id,) in candidates:
+            # NOTE: the job can be claimed by another worker in parallel, so
+            #   the status is checked as a part of the update statement.
+            count = (self.model_query(models.WorkerJob).
+                     filter_by(id=job_id,
+                               status=consts.WorkerJobStatus.PENDING).
+                     update({"status": consts.WorkerJobStatus.RUNNING,
+                             "hostname": hostname},
+                            synchronize_session=False))
+            if count:
+                return (self.model_query(models.WorkerJob).
+                        filter_by(id=job_id).options(undefer("job")).one())
+
+    def worker_job_release(self, job_uuid, hostname):
+        count = (self.model_query(models.WorkerJob).
+                 filter_by(uuid=job_uuid, hostname=hostname,
+                           status=consts.WorkerJobStatus.RUNNING).
+                 update({"status": consts.WorkerJobStatus.PENDING,
+                         "hostname": None}, synchronize_session=False))
+        return bool(count)
+
+    def worker_job_finish(self, job_uuid, hostname, results):
+        count = (self.model_query(models.WorkerJob).
+                 filter_by(uuid=job_uuid, hostname=hostname).
+                 filter(models.WorkerJob.status.in_(
+                     [consts.WorkerJobStatus.RUNNING,
+                      consts.WorkerJobStatus.ABORTED])).
+                 update({"status": consts.WorkerJobStatus.FINISHED,
+                         "results": results}, synchronize_session=False))
+        return bool(count)
+
+    def worker_jobs_abort(self, workload_uuid):
+        session = get_session()
+        with session.begin():
+            query = self.model_query(models.WorkerJob, session=session)
+            query.filter_by(workload_uuid=workload_uuid,
+                            status=consts.WorkerJobStatus.PENDING).delete(
+                synchronize_session=False)
+            query.filter_by(workload_uuid=workload_uuid,
+                            status=consts.WorkerJobStatus.RUNNING).update(
+                {"status": consts.WorkerJobStatus.ABORTED},
+                synchronize_session=False)
+
+    def worker_job_delete(self, job_uuid):
+        count = (self.model_query(models.WorkerJob).
+                 filter_by(uuid=job_uuid).delete(synchronize_session=False))
+        if not count:
+            raise exceptions.ResourceNotFound(id=job_uuid)
+
+    def worker_jobs_delete(self, workload_uuid):
+        (self.model_query(models.WorkerJob).
+         filter_by(workload_uuid=workload_uuid).
+         delete(synchronize_session=False))
@@ -0,0 +1,137 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Codecs of raw iteration results stored in WorkloadData chunks.
+
+A codec is a combination of a layout and a compressor written as
+"<layout>+<compressor>" (e.g. "columnar+zlib"):
+
+* the layout transforms a list of iteration results into a JSON-compatible
+  structure. "row" keeps the list as is, "columnar" stores a list of values
+  per field of iterations (all "timestamp" values together, all "duration"
+  values together, etc), so similar data is placed side by side and is
+  compressed much better;
+* the compressor packs the JSON-encoded layout ("zlib" or "lzma" if the
+  lzma module is available).
+
+NOTE: the lzma module is a part of the standard library on Python 3 only, so
+chunks stored with "lzma" codecs can't be decoded by Rally running on
+Python 2.
+
+Encoded chunk looks like {"codec": "columnar+zlib", "data": "<base64>"}.
+Chunks which were stored before codecs were introduced look like
+{"raw": [...]} and are decoded as is.
+"""
+
+import base64
+import collections
+import json
+import zlib
+
+from rally import exceptions
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+
+def _row_pack(raw):
+    return raw
+
+
+def _row_unpack(data):
+    return data
+
+
+def _columnar_pack(raw):
+    columns = collections.OrderedDict()
+    missing = {}
+    for i, itr in enumerate(raw):
+        for key in itr:
+            if key not in columns:
+                columns[key] = [None] * i
+                if i:
+                    missing[key] = list(range(i))
+        for key, values in columns.items():
+            if key in itr:
+                values.append(itr[key])
+            else:
+                values.append(None)
+                missing.setdefault(key, []).append(i)
+    return {"count": len(raw),
+            "keys": list(columns),
+            "columns": list(columns.values()),
+            "missing": missing}
+
+
+def _columnar_unpack(data):
+    raw = [collections.OrderedDict() for i in range(data["count"])]
+    for key, values in zip(data["keys"], data["columns"]):
+        absent = set(data["missing"].get(key, ()))
+        for i, value in enumerate(values):
+            if i not in absent:
+                raw[i][key] = value
+    return raw
+
+
+LAYOUTS = {"row": (_row_pack, _row_unpack),
+           "columnar": (_columnar_pack, _columnar_unpack)}
+
+COMPRESSORS = {"zlib": (lambda data: zlib.compress(data, 6), zlib.decompress)}
+if lzma is not None:
+    COMPRESSORS["lzma"] = (lzma.compress, lzma.decompress)
+
+CODECS = sorted("%s+%s" % (layout, compressor)
+                for layout in LAYOUTS for compressor in COMPRESSORS)
+
+DEFAULT_CODEC = "columnar+zlib"
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def encode(raw, codec=None):
+    """Encode iteration results of a chunk.
+
+    :param raw: a list of iteration results
+    :param codec: a name of codec. Defaults to DEFAULT_CODEC
+    :returns: a tuple with the chunk data to store, a size of the
+              JSON-encoded layout before compression and a size of the JSON
+              representation of the chunk data (i.e. the size which is
+              written to the DB)
+    """
+    codec = codec or DEFAULT_CODEC
+    layout, compressor = codec.split("+")
+    uncompressed = _dumps(LAYOUTS[layout][0](raw))
+    data = COMPRESSORS[compressor][0](uncompressed)
+    chunk_data = {"codec": codec,
+                  "data": base64.b64encode(data).decode("ascii")}
+    return chunk_data, len(uncompressed), len(json.dumps(chunk_data))
+
+
+def decode(chunk_data):
+    """Decode iteration results of a chunk stored with any codec."""
+    if "raw" in chunk_data:
+        return chunk_data["raw"]
+    layout, compressor = chunk_data["codec"].split("+")
+    if compressor not in COMPRESSORS:
+        raise exceptions.RallyException(
+            "Chunk of workload data is encoded with '%s' codec, but the "
+            "'%s' compressor is not available (the '%s' module is missing)."
+            % (chunk_data["codec"], compressor, compressor))
+    data = COMPRESSORS[compressor][1](base64.b64decode(chunk_data["data"]))
+    return LAYOUTS[layout][1](json.loads(
+        data.decode("utf-8"), object_pairs_hook=collections.OrderedDict))
@@ -0,0 +1,62 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add worker_jobs table
+
+Revision ID: 7287df262dbc
+Revises: fab4f4f31f8a
+Create Date: 2017-10-02 13:12:41.518310
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "7287df262dbc"
+down_revision = "fab4f4f31f8a"
+branch_labels = None
+depends_on = None
+
+
+from alembic import op
+import sqlalchemy as sa
+
+from rally.common.db.sqlalchemy import types as sa_types
+from rally import exceptions
+
+
+def upgrade():
+    op.create_table(
+        "worker_jobs",
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("uuid", sa.String(length=36), nullable=False),
+        sa.Column("workload_uuid", sa.String(length=36), nullable=False),
+        sa.Column("hostname", sa.String(length=255), nullable=True),
+        sa.Column("status", sa.String(length=36), nullable=False),
+        sa.Column("first_iteration", sa.Integer(), nullable=False),
+        sa.Column("times", sa.Integer(), nullable=False),
+        sa.Column("job", sa_types.LongBinary(), nullable=False),
+        sa.Column("results", sa_types.LongBinary(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+
+    op.create_index("worker_job_uuid", "worker_jobs", ["uuid"], unique=True)
+    op.create_index("worker_job_workload_uuid", "worker_jobs",
+                    ["workload_uuid"], unique=False)
+    op.create_index("worker_job_status", "worker_jobs", ["status"],
+                    unique=False)
+
+
+def downgrade():
+    raise exceptions.DowngradeNotSupported()
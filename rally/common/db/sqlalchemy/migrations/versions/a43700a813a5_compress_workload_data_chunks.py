@@ -0,0 +1,108 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compress workload data chunks
+
+Revision ID: a43700a813a5
+Revises: 7287df262dbc
+Create Date: 2017-10-09 15:21:08.173902
+
+"""
+
+import base64
+import collections
+import json
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+from rally.common.db.sqlalchemy import types as sa_types
+from rally import exceptions
+
+# revision identifiers, used by Alembic.
+revision = "a43700a813a5"
+down_revision = "7287df262dbc"
+branch_labels = None
+depends_on = None
+
+
+workload_data_helper = sa.Table(
+    "workloaddata",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("uuid", sa.String(36), nullable=False),
+    sa.Column("chunk_data", sa_types.MutableJSONEncodedDict(), nullable=False),
+    sa.Column("chunk_size", sa.Integer, nullable=False),
+    sa.Column("compressed_chunk_size", sa.Integer, nullable=False)
+)
+
+
+# NOTE: the encoder is copied from rally.common.db.sqlalchemy.chunk_codec as
+#   it was at this revision, so later changes of codecs don't affect the
+#   migration. The "columnar+zlib" codec should be decodable by chunk_codec
+#   forever.
+def _columnar_pack(raw):
+    columns = collections.OrderedDict()
+    missing = {}
+    for i, itr in enumerate(raw):
+        for key in itr:
+            if key not in columns:
+                columns[key] = [None] * i
+                if i:
+                    missing[key] = list(range(i))
+        for key, values in columns.items():
+            if key in itr:
+                values.append(itr[key])
+            else:
+                values.append(None)
+                missing.setdefault(key, []).append(i)
+    return {"count": len(raw),
+            "keys": list(columns),
+            "columns": list(columns.values()),
+            "missing": missing}
+
+
+def _encode(raw):
+    uncompressed = json.dumps(_columnar_pack(raw),
+                              separators=(",", ":")).encode("utf-8")
+    chunk_data = {"codec": "columnar+zlib",
+                  "data": base64.b64encode(
+                      zlib.compress(uncompressed, 6)).decode("ascii")}
+    return chunk_data, len(uncompressed), len(json.dumps(chunk_data))
+
+
+def upgrade():
+    connection = op.get_bind()
+
+    # NOTE: chunks are fetched one by one, since all the raw data of
+    #   a big database does not fit into memory
+    ids = [row.id for row in connection.execute(
+        sa.select([workload_data_helper.c.id]))]
+    for chunk_id in ids:
+        wdata = connection.execute(workload_data_helper.select(
+            workload_data_helper.c.id == chunk_id)).fetchone()
+        if "raw" not in wdata.chunk_data:
+            continue
+        raw = wdata.chunk_data["raw"]
+        chunk_data, chunk_size, compressed_chunk_size = _encode(raw)
+        connection.execute(workload_data_helper.update().where(
+            workload_data_helper.c.id == chunk_id).values(
+            chunk_data=chunk_data,
+            chunk_size=chunk_size,
+            compressed_chunk_size=compressed_chunk_size))
+
+
+def downgrade():
+    raise exceptions.DowngradeNotSupported()
@@ -419,6 +419,28 @@ class Worker(BASE, RallyBase):
     hostname = sa.Column(sa.String(255))
 
 
+class WorkerJob(BASE, RallyBase):
+    """Represents a range of workload iterations handed to a worker."""
+    __tablename__ = "worker_jobs"
+    __table_args__ = (
+        sa.Index("worker_job_uuid", "uuid", unique=True),
+        sa.Index("worker_job_workload_uuid", "workload_uuid"),
+        sa.Index("worker_job_status", "status"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    uuid = sa.Column(sa.String(36), default=UUID, nullable=False)
+    workload_uuid = sa.Column(sa.String(36), nullable=False)
+    # hostname of the worker which executes the job
+    hostname = sa.Column(sa.String(255), nullable=True)
+    status = sa.Column(sa.String(36), nullable=False,
+                       default=consts.WorkerJobStatus.PENDING)
+    first_iteration = sa.Column(sa.Integer, nullable=False)
+    times = sa.Column(sa.Integer, nullable=False)
+    job = deferred(sa.Column(sa_types.LongBinary, nullable=False))
+    results = deferred(sa.Column(sa_types.LongBinary, nullable=True))
+
+
 # TODO(boris-42): Remove it after oslo.db > 1.4.1 will be released.
 def drop_all_objects(engine):
     """Drop all database objects.
@@ -64,6 +64,22 @@ class LongText(sa_types.TypeDecorator):
             return dialect.type_descriptor(sa_types.Text)
 
 
+class LongBinary(sa_types.TypeDecorator):
+    """Represents a binary data.
+
+       The same as for LongText, MySql BLOB type is limited by 64kb, so this
+       type uses LONGBLOB for MySql.
+    """
+
+    impl = sa_types.LargeBinary
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "mysql":
+            return dialect.type_descriptor(mysql_types.LONGBLOB)
+        else:
+            return dialect.type_descriptor(sa_types.LargeBinary)
+
+
 class JSONEncodedDict(LongText):
     """Represents an immutable structure as a json-encoded string."""
 
@@ -106,6 +106,7 @@ HOOK_RUN_RESULT_SCHEMA = {
     "properties": {
         "started_at": {"type": "number"},
         "finished_at": {"type": "number"},
+        "skew": {"type": "number"},
         "triggered_by": {
             "type": "object",
             "properties": {"event_type": {"type": "string"},
@@ -310,13 +311,14 @@ class Workload(object):
     def __getitem__(self, key):
         return self.workload[key]
 
-    def add_workload_data(self, chunk_order, workload_data):
+    def add_workload_data(self, chunk_order, workload_data, codec=None):
         db.workload_data_create(self.workload["task_uuid"],
                                 self.workload["uuid"], chunk_order,
-                                workload_data)
+                                workload_data, codec=codec)
 
     def set_results(self, load_duration, full_duration, start_time,
-                    sla_results, hooks_results=None):
+                    sla_results, hooks_results=None, statistics=None,
+                    context_execution=None):
         db.workload_set_results(workload_uuid=self.workload["uuid"],
                                 subtask_uuid=self.workload["subtask_uuid"],
                                 task_uuid=self.workload["task_uuid"],
@@ -324,7 +326,9 @@ class Workload(object):
                                 full_duration=full_duration,
                                 start_time=start_time,
                                 sla_results=sla_results,
-                                hooks_results=hooks_results)
+                                hooks_results=hooks_results,
+                                statistics=statistics,
+                                context_execution=context_execution)
 
     @classmethod
     def to_task(cls, workload):
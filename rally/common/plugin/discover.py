@@ -19,6 +19,7 @@ import os
 import pkg_resources
 import pkgutil
 import sys
+import threading
 
 from oslo_utils import importutils
 import six
@@ -29,6 +30,53 @@ from rally.common import logging
 
 LOG = logging.getLogger(__name__)
 
+# NOTE: modules with plugins which are imported on demand (see
+#   rally.plugins.load). _LAZY_MODULES_BY_NAME maps names of plugins to
+#   modules which define them, _LAZY_MODULES contains all the modules
+#   (including ones without plugins) which are imported once all
+#   subclasses of some class are requested.
+_LAZY_MODULES = []
+_LAZY_MODULES_BY_NAME = {}
+_LAZY_LOCK = threading.RLock()
+
+
+def add_lazy_modules(modules, modules_by_plugin_name):
+    """Register modules which are imported on demand.
+
+    :param modules: names of all the modules
+    :param modules_by_plugin_name: dict with lists of names of modules by
+        names of plugins which are defined in them
+    """
+    with _LAZY_LOCK:
+        _LAZY_MODULES.extend(m for m in modules if m not in sys.modules)
+        for name, plugin_modules in modules_by_plugin_name.items():
+            _LAZY_MODULES_BY_NAME.setdefault(name, []).extend(plugin_modules)
+
+
+def import_lazy_modules(plugin_name=None):
+    """Import modules registered with add_lazy_modules.
+
+    :param plugin_name: import only modules which define plugins with this
+        name. By default, all the modules are imported
+    """
+    if plugin_name is None:
+        if not _LAZY_MODULES:
+            return
+    elif plugin_name not in _LAZY_MODULES_BY_NAME:
+        return
+
+    with _LAZY_LOCK:
+        if plugin_name is None:
+            modules = list(_LAZY_MODULES)
+            del _LAZY_MODULES[:]
+            _LAZY_MODULES_BY_NAME.clear()
+        else:
+            modules = _LAZY_MODULES_BY_NAME.pop(plugin_name, [])
+        for module_name in modules:
+            if module_name not in sys.modules:
+                sys.modules[module_name] = importutils.import_module(
+                    module_name)
+
 
 def itersubclasses(cls, seen=None):
     """Generator over all subclasses of a given class in depth first order.
@@ -36,6 +84,10 @@ def itersubclasses(cls, seen=None):
     NOTE: Use 'seen' to exclude cls which was reduplicated found, because
     cls maybe has multiple super classes of the same plugin.
     """
+    if seen is None:
+        # NOTE: subclasses may be defined in modules which are not imported
+        #   yet
+        import_lazy_modules()
 
     seen = seen or set()
     try:
@@ -50,22 +102,56 @@ def itersubclasses(cls, seen=None):
                 yield sub
 
 
-def import_modules_from_package(package):
-    """Import modules from package and append into sys.modules
+def find_modules_in_package(package):
+    """Find modules of package without importing them.
 
     :param package: Full package name. For example: rally.deployment.engines
+    :returns: a list of tuples with a name of module and a path to its file
     """
     path = [os.path.dirname(rally.__file__), ".."] + package.split(".")
     path = os.path.join(*path)
+    modules = []
     for root, dirs, files in os.walk(path):
         for filename in files:
             if filename.startswith("__") or not filename.endswith(".py"):
                 continue
             new_package = ".".join(root.split(os.sep)).split("....")[1]
-            module_name = "%s.%s" % (new_package, filename[:-3])
-            if module_name not in sys.modules:
-                sys.modules[module_name] = importutils.import_module(
-                    module_name)
+            modules.append(("%s.%s" % (new_package, filename[:-3]),
+                            os.path.join(root, filename)))
+    return modules
+
+
+def import_modules_from_package(package):
+    """Import modules from package and append into sys.modules
+
+    :param package: Full package name. For example: rally.deployment.engines
+    """
+    for module_name, path in find_modules_in_package(package):
+        if module_name not in sys.modules:
+            sys.modules[module_name] = importutils.import_module(module_name)
+
+
+def find_modules_by_entry_point():
+    """Find modules of packages registered by entry-point 'rally_plugins'.
+
+    Packages are imported to get their paths, modules are not imported.
+
+    :returns: a list of tuples with a package, a name and a version of the
+        distribution which provides it and a list of names of its modules
+    """
+    packages = []
+    for ep in pkg_resources.iter_entry_points("rally_plugins"):
+        if ep.name == "path":
+            m = ep.load()
+            if hasattr(m, "__path__"):
+                path = pkgutil.extend_path(m.__path__, m.__name__)
+            else:
+                path = [m.__file__]
+            modules = [name for loader, name, _is_pkg in pkgutil.walk_packages(
+                path, prefix=m.__name__ + ".")]
+            packages.append((m, "%s %s" % (ep.dist.project_name,
+                                           ep.dist.version), modules))
+    return packages
 
 
 def import_modules_by_entry_point():
@@ -14,6 +14,7 @@
 #    under the License.
 
 import sys
+import weakref
 
 from rally.common.i18n import _
 from rally.common.i18n import _LE
@@ -23,6 +24,32 @@ from rally.common.plugin import meta
 from rally import exceptions
 
 
+# NOTE: the index of plugins by their names. It is maintained by
+#   Plugin._meta_init, Plugin._meta_set and Plugin._meta_clear, so looking a
+#   plugin up doesn't walk the whole tree of subclasses. Weak references are
+#   stored, since (like with __subclasses__) plugin classes created on the
+#   fly should not be kept alive by the index.
+_PLUGINS_BY_NAME = {}
+_PLUGIN_NAMES = weakref.WeakKeyDictionary()
+
+
+def _update_index(plugin):
+    """Put the plugin to the index under its current name."""
+    old_name = _PLUGIN_NAMES.pop(plugin, None)
+    if old_name is not None:
+        refs = [ref for ref in _PLUGINS_BY_NAME.get(old_name, [])
+                if ref() not in (plugin, None)]
+        if refs:
+            _PLUGINS_BY_NAME[old_name] = refs
+        else:
+            _PLUGINS_BY_NAME.pop(old_name, None)
+    if plugin._meta_is_inited(raise_exc=False):
+        name = plugin._meta.get("name")
+        if name is not None:
+            _PLUGIN_NAMES[plugin] = name
+            _PLUGINS_BY_NAME.setdefault(name, []).append(weakref.ref(plugin))
+
+
 def base():
     """Mark Plugin as a base.
 
@@ -76,14 +103,16 @@ def configure(name, platform="default", hidden=False):
                              plugin_id)
 
         plugin._meta_init()
-        try:
-            existing_plugin = plugin._get_base().get(
-                name=name, platform=platform, allow_hidden=True,
-                fallback_to_default=False)
-        except exceptions.PluginNotFound:
+        # NOTE: only the index is checked here, so loading N plugins doesn't
+        #   scan the tree of subclasses N times
+        existing_plugins = [
+            p for p in plugin._get_base()._get_indexed(name)
+            if p.get_platform() == platform]
+        if not existing_plugins:
             plugin._meta_set("name", name)
             plugin._meta_set("platform", platform)
         else:
+            existing_plugin = existing_plugins[0]
             plugin.unregister()
             raise exceptions.PluginWithSuchNameExists(
                 name=name, platform=existing_plugin.get_platform(),
@@ -132,6 +161,28 @@ def deprecated(reason, rally_version):
 class Plugin(meta.MetaMixin, info.InfoMixin):
     """Base class for all Plugins in Rally."""
 
+    @classmethod
+    def _meta_init(cls):
+        super(Plugin, cls)._meta_init()
+        _update_index(cls)
+
+    @classmethod
+    def _meta_clear(cls):
+        super(Plugin, cls)._meta_clear()
+        _update_index(cls)
+
+    @classmethod
+    def _meta_set(cls, key, value):
+        super(Plugin, cls)._meta_set(key, value)
+        if key == "name":
+            _update_index(cls)
+
+    @classmethod
+    def _meta_setdefault(cls, key, value):
+        super(Plugin, cls)._meta_setdefault(key, value)
+        if key == "name":
+            _update_index(cls)
+
     @classmethod
     def unregister(cls):
         """Removes all plugin meta information and makes it undiscoverable."""
@@ -146,8 +197,8 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
             fallback_to_default=True):
         """Return plugin by its name for specified platform.
 
-        This method iterates over all subclasses of cls and returns plugin
-        by name for specified platform.
+        This method looks for subclasses of cls with the specified name in
+        the index of plugins and returns plugin for specified platform.
 
         If platform is not specified, it will return first found plugin from
         any of platform.
@@ -199,7 +250,13 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
         """
         plugins = []
 
-        for p in discover.itersubclasses(cls):
+        candidates = cls._get_indexed(name) if name else None
+        if not candidates:
+            # NOTE: plugins whose meta was set bypassing Plugin methods are
+            #   not indexed, so they can be found only by the scan.
+            candidates = discover.itersubclasses(cls)
+
+        for p in candidates:
             if not issubclass(p, Plugin):
                 continue
             if not p._meta_is_inited(raise_exc=False):
@@ -214,6 +271,19 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
 
         return plugins
 
+    @classmethod
+    def _get_indexed(cls, name):
+        """Return indexed subclasses of cls with the specified name."""
+        discover.import_lazy_modules(name)
+        plugins = []
+        for ref in _PLUGINS_BY_NAME.get(name, ()):
+            p = ref()
+            if (p is not None and p is not cls and issubclass(p, cls)
+                    and p._meta_is_inited(raise_exc=False)
+                    and p._meta.get("name") == name):
+                plugins.append(p)
+        return plugins
+
     @classmethod
     def get_name(cls):
         """Return plugin's name."""
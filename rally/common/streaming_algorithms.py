@@ -20,8 +20,6 @@ import math
 
 import six
 
-from rally.task.processing import utils
-
 
 @six.add_metaclass(abc.ABCMeta)
 class StreamingAlgorithm(object):
@@ -31,6 +29,15 @@ class StreamingAlgorithm(object):
     def add(self, value):
         """Process a single value from the input stream."""
 
+    def add_many(self, values):
+        """Process a list of values from the input stream.
+
+        The result is the same as if the values are processed one by one,
+        but subclasses may do it faster.
+        """
+        for value in values:
+            self.add(value)
+
     @abc.abstractmethod
     def merge(self, other):
         """Merge results processed by another instance."""
@@ -45,6 +52,12 @@ class StreamingAlgorithm(object):
         except (TypeError, ValueError):
             raise TypeError("Non-numerical value: %r" % value)
 
+    def _cast_all_to_float(self, values):
+        try:
+            return list(map(float, values))
+        except (TypeError, ValueError):
+            return [self._cast_to_float(value) for value in values]
+
 
 class MeanComputation(StreamingAlgorithm):
     """Compute mean for a stream of numbers."""
@@ -57,6 +70,12 @@ class MeanComputation(StreamingAlgorithm):
         self.count += 1
         self.total += value
 
+    def add_many(self, values):
+        self.count += len(values)
+        # NOTE: sum() adds the values one by one, so the total is exactly
+        #   the same as with add()
+        self.total = sum(values, self.total)
+
     def merge(self, other):
         self.count += other.count
         self.total += other.total
@@ -125,6 +144,10 @@ class MinComputation(StreamingAlgorithm):
         if self._value is None or value < self._value:
             self._value = value
 
+    def add_many(self, values):
+        if values:
+            self.add(min(self._cast_all_to_float(values)))
+
     def merge(self, other):
         if other._value is not None:
             self.add(other._value)
@@ -145,6 +168,10 @@ class MaxComputation(StreamingAlgorithm):
         if self._value is None or value > self._value:
             self._value = value
 
+    def add_many(self, values):
+        if values:
+            self.add(max(self._cast_all_to_float(values)))
+
     def merge(self, other):
         if other._value is not None:
             self.add(other._value)
@@ -153,34 +180,229 @@ class MaxComputation(StreamingAlgorithm):
         return self._value
 
 
+class _Buckets(object):
+    """Counters of a sketch indexed by keys of buckets."""
+
+    def __init__(self, max_buckets):
+        self.max_buckets = max_buckets
+        self.counts = {}
+        self.min_key = None
+
+    def add(self, key, count=1):
+        if self.min_key is not None and key < self.min_key:
+            key = self.min_key
+        self.counts[key] = self.counts.get(key, 0) + count
+        if len(self.counts) > self.max_buckets:
+            self._collapse()
+
+    def add_many(self, keys):
+        counts = self.counts
+        min_key = self.min_key
+        for key in keys:
+            if min_key is not None and key < min_key:
+                key = min_key
+            counts[key] = counts.get(key, 0) + 1
+        if len(counts) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        # NOTE: the buckets of the smallest absolute values are collapsed, so
+        #   the largest values (which matter the most for durations) keep the
+        #   accuracy
+        keys = sorted(self.counts)
+        excess = len(keys) - self.max_buckets
+        self.min_key = keys[excess]
+        for key in keys[:excess]:
+            self.counts[self.min_key] += self.counts.pop(key)
+
+
+class QuantileSketch(object):
+    """Mergeable sketch of a stream of numbers for approximate quantiles.
+
+    The sketch follows DDSketch (Masson, Rim, Lee. "DDSketch: A Fast and
+    Fully-Mergeable Quantile Sketch with Relative-Error Guarantees", 2019):
+    values are counted in buckets with logarithmically growing bounds, so a
+    value returned for any quantile differs from the exact value of the
+    same rank by at most ``relative_accuracy`` (relatively). Merging of two
+    sketches gives the same sketch as processing of both streams by one.
+
+    Memory is bounded by ``max_buckets`` buckets per sign of values. If
+    values span more orders of magnitude than the buckets cover (about 17
+    for default arguments), the buckets of the smallest absolute values are
+    collapsed and the error bound holds for the rest of them only.
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Unexpected relative accuracy: %s"
+                             % relative_accuracy)
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive = _Buckets(max_buckets)
+        self._negative = _Buckets(max_buckets)
+        self.zero_count = 0
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def _key(self, value):
+        return int(math.ceil(math.log(value) / self._log_gamma))
+
+    def _value(self, key):
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def add(self, value):
+        if value > 0:
+            self._positive.add(self._key(value))
+        elif value < 0:
+            self._negative.add(self._key(-value))
+        else:
+            self.zero_count += 1
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def add_many(self, values):
+        if not values:
+            return
+        # NOTE: the same as _key(), but without a call per value
+        log, ceil, log_gamma = math.log, math.ceil, self._log_gamma
+        self._positive.add_many([int(ceil(log(v) / log_gamma))
+                                 for v in values if v > 0])
+        self._negative.add_many([int(ceil(log(-v) / log_gamma))
+                                 for v in values if v < 0])
+        self.zero_count += values.count(0)
+        self.count += len(values)
+        min_value = min(values)
+        if self.min is None or min_value < self.min:
+            self.min = min_value
+        max_value = max(values)
+        if self.max is None or max_value > self.max:
+            self.max = max_value
+
+    def merge(self, other):
+        if self.relative_accuracy != other.relative_accuracy:
+            raise ValueError("Sketches with different relative accuracy "
+                             "can't be merged.")
+        if not other.count:
+            return
+        for key, count in other._positive.counts.items():
+            self._positive.add(key, count)
+        for key, count in other._negative.counts.items():
+            self._negative.add(key, count)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if self.min is None or other.min < self.min:
+            self.min = other.min
+        if self.max is None or other.max > self.max:
+            self.max = other.max
+
+    def quantile(self, q):
+        """Return an approximate value of the given quantile.
+
+        :param q: quantile from 0 to 1. The exact value of the quantile is
+                  the value with rank floor(q * (count - 1)) of the sorted
+                  stream.
+        :returns: None if the stream is empty
+        """
+        if not self.count:
+            return None
+        rank = int(q * (self.count - 1))
+        if rank == 0:
+            return self.min
+        if rank == self.count - 1:
+            return self.max
+        seen = 0
+        value = None
+        for key in sorted(self._negative.counts, reverse=True):
+            seen += self._negative.counts[key]
+            if seen > rank:
+                value = -self._value(key)
+                break
+        else:
+            seen += self.zero_count
+            if seen > rank:
+                value = 0.0
+            else:
+                for key in sorted(self._positive.counts):
+                    seen += self._positive.counts[key]
+                    if seen > rank:
+                        value = self._value(key)
+                        break
+        # NOTE: the exact value is always within [min, max], so clamping
+        #   makes the result only more accurate
+        return min(max(value, self.min), self.max)
+
+
 class PercentileComputation(StreamingAlgorithm):
-    """Compute percentile value from a stream of numbers."""
+    """Compute percentile value from a stream of numbers.
+
+    Up to ``exact_limit`` values are kept as they are and the percentile is
+    exact (it is interpolated between the closest ranks). For longer
+    streams the values are moved to QuantileSketch, so the memory is
+    bounded and the result differs from the value of the closest lower rank
+    by at most ``relative_accuracy`` (relatively).
+    """
 
-    def __init__(self, percent, length):
+    exact_limit = 10000
+    relative_accuracy = 0.01
+
+    def __init__(self, percent, length=None):
         """Init streaming computation.
 
         :param percent: numeric percent (from 0.00..1 to 0.999..)
-        :param length: count of the measurements
+        :param length: count of the measurements. It is not used anymore
+                       and is kept for backward compatibility only
         """
         if not 0 < percent < 1:
             raise ValueError("Unexpected percent: %s" % percent)
         self._percent = percent
+        self._values = []
+        self._sketch = None
 
-        self._graph_zipper = utils.GraphZipper(length, 10000)
+    def _to_sketch(self):
+        self._sketch = QuantileSketch(self.relative_accuracy)
+        self._sketch.add_many(self._values)
+        self._values = []
 
     def add(self, value):
-        self._graph_zipper.add_point(value)
+        value = self._cast_to_float(value)
+        if self._sketch is not None:
+            self._sketch.add(value)
+        else:
+            self._values.append(value)
+            if len(self._values) > self.exact_limit:
+                self._to_sketch()
+
+    def add_many(self, values):
+        values = self._cast_all_to_float(values)
+        if self._sketch is not None:
+            self._sketch.add_many(values)
+        else:
+            self._values.extend(values)
+            if len(self._values) > self.exact_limit:
+                self._to_sketch()
 
     def merge(self, other):
-        # TODO(ikhudoshyn): Implement me
-        raise NotImplementedError()
+        if (self._sketch is None and other._sketch is None and
+                len(self._values) + len(other._values) <= self.exact_limit):
+            self._values.extend(other._values)
+            return
+        if self._sketch is None:
+            self._to_sketch()
+        if other._sketch is not None:
+            self._sketch.merge(other._sketch)
+        self._sketch.add_many(other._values)
 
     def result(self):
-        results = list(
-            map(lambda x: x[1], self._graph_zipper.get_zipped_graph()))
-        if results:
+        if self._sketch is not None:
+            return self._sketch.quantile(self._percent)
+        if self._values:
             # NOTE(amaretskiy): Calculate percentile of a list of values
-            results.sort()
+            results = sorted(self._values)
             k = (len(results) - 1) * self._percent
             f = math.floor(k)
             c = math.ceil(k)
@@ -201,6 +423,9 @@ class IncrementComputation(StreamingAlgorithm):
     def add(self, *args):
         self._count += 1
 
+    def add_many(self, values):
+        self._count += len(values)
+
     def merge(self, other):
         self._count += other._count
 
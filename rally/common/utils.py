@@ -14,7 +14,6 @@
 #    under the License.
 
 import bisect
-import collections
 import copy
 import ctypes
 import heapq
@@ -541,48 +540,12 @@ def terminate_thread(thread_ident, exc_type=exceptions.ThreadTimeoutException):
     Use PyThreadState_SetAsyncExc to terminate thread.
 
     :param thread_ident: threading.Thread.ident value
-    :param exc_type: an Exception type to be raised
+    :param exc_type: an Exception type to be raised. None means that
+        an exception which is set but not raised yet should be cleared
     """
-
+    exc = ctypes.py_object(exc_type) if exc_type is not None else None
     ctypes.pythonapi.PyThreadState_SetAsyncExc(
-        ctypes.c_long(thread_ident), ctypes.py_object(exc_type))
-
-
-def timeout_thread(queue):
-    """Terminate threads by timeout.
-
-    Function need to be run in separate thread. Its designed to terminate
-    threads which are running longer then timeout.
-
-    Parent thread will put tuples (thread_ident, deadline) in the queue,
-    where `thread_ident` is Thread.ident value of thread to watch, and
-    `deadline` is timestamp when thread should be terminated. Also tuple
-    (None, None) should be put when all threads are exited and no more
-    threads to watch.
-
-    :param queue: Queue object to communicate with parent thread.
-    """
-
-    all_threads = collections.deque()
-    while True:
-        if not all_threads:
-            timeout = None
-        else:
-            thread, deadline = all_threads[0]
-            timeout = deadline - time.time()
-        try:
-            next_thread = queue.get(timeout=timeout)
-            all_threads.append(next_thread)
-        except (moves.queue.Empty, ValueError):
-            # NOTE(rvasilets) Empty means that timeout was occurred.
-            # ValueError means that timeout lower than 0.
-            if thread.isAlive():
-                LOG.info("Thread %s is timed out. Terminating." % thread.ident)
-                terminate_thread(thread.ident)
-            all_threads.popleft()
-
-        if next_thread == (None, None,):
-            return
+        ctypes.c_long(thread_ident), exc)
 
 
 class LockedDict(dict):
@@ -621,6 +584,11 @@ class LockedDict(dict):
         self._is_ready_to_be_unlocked = True
         return self
 
+    def __reduce__(self):
+        # NOTE: items of dict subclasses are unpickled before attributes,
+        #   so the dict is created from scratch instead
+        return self.__class__, (dict(self),)
+
     def __deepcopy__(self, memo=None):
         def unlock(obj):
             if isinstance(obj, LockedDict):
@@ -669,6 +637,49 @@ class LockedDict(dict):
         return super(LockedDict, self).clear(*args, **kwargs)
 
 
+class CopyOnWriteDict(dict):
+    """This represents a writable view of a read-only LockedDict.
+
+    Items are shared with the LockedDict, so the view costs as much as
+    a shallow copy of its top level. Nested LockedDicts are replaced by
+    views of them when they are got, so changes are stored in the view
+    only and the LockedDict remains the same:
+
+    base = LockedDict(foo={"bar": 1})
+    d = CopyOnWriteDict(base, spam=42)
+    d["foo"]["bar"] = 2  # Works, base["foo"]["bar"] is still 1
+
+    Lists of the LockedDict are tuples, so they can not be changed in place.
+    """
+
+    def _get_view(self, key, value):
+        if type(value) == LockedDict:
+            value = CopyOnWriteDict(value)
+            super(CopyOnWriteDict, self).__setitem__(key, value)
+        return value
+
+    def __getitem__(self, key):
+        return self._get_view(
+            key, super(CopyOnWriteDict, self).__getitem__(key))
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def values(self):
+        return [self[k] for k in self]
+
+    def items(self):
+        return [(k, self[k]) for k in self]
+
+    def __deepcopy__(self, memo=None):
+        return copy.deepcopy(dict(self), memo=memo)
+
+
 def format_float_to_str(num):
     """Format number into human-readable float format.
 
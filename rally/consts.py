@@ -214,6 +214,14 @@ class _VerificationStatus(utils.ImmutableMixin, utils.EnumMixin):
     CRASHED = "crashed"
 
 
+class _WorkerJobStatus(utils.ImmutableMixin, utils.EnumMixin):
+    """Statuses of iteration ranges handed to distributed workers."""
+    PENDING = "pending"
+    RUNNING = "running"
+    ABORTED = "aborted"
+    FINISHED = "finished"
+
+
 class _TimeFormat(utils.ImmutableMixin, utils.EnumMixin):
     """International time formats"""
     ISO8601 = "%Y-%m-%dT%H:%M:%S%z"
@@ -230,4 +238,5 @@ HookStatus = _HookStatus()
 TagType = _TagType()
 VerifierStatus = _VerifierStatus()
 VerificationStatus = _VerificationStatus()
+WorkerJobStatus = _WorkerJobStatus()
 TimeFormat = _TimeFormat()
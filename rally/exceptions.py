@@ -218,6 +218,19 @@ class WorkerAlreadyRegistered(RallyException):
     msg_fmt = _("Worker %(worker)s already registered")
 
 
+class WorkerDataNotAuthenticated(RallyException):
+    error_code = 529
+    msg_fmt = _("Data of worker job %(job)s is not authenticated. Check "
+                "that the coordinator and workers use the same "
+                "distributed_secret_key")
+
+
+class WorkersNotAvailable(RallyException):
+    error_code = 530
+    msg_fmt = _("No worker has executed jobs of workload %(workload)s for "
+                "%(timeout)s seconds")
+
+
 class MultipleMatchesFound(RallyException):
     error_code = 470
     msg_fmt = _("Found multiple %(needle)s: %(haystack)s")
@@ -14,7 +14,9 @@
 #    under the License.
 
 import abc
+import collections
 import os
+import threading
 
 from oslo_config import cfg
 from six.moves.urllib import parse
@@ -25,6 +27,7 @@ from rally.common import logging
 from rally.common.plugin import plugin
 from rally import consts
 from rally import exceptions
+from rally.task import atomic
 
 
 LOG = logging.getLogger(__name__)
@@ -71,10 +74,13 @@ def configure(name, default_version=None, default_service_type=None,
 class OSClient(plugin.Plugin):
     """Base class for openstack clients"""
 
-    def __init__(self, credential, api_info, cache_obj):
+    def __init__(self, credential, api_info, cache_obj, session_pool=None,
+                 atomic_inst=None):
         self.credential = credential
         self.api_info = api_info
         self.cache = cache_obj
+        self.session_pool = session_pool
+        self.atomic_inst = atomic_inst
 
     def choose_version(self, version=None):
         """Return version string.
@@ -148,7 +154,8 @@ class OSClient(plugin.Plugin):
     @property
     def keystone(self):
         return OSClient.get("keystone")(self.credential, self.api_info,
-                                        self.cache)
+                                        self.cache, self.session_pool,
+                                        self.atomic_inst)
 
     def _get_session(self, auth_url=None, version=None):
         LOG.warning(
@@ -236,7 +243,12 @@ class Keystone(OSClient):
         try:
             if "keystone_auth_ref" not in self.cache:
                 sess, plugin = self.get_session()
-                self.cache["keystone_auth_ref"] = plugin.get_access(sess)
+                if self._token_expires_soon(plugin):
+                    auth_ref = self._authenticate("keystone.authenticate",
+                                                  plugin.get_access, sess)
+                else:
+                    auth_ref = plugin.get_access(sess)
+                self.cache["keystone_auth_ref"] = auth_ref
         except Exception as e:
             if logging.is_debug():
                 LOG.exception("Unable to authenticate for user"
@@ -252,52 +264,85 @@ class Keystone(OSClient):
                 error=str(e))
         return self.cache["keystone_auth_ref"]
 
+    @staticmethod
+    def _token_expires_soon(plugin):
+        # NOTE: the same check is done by the identity plugin itself while
+        #   getting access, so this one only tells whether the token is going
+        #   to be requested.
+        return (plugin.auth_ref is None or plugin.auth_ref.will_expire_soon(
+            plugin.MIN_TOKEN_LIFE_SECONDS))
+
+    def _authenticate(self, action_name, func, *args):
+        """Call func, counting its duration as auth overhead if needed."""
+        if self.atomic_inst is None:
+            return func(*args)
+        with atomic.ActionTimer(self.atomic_inst, action_name):
+            return func(*args)
+
     def get_session(self, version=None):
         key = "keystone_session_and_plugin_%s" % version
         if key not in self.cache:
-            from keystoneauth1 import discover
-            from keystoneauth1 import identity
-            from keystoneauth1 import session
-
-            version = self.choose_version(version)
-            auth_url = self.credential.auth_url
-            if version is not None:
-                auth_url = self._remove_url_version()
-
-            password_args = {
-                "auth_url": auth_url,
-                "username": self.credential.username,
-                "password": self.credential.password,
-                "tenant_name": self.credential.tenant_name
-            }
-
-            if version is None:
-                # NOTE(rvasilets): If version not specified than we discover
-                # available version with the smallest number. To be able to
-                # discover versions we need session
-                temp_session = session.Session(
-                    verify=(self.credential.https_cacert or
-                            not self.credential.https_insecure),
-                    timeout=CONF.openstack_client_http_timeout)
-                version = str(discover.Discover(
-                    temp_session,
-                    password_args["auth_url"]).version_data()[0]["version"][0])
-
-            if "v2.0" not in password_args["auth_url"] and (
-                    version != "2"):
-                password_args.update({
-                    "user_domain_name": self.credential.user_domain_name,
-                    "domain_name": self.credential.domain_name,
-                    "project_domain_name": self.credential.project_domain_name
-                })
-            identity_plugin = identity.Password(**password_args)
-            sess = session.Session(
-                auth=identity_plugin,
+            if self.session_pool is None:
+                self.cache[key] = self._create_session(version)
+            else:
+                version = self.choose_version(version)
+                self.cache[key] = self.session_pool.get(
+                    self._get_session_pool_key(version),
+                    lambda: self._authenticate("keystone.create_session",
+                                               self._create_session, version))
+        return self.cache[key]
+
+    def _get_session_pool_key(self, version):
+        return (self.credential.auth_url, self.credential.username,
+                self.credential.password, self.credential.tenant_name,
+                self.credential.domain_name, self.credential.user_domain_name,
+                self.credential.project_domain_name,
+                self.credential.https_insecure, self.credential.https_cacert,
+                CONF.openstack_client_http_timeout, version)
+
+    def _create_session(self, version=None):
+        from keystoneauth1 import discover
+        from keystoneauth1 import identity
+        from keystoneauth1 import session
+
+        version = self.choose_version(version)
+        auth_url = self.credential.auth_url
+        if version is not None:
+            auth_url = self._remove_url_version()
+
+        password_args = {
+            "auth_url": auth_url,
+            "username": self.credential.username,
+            "password": self.credential.password,
+            "tenant_name": self.credential.tenant_name
+        }
+
+        if version is None:
+            # NOTE(rvasilets): If version not specified than we discover
+            # available version with the smallest number. To be able to
+            # discover versions we need session
+            temp_session = session.Session(
                 verify=(self.credential.https_cacert or
                         not self.credential.https_insecure),
                 timeout=CONF.openstack_client_http_timeout)
-            self.cache[key] = (sess, identity_plugin)
-        return self.cache[key]
+            version = str(discover.Discover(
+                temp_session,
+                password_args["auth_url"]).version_data()[0]["version"][0])
+
+        if "v2.0" not in password_args["auth_url"] and (
+                version != "2"):
+            password_args.update({
+                "user_domain_name": self.credential.user_domain_name,
+                "domain_name": self.credential.domain_name,
+                "project_domain_name": self.credential.project_domain_name
+            })
+        identity_plugin = identity.Password(**password_args)
+        sess = session.Session(
+            auth=identity_plugin,
+            verify=(self.credential.https_cacert or
+                    not self.credential.https_insecure),
+            timeout=CONF.openstack_client_http_timeout)
+        return sess, identity_plugin
 
     def _remove_url_version(self):
         """Remove any version from the auth_url.
@@ -789,18 +834,104 @@ class Watcher(OSClient):
         return client
 
 
+class SessionPool(object):
+    """Process-wide pool of keystone sessions.
+
+    Scenarios create new Clients on each iteration, so without the pool
+    each iteration discovers the keystone version and requests a new token.
+    Pooled sessions are shared by all the threads of the process which use
+    the same credential and keystone version. Identity plugins of
+    keystoneauth1 request a new token (under a lock) when the current one
+    expires in less than MIN_TOKEN_LIFE_SECONDS, so pooled tokens are
+    refreshed shortly before expiry.
+    """
+
+    def __init__(self, max_size=1000):
+        """Init the pool.
+
+        :param max_size: maximum number of pooled sessions. The oldest ones
+            are dropped when it is exceeded
+        """
+        self.max_size = max_size
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._creation_locks = {}
+        self._sessions = collections.OrderedDict()
+
+    def _check_pid(self):
+        # NOTE: runners fork processes for iterations. Sessions share opened
+        #   connections with the parent process and locks can be copied while
+        #   held by threads which do not exist in the child, so the forked
+        #   process starts with an empty pool.
+        if self._pid != os.getpid():
+            self._reset()
+
+    def get(self, key, create):
+        """Return a pooled (session, identity plugin) pair.
+
+        :param key: hashable key of a credential and a keystone version
+        :param create: callable which returns a new (session, identity
+            plugin) pair. It is called once per key even if several threads
+            ask for the missing key simultaneously
+        """
+        self._check_pid()
+        with self._lock:
+            if key in self._sessions:
+                return self._sessions[key]
+            creation_lock = self._creation_locks.setdefault(
+                key, threading.Lock())
+        with creation_lock:
+            with self._lock:
+                if key in self._sessions:
+                    return self._sessions[key]
+            session_and_plugin = create()
+            with self._lock:
+                self._sessions[key] = session_and_plugin
+                self._creation_locks.pop(key, None)
+                while len(self._sessions) > self.max_size:
+                    self._sessions.popitem(last=False)
+            return session_and_plugin
+
+    def clear(self):
+        """Remove all pooled sessions."""
+        with self._lock:
+            self._sessions.clear()
+
+
+SESSION_POOL = SessionPool()
+
+
 class Clients(object):
     """This class simplify and unify work with OpenStack python clients."""
 
-    def __init__(self, credential, api_info=None, cache=None):
+    def __init__(self, credential, api_info=None, cache=None,
+                 session_pool=None, atomic_inst=None):
+        """Init clients.
+
+        :param credential: OpenStack credential
+        :param api_info: dict with versions and service types of clients
+        :param cache: dict to cache client handles in
+        :param session_pool: SessionPool to borrow keystone sessions from.
+            By default, each Clients object authenticates on its own
+        :param atomic_inst: an object to store atomic actions in (usually, a
+            scenario). If it is set, the time spent on authentication is
+            stored as "keystone.create_session" and "keystone.authenticate"
+            atomic actions
+        """
         self.credential = credential
         self.api_info = api_info or {}
         self.cache = cache or {}
+        self.session_pool = session_pool
+        self.atomic_inst = atomic_inst
 
     def __getattr__(self, client_name):
         """Lazy load of clients."""
         return OSClient.get(client_name)(self.credential, self.api_info,
-                                         self.cache)
+                                         self.cache, self.session_pool,
+                                         self.atomic_inst)
 
     @classmethod
     def create_from_env(cls):
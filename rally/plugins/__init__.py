@@ -13,39 +13,162 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
+import json
 import os
+import sys
+import tempfile
 
 import decorator
 
+from rally.common import logging
 from rally.common.plugin import discover
+from rally.common.plugin import plugin
 
 
+LOG = logging.getLogger(__name__)
+
 PLUGINS_LOADED = False
 
+MANIFEST_PATH = os.path.expanduser("~/.rally/plugins_manifest.json")
+
+
+def _get_packages():
+    packages = ["rally.deployment.engines",
+                "rally.deployment.serverprovider",
+                "rally.plugins.common"]
+    try:
+        import rally_openstack  # noqa
+    except ImportError:
+        # print warnings when rally_openstack will be released
+        packages.extend(["rally.plugins.openstack", "rally.plugins.workload"])
+    return packages
+
+
+def _stamp_files(paths):
+    stamps = []
+    for path in paths:
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            stamps.append([path, stat.st_mtime, stat.st_size])
+            continue
+        for root, dirs, files in os.walk(path):
+            for filename in sorted(files):
+                if filename.endswith(".py"):
+                    stat = os.stat(os.path.join(root, filename))
+                    stamps.append([os.path.join(root, filename),
+                                   stat.st_mtime, stat.st_size])
+    return stamps
+
+
+def _find_modules():
+    """Find modules with plugins which can be imported on demand.
+
+    :returns: a list of names of the modules and a key which changes when
+        any of the modules or versions of packages change
+    """
+    modules = []
+    stamps = [sys.version]
+    for package in _get_packages():
+        package_modules = discover.find_modules_in_package(package)
+        modules.extend(name for name, path in package_modules)
+        stamps.append(package)
+        stamps.extend(_stamp_files([path for name, path in package_modules]))
+    for package, distribution, package_modules in (
+            discover.find_modules_by_entry_point()):
+        modules.extend(package_modules)
+        stamps.append(distribution)
+        if hasattr(package, "__path__"):
+            stamps.extend(_stamp_files(package.__path__))
+        else:
+            stamps.extend(_stamp_files([package.__file__]))
+    key = hashlib.sha1(json.dumps(stamps).encode("utf-8")).hexdigest()
+    return modules, key
+
+
+def _read_manifest(key):
+    try:
+        with open(MANIFEST_PATH) as f:
+            manifest = json.load(f)
+    except (IOError, ValueError):
+        return None
+    if manifest.get("key") != key:
+        return None
+    return manifest
+
+
+def _write_manifest(key, modules):
+    modules = set(modules)
+    plugins = {}
+    for p in plugin.Plugin.get_all(allow_hidden=True):
+        if p.get_name() is not None and p.__module__ in modules:
+            plugins.setdefault(p.get_name(), []).append(p.__module__)
+    manifest = {"key": key, "modules": sorted(modules), "plugins": plugins}
+    try:
+        dirname = os.path.dirname(MANIFEST_PATH)
+        if not os.path.exists(dirname):
+            os.makedirs(dirname)
+        # NOTE: the manifest is written to a temporary file and renamed, so
+        #   other processes never read it partially written
+        with tempfile.NamedTemporaryFile("w", dir=dirname, delete=False) as f:
+            json.dump(manifest, f)
+        os.rename(f.name, MANIFEST_PATH)
+    except (IOError, OSError) as e:
+        LOG.debug("Failed to write the manifest of plugins %s: %s"
+                  % (MANIFEST_PATH, e))
+
+
+def _load_modules_lazily():
+    try:
+        modules, key = _find_modules()
+    except Exception as e:
+        LOG.debug("Failed to find modules with plugins: %s" % e)
+        return False
+
+    manifest = _read_manifest(key)
+    if manifest is not None:
+        discover.add_lazy_modules(manifest["modules"], manifest["plugins"])
+        return True
+
+    _load_modules()
+    if all(m in sys.modules for m in modules):
+        # NOTE: modules which failed to load are skipped with a warning, so
+        #   the manifest is written only if all of them are loaded.
+        _write_manifest(key, modules)
+    return True
+
+
+def _load_modules():
+    for package in _get_packages():
+        discover.import_modules_from_package(package)
+    discover.import_modules_by_entry_point()
+
+
+def load(lazy=False):
+    """Load plugins of Rally, ones installed as packages and user ones.
 
-def load():
+    :param lazy: import modules of Rally plugins and modules of packages with
+        plugins only when their plugins are requested. Modules which define
+        each plugin are taken from the manifest of plugins (MANIFEST_PATH),
+        which is rebuilt when any of the modules or versions of packages
+        change. Plugins from /opt/rally/plugins and ~/.rally/plugins are
+        always loaded at once.
+    """
     global PLUGINS_LOADED
 
     if not PLUGINS_LOADED:
-        discover.import_modules_from_package("rally.deployment.engines")
-        discover.import_modules_from_package("rally.deployment.serverprovider")
-        discover.import_modules_from_package("rally.plugins.common")
-        try:
-            import rally_openstack  # noqa
-        except ImportError:
-            # print warnings when rally_openstack will be released
-            discover.import_modules_from_package("rally.plugins.openstack")
-            discover.import_modules_from_package("rally.plugins.workload")
-
-        discover.import_modules_by_entry_point()
+        if not (lazy and _load_modules_lazily()):
+            _load_modules()
 
         discover.load_plugins("/opt/rally/plugins/")
         discover.load_plugins(os.path.expanduser("~/.rally/plugins/"))
+    elif not lazy:
+        discover.import_lazy_modules()
 
     PLUGINS_LOADED = True
 
 
 @decorator.decorator
 def ensure_plugins_are_loaded(f, *args, **kwargs):
-    load()
+    load(lazy=True)
     return f(*args, **kwargs)
@@ -13,13 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import collections
 import multiprocessing
 import threading
 import time
 
-from six.moves import queue as Queue
-
 from rally.common import utils
 from rally.common import validation
 from rally import consts
@@ -32,10 +29,12 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times,
                     info):
     """Start the scenario within threads.
 
-    Spawn threads to support scenario execution for a fixed number of times.
-    This generates a constant load on the cloud under test by executing each
-    scenario iteration without pausing between iterations. Each thread runs
-    the scenario method once with passed scenario arguments and context.
+    Run scenario iterations in a pool of `concurrency` threads for a fixed
+    number of times. This generates a constant load on the cloud under test
+    by executing each scenario iteration without pausing between iterations.
+    A new iteration is dispatched as soon as one of running iterations
+    finishes and releases its slot in the pool. Each iteration runs the
+    scenario method once with passed scenario arguments and context.
     After execution the result is appended to the queue.
 
     :param queue: queue object to append results
@@ -53,67 +52,25 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times,
     :param info: info about all processes count and counter of launched process
     """
 
-    pool = collections.deque()
-    alive_threads_in_pool = 0
-    finished_threads_in_pool = 0
-
     runner._log_worker_info(times=times, concurrency=concurrency,
                             timeout=timeout, cls=cls, method_name=method_name,
                             args=args)
 
-    if timeout:
-        timeout_queue = Queue.Queue()
-        collector_thr_by_timeout = threading.Thread(
-            target=utils.timeout_thread,
-            args=(timeout_queue, )
-        )
-        collector_thr_by_timeout.start()
-
-    iteration = next(iteration_gen)
-    while iteration < times and not aborted.is_set():
-        scenario_context = runner._get_scenario_context(iteration, context)
-        worker_args = (
-            queue, cls, method_name, scenario_context, args, event_queue)
-
-        thread = threading.Thread(target=runner._worker_thread,
-                                  args=worker_args)
-
-        thread.start()
-        if timeout:
-            timeout_queue.put((thread, time.time() + timeout))
-        pool.append(thread)
-        alive_threads_in_pool += 1
-
-        while alive_threads_in_pool == concurrency:
-            prev_finished_threads_in_pool = finished_threads_in_pool
-            finished_threads_in_pool = 0
-            for t in pool:
-                if not t.isAlive():
-                    finished_threads_in_pool += 1
-
-            alive_threads_in_pool -= finished_threads_in_pool
-            alive_threads_in_pool += prev_finished_threads_in_pool
-
-            if alive_threads_in_pool < concurrency:
-                # NOTE(boris-42): cleanup pool array. This is required because
-                # in other case array length will be equal to times which
-                # is unlimited big
-                while pool and not pool[0].isAlive():
-                    pool.popleft().join()
-                    finished_threads_in_pool -= 1
-                break
-
-            # we should wait to not create big noise with these checks
-            time.sleep(0.001)
-        iteration = next(iteration_gen)
+    pool = runner.WorkerThreadPool(concurrency, timeout=timeout)
 
-    # Wait until all threads are done
-    while pool:
-        pool.popleft().join()
-
-    if timeout:
-        timeout_queue.put((None, None,))
-        collector_thr_by_timeout.join()
+    try:
+        while not aborted.is_set():
+            pool.wait_for_free_slot()
+            iteration = next(iteration_gen)
+            if iteration >= times or aborted.is_set():
+                break
+            scenario_context = runner._get_scenario_context(iteration,
+                                                            context)
+            pool.submit(runner._worker_thread, queue, cls, method_name,
+                        scenario_context, args, event_queue)
+    finally:
+        # Wait until all iterations are done
+        pool.join()
 
 
 @validation.configure("check_constant")
@@ -215,8 +172,8 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
                              concurrency_per_worker=concurrency_per_worker,
                              concurrency_overhead=concurrency_overhead)
 
-        result_queue = multiprocessing.Queue()
-        event_queue = multiprocessing.Queue()
+        result_queue = runner.BatchedPipe()
+        event_queue = runner.BatchedPipe()
 
         def worker_args_gen(concurrency_overhead):
             while True:
@@ -230,7 +187,8 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
         process_pool = self._create_process_pool(
             processes_to_start, _worker_process,
             worker_args_gen(concurrency_overhead))
-        self._join_processes(process_pool, result_queue, event_queue)
+        self._join_processes(process_pool, result_queue, event_queue,
+                             validate_results=False)
 
 
 def _run_scenario_once_with_unpack_args(args):
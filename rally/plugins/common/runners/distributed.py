@@ -0,0 +1,211 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime as dt
+import time
+
+from oslo_utils import timeutils
+
+from rally.common import db
+from rally.common import logging
+from rally import consts
+from rally import exceptions
+from rally.task import runner
+from rally.task import sla
+from rally.task import worker
+
+
+LOG = logging.getLogger(__name__)
+
+
+@runner.configure(name="distributed")
+class DistributedScenarioRunner(runner.ScenarioRunner):
+    """Spreads constant load across registered Rally workers.
+
+    Iterations are split into ranges (jobs) which are stored in the database.
+    Rally workers (see `rally task worker`) which use the same database take
+    the jobs, execute iterations with the given concurrency and send results
+    back. Jobs of workers which stop reporting that they are alive for
+    `worker_timeout` seconds are handed to other workers, and the workload
+    fails if no worker is executing its jobs for `worker_timeout` seconds.
+
+    Jobs and results are authenticated with the `distributed_secret_key`
+    option, which should be the same for Rally and all the workers (the
+    workload fails if it is not set).
+
+    SLA criteria are checked by workers, the coordinator only merges their
+    SLA checkers. Iteration events for hooks are generated on receiving
+    results of a job.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string",
+                "description": "Type of Runner."
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Total number of iteration executions."
+            },
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The number of parallel iteration executions "
+                               "in each worker."
+            },
+            "timeout": {
+                "type": "number",
+                "description": "Operation's timeout."
+            },
+            "iterations_per_job": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The number of iterations handed to a worker "
+                               "at once."
+            },
+            "worker_timeout": {
+                "type": "number",
+                "minimum": 1,
+                "description": "Time (in seconds) after which a silent "
+                               "worker is considered as a dead one."
+            }
+        },
+        "required": ["type"],
+        "additionalProperties": False
+    }
+
+    POLL_INTERVAL = 0.5
+
+    def _create_jobs(self, context, args):
+        times = self.config.get("times", 1)
+        iterations_per_job = self.config.get("iterations_per_job", 100)
+        workload_uuid = context["owner_id"]
+
+        self._sla_config = db.workload_get(workload_uuid)["sla"]
+        job = worker.dump_job(
+            scenario_name=context["scenario_name"], context=context,
+            args=args, sla_config=self._sla_config,
+            concurrency=self.config.get("concurrency", 1),
+            timeout=self.config.get("timeout", 0))
+
+        for first_iteration in range(0, times, iterations_per_job):
+            db.worker_job_create(
+                workload_uuid, first_iteration,
+                min(iterations_per_job, times - first_iteration), job)
+
+    def _release_jobs_of_dead_workers(self, jobs):
+        """Hand jobs of dead workers to other ones.
+
+        :returns: True if any of the jobs is executed by an alive worker
+        """
+        threshold = timeutils.utcnow() - dt.timedelta(
+            seconds=self.config.get("worker_timeout", 60))
+        dead_workers = set()
+        alive_workers = set()
+
+        for job in jobs:
+            hostname = job["hostname"]
+            if hostname is None or hostname in alive_workers:
+                continue
+            if hostname not in dead_workers:
+                try:
+                    worker_info = db.get_worker(hostname)
+                except exceptions.WorkerNotFound:
+                    dead_workers.add(hostname)
+                else:
+                    if worker_info["updated_at"] < threshold:
+                        dead_workers.add(hostname)
+                    else:
+                        alive_workers.add(hostname)
+                        continue
+
+            LOG.warning("Worker %(hostname)s is not alive, job %(job)s is "
+                        "handed to other workers."
+                        % {"hostname": hostname, "job": job["uuid"]})
+            if job["status"] == consts.WorkerJobStatus.ABORTED:
+                db.worker_job_delete(job["uuid"])
+            else:
+                db.worker_job_release(job["uuid"], hostname)
+        return bool(alive_workers)
+
+    def _load_job_results(self, job):
+        try:
+            results, sla_checker = worker.load_job_results(job)
+        except exceptions.WorkerDataNotAuthenticated as e:
+            LOG.error(e.format_message())
+            results, sla_checker = worker.get_failed_results(
+                job["times"], e), None
+        if sla_checker is None:
+            sla_checker = sla.SLAChecker({"sla": self._sla_config})
+            for result in results:
+                sla_checker.add_iteration(result)
+        return results, sla_checker
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified scenario with given arguments.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: context that contains users, admin & other
+                        information, that was created before scenario
+                        execution starts.
+        :param args: Arguments to call the scenario method with
+
+        :returns: List of results fore each single scenario iteration,
+                  where each result is a dictionary
+        """
+        workload_uuid = context["owner_id"]
+        worker_timeout = self.config.get("worker_timeout", 60)
+        try:
+            self._create_jobs(context, args)
+            self._collect_results(workload_uuid, worker_timeout)
+        finally:
+            # NOTE: jobs contain the context of the workload (credentials
+            #   of users, etc), so they are not left in the database if the
+            #   workload is aborted or failed
+            db.worker_jobs_delete(workload_uuid)
+
+    def _collect_results(self, workload_uuid, worker_timeout):
+        iterations_count = 0
+        abort_sent = False
+        last_progress = time.time()
+        while True:
+            if self.aborted.is_set() and not abort_sent:
+                db.worker_jobs_abort(workload_uuid)
+                abort_sent = True
+
+            for job in db.worker_job_list(workload_uuid,
+                                          consts.WorkerJobStatus.FINISHED,
+                                          with_results=True):
+                results, sla_checker = self._load_job_results(job)
+                for i in range(len(results)):
+                    iterations_count += 1
+                    self.send_event(type="iteration", value=iterations_count)
+                self._send_checked_results(results, sla_checker)
+                db.worker_job_delete(job["uuid"])
+                last_progress = time.time()
+
+            jobs = db.worker_job_list(workload_uuid)
+            if not jobs:
+                break
+            if self._release_jobs_of_dead_workers(jobs):
+                last_progress = time.time()
+            elif time.time() - last_progress > worker_timeout:
+                raise exceptions.WorkersNotAvailable(workload=workload_uuid,
+                                                     timeout=worker_timeout)
+            self.aborted.wait(self.POLL_INTERVAL)
@@ -0,0 +1,379 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing
+import time
+
+try:
+    import asyncio
+    from concurrent import futures
+except ImportError:
+    asyncio = None
+
+if asyncio and not hasattr(asyncio.AbstractEventLoop, "create_future"):
+    # NOTE: AbstractEventLoop.create_future() is added in Python 3.5.2
+    asyncio = None
+
+from rally.common import logging
+from rally.common import utils as rutils
+from rally.common import validation
+from rally import consts
+from rally import exceptions
+from rally.task import runner
+from rally.task import utils
+
+
+LOG = logging.getLogger(__name__)
+
+
+def _run_scenario_once_async(loop, cls, method_name, context_obj,
+                             scenario_kwargs, event_queue, timeout):
+    """Start a coroutine scenario iteration on the event loop.
+
+    :returns: asyncio.Future which is resolved with the result of the
+        iteration in the same format as runner._run_scenario_once returns
+    """
+    iteration = context_obj["iteration"]
+    event_queue.put({
+        "type": "iteration",
+        "value": iteration,
+    })
+
+    # provide arguments isolation between iterations
+    scenario_kwargs = runner._copy_scenario_kwargs(scenario_kwargs)
+
+    LOG.debug("Task %(task)s | ITER: %(iteration)s START",
+              {"task": context_obj["task"]["uuid"], "iteration": iteration})
+
+    scenario_inst = cls(context_obj)
+    result = loop.create_future()
+    timer = rutils.Timer()
+    timer.__enter__()
+
+    def finish(error):
+        timer.__exit__(None, None, None)
+        result.set_result(runner._get_scenario_result(
+            context_obj, scenario_inst, timer, error))
+
+    def on_done(task):
+        if timeout_handle:
+            timeout_handle.cancel()
+        error = []
+        if task.cancelled():
+            error = utils.format_exc(exceptions.ThreadTimeoutException())
+        elif task.exception():
+            error = utils.format_exc(task.exception())
+            if logging.is_debug():
+                LOG.error(error[2])
+        finish(error)
+
+    try:
+        task = loop.create_task(
+            getattr(scenario_inst, method_name)(**scenario_kwargs))
+    except Exception as e:
+        if logging.is_debug():
+            LOG.exception(e)
+        finish(utils.format_exc(e))
+        return result
+
+    timeout_handle = timeout and loop.call_later(timeout, task.cancel)
+    task.add_done_callback(on_done)
+    return result
+
+
+def _run_scenario_once_in_executor(loop, executor, cls, method_name,
+                                   context_obj, scenario_kwargs, event_queue,
+                                   timeout):
+    """Start a synchronous scenario iteration in the thread pool executor.
+
+    The timeout is counted since the iteration is started by a thread of
+    the executor (not since it is queued), and the iteration is interrupted
+    with ThreadTimeoutException in the same way as WorkerThreadPool does.
+
+    :returns: a tuple of concurrent.futures.Future of the iteration, which
+        can be cancelled while the iteration is waiting for a free thread,
+        and asyncio.Future which is resolved with the result of the
+        iteration as soon as its thread is released (or with None if the
+        iteration is cancelled before it is started)
+    """
+    result = loop.create_future()
+    started = {}
+
+    def start_timer(handle):
+        started["timeout_handle"] = loop.call_later(timeout,
+                                                    handle.terminate)
+
+    def stop_timer():
+        started["timeout_handle"].cancel()
+
+    def format_result_on_timeout(exc):
+        timed_out = runner.format_result_on_timeout(exc, timeout)
+        timed_out["timestamp"] = started["timestamp"]
+        return timed_out
+
+    def run():
+        started["timestamp"] = time.time()
+        handle = runner._IterationHandle()
+        if timeout:
+            loop.call_soon_threadsafe(start_timer, handle)
+        try:
+            return runner._run_scenario_once(cls, method_name, context_obj,
+                                             scenario_kwargs, event_queue)
+        except exceptions.ThreadTimeoutException as e:
+            return format_result_on_timeout(e)
+        finally:
+            handle.finish()
+            if timeout:
+                loop.call_soon_threadsafe(stop_timer)
+
+    def on_done(future):
+        if future.cancelled():
+            result.set_result(None)
+        elif isinstance(future.exception(),
+                        exceptions.ThreadTimeoutException):
+            # NOTE: the exception is delivered right after the iteration
+            #   is finished, but before its handle is
+            result.set_result(format_result_on_timeout(future.exception()))
+        elif future.exception():
+            result.set_exception(future.exception())
+        else:
+            result.set_result(future.result())
+
+    future = executor.submit(run)
+    future.add_done_callback(
+        lambda f: loop.call_soon_threadsafe(on_done, f))
+    return future, result
+
+
+def _worker_process(queue, iteration_gen, timeout, concurrency, times,
+                    context, cls, method_name, args, event_queue, aborted,
+                    executor_threads, info):
+    """Start the scenario iterations on the event loop.
+
+    Coroutine scenarios (the ones with `async def run`) are executed right on
+    the event loop, so the number of concurrent iterations is not limited by
+    the number of threads. Synchronous scenarios are executed in a pool of
+    `executor_threads` threads.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param timeout: operation's timeout
+    :param concurrency: number of concurrently running scenario iterations
+    :param times: total number of scenario iterations to be run
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param event_queue: queue object to append events
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param executor_threads: maximum number of threads for synchronous
+                             scenarios
+    :param info: info about all processes count and counter of launched process
+    """
+    runner._log_worker_info(times=times, concurrency=concurrency,
+                            timeout=timeout, cls=cls, method_name=method_name,
+                            args=args, executor_threads=executor_threads)
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    if asyncio.iscoroutinefunction(getattr(cls, method_name)):
+        executor = None
+    else:
+        executor = futures.ThreadPoolExecutor(
+            max_workers=min(concurrency, executor_threads))
+
+    finished = loop.create_future()
+    state = {"running": 0, "exhausted": False}
+    # NOTE: iterations which are submitted to the executor, but may still
+    #   wait for a free thread. They are cancelled if the load is aborted.
+    queued = set()
+
+    def start_iterations():
+        while (state["running"] < concurrency and not state["exhausted"]
+               and not aborted.is_set()):
+            iteration = next(iteration_gen)
+            if iteration >= times:
+                state["exhausted"] = True
+                break
+            scenario_context = runner._get_scenario_context(iteration,
+                                                            context)
+            if executor:
+                future, result = _run_scenario_once_in_executor(
+                    loop, executor, cls, method_name, scenario_context, args,
+                    event_queue, timeout)
+                queued.add(future)
+                result.add_done_callback(
+                    lambda r, future=future: queued.discard(future))
+            else:
+                result = _run_scenario_once_async(
+                    loop, cls, method_name, scenario_context, args,
+                    event_queue, timeout)
+            state["running"] += 1
+            result.add_done_callback(on_iteration_done)
+
+        if not state["running"] and not finished.done():
+            finished.set_result(None)
+
+    def on_iteration_done(result):
+        state["running"] -= 1
+        if result.result() is not None:
+            queue.put(result.result())
+        if aborted.is_set():
+            for future in list(queued):
+                future.cancel()
+        safe_start_iterations()
+
+    def safe_start_iterations():
+        # NOTE: exceptions raised in callbacks are only logged by the event
+        # loop, so propagate them to run_until_complete instead of hanging
+        try:
+            start_iterations()
+        except Exception as e:
+            if not finished.done():
+                finished.set_exception(e)
+
+    loop.call_soon(safe_start_iterations)
+    try:
+        loop.run_until_complete(finished)
+    finally:
+        if executor:
+            executor.shutdown(wait=True)
+        loop.close()
+
+
+@validation.configure("check_event_loop")
+class CheckEventLoopValidator(validation.Validator):
+    """Additional validation for event_loop runner."""
+
+    def validate(self, credentials, config, plugin_cls, plugin_cfg):
+        if asyncio is None:
+            return self.fail("The runner requires asyncio module which is "
+                             "available only in Python 3.5.2 or newer.")
+        if plugin_cfg.get("concurrency", 1) > plugin_cfg.get("times", 1):
+            return self.fail(
+                "Parameter 'concurrency' means a number of parallel executions"
+                " of iterations. Parameter 'times' means total number of "
+                "iteration executions. It is redundant (and restricted) to "
+                "have number of parallel iterations bigger then total number "
+                "of iterations.")
+
+
+@validation.add("check_event_loop")
+@runner.configure(name="event_loop")
+class EventLoopScenarioRunner(runner.ScenarioRunner):
+    """Creates constant load executing iterations on asyncio event loop.
+
+    This runner works as the constant runner, but the concurrent iterations
+    are driven by an asyncio event loop in each worker process instead of
+    a separate thread per iteration. Scenarios which implement `run` as
+    a coroutine (`async def run`) are executed directly on the event loop,
+    so a single host is able to keep tens of thousands of concurrent
+    iterations of I/O-bound scenarios. Ordinary synchronous scenarios are
+    executed in a pool of at most `executor_threads` threads per process.
+
+    The runner requires Python 3.5.2 or newer.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string",
+                "description": "Type of Runner."
+            },
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The number of parallel iteration executions."
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Total number of iteration executions."
+            },
+            "timeout": {
+                "type": "number",
+                "description": "Operation's timeout."
+            },
+            "executor_threads": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The maximum number of threads per process "
+                               "to run synchronous scenarios in."
+            },
+            "max_cpu_count": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The maximum number of processes to create load"
+                               " from."
+            }
+        },
+        "required": ["type"],
+        "additionalProperties": False
+    }
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified scenario with given arguments.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: context that contains users, admin & other
+                        information, that was created before scenario
+                        execution starts.
+        :param args: Arguments to call the scenario method with
+
+        :returns: List of results fore each single scenario iteration,
+                  where each result is a dictionary
+        """
+        timeout = self.config.get("timeout", 0)  # 0 means no timeout
+        times = self.config.get("times", 1)
+        concurrency = self.config.get("concurrency", 1)
+        executor_threads = self.config.get("executor_threads", concurrency)
+        iteration_gen = rutils.RAMInt()
+
+        cpu_count = multiprocessing.cpu_count()
+        max_cpu_used = min(cpu_count,
+                           self.config.get("max_cpu_count", cpu_count))
+
+        processes_to_start = min(max_cpu_used, times, concurrency)
+        concurrency_per_worker, concurrency_overhead = divmod(
+            concurrency, processes_to_start)
+
+        self._log_debug_info(times=times, concurrency=concurrency,
+                             timeout=timeout, max_cpu_used=max_cpu_used,
+                             processes_to_start=processes_to_start,
+                             concurrency_per_worker=concurrency_per_worker,
+                             concurrency_overhead=concurrency_overhead,
+                             executor_threads=executor_threads)
+
+        result_queue = runner.BatchedPipe()
+        event_queue = runner.BatchedPipe()
+
+        def worker_args_gen(concurrency_overhead):
+            while True:
+                yield (result_queue, iteration_gen, timeout,
+                       concurrency_per_worker + (concurrency_overhead and 1),
+                       times, context, cls, method_name, args, event_queue,
+                       self.aborted, executor_threads)
+                if concurrency_overhead:
+                    concurrency_overhead -= 1
+
+        process_pool = self._create_process_pool(
+            processes_to_start, _worker_process,
+            worker_args_gen(concurrency_overhead))
+        self._join_processes(process_pool, result_queue, event_queue,
+                             validate_results=False)
@@ -13,13 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import collections
+import bisect
 import multiprocessing
-import threading
 import time
 
-from six.moves import queue as Queue
-
 from rally.common import logging
 from rally.common import utils
 from rally.common import validation
@@ -29,14 +26,65 @@ from rally.task import runner
 LOG = logging.getLogger(__name__)
 
 
+def _get_schedule(rps_cfg):
+    """Compute the intended start time of iterations up front.
+
+    The constant rps means that the i-th iteration should be started in
+    i / rps seconds since the beginning of the load. If rps is increased
+    each `duration` seconds by `step` from `start` to `end` values, the
+    load is split into stages with constant rps each, so the start time of
+    an iteration is calculated from the stage it falls into.
+
+    :param rps_cfg: rps section from task config
+    :returns: function which takes a number of iteration (starting from 0)
+        and returns its start offset (in seconds) since the beginning of the
+        load
+    """
+    if not isinstance(rps_cfg, dict):
+        rps = float(rps_cfg)
+        return lambda iteration: iteration / rps
+
+    duration = rps_cfg.get("duration", 1)
+    # NOTE: each stage is described with a number of iterations
+    #   started before the stage, its start offset and rps.
+    stages = []
+    first_iteration, offset, rps = 0.0, 0.0, float(rps_cfg["start"])
+    while rps < rps_cfg["end"]:
+        stages.append((first_iteration, offset, rps))
+        first_iteration += rps * duration
+        offset += duration
+        rps = min(rps + rps_cfg["step"], float(rps_cfg["end"]))
+    stages.append((first_iteration, offset, float(rps_cfg["end"])))
+    first_iterations = [s[0] for s in stages]
+
+    def get_start_offset(iteration):
+        idx = bisect.bisect_right(first_iterations, iteration) - 1
+        first_iteration, offset, rps = stages[idx]
+        return offset + (iteration - first_iteration) / rps
+
+    return get_start_offset
+
+
+def _worker_thread(queue, cls, method_name, context_obj, scenario_kwargs,
+                   event_queue, scheduled_at):
+    result = runner._run_scenario_once(cls, method_name, context_obj,
+                                       scenario_kwargs, event_queue)
+    # NOTE: the delay of the start is rendered by the report (see
+    #   rally.task.processing.charts.StartDelayStatsTable)
+    result["scheduled_at"] = scheduled_at
+    queue.put(result)
+
+
 def _worker_process(queue, iteration_gen, timeout, times, max_concurrent,
                     context, cls, method_name, args, event_queue, aborted,
-                    runs_per_second, rps_cfg, processes_to_start, info):
+                    start_time, rps_cfg, processes_to_start, info):
     """Start scenario within threads.
 
-    Spawn N threads per second. Each thread runs the scenario once, and appends
-    result to queue. A maximum of max_concurrent threads will be ran
-    concurrently.
+    Each iteration is started at the time calculated by the schedule (see
+    _get_schedule) in a pool of threads. A maximum of max_concurrent
+    iterations will be ran concurrently. If there is no free thread at the
+    scheduled time, an iteration is started as soon as one of threads is
+    released and the delay is recorded to the result of the iteration.
 
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
@@ -49,76 +97,41 @@ def _worker_process(queue, iteration_gen, timeout, times, max_concurrent,
     :param args: scenario args
     :param aborted: multiprocessing.Event that aborts load generation if
                     the flag is set
-    :param runs_per_second: function that should return desired rps value
+    :param start_time: timestamp of the beginning of the load, the same for
+                       all processes
     :param rps_cfg: rps section from task config
     :param processes_to_start: int, number of started processes for scenario
                                execution
     :param info: info about all processes count and counter of runned process
     """
 
-    pool = collections.deque()
-    if isinstance(rps_cfg, dict):
-        rps = rps_cfg["start"]
-    else:
-        rps = rps_cfg
-    sleep = 1.0 / rps
-
-    runner._log_worker_info(times=times, rps=rps, timeout=timeout,
+    runner._log_worker_info(times=times, rps=rps_cfg, timeout=timeout,
                             cls=cls, method_name=method_name, args=args)
 
-    time.sleep(
-        (sleep * info["processes_counter"]) / info["processes_to_start"])
-
-    start = time.time()
-    timeout_queue = Queue.Queue()
-
-    if timeout:
-        collector_thr_by_timeout = threading.Thread(
-            target=utils.timeout_thread,
-            args=(timeout_queue, )
-        )
-        collector_thr_by_timeout.start()
-
-    i = 0
-    while i < times and not aborted.is_set():
-        scenario_context = runner._get_scenario_context(next(iteration_gen),
-                                                        context)
-        worker_args = (
-            queue, cls, method_name, scenario_context, args, event_queue)
-        thread = threading.Thread(target=runner._worker_thread,
-                                  args=worker_args)
-
-        i += 1
-        thread.start()
-        if timeout:
-            timeout_queue.put((thread, time.time() + timeout))
-        pool.append(thread)
-
-        time_gap = time.time() - start
-        real_rps = i / time_gap if time_gap else "Infinity"
-
-        LOG.debug("Worker: %s rps: %s (requested rps: %s)",
-                  i, real_rps, runs_per_second(rps_cfg, start,
-                                               processes_to_start))
-
-        # try to join latest thread(s) until it finished, or until time to
-        # start new thread (if we have concurrent slots available)
-        while i / (time.time() - start) > runs_per_second(
-                rps_cfg, start, processes_to_start) or (
-                    len(pool) >= max_concurrent):
-            if pool:
-                pool[0].join(0.001)
-                if not pool[0].isAlive():
-                    pool.popleft()
-            else:
-                time.sleep(0.001)
-
-    while pool:
-        pool.popleft().join()
-
-    if timeout:
-        timeout_queue.put((None, None,))
-        collector_thr_by_timeout.join()
+    get_start_offset = _get_schedule(rps_cfg)
+    pool = runner.WorkerThreadPool(max_concurrent, timeout=timeout)
+
+    try:
+        while not aborted.is_set():
+            pool.wait_for_free_slot()
+            iteration = next(iteration_gen)
+            if iteration >= times:
+                break
+
+            scheduled_at = start_time + get_start_offset(iteration)
+            time_to_wait = scheduled_at - time.time()
+            if time_to_wait > 0 and aborted.wait(time_to_wait):
+                break
+
+            LOG.debug("Worker: iteration %s is started with %.3fs delay",
+                      iteration, time.time() - scheduled_at)
+
+            scenario_context = runner._get_scenario_context(iteration,
+                                                            context)
+            pool.submit(_worker_thread, queue, cls, method_name,
+                        scenario_context, args, event_queue, scheduled_at)
+    finally:
+        pool.join()
 
 
 @validation.configure("check_rps")
@@ -235,21 +248,8 @@ class RPSScenarioRunner(runner.ScenarioRunner):
         max_cpu_used = min(cpu_count,
                            self.config.get("max_cpu_count", cpu_count))
 
-        def runs_per_second(rps_cfg, start_timer, number_of_processes):
-            """At the given second return desired rps."""
-
-            if not isinstance(rps_cfg, dict):
-                return float(rps_cfg) / number_of_processes
-            stage_order = (time.time() - start_timer) / rps_cfg.get(
-                "duration", 1) - 1
-            rps = (float(rps_cfg["start"] + rps_cfg["step"] * stage_order) /
-                   number_of_processes)
-
-            return min(rps, float(rps_cfg["end"]))
-
         processes_to_start = min(max_cpu_used, times,
                                  self.config.get("max_concurrency", times))
-        times_per_worker, times_overhead = divmod(times, processes_to_start)
 
         # Determine concurrency per worker
         concurrency_per_worker, concurrency_overhead = divmod(
@@ -258,42 +258,36 @@ class RPSScenarioRunner(runner.ScenarioRunner):
         self._log_debug_info(times=times, timeout=timeout,
                              max_cpu_used=max_cpu_used,
                              processes_to_start=processes_to_start,
-                             times_per_worker=times_per_worker,
-                             times_overhead=times_overhead,
                              concurrency_per_worker=concurrency_per_worker,
                              concurrency_overhead=concurrency_overhead)
 
-        result_queue = multiprocessing.Queue()
-        event_queue = multiprocessing.Queue()
+        result_queue = runner.BatchedPipe()
+        event_queue = runner.BatchedPipe()
+        start_time = time.time()
 
-        def worker_args_gen(times_overhead, concurrency_overhead):
+        def worker_args_gen(concurrency_overhead):
             """Generate arguments for process worker.
 
-            Remainder of threads per process division is distributed to
+            Remainder of concurrency per process division is distributed to
             process workers equally - one thread per each process worker
-            until the remainder equals zero. The same logic is applied
-            to concurrency overhead.
-            :param times_overhead: remaining number of threads to be
-                                   distributed to workers
+            until the remainder equals zero.
             :param concurrency_overhead: remaining number of maximum
                                          concurrent threads to be
                                          distributed to workers
             """
             while True:
                 yield (
-                    result_queue, iteration_gen, timeout,
-                    times_per_worker + (times_overhead and 1),
+                    result_queue, iteration_gen, timeout, times,
                     concurrency_per_worker + (concurrency_overhead and 1),
                     context, cls, method_name, args, event_queue,
-                    self.aborted, runs_per_second, self.config["rps"],
+                    self.aborted, start_time, self.config["rps"],
                     processes_to_start
                 )
-                if times_overhead:
-                    times_overhead -= 1
                 if concurrency_overhead:
                     concurrency_overhead -= 1
 
         process_pool = self._create_process_pool(
             processes_to_start, _worker_process,
-            worker_args_gen(times_overhead, concurrency_overhead))
-        self._join_processes(process_pool, result_queue, event_queue)
+            worker_args_gen(concurrency_overhead))
+        self._join_processes(process_pool, result_queue, event_queue,
+                             validate_results=False)
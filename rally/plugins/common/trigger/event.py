@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import bisect
+
 from rally import consts
 from rally.task import trigger
 
@@ -35,7 +37,7 @@ class EventTrigger(trigger.Trigger):
                         "minItems": 1,
                         "uniqueItems": True,
                         "items": {
-                            "type": "integer",
+                            "type": "number",
                             "minimum": 0,
                         }
                     },
@@ -63,9 +65,21 @@ class EventTrigger(trigger.Trigger):
         ]
     }
 
+    def __init__(self, context, task, hook_cls):
+        super(EventTrigger, self).__init__(context, task, hook_cls)
+        self._values = sorted(self.config["at"])
+
     def get_listening_event(self):
         return self.config["unit"]
 
+    def get_next_value(self, last_value=None):
+        index = 0
+        if last_value is not None:
+            index = bisect.bisect_right(self._values, last_value)
+        if index < len(self._values):
+            return self._values[index]
+        return None
+
     def on_event(self, event_type, value=None):
         if not (event_type == self.get_listening_event()
                 and value in self.config["at"]):
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import math
+
 from rally import consts
 from rally.task import trigger
 
@@ -30,9 +32,11 @@ class PeriodicTrigger(trigger.Trigger):
                                " after start of workload.",
                 "properties": {
                     "unit": {"enum": ["time"]},
-                    "start": {"type": "integer", "minimum": 0},
-                    "end": {"type": "integer", "minimum": 1},
-                    "step": {"type": "integer", "minimum": 1},
+                    "start": {"type": "number", "minimum": 0},
+                    "end": {"type": "number", "minimum": 0,
+                            "exclusiveMinimum": True},
+                    "step": {"type": "number", "minimum": 0,
+                             "exclusiveMinimum": True},
                 },
                 "required": ["unit", "step"],
                 "additionalProperties": False,
@@ -60,10 +64,31 @@ class PeriodicTrigger(trigger.Trigger):
     def get_listening_event(self):
         return self.config["unit"]
 
+    def _get_value(self, index):
+        value = self.config["start"] + index * self.config["step"]
+        if isinstance(value, float):
+            # NOTE: sub-second steps produce values like 0.30000000000000004
+            value = round(value, 6)
+        return value
+
+    def get_next_value(self, last_value=None):
+        if last_value is None or last_value < self.config["start"]:
+            index = 0
+        else:
+            index = int(math.floor(round(
+                (last_value - self.config["start"]) /
+                float(self.config["step"]), 6))) + 1
+        value = self._get_value(index)
+        if value > self.config["end"]:
+            return None
+        return value
+
     def on_event(self, event_type, value=None):
         if not (event_type == self.get_listening_event() and
                 self.config["start"] <= value <= self.config["end"] and
-                (value - self.config["start"]) % self.config["step"] == 0):
+                self._get_value(int(round(
+                    (value - self.config["start"]) /
+                    float(self.config["step"])))) == value):
             # do nothing
             return
         super(PeriodicTrigger, self).on_event(event_type, value)
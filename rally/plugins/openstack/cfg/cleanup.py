@@ -19,5 +19,9 @@ OPTS = {"cleanup": [
     cfg.IntOpt("resource_deletion_timeout", default=600,
                help="A timeout in seconds for deleting resources"),
     cfg.IntOpt("cleanup_threads", default=20,
-               help="Number of cleanup threads to run")
+               help="Number of cleanup threads to run"),
+    cfg.DictOpt("cleanup_rate_limits", default={},
+                help="Maximum number of resources of a service which are "
+                     "deleted per second, e.g. 'nova:10,neutron:20'. There "
+                     "is no limit for services which are not listed")
 ]}
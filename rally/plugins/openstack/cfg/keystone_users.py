@@ -34,4 +34,12 @@ OPTS = {"users_context": [
                default="member",
                help="The default role name of the keystone to assign to "
                     "users."),
+    cfg.FloatOpt("resource_management_rate_limit",
+                 default=0,
+                 help="Maximum number of tenants or users which are created "
+                      "or deleted per second. There is no limit if it is 0."),
+    cfg.IntOpt("resource_management_retries",
+               default=0,
+               help="Number of times to retry creation or deletion of a "
+                    "tenant or a user which failed."),
 ]}
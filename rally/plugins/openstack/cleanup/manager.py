@@ -13,8 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import threading
 import time
 
+from oslo_config import cfg
+
 from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
@@ -22,10 +26,158 @@ from rally.common.plugin import discover
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
 from rally.plugins.openstack.cleanup import base
+from rally.task import utils as task_utils
 
 
 LOG = logging.getLogger(__name__)
 
+CONF = cfg.CONF
+
+
+class DeletionWatcher(object):
+    """Waits for deletion of resources in the background.
+
+    Resources are checked from a single thread every interval of their
+    managers. Deletion of resources of managers with the default
+    is_deleted() is confirmed in bulk by one list() call per user or tenant,
+    is_deleted() of each resource is called for other managers, for single
+    resources and when the list() call fails. Resources which are not
+    deleted in time are reported to the log.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = []
+        self._closed = False
+        self._thread = None
+
+    def add(self, resource, msg_kw):
+        """Wait for deletion of the resource.
+
+        :param resource: instance of resource manager initiated with resource
+                         that is being deleted
+        :param msg_kw: dict which describes the resource in messages
+        """
+        now = time.time()
+        with self._cond:
+            self._pending.append({"resource": resource, "msg_kw": msg_kw,
+                                  "started_at": now, "check_at": now,
+                                  "failures": 0})
+            self._cond.notify()
+
+    def start(self):
+        """Wait for resources in a separate thread."""
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def close(self):
+        """Wait until all the added resources are deleted or timed out."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+        else:
+            self._run()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._pending and self._closed:
+                        return
+                    now = time.time()
+                    due = [p for p in self._pending if p["check_at"] <= now]
+                    if due:
+                        break
+                    self._cond.wait(
+                        min(p["check_at"] for p in self._pending) - now
+                        if self._pending else None)
+
+            deleted = set(id(p) for p in self._check(due))
+
+            now = time.time()
+            done = set()
+            for pending in due:
+                resource = pending["resource"]
+                pending["check_at"] = now + resource._interval
+                if id(pending) in deleted:
+                    done.add(id(pending))
+                elif pending["failures"] > resource._max_attempts or (
+                        pending["check_at"] - pending["started_at"]
+                        > resource._timeout):
+                    LOG.warning(
+                        _("Resource deletion failed, timeout occurred for "
+                          "%(service)s.%(resource)s: %(uuid)s.")
+                        % pending["msg_kw"])
+                    done.add(id(pending))
+            with self._cond:
+                self._pending = [p for p in self._pending
+                                 if id(p) not in done]
+
+    @staticmethod
+    def _is_listable(resource):
+        # NOTE: absence of a resource in the list means that it is deleted
+        #   only for the default check of the status
+        return (getattr(type(resource), "is_deleted", None)
+                == base.ResourceManager.is_deleted)
+
+    def _check(self, due):
+        """Check whether the resources are deleted.
+
+        :returns: list of deleted resources (items of due)
+        """
+        groups = collections.OrderedDict()
+        for pending in due:
+            resource = pending["resource"]
+            if self._is_listable(resource):
+                key = (type(resource), id(resource.admin), id(resource.user),
+                       resource.tenant_uuid)
+            else:
+                key = id(pending)
+            groups.setdefault(key, []).append(pending)
+
+        deleted = []
+        for group in groups.values():
+            resource = group[0]["resource"]
+            # NOTE: a single resource is cheaper to get than to list
+            if len(group) > 1 and self._is_listable(resource):
+                try:
+                    alive = set(
+                        type(resource)(resource=raw).id()
+                        for raw in resource.list()
+                        if task_utils.get_status(raw) not in (
+                            "DELETED", "DELETE_COMPLETE"))
+                except Exception as e:
+                    LOG.debug("Failed to list %s.%s resources, checking them "
+                              "one by one: %s"
+                              % (resource._service, resource._resource, e))
+                else:
+                    deleted.extend(p for p in group
+                                   if p["resource"].id() not in alive)
+                    continue
+            for pending in group:
+                if self._is_deleted(pending):
+                    deleted.append(pending)
+        return deleted
+
+    @staticmethod
+    def _is_deleted(pending):
+        resource = pending["resource"]
+        try:
+            return resource.is_deleted()
+        except Exception as e:
+            LOG.warning(
+                _("Seems like %s.%s.is_deleted(self) method is broken "
+                  "It shouldn't raise any exceptions.")
+                % (resource.__module__, type(resource).__name__))
+            LOG.exception(e)
+            # NOTE(boris-42): Avoid LOG spamming in case of bad
+            #                 is_deleted() method
+            pending["failures"] += 1
+            return False
+
 
 class SeekAndDestroy(object):
 
@@ -51,6 +203,7 @@ class SeekAndDestroy(object):
         self.resource_classes = resource_classes or [
             rutils.RandomNameGeneratorMixin]
         self.task_id = task_id
+        self._watcher = None
 
     def _get_cached_client(self, user):
         """Simplifies initialization and caching OpenStack clients."""
@@ -63,7 +216,9 @@ class SeekAndDestroy(object):
         """Safe resource deletion with retries and timeouts.
 
         Send request to delete resource, in case of failures repeat it few
-        times. After that pull status of resource until it's deleted.
+        times. After that pull status of resource until it's deleted. When
+        the cleanup is run by exterminate(), the status is pulled by the
+        shared DeletionWatcher and this method doesn't wait for it.
 
         Writes in LOG warning with UUID of resource that wasn't deleted
 
@@ -93,31 +248,13 @@ class SeekAndDestroy(object):
             if logging.is_debug():
                 LOG.exception(e)
         else:
-            started = time.time()
-            failures_count = 0
-            while time.time() - started < resource._timeout:
-                try:
-                    if resource.is_deleted():
-                        return
-                except Exception as e:
-                    LOG.warning(
-                        _("Seems like %s.%s.is_deleted(self) method is broken "
-                          "It shouldn't raise any exceptions.")
-                        % (resource.__module__, type(resource).__name__))
-                    LOG.exception(e)
-
-                    # NOTE(boris-42): Avoid LOG spamming in case of bad
-                    #                 is_deleted() method
-                    failures_count += 1
-                    if failures_count > resource._max_attempts:
-                        break
-
-                finally:
-                    rutils.interruptable_sleep(resource._interval)
-
-            LOG.warning(_("Resource deletion failed, timeout occurred for "
-                          "%(service)s.%(resource)s: %(uuid)s.")
-                        % msg_kw)
+            if self._watcher:
+                self._watcher.add(resource, msg_kw)
+            else:
+                # NOTE: the resource is waited for in the calling thread
+                watcher = DeletionWatcher()
+                watcher.add(resource, msg_kw)
+                watcher.close()
 
     def _publisher(self, queue):
         """Publisher for deletion jobs.
@@ -182,8 +319,20 @@ class SeekAndDestroy(object):
     def exterminate(self):
         """Delete all resources for passed users, admin and resource_mgr."""
 
-        broker.run(self._publisher, self._consumer,
-                   consumers_count=self.manager_cls._threads)
+        service = self.manager_cls._service
+        rate_limit = CONF.cleanup.cleanup_rate_limits.get(service)
+        # NOTE: consumers only send deletion requests, their results are
+        #   waited for by the watcher in the background
+        self._watcher = DeletionWatcher()
+        self._watcher.start()
+        try:
+            broker.run(self._publisher, self._consumer,
+                       consumers_count=self.manager_cls._threads,
+                       rate_limiter=broker.get_rate_limiter(
+                           service, float(rate_limit or 0)))
+        finally:
+            self._watcher.close()
+            self._watcher = None
 
 
 def list_resource_names(admin_required=None):
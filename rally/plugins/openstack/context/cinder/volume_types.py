@@ -27,7 +27,8 @@ LOG = logging.getLogger(__name__)
 
 
 @validation.add("required_platform", platform="openstack", admin=True)
-@context.configure(name="volume_types", platform="openstack", order=410)
+@context.configure(name="volume_types", platform="openstack", order=410,
+                   depends_on=["api_versions"])
 class VolumeTypeGenerator(context.Context):
     """Adds cinder volumes types."""
 
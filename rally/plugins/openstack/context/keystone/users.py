@@ -28,6 +28,7 @@ from rally import consts
 from rally import exceptions
 from rally import osclients
 from rally.plugins.openstack import credential
+from rally.plugins.openstack import scenario
 from rally.plugins.openstack.services.identity import identity
 from rally.plugins.openstack.wrappers import network
 from rally.task import context
@@ -78,22 +79,34 @@ class UserGenerator(context.Context):
                      "type": "string",
                      "description": USER_DOMAIN_DESCR},
                  "user_choice_method": {
-                     "$ref": "#/definitions/user_choice_method"}},
+                     "$ref": "#/definitions/user_choice_method"},
+                 "user_weights": {
+                     "$ref": "#/definitions/user_weights"}},
              "additionalProperties": False},
             # TODO(andreykurilin): add ability to specify users here.
             {"description": "Use existing users and tenants.",
              "properties": {
                  "user_choice_method": {
-                     "$ref": "#/definitions/user_choice_method"}
+                     "$ref": "#/definitions/user_choice_method"},
+                 "user_weights": {
+                     "$ref": "#/definitions/user_weights"}
              },
              "additionalProperties": False}
         ],
         "definitions": {
             "user_choice_method": {
-                "enum": ["random", "round_robin"],
+                "enum": ["random", "round_robin", "weighted", "sticky"],
                 "description": "The mode of balancing usage of users between "
-                               "scenario iterations."}
-
+                               "scenario iterations."},
+            "user_weights": {
+                "type": "array",
+                "items": {"type": "number", "exclusiveMinimum": True,
+                          "minimum": 0},
+                "minItems": 1,
+                "description": "Weights of users for the 'weighted' "
+                               "user_choice_method. The i-th weight is "
+                               "the weight of the i-th user of each tenant, "
+                               "users without weights weigh 1."}
         }
     }
 
@@ -111,7 +124,8 @@ class UserGenerator(context.Context):
 
         deployment = objects.Deployment.get(context["task"]["deployment_uuid"])
         existing_users = deployment.get_credentials_for("openstack")["users"]
-        if existing_users and not (set(self.config) - {"user_choice_method"}):
+        if existing_users and not (set(self.config) - {"user_choice_method",
+                                                       "user_weights"}):
             self.existing_users = existing_users
         else:
             self.existing_users = []
@@ -150,9 +164,15 @@ class UserGenerator(context.Context):
                 if default:
                     clients.neutron().delete_security_group(default[0]["id"])
 
-    def _create_tenants(self):
-        threads = self.config["resource_management_workers"]
+    def _run_broker(self, publish, consume):
+        """Run the broker limited by options of the users context."""
+        return broker.run(
+            publish, consume, self.config["resource_management_workers"],
+            rate_limiter=broker.get_rate_limiter(
+                "keystone", CONF.users_context.resource_management_rate_limit),
+            retries=CONF.users_context.resource_management_retries)
 
+    def _create_tenants(self):
         tenants = collections.deque()
 
         def publish(queue):
@@ -171,7 +191,7 @@ class UserGenerator(context.Context):
             tenants.append(tenant_dict)
 
         # NOTE(msdubov): consume() will fill the tenants list in the closure.
-        broker.run(publish, consume, threads)
+        self._run_broker(publish, consume)
         tenants_dict = {}
         for t in tenants:
             tenants_dict[t["id"]] = t
@@ -180,7 +200,6 @@ class UserGenerator(context.Context):
 
     def _create_users(self):
         # NOTE(msdubov): This should be called after _create_tenants().
-        threads = self.config["resource_management_workers"]
         users_per_tenant = self.config["users_per_tenant"]
         default_role = cfg.CONF.users_context.keystone_default_role
 
@@ -224,7 +243,7 @@ class UserGenerator(context.Context):
                           "tenant_id": tenant_id})
 
         # NOTE(msdubov): consume() will fill the users list in the closure.
-        broker.run(publish, consume, threads)
+        self._run_broker(publish, consume)
         return list(users)
 
     def _get_consumer_for_deletion(self, func_name):
@@ -236,25 +255,21 @@ class UserGenerator(context.Context):
         return consume
 
     def _delete_tenants(self):
-        threads = self.config["resource_management_workers"]
-
         def publish(queue):
             for tenant_id in self.context["tenants"]:
                 queue.append(tenant_id)
 
-        broker.run(publish, self._get_consumer_for_deletion("delete_project"),
-                   threads)
+        self._run_broker(publish,
+                         self._get_consumer_for_deletion("delete_project"))
         self.context["tenants"] = {}
 
     def _delete_users(self):
-        threads = self.config["resource_management_workers"]
-
         def publish(queue):
             for user in self.context["users"]:
                 queue.append(user["id"])
 
-        broker.run(publish, self._get_consumer_for_deletion("delete_user"),
-                   threads)
+        self._run_broker(publish,
+                         self._get_consumer_for_deletion("delete_user"))
         self.context["users"] = []
 
     def create_users(self):
@@ -312,6 +327,10 @@ class UserGenerator(context.Context):
         else:
             self.create_users()
 
+        self.context["user_selection_index"] = scenario.UserSelectionIndex(
+            self.context["users"], self.config["user_choice_method"],
+            self.config.get("user_weights"))
+
     @logging.log_task_wrapper(LOG.info, _("Exit context: `users`"))
     def cleanup(self):
         """Delete tenants and users, using the broker pattern."""
@@ -13,11 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import functools
+import os
 import random
+import threading
 
 from oslo_config import cfg
 from osprofiler import profiler
+from rally.common import utils
 from rally import osclients
 from rally.task import scenario
 
@@ -26,9 +30,99 @@ configure = functools.partial(scenario.configure, platform="openstack")
 CONF = cfg.CONF
 
 
+class UserSelectionIndex(utils.ImmutableMixin):
+    """Chooses users for iterations in constant time.
+
+    The index is built once from the list of users of the context and keeps
+    positions of users in that list only, so it is small and it can be
+    shared by all iterations (and pickled along with the context).
+
+    Supported methods are:
+
+    * random - any user with the same probability;
+    * round_robin - tenants (sorted by IDs) in turn, then users of
+      the tenant in turn;
+    * weighted - any user with the probability which is proportional to
+      its weight. The i-th weight is the weight of the i-th user of each
+      tenant, users without weights weigh 1;
+    * sticky - the same user for all iterations which are executed by
+      the same worker (thread of a process), so caches of clients and
+      sessions of the user are reused.
+    """
+
+    def __init__(self, users, method, weights=None):
+        """Build the index.
+
+        :param users: list of users of the context
+        :param method: the method of choice of users
+        :param weights: weights of users for the weighted method
+        """
+        positions = collections.defaultdict(list)
+        for i, user in enumerate(users):
+            positions[user["tenant_id"]].append(i)
+        self.method = method
+        self._users_count = len(users)
+        self._round_robin = tuple(tuple(positions[tid])
+                                  for tid in sorted(positions))
+        self._alias_table = None
+        if method == "weighted":
+            weights = weights or []
+            self._alias_table = self._build_alias_table(
+                [weights[i] if i < len(weights) else 1
+                 for user_positions in positions.values()
+                 for i in range(len(user_positions))],
+                [p for user_positions in positions.values()
+                 for p in user_positions])
+        super(UserSelectionIndex, self).__init__()
+
+    @staticmethod
+    def _build_alias_table(weights, positions):
+        # NOTE: Vose's alias method. Each slot of the table has the same
+        #   probability and it holds a position and an alias of it.
+        count = len(weights)
+        total = float(sum(weights))
+        scaled = [w * count / total for w in weights]
+        small = [i for i, w in enumerate(scaled) if w < 1]
+        large = [i for i, w in enumerate(scaled) if w >= 1]
+        table = [None] * count
+        while small and large:
+            less, more = small.pop(), large.pop()
+            table[less] = (scaled[less], positions[less], positions[more])
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+        for i in small + large:
+            table[i] = (1, positions[i], positions[i])
+        return tuple(table)
+
+    def choose(self, iteration):
+        """Return the position of the user of the iteration in the list.
+
+        :param iteration: the number of the iteration (starts from 1)
+        """
+        if self.method == "round_robin":
+            # NOTE(amaretskiy): iteration is subtracted by `1' because it
+            #                   starts from `1' but we count from `0'
+            iteration -= 1
+            positions = self._round_robin[iteration % len(self._round_robin)]
+            return positions[
+                (iteration // len(self._round_robin)) % len(positions)]
+        elif self.method == "weighted":
+            probability, position, alias = random.choice(self._alias_table)
+            return position if random.random() < probability else alias
+        elif self.method == "sticky":
+            worker = (os.getpid(), threading.current_thread().ident)
+            return hash(worker) % self._users_count
+        return random.randrange(self._users_count)
+
+
 class OpenStackScenario(scenario.Scenario):
     """Base class for all OpenStack scenarios."""
 
+    # NOTE: clients of iterations borrow keystone sessions (and tokens) from
+    #   the process-wide pool. Scenarios which measure authentication itself
+    #   should turn it off.
+    _share_keystone_sessions = True
+
     def __init__(self, context=None, admin_clients=None, clients=None):
         super(OpenStackScenario, self).__init__(context)
         if context:
@@ -41,16 +135,22 @@ class OpenStackScenario(scenario.Scenario):
                         "service_type": api_versions[service].get(
                             "service_type")}
 
+            session_pool = None
+            if self._share_keystone_sessions:
+                session_pool = osclients.SESSION_POOL
+
             if admin_clients is None and "admin" in context:
                 self._admin_clients = osclients.Clients(
-                    context["admin"]["credential"], api_info)
+                    context["admin"]["credential"], api_info,
+                    session_pool=session_pool, atomic_inst=self)
             if clients is None:
                 if "users" in context and "user" not in context:
                     self._choose_user(context)
 
                 if "user" in context:
                     self._clients = osclients.Clients(
-                        context["user"]["credential"], api_info)
+                        context["user"]["credential"], api_info,
+                        session_pool=session_pool, atomic_inst=self)
 
         if admin_clients:
             self._admin_clients = admin_clients
@@ -66,23 +166,16 @@ class OpenStackScenario(scenario.Scenario):
         We are choosing on each iteration one user
 
         """
-        if context["user_choice_method"] == "random":
-            user = random.choice(context["users"])
-            tenant = context["tenants"][user["tenant_id"]]
-        else:
-            # Second and last case - 'round_robin'.
-            tenants_amount = len(context["tenants"])
-            # NOTE(amaretskiy): iteration is subtracted by `1' because it
-            #                   starts from `1' but we count from `0'
-            iteration = context["iteration"] - 1
-            tenant_index = int(iteration % tenants_amount)
-            tenant_id = sorted(context["tenants"].keys())[tenant_index]
-            tenant = context["tenants"][tenant_id]
-            users = context["tenants"][tenant_id]["users"]
-            user_index = int((iteration / tenants_amount) % len(users))
-            user = users[user_index]
-
-        context["user"], context["tenant"] = user, tenant
+        index = context.get("user_selection_index")
+        if index is None:
+            # NOTE: the index is built by the users context, other contexts
+            #   may provide users without it
+            index = UserSelectionIndex(context["users"],
+                                       context["user_choice_method"])
+        user = context["users"][index.choose(context.get("iteration", 1))]
+
+        context["user"] = user
+        context["tenant"] = context["tenants"][user["tenant_id"]]
 
     def clients(self, client_type, version=None):
         """Returns a python openstack client of the requested type.
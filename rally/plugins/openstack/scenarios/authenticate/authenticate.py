@@ -25,6 +25,8 @@ from rally.task import validation
 @scenario.configure(name="Authenticate.keystone", platform="openstack")
 class Keystone(scenario.OpenStackScenario):
 
+    _share_keystone_sessions = False
+
     @atomic.action_timer("authenticate.keystone")
     def run(self):
         """Check Keystone Client."""
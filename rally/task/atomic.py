@@ -15,12 +15,16 @@
 
 import collections
 import functools
+import threading
 
 from rally.common import logging
 from rally.common import utils
 
 LOG = logging.getLogger(__name__)
 
+# NOTE: timers which are entered but not exited yet, per thread
+_ACTIVE_TIMERS = threading.local()
+
 
 class ActionTimerMixin(object):
 
@@ -52,26 +56,56 @@ class ActionTimer(utils.Timer):
         super(ActionTimer, self).__init__()
         self.instance = instance
         self.name = name
-        self._root = self._find_parent(self.instance._atomic_actions)
+        self._root = _find_parent(self.instance._atomic_actions)
         self.atomic_action = {"name": self.name,
                               "children": [],
                               "started_at": None}
         self._root.append(self.atomic_action)
 
-    def _find_parent(self, atomic_actions):
-        while atomic_actions and "finished_at" not in atomic_actions[-1]:
-            atomic_actions = atomic_actions[-1]["children"]
-        return atomic_actions
-
     def __enter__(self):
         super(ActionTimer, self).__enter__()
         self.atomic_action["started_at"] = self.start
+        if not hasattr(_ACTIVE_TIMERS, "timers"):
+            _ACTIVE_TIMERS.timers = []
+        _ACTIVE_TIMERS.timers.append(self)
 
     def __exit__(self, type_, value, tb):
+        _ACTIVE_TIMERS.timers.remove(self)
         super(ActionTimer, self).__exit__(type_, value, tb)
         self.atomic_action["finished_at"] = self.finish
 
 
+def _find_parent(atomic_actions):
+    while atomic_actions and "finished_at" not in atomic_actions[-1]:
+        atomic_actions = atomic_actions[-1]["children"]
+    return atomic_actions
+
+
+def get_active_timer():
+    """Return the innermost ActionTimer which is active in this thread.
+
+    :returns: the ActionTimer or None if there is no active timers
+    """
+    timers = getattr(_ACTIVE_TIMERS, "timers", None)
+    return timers[-1] if timers else None
+
+
+def add_atomic_action(instance, name, started_at, finished_at):
+    """Add an atomic action which is measured without ActionTimer.
+
+    The action becomes a child of the atomic action of the instance which
+    is not finished yet (if any).
+
+    :param instance: instance of subclass of ActionTimerMixin
+    :param name: name of the action
+    :param started_at: the time when the action started
+    :param finished_at: the time when the action finished
+    """
+    _find_parent(instance._atomic_actions).append(
+        {"name": name, "children": [], "started_at": started_at,
+         "finished_at": finished_at})
+
+
 def action_timer(name):
     """Provide measure of execution time.
 
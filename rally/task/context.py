@@ -14,6 +14,10 @@
 #    under the License.
 
 import abc
+import sys
+import threading
+import time
+import traceback
 
 import six
 
@@ -29,7 +33,8 @@ LOG = logging.getLogger(__name__)
 
 @logging.log_deprecated_args("Use 'platform' arg instead", "0.10.0",
                              ["namespace"], log_function=LOG.warning)
-def configure(name, order, platform="default", namespace=None, hidden=False):
+def configure(name, order, platform="default", namespace=None, hidden=False,
+              depends_on=None):
     """Context class wrapper.
 
     Each context class has to be wrapped by configure() wrapper. It
@@ -43,6 +48,10 @@ def configure(name, order, platform="default", namespace=None, hidden=False):
                   Contexts with smaller order are run first
     :param hidden: If it is true you won't be able to specify context via
                    task config
+    :param depends_on: Names of contexts which have to be set up before this
+                       one. By default it depends on all contexts with smaller
+                       order, the ones with the same order are set up
+                       concurrently
     """
     if namespace:
         platform = namespace
@@ -51,6 +60,8 @@ def configure(name, order, platform="default", namespace=None, hidden=False):
         cls = plugin.configure(name=name, platform=platform,
                                hidden=hidden)(cls)
         cls._meta_set("order", order)
+        if depends_on is not None:
+            cls._meta_set("depends_on", tuple(depends_on))
         return cls
 
     return wrapper
@@ -111,6 +122,11 @@ class BaseContext(plugin.Plugin, functional.FunctionalMixin,
     def get_order(cls):
         return cls._meta_get("order")
 
+    @classmethod
+    def get_dependencies(cls):
+        """Return names of contexts to set up first (None if not declared)."""
+        return cls._meta_get("depends_on")
+
     @abc.abstractmethod
     def setup(self):
         """Prepare environment for test.
@@ -159,9 +175,19 @@ class Context(BaseContext, validation.ValidatablePluginMixin):
 class ContextManager(object):
     """Create context environment and run method inside it."""
 
-    def __init__(self, context_obj):
+    def __init__(self, context_obj, workers=1):
+        """ContextManager constructor.
+
+        :param context_obj: dict with the context of a workload
+        :param workers: maximum number of contexts which are set up or
+                        cleaned up at the same time
+        """
         self._visited = []
         self.context_obj = context_obj
+        self.workers = workers
+        # NOTE: timings of setup and cleanup of each context, they are stored
+        #   as Workload.context_execution
+        self.execution = {}
 
     def _get_sorted_context_lst(self):
         context_list = []
@@ -197,16 +223,125 @@ class ContextManager(object):
 
         return sorted([ctx(self.context_obj) for ctx in context_list])
 
+    @staticmethod
+    def _get_dependencies(ctxlst):
+        """Return positions of contexts which each context depends on.
+
+        :param ctxlst: sorted list of contexts
+        :returns: list of sets of positions in ctxlst. Declared dependencies
+            are looked up among preceding contexts only, so there are no
+            cycles
+        """
+        dependencies = []
+        for i, ctx in enumerate(ctxlst):
+            declared = ctx.get_dependencies()
+            if declared is None:
+                dependencies.append(
+                    set(j for j in range(i)
+                        if ctxlst[j].get_order() != ctx.get_order()))
+            else:
+                dependencies.append(set(j for j in range(i)
+                                        if ctxlst[j].get_name() in declared))
+        return dependencies
+
+    def _execute(self, ctxlst, dependencies, method, stop_on_error):
+        """Call the method of contexts on a pool of threads.
+
+        A context is picked up when all contexts it depends on are done. The
+        first ones of the list are picked up first, so a single worker calls
+        the method in the order of the list. The calling thread is one of the
+        workers.
+
+        :param ctxlst: list of contexts
+        :param dependencies: list of sets of positions in ctxlst
+        :param method: name of the method to call
+        :param stop_on_error: whether to pick up no more contexts when the
+            method of some context fails, otherwise errors are just logged
+        :returns: list of positions of contexts which were picked up and
+            exc_info of the first error (or None)
+        """
+        cond = threading.Condition()
+        waiting = dict((i, set(deps)) for i, deps in enumerate(dependencies))
+        started = []
+        state = {"running": 0, "exc_info": None}
+
+        def worker():
+            while True:
+                with cond:
+                    while True:
+                        ready = [i for i, deps in waiting.items() if not deps]
+                        if ready and not (stop_on_error and state["exc_info"]):
+                            i = min(ready)
+                            del waiting[i]
+                            started.append(i)
+                            state["running"] += 1
+                            break
+                        if not state["running"]:
+                            # NOTE: either all contexts are done or no more
+                            #   contexts are picked up because of an error
+                            cond.notify_all()
+                            return
+                        cond.wait()
+
+                exc_info = self._call(ctxlst[i], method)
+                if exc_info and not stop_on_error:
+                    LOG.error("Context %s failed during %s."
+                              % (ctxlst[i].get_name(), method),
+                              exc_info=exc_info)
+
+                with cond:
+                    state["running"] -= 1
+                    if exc_info and not state["exc_info"]:
+                        state["exc_info"] = exc_info
+                    for deps in waiting.values():
+                        deps.discard(i)
+                    cond.notify_all()
+
+        threads = [threading.Thread(target=worker)
+                   for i in range(min(self.workers, len(ctxlst)) - 1)]
+        for thread in threads:
+            thread.start()
+        worker()
+        for thread in threads:
+            thread.join()
+        return started, state["exc_info"]
+
+    def _call(self, ctx, method):
+        """Call the method of the context and record its timings.
+
+        :returns: exc_info of the error of the method or None
+        """
+        record = {"started_at": time.time(), "finished_at": None,
+                  "error": None}
+        name = "%s@%s" % (ctx.get_name(), ctx.get_platform())
+        self.execution.setdefault(name, {})[method] = record
+        exc_info = None
+        try:
+            getattr(ctx, method)()
+        except Exception as e:
+            exc_info = sys.exc_info()
+            record["error"] = [e.__class__.__name__, str(e),
+                               traceback.format_exc()]
+        record["finished_at"] = time.time()
+        return exc_info
+
     def setup(self):
         """Executes in right order setup() methods of all specified context.
 
+        Contexts which don't depend on each other are set up concurrently.
+
         :returns: dict that contains data generated by context plugins
         """
 
         self._visited = []
-        for ctx in self._get_sorted_context_lst():
-            self._visited.append(ctx)
-            ctx.setup()
+        ctxlst = self._get_sorted_context_lst()
+        started, exc_info = self._execute(
+            ctxlst, self._get_dependencies(ctxlst), "setup",
+            stop_on_error=True)
+        # NOTE: contexts are cleaned up even if their setup fails
+        self._visited = [ctxlst[i] for i in sorted(started)]
+        if exc_info:
+            six.reraise(*exc_info)
 
         return self.context_obj
 
@@ -219,15 +354,20 @@ class ContextManager(object):
         >>> ctx2.setup()
         >>> ctx2.cleanup()
         >>> ctx1.cleanup()
+
+        A context is cleaned up when all contexts which depend on it are
+        cleaned up.
         """
 
         ctxlst = self._visited or self._get_sorted_context_lst()
-        for ctx in ctxlst[::-1]:
-            try:
-                ctx.cleanup()
-            except Exception as e:
-                LOG.error("Context %s failed during cleanup." % ctx.get_name())
-                LOG.exception(e)
+        # NOTE: the dependencies are reversed along with the list
+        last = len(ctxlst) - 1
+        dependents = [set() for ctx in ctxlst]
+        for i, deps in enumerate(self._get_dependencies(ctxlst)):
+            for j in deps:
+                dependents[last - j].add(last - i)
+        self._execute(ctxlst[::-1], dependents, "cleanup",
+                      stop_on_error=False)
 
     def __enter__(self):
         try:
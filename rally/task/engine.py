@@ -22,7 +22,9 @@ import traceback
 
 import jsonschema
 from oslo_config import cfg
+from six.moves import queue as Queue
 
+from rally.common.db.sqlalchemy import chunk_codec
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common import objects
@@ -33,6 +35,7 @@ from rally import exceptions
 from rally.plugins.openstack import scenario as os_scenario
 from rally.task import context
 from rally.task import hook
+from rally.task.processing import statistics
 from rally.task import runner
 from rally.task import scenario
 from rally.task import sla
@@ -46,6 +49,28 @@ CONF = cfg.CONF
 TASK_ENGINE_OPTS = [
     cfg.IntOpt("raw_result_chunk_size", default=1000, min=1,
                help="Size of raw result chunk in iterations"),
+    cfg.IntOpt("raw_result_max_pending_chunks", default=10, min=1,
+               help="Maximum number of raw result chunks which are received "
+                    "from a runner but are not stored yet. The runner is "
+                    "paused while there are more pending results"),
+    cfg.StrOpt("raw_result_chunk_codec", default=chunk_codec.DEFAULT_CODEC,
+               choices=chunk_codec.CODECS,
+               help="Codec of stored raw result chunks written as "
+                    "'<layout>+<compressor>'. The 'columnar' layout groups "
+                    "values of each field of iterations together which makes "
+                    "compression more efficient. The 'lzma' compressor is "
+                    "available on Python 3 only, so chunks stored with it "
+                    "can't be read by Rally running on Python 2"),
+    cfg.IntOpt("context_workers", default=4, min=1,
+               help="Maximum number of contexts of a workload which are set "
+                    "up or cleaned up concurrently. Contexts with the same "
+                    "order and contexts which don't depend on each other "
+                    "are set up at the same time"),
+    cfg.StrOpt("distributed_secret_key", secret=True,
+               help="Key which authenticates jobs and results of workloads "
+                    "executed by the 'distributed' runner. The same key "
+                    "should be set for Rally which starts tasks and for all "
+                    "the workers"),
 ]
 CONF.register_opts(TASK_ENGINE_OPTS)
 
@@ -58,7 +83,7 @@ class ResultConsumer(object):
     """
 
     def __init__(self, workload_cfg, task, subtask, workload, runner,
-                 abort_on_sla_failure):
+                 abort_on_sla_failure, context_manager=None):
         """ResultConsumer constructor.
 
         :param workload_cfg: A configuration of the Workload
@@ -69,6 +94,8 @@ class ResultConsumer(object):
                        consumed
         :param abort_on_sla_failure: True if the execution should be stopped
                                      when some SLA check fails
+        :param context_manager: ContextManager of the workload, timings of
+                                its contexts are stored with the results
         """
 
         self.task = task
@@ -76,6 +103,7 @@ class ResultConsumer(object):
         self.workload = workload
         self.workload_cfg = workload_cfg
         self.runner = runner
+        self.context_manager = context_manager
         self.load_started_at = float("inf")
         self.load_finished_at = 0
         self.workload_data_count = 0
@@ -85,13 +113,27 @@ class ResultConsumer(object):
         self.abort_on_sla_failure = abort_on_sla_failure
         self.is_done = threading.Event()
         self.unexpected_failure = {}
+        # the first error of storing raw results (if any)
+        self.storage_failure = None
         self.results = []
+        # NOTE: statistics are collected while results arrive, so there is
+        #   no need to read all the raw data back at the end of the workload
+        self.statistics = statistics.WorkloadStatistics()
+        self.chunk_size = CONF.raw_result_chunk_size
+        # NOTE: the runner is paused by its result queue while the writer
+        #   lags behind, the chunk which is filled by the consumer is
+        #   counted as a pending one as well
+        self.runner.result_queue.set_limit(
+            self.chunk_size * (CONF.raw_result_max_pending_chunks + 1))
+        self.chunks = Queue.Queue()
         self.thread = threading.Thread(target=self._consume_results)
+        self.writer = threading.Thread(target=self._write_chunks)
         self.aborting_checker = threading.Thread(target=self.wait_and_abort)
         if self.workload_cfg["hooks"]:
             self.event_thread = threading.Thread(target=self._consume_events)
 
     def __enter__(self):
+        self.writer.start()
         self.thread.start()
         self.aborting_checker.start()
         if self.workload_cfg["hooks"]:
@@ -101,39 +143,78 @@ class ResultConsumer(object):
 
     def _consume_results(self):
         task_aborted = False
+        result_queue = self.runner.result_queue
+        try:
+            while True:
+                if result_queue:
+                    task_aborted = self._consume_batch(result_queue.popleft(),
+                                                       task_aborted)
+                elif self.is_done.isSet():
+                    break
+                else:
+                    result_queue.wait(0.1)
+        finally:
+            # NOTE: the runner should not wait for the consumer which is
+            #   stopped, the writer stops after storing handed chunks
+            result_queue.set_limit(None)
+            self.chunks.put(None)
+
+    def _consume_batch(self, results, task_aborted):
+        checked_by = getattr(results, "sla_checker", None)
+        for r in results:
+            self.load_started_at = min(r["timestamp"], self.load_started_at)
+            self.load_finished_at = max(r["duration"] + r["timestamp"],
+                                        self.load_finished_at)
+            if checked_by is None:
+                success = self.sla_checker.add_iteration(r)
+                task_aborted = self._abort_on_sla_failure(success,
+                                                          task_aborted)
+            self.statistics.add_iteration(r)
+            # NOTE: a full chunk is handed to the writer as is, so collected
+            #   results are never copied
+            self.results.append(r)
+            if len(self.results) >= self.chunk_size:
+                self.chunks.put(self.results)
+                self.results = []
+        if checked_by is not None:
+            success = self.sla_checker.merge(checked_by)
+            task_aborted = self._abort_on_sla_failure(success, task_aborted)
+        return task_aborted
+
+    def _write_chunks(self):
+        """Store chunks of results in the background."""
         while True:
-            if self.runner.result_queue:
-                results = self.runner.result_queue.popleft()
-                self.results.extend(results)
-                for r in results:
-                    self.load_started_at = min(r["timestamp"],
-                                               self.load_started_at)
-                    self.load_finished_at = max(r["duration"] + r["timestamp"],
-                                                self.load_finished_at)
-                    success = self.sla_checker.add_iteration(r)
-                    if (self.abort_on_sla_failure and
-                            not success and
-                            not task_aborted):
-                        self.sla_checker.set_aborted_on_sla()
-                        self.runner.abort()
-                        self.task.update_status(
-                            consts.TaskStatus.SOFT_ABORTING)
-                        task_aborted = True
-
-                # save results chunks
-                chunk_size = CONF.raw_result_chunk_size
-                while len(self.results) >= chunk_size:
-                    results_chunk = self.results[:chunk_size]
-                    self.results = self.results[chunk_size:]
-                    results_chunk.sort(key=lambda x: x["timestamp"])
-                    self.workload.add_workload_data(self.workload_data_count,
-                                                    {"raw": results_chunk})
-                    self.workload_data_count += 1
-
-            elif self.is_done.isSet():
+            chunk = self.chunks.get()
+            if chunk is None:
                 break
-            else:
-                time.sleep(0.1)
+            self._store_chunk(chunk)
+            self.runner.result_queue.release(len(chunk))
+
+    def _store_chunk(self, chunk):
+        # NOTE(boris-42): Sort in order of starting
+        #                 instead of order of ending
+        chunk.sort(key=lambda x: x["timestamp"])
+        try:
+            self.workload.add_workload_data(
+                self.workload_data_count, {"raw": chunk},
+                codec=CONF.raw_result_chunk_codec)
+        except Exception as e:
+            LOG.exception("Failed to store chunk %s of raw results."
+                          % self.workload_data_count)
+            if self.storage_failure is None:
+                self.storage_failure = e
+                # NOTE: results of the workload are incomplete anyway, so
+                #   there is no reason to continue the load
+                self.runner.abort()
+        self.workload_data_count += 1
+
+    def _abort_on_sla_failure(self, success, task_aborted):
+        if self.abort_on_sla_failure and not success and not task_aborted:
+            self.sla_checker.set_aborted_on_sla()
+            self.runner.abort()
+            self.task.update_status(consts.TaskStatus.SOFT_ABORTING)
+            return True
+        return task_aborted
 
     def _consume_events(self):
         while not self.is_done.isSet() or self.runner.event_queue:
@@ -149,6 +230,7 @@ class ResultConsumer(object):
         self.is_done.set()
         self.aborting_checker.join()
         self.thread.join()
+        self.writer.join()
 
         if exc_type:
             self.sla_checker.set_unexpected_failure(exc_value)
@@ -170,19 +252,23 @@ class ResultConsumer(object):
         if self.workload_cfg["hooks"]:
             self.event_thread.join()
             results["hooks_results"] = self.hook_executor.results()
+        if self.context_manager is not None:
+            results["context_execution"] = self.context_manager.execution
 
         if self.results:
-            # NOTE(boris-42): Sort in order of starting
-            #                 instead of order of ending
-            self.results.sort(key=lambda x: x["timestamp"])
-            self.workload.add_workload_data(self.workload_data_count,
-                                            {"raw": self.results})
+            self._store_chunk(self.results)
+        if (self.storage_failure is not None
+                and not self.sla_checker.unexpected_failure):
+            self.sla_checker.set_unexpected_failure(self.storage_failure)
+
         start_time = (self.load_started_at
                       if self.load_started_at != float("inf") else None)
         self.workload.set_results(load_duration=load_duration,
                                   full_duration=(self.finish - self.start),
                                   sla_results=self.sla_checker.results(),
-                                  start_time=start_time, **results)
+                                  start_time=start_time,
+                                  statistics=self.statistics.to_dict(),
+                                  **results)
 
     @staticmethod
     def is_task_in_aborting_status(task_uuid, check_soft=True):
@@ -248,6 +334,8 @@ class TaskEngine(object):
         :param deployment: Instance of Deployment,
         :param abort_on_sla_failure: True if the execution should be stopped
                                      when some SLA check fails
+        :param context_manager: ContextManager of the workload, timings of
+                                its contexts are stored with the results
         """
         try:
             self.config = TaskConfig(config)
@@ -531,10 +619,13 @@ class TaskEngine(object):
         runner_obj = runner_cls(self.task, workload["runner"])
         context_obj = self._prepare_context(
             workload["context"], workload["name"], workload_obj["uuid"])
+        ctx_manager = context.ContextManager(context_obj,
+                                             workers=CONF.context_workers)
         try:
             with ResultConsumer(workload, self.task, subtask_obj, workload_obj,
-                                runner_obj, self.abort_on_sla_failure):
-                with context.ContextManager(context_obj):
+                                runner_obj, self.abort_on_sla_failure,
+                                context_manager=ctx_manager):
+                with ctx_manager:
                     runner_obj.run(workload["name"], context_obj,
                                    workload["args"])
         except Exception as e:
@@ -15,11 +15,13 @@
 
 import abc
 import collections
+import heapq
 import threading
+import time
 
 import six
 
-from rally.common.i18n import _, _LE
+from rally.common.i18n import _LE
 from rally.common import logging
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
@@ -38,7 +40,15 @@ configure = plugin.configure
 
 
 class HookExecutor(object):
-    """Runs hooks and collects results from them."""
+    """Runs hooks and collects results from them.
+
+    Triggers of "iteration" and "time" events are notified only of the
+    values returned by their get_next_value() methods. Triggers of
+    iterations are kept in buckets by these values, triggers of time are
+    kept in a heap by the moments they should be notified at, so the cost
+    of an event does not depend on the number of triggers which are not
+    due and time triggers are not limited to whole seconds.
+    """
 
     def __init__(self, config, task):
         self.config = config
@@ -53,32 +63,98 @@ class HookExecutor(object):
             event_type = trigger_obj.get_listening_event()
             self.triggers[event_type].append(trigger_obj)
 
+        # iteration -> triggers which should be notified of it
+        self._iterations = collections.defaultdict(list)
+        # all iterations up to this one have happened
+        self._iterations_passed = 0
+        # iterations after self._iterations_passed which have happened
+        self._iterations_seen = set()
+        for trigger_obj in self.triggers.get("iteration", []):
+            self._schedule_iteration(trigger_obj)
+
+        # heap of (seconds since start, sequence number, trigger)
+        self._timers = []
+        self._timers_count = 0
+        self._timer_started_at = None
+        for trigger_obj in self.triggers.get("time", []):
+            self._schedule_time(trigger_obj)
+
         if "time" in self.triggers:
             self._timer_thread = threading.Thread(target=self._timer_method)
             self._timer_stop_event = threading.Event()
 
+    def _schedule_iteration(self, trigger_obj, last_value=None):
+        value = trigger_obj.get_next_value(last_value)
+        if value is not None:
+            self._iterations[value].append(trigger_obj)
+
+    def _schedule_time(self, trigger_obj, last_value=None):
+        value = trigger_obj.get_next_value(last_value)
+        if value is not None:
+            self._timers_count += 1
+            heapq.heappush(self._timers,
+                           (value, self._timers_count, trigger_obj))
+
     def _timer_method(self):
         """Timer thread method.
 
         It generates events with type "time" to inform HookExecutor
         about how many time passed since beginning of the first iteration.
+        The events are generated at the moments the nearest time triggers
+        are scheduled at.
         """
-        stopwatch = rutils.Stopwatch(stop_event=self._timer_stop_event)
-        stopwatch.start()
-        seconds_since_start = 0
-        while not self._timer_stop_event.isSet():
-            self.on_event(event_type="time", value=seconds_since_start)
-            seconds_since_start += 1
-            stopwatch.sleep(seconds_since_start)
+        self._timer_started_at = time.time()
+        while self._timers and not self._timer_stop_event.isSet():
+            delay = (self._timer_started_at + self._timers[0][0] -
+                     time.time())
+            if delay > 0:
+                self._timer_stop_event.wait(delay)
+                if self._timer_stop_event.isSet():
+                    break
+            self.on_event(event_type="time",
+                          value=time.time() - self._timer_started_at)
 
     def _start_timer(self):
-        self._timer_thread.start()
+        if self._timer_thread.ident is None:
+            self._timer_thread.start()
 
     def _stop_timer(self):
         self._timer_stop_event.set()
         if self._timer_thread.ident is not None:
             self._timer_thread.join()
 
+    def _notify(self, trigger_obj, event_type, value, scheduled_at):
+        trigger_obj.scheduled_at = scheduled_at
+        trigger_obj.on_event(event_type, value)
+
+    def _on_iteration(self, value):
+        now = time.time()
+        self._iterations_seen.add(value)
+        while self._iterations_passed + 1 in self._iterations_seen:
+            self._iterations_passed += 1
+            self._iterations_seen.remove(self._iterations_passed)
+
+        # NOTE: iterations are reported by concurrent workers, so the
+        #   next value of a trigger may have happened already
+        for trigger_obj in self._iterations.pop(value, []):
+            next_value = value
+            while next_value is not None and (
+                    next_value <= self._iterations_passed or
+                    next_value in self._iterations_seen):
+                self._notify(trigger_obj, "iteration", next_value, now)
+                last_value = next_value
+                next_value = trigger_obj.get_next_value(last_value)
+            self._schedule_iteration(trigger_obj, last_value)
+
+    def _on_time(self, value):
+        while self._timers and self._timers[0][0] <= value:
+            scheduled, count, trigger_obj = heapq.heappop(self._timers)
+            scheduled_at = None
+            if self._timer_started_at is not None:
+                scheduled_at = self._timer_started_at + scheduled
+            self._notify(trigger_obj, "time", scheduled, scheduled_at)
+            self._schedule_time(trigger_obj, scheduled)
+
     def on_event(self, event_type, value):
         """Notify about event.
 
@@ -86,17 +162,17 @@ class HookExecutor(object):
         particular event occurred.
         It runs hooks configured for event.
         """
-        if "time" in self.triggers:
-            # start timer on first iteration
-            if event_type == "iteration" and value == 1:
+        if event_type == "iteration":
+            if "time" in self.triggers:
+                # start timer on first iteration
                 self._start_timer()
-
-        for trigger_obj in self.triggers[event_type]:
-            started = trigger_obj.on_event(event_type, value)
-            if started:
-                LOG.info(_("Hook %s is trigged for Task %s by %s=%s")
-                         % (trigger_obj.hook_cls.__name__, self.task["uuid"],
-                            event_type, value))
+            self._on_iteration(value)
+        elif event_type == "time":
+            self._on_time(value)
+        else:
+            now = time.time()
+            for trigger_obj in self.triggers[event_type]:
+                self._notify(trigger_obj, event_type, value, now)
 
     def results(self):
         """Returns list of dicts with hook results."""
@@ -124,6 +200,7 @@ class Hook(plugin.Plugin, validation.ValidatablePluginMixin):
         self._thread = threading.Thread(target=self._thread_method)
         self._started_at = 0.0
         self._finished_at = 0.0
+        self._scheduled_at = None
         self._result = {
             "status": consts.HookStatus.SUCCESS,
             "started_at": self._started_at,
@@ -166,8 +243,14 @@ class Hook(plugin.Plugin, validation.ValidatablePluginMixin):
                     raise exceptions.RallyException(message)
                 self._result["output"][key].append(value)
 
-    def run_async(self):
-        """Run hook asynchronously."""
+    def run_async(self, scheduled_at=None):
+        """Run hook asynchronously.
+
+        :param scheduled_at: timestamp the hook is expected to start at,
+            if it is specified the delay of the start is saved in result
+            as "skew"
+        """
+        self._scheduled_at = scheduled_at
         self._thread.start()
 
     def run_sync(self):
@@ -184,6 +267,8 @@ class Hook(plugin.Plugin, validation.ValidatablePluginMixin):
         self._result["started_at"] = self._started_at
         self._finished_at = timer.finish_timestamp()
         self._result["finished_at"] = self._finished_at
+        if self._scheduled_at is not None:
+            self._result["skew"] = self._started_at - self._scheduled_at
 
     @abc.abstractmethod
     def run(self):
@@ -49,6 +49,7 @@ class Chart(plugin.Plugin):
         self._workload = workload
         self.base_size = self._workload["total_iteration_count"]
         self.zipped_size = zipped_size
+        self._atomic_names = None
 
     def add_iteration(self, iteration):
         """Add iteration data.
@@ -81,9 +82,25 @@ class Chart(plugin.Plugin):
             for name in self._get_atomic_names()
         )
 
+    def _get_atomic_durations(self, atomic_actions):
+        """Get durations of top-level atomic actions of an iteration.
+
+        The result is the same as of _fix_atomic_actions() for merged
+        atomic actions, but inner atomic actions are not processed.
+        """
+        durations = {}
+        for action in atomic_actions:
+            durations[action["name"]] = durations.get(action["name"], 0) + (
+                action["finished_at"] - action["started_at"])
+        return [(name, durations.get(name, 0))
+                for name in self._get_atomic_names()]
+
     def _get_atomic_names(self):
-        duration_stats = self._workload["statistics"]["durations"]
-        return [a["display_name"] for a in duration_stats["atomics"]]
+        if self._atomic_names is None:
+            duration_stats = self._workload["statistics"]["durations"]
+            self._atomic_names = [a["display_name"]
+                                  for a in duration_stats["atomics"]]
+        return self._atomic_names
 
     def _map_iteration_values(self, iteration):
         """Get values for processing, from given iteration."""
@@ -114,9 +131,7 @@ class AtomicStackedAreaChart(Chart):
     widget = "StackedArea"
 
     def _map_iteration_values(self, iteration):
-        atomic_actions = atomic.merge_atomic_actions(
-            iteration["atomic_actions"])
-        atomics = self._fix_atomic_actions(atomic_actions)
+        atomics = self._get_atomic_durations(iteration["atomic_actions"])
         if self._workload["failed_iteration_count"]:
             if iteration["error"]:
                 failed_duration = (
@@ -146,9 +161,7 @@ class AvgChart(Chart):
 class AtomicAvgChart(AvgChart):
 
     def _map_iteration_values(self, iteration):
-        atomic_actions = atomic.merge_atomic_actions(
-            iteration["atomic_actions"])
-        return self._fix_atomic_actions(atomic_actions)
+        return self._get_atomic_durations(iteration["atomic_actions"])
 
 
 class LoadProfileChart(Chart):
@@ -209,6 +222,40 @@ class LoadProfileChart(Chart):
         return [(self._name, list(zip(self._time_axis, self._running)))]
 
 
+class ThroughputChart(Chart):
+    """Chart for the number of iterations started each second."""
+
+    widget = "Lines"
+
+    def __init__(self, workload, name="started iterations"):
+        """Setup chart with graph name.
+
+        :param workload:  dict, detailed information about Workload
+        :param name: str name for Y axis
+        """
+        super(ThroughputChart, self).__init__(workload)
+        self._name = name
+        self._started = collections.defaultdict(int)
+        if self._workload["data"]:
+            self._tstamp_start = self._workload["data"][0]["timestamp"]
+        else:
+            self._tstamp_start = self._workload["start_time"]
+
+    def _map_iteration_values(self, iteration):
+        return iteration["timestamp"]
+
+    def add_iteration(self, iteration):
+        second = int(self._map_iteration_values(iteration)
+                     - self._tstamp_start)
+        self._started[second] += 1
+
+    def render(self):
+        if not self._started:
+            return []
+        return [(self._name, [(second, self._started.get(second, 0))
+                              for second in range(max(self._started) + 1)])]
+
+
 class HistogramChart(Chart):
     """Base class for chart with histograms.
 
@@ -242,11 +289,12 @@ class HistogramChart(Chart):
         for name, value in self._map_iteration_values(iteration):
             if name not in self._data:
                 raise KeyError("Unexpected histogram name: %s" % name)
-            for i, view in enumerate(self._data[name]["views"]):
-                for bin_i, bin_v in enumerate(view["x"]):
-                    if (value or 0) <= bin_v:
-                        self._data[name]["views"][i]["y"][bin_i] += 1
-                        break
+            for view in self._data[name]["views"]:
+                # NOTE: the value is counted by the first bin which upper
+                #   bound is not less than it, bounds are sorted
+                bin_i = bisect.bisect_left(view["x"], value or 0)
+                if bin_i < len(view["x"]):
+                    view["y"][bin_i] += 1
 
     def render(self):
         data = []
@@ -289,9 +337,7 @@ class AtomicHistogramChart(HistogramChart):
                 "disabled": i}
 
     def _map_iteration_values(self, iteration):
-        atomic_actions = atomic.merge_atomic_actions(
-            iteration["atomic_actions"])
-        return self._fix_atomic_actions(atomic_actions)
+        return self._get_atomic_durations(iteration["atomic_actions"])
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -384,9 +430,10 @@ class MainStatsTable(Table):
 
     _DEPTH_OF_PROCESSING = 2
 
-    def __init__(self, *args, **kwargs):
-        super(MainStatsTable, self).__init__(*args, **kwargs)
-        self.iters_num = self._workload["total_iteration_count"]
+    # NOTE: durations and successes of each row are collected into lists and
+    #   are passed to the streaming algorithms by batches of this size,
+    #   which is much faster than processing them one by one
+    _BATCH_SIZE = 1000
 
     def _initialize_atomic(self, name, root, real_name=None, count=1):
         real_name = real_name or name
@@ -394,9 +441,9 @@ class MainStatsTable(Table):
             # streaming algorithms
             "sa": [
                 [streaming.MinComputation(), None],
-                [streaming.PercentileComputation(0.5, self.iters_num), None],
-                [streaming.PercentileComputation(0.9, self.iters_num), None],
-                [streaming.PercentileComputation(0.95, self.iters_num), None],
+                [streaming.PercentileComputation(0.5), None],
+                [streaming.PercentileComputation(0.9), None],
+                [streaming.PercentileComputation(0.95), None],
                 [streaming.MaxComputation(), None],
                 [streaming.MeanComputation(), None],
                 [streaming.MeanComputation(),
@@ -406,9 +453,25 @@ class MainStatsTable(Table):
                  lambda st, has_result: st.result()]],
             "children": collections.OrderedDict(),
             "real_name": real_name,
-            "count_per_iteration": count
+            "count_per_iteration": count,
+            "durations": [],
+            "successes": []
         }
 
+    def _flush(self, row):
+        """Pass the collected values of a row to the streaming algorithms."""
+        durations = row["durations"]
+        if durations:
+            stats = row["sa"]
+            # count
+            stats[-1][0].add_many(durations)
+            # success
+            stats[-2][0].add_many(row["successes"])
+            for idx in range(6):
+                stats[idx][0].add_many(durations)
+            row["durations"] = []
+            row["successes"] = []
+
     def _add_data(self, raw_data, root=None):
         """Add iteration data."""
         p_data = self._data if root is None else root
@@ -422,13 +485,11 @@ class MainStatsTable(Table):
                                         real_name=original_name,
                                         count=data["count"])
 
-            stats = p_data[name]["sa"]
-            # count
-            stats[-1][0].add()
-            # success
-            stats[-2][0].add(0 if data.get("error", False) else 1)
-            for idx in range(6):
-                stats[idx][0].add(data["duration"])
+            row = p_data[name]
+            row["durations"].append(data["duration"])
+            row["successes"].append(0 if data.get("error", False) else 1)
+            if len(row["durations"]) >= self._BATCH_SIZE:
+                self._flush(row)
 
             if data["children"]:
                 self._add_data(data["children"], root=p_data[name]["children"])
@@ -484,6 +545,7 @@ class MainStatsTable(Table):
         self._add_data(data)
 
     def _process_result(self, name, values, depth=0):
+        self._flush(values)
         row = self._process_row(name, values["sa"])
         children = []
 
@@ -565,6 +627,53 @@ class MainStatsTable(Table):
         return rendered_data
 
 
+class StartDelayStatsTable(Table):
+    """Statistics of delays between scheduled and actual starts.
+
+    Runners which start iterations by a schedule (e.g. "rps") store the
+    intended start time of each iteration as "scheduled_at". If an
+    iteration is started late (there was no free thread at the scheduled
+    time), the delay is not visible in its duration, so the duration from
+    the scheduled start (i.e. corrected for coordinated omission) is
+    calculated as well. It includes idle_duration of the iteration in the
+    same way as the "total" row of MainStatsTable does.
+
+    Iterations without "scheduled_at" are skipped, so the table is empty
+    for workloads of other runners.
+    """
+
+    columns = ["Action", "Min (sec)", "Median (sec)", "90%ile (sec)",
+               "95%ile (sec)", "Max (sec)", "Avg (sec)", "Count"]
+
+    _styles = None
+
+    def _initialize_row(self, name):
+        self._data[name] = [
+            [streaming.MinComputation(), None],
+            [streaming.PercentileComputation(0.5), None],
+            [streaming.PercentileComputation(0.9), None],
+            [streaming.PercentileComputation(0.95), None],
+            [streaming.MaxComputation(), None],
+            [streaming.MeanComputation(), None],
+            [streaming.IncrementComputation(), lambda v, na: v.result()]]
+
+    def _map_iteration_values(self, iteration):
+        delay = iteration["timestamp"] - iteration["scheduled_at"]
+        return [("start delay", delay),
+                ("duration from scheduled start",
+                 delay + iteration["duration"] + iteration["idle_duration"])]
+
+    def add_iteration(self, iteration):
+        if iteration.get("scheduled_at") is None:
+            return
+        for name, value in self._map_iteration_values(iteration):
+            if name not in self._data:
+                self._initialize_row(name)
+            self._data[name][-1][0].add()
+            for computation, dummy in self._data[name][:-1]:
+                computation.add(value)
+
+
 class OutputChart(Chart):
     """Base class for charts related to scenario output."""
 
@@ -733,12 +842,11 @@ class OutputStatsTable(OutputTable):
     def add_iteration(self, iteration):
         for name, value in self._map_iteration_values(iteration):
             if name not in self._data:
-                iters_num = self._workload["total_iteration_count"]
                 self._data[name] = [
                     [streaming.MinComputation(), None],
-                    [streaming.PercentileComputation(0.5, iters_num), None],
-                    [streaming.PercentileComputation(0.9, iters_num), None],
-                    [streaming.PercentileComputation(0.95, iters_num), None],
+                    [streaming.PercentileComputation(0.5), None],
+                    [streaming.PercentileComputation(0.9), None],
+                    [streaming.PercentileComputation(0.95), None],
                     [streaming.MaxComputation(), None],
                     [streaming.MeanComputation(), None],
                     [streaming.IncrementComputation(),
@@ -89,6 +89,8 @@ def _process_workload(workload, workload_cfg, pos):
     main_hist = charts.MainHistogramChart(workload)
     main_stat = charts.MainStatsTable(workload)
     load_profile = charts.LoadProfileChart(workload)
+    throughput = charts.ThroughputChart(workload)
+    start_delay = charts.StartDelayStatsTable(workload)
     atomic_pie = charts.AtomicAvgChart(workload)
     atomic_area = charts.AtomicStackedAreaChart(workload)
     atomic_hist = charts.AtomicHistogramChart(workload)
@@ -126,7 +128,8 @@ def _process_workload(workload, workload_cfg, pos):
         complete_output.append(complete_charts)
 
         for chart in (main_area, main_hist, main_stat, load_profile,
-                      atomic_pie, atomic_area, atomic_hist):
+                      throughput, start_delay, atomic_pie, atomic_area,
+                      atomic_hist):
             chart.add_iteration(itr)
 
     cls, method = workload["name"].split(".")
@@ -148,10 +151,12 @@ def _process_workload(workload, workload_cfg, pos):
                     ("errors", len(errors))],
             "histogram": main_hist.render()},
         "load_profile": load_profile.render(),
+        "throughput": throughput.render(),
         "atomic": {"histogram": atomic_hist.render(),
                    "iter": atomic_area.render(),
                    "pie": atomic_pie.render()},
         "table": main_stat.render(),
+        "start_delay": start_delay.render(),
         "additive_output": additive_output,
         "complete_output": complete_output,
         "has_output": any(additive_output) or any(complete_output),
@@ -0,0 +1,56 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.task.processing import charts
+
+
+class WorkloadStatistics(object):
+    """Statistics of a workload which are collected while results arrive.
+
+    Iterations are processed one by one, so the statistics can be stored at
+    the end of the workload without reading all its raw data back.
+    """
+
+    def __init__(self, total_iteration_count=None):
+        """Init statistics.
+
+        :param total_iteration_count: number of iterations if it is known
+            beforehand
+        """
+        self.iteration_count = 0
+        self.failed_iteration_count = 0
+        self.min_duration = None
+        self.max_duration = None
+        self.durations = charts.MainStatsTable(
+            {"total_iteration_count": total_iteration_count})
+
+    def add_iteration(self, iteration):
+        self.iteration_count += 1
+        if iteration.get("error"):
+            self.failed_iteration_count += 1
+
+        duration = iteration.get("duration", 0)
+        if self.min_duration is None or duration < self.min_duration:
+            self.min_duration = duration
+        if self.max_duration is None or duration > self.max_duration:
+            self.max_duration = duration
+
+        self.durations.add_iteration(iteration)
+
+    def to_dict(self):
+        return {"total_iteration_count": self.iteration_count,
+                "failed_iteration_count": self.failed_iteration_count,
+                "min_duration": self.min_duration,
+                "max_duration": self.max_duration,
+                "durations": self.durations.to_dict()}
@@ -17,14 +17,20 @@ import abc
 import collections
 import copy
 import multiprocessing
+from multiprocessing import util as mp_util
+import select
+import threading
 import time
 
 import six
+from six.moves import cPickle as pickle
+from six.moves import queue as Queue
 
 from rally.common import logging
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
 from rally.common import validation
+from rally import exceptions
 from rally.task.processing import charts
 from rally.task import scenario
 from rally.task import types
@@ -45,10 +51,30 @@ def format_result_on_timeout(exc, timeout):
     }
 
 
+# NOTE: values of these types are immutable, so arguments which consist of
+#   them only are isolated between iterations by a shallow copy
+_SCALAR_TYPES = ((type(None), bool, float, six.text_type, six.binary_type)
+                 + six.integer_types + six.string_types)
+
+
+def _copy_scenario_kwargs(scenario_kwargs):
+    """Return a copy of scenario arguments for a single iteration."""
+    if all(isinstance(v, _SCALAR_TYPES) for v in scenario_kwargs.values()):
+        return dict(scenario_kwargs)
+    return copy.deepcopy(scenario_kwargs)
+
+
 def _get_scenario_context(iteration, context_obj):
-    context_obj = copy.deepcopy(context_obj)
-    context_obj["iteration"] = iteration + 1  # Numeration starts from `1'
-    return context_obj
+    """Return the context of a single iteration.
+
+    Iterations share the read-only context of the workload and get
+    copy-on-write views of it, so changes made by one of them are not seen
+    by the others.
+    """
+    if not isinstance(context_obj, rutils.LockedDict):
+        context_obj = rutils.LockedDict(context_obj)
+    # Numeration starts from `1'
+    return rutils.CopyOnWriteDict(context_obj, iteration=iteration + 1)
 
 
 def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs,
@@ -60,10 +86,10 @@ def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs,
     })
 
     # provide arguments isolation between iterations
-    scenario_kwargs = copy.deepcopy(scenario_kwargs)
+    scenario_kwargs = _copy_scenario_kwargs(scenario_kwargs)
 
-    LOG.info("Task %(task)s | ITER: %(iteration)s START" %
-             {"task": context_obj["task"]["uuid"], "iteration": iteration})
+    LOG.debug("Task %(task)s | ITER: %(iteration)s START",
+              {"task": context_obj["task"]["uuid"], "iteration": iteration})
 
     scenario_inst = cls(context_obj)
     error = []
@@ -75,17 +101,30 @@ def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs,
         if logging.is_debug():
             LOG.exception(e)
     finally:
+        return _get_scenario_result(context_obj, scenario_inst, timer, error)
+
+
+def _get_scenario_result(context_obj, scenario_inst, timer, error):
+    """Compose the result of a finished scenario iteration.
+
+    :param context_obj: context of the iteration
+    :param scenario_inst: instance of the scenario
+    :param timer: finished rally.common.utils.Timer of the iteration
+    :param error: formatted error of the iteration or an empty list
+    """
+    if logging.is_debug():
         status = "Error %s: %s" % tuple(error[0:2]) if error else "OK"
-        LOG.info("Task %(task)s | ITER: %(iteration)s END: %(status)s" %
-                 {"task": context_obj["task"]["uuid"], "iteration": iteration,
-                  "status": status})
+        LOG.debug("Task %(task)s | ITER: %(iteration)s END: %(status)s",
+                  {"task": context_obj["task"]["uuid"],
+                   "iteration": context_obj["iteration"],
+                   "status": status})
 
-        return {"duration": timer.duration() - scenario_inst.idle_duration(),
-                "timestamp": timer.timestamp(),
-                "idle_duration": scenario_inst.idle_duration(),
-                "error": error,
-                "output": scenario_inst._output,
-                "atomic_actions": scenario_inst.atomic_actions()}
+    return {"duration": timer.duration() - scenario_inst.idle_duration(),
+            "timestamp": timer.timestamp(),
+            "idle_duration": scenario_inst.idle_duration(),
+            "error": error,
+            "output": scenario_inst._output,
+            "atomic_actions": scenario_inst.atomic_actions()}
 
 
 def _worker_thread(queue, cls, method_name, context_obj, scenario_kwargs,
@@ -104,6 +143,346 @@ def _log_worker_info(**info):
     LOG.debug("Starting a worker.\n\t%s", info_message)
 
 
+class _IterationHandle(object):
+    """Tracks a single iteration executed by a WorkerThreadPool thread.
+
+    The iteration (not the whole thread) is interrupted by terminate() if
+    it is still running.
+    """
+
+    def __init__(self):
+        self.ident = threading.current_thread().ident
+        self.lock = threading.Lock()
+        self.running = True
+        self.terminated = False
+
+    def terminate(self):
+        with self.lock:
+            if self.running:
+                LOG.info("Thread %s is timed out. Terminating." % self.ident)
+                rutils.terminate_thread(self.ident)
+                self.terminated = True
+
+    def finish(self):
+        while True:
+            try:
+                with self.lock:
+                    self.running = False
+                    if self.terminated:
+                        # NOTE: the iteration can finish between
+                        #   the moment of timeout and the delivery of
+                        #   ThreadTimeoutException. Drop such exception,
+                        #   otherwise it will kill the next iteration.
+                        rutils.terminate_thread(self.ident, exc_type=None)
+                return
+            except exceptions.ThreadTimeoutException:
+                # the pending exception was delivered right here
+                pass
+
+
+class WorkerThreadPool(object):
+    """Reusable pool of threads which execute scenario iterations.
+
+    The number of slots equals to the number of threads, so a dispatcher
+    which waits for a free slot is woken up as soon as one of the running
+    iterations is finished (there is no need to poll threads).
+
+    Threads are created lazily and live until join() is called.
+    """
+
+    def __init__(self, size, timeout=0):
+        """Init the pool.
+
+        :param size: maximum number of concurrently running iterations
+        :param timeout: an iteration is interrupted with
+            ThreadTimeoutException after `timeout` seconds, 0 means no
+            timeout
+        """
+        self.size = size
+        self.timeout = timeout
+        self._slots = threading.Semaphore(size)
+        self._tasks = Queue.Queue()
+        self._threads = []
+
+        if timeout:
+            self._timeout_queue = Queue.Queue()
+            self._timeout_thread = threading.Thread(
+                target=self._watch_timeouts)
+            self._timeout_thread.start()
+
+    def _watch_timeouts(self):
+        handles = collections.deque()
+        while True:
+            if handles:
+                wait = max(handles[0][1] - time.time(), 0)
+            else:
+                wait = None
+            try:
+                handle, deadline = self._timeout_queue.get(timeout=wait)
+            except Queue.Empty:
+                handles.popleft()[0].terminate()
+                continue
+            if handle is None:
+                return
+            handles.append((handle, deadline))
+
+    def _run(self):
+        current = {"handle": None, "on_done": None}
+        while True:
+            try:
+                return self._serve(current)
+            except exceptions.ThreadTimeoutException:
+                # NOTE: the exception of a timed out iteration can be
+                #   delivered outside of the iteration itself (e.g. right
+                #   after it has returned). The iteration is finished and
+                #   its slot is released by the next _serve() call.
+                pass
+
+    def _serve(self, current):
+        while True:
+            if current["handle"] is not None:
+                # NOTE: no exception can be delivered to the thread after
+                #   finish() returns, so the slot is released exactly once
+                current["handle"].finish()
+                current["handle"] = None
+                self._slots.release()
+                if current["on_done"] is not None:
+                    current["on_done"]()
+
+            task = self._tasks.get()
+            if task is None:
+                return
+            func, args, current["on_done"] = task
+            current["handle"] = _IterationHandle()
+            if self.timeout:
+                self._timeout_queue.put(
+                    (current["handle"], time.time() + self.timeout))
+            try:
+                func(*args)
+            except exceptions.ThreadTimeoutException:
+                # NOTE: an iteration is timed out while its result is
+                #   processed, the result is lost anyway.
+                LOG.warning("Iteration is interrupted due to timeout.")
+
+    def wait_for_free_slot(self):
+        """Block until one of iterations is finished (if there is no slot).
+
+        The acquired slot should be consumed by the next submit() call.
+        """
+        self._slots.acquire()
+
+    def release_slot(self):
+        """Release the slot acquired by wait_for_free_slot() unused."""
+        self._slots.release()
+
+    def submit(self, func, *args, **kwargs):
+        """Run func(*args) in one of threads of the pool.
+
+        The caller should acquire a slot via wait_for_free_slot() first.
+
+        :param on_done: optional callable which is called (without
+            arguments) by the thread after the iteration is finished (even
+            if it is timed out) and its slot is released
+        """
+        self._tasks.put((func, args, kwargs.get("on_done")))
+        if len(self._threads) < self.size:
+            thread = threading.Thread(target=self._run)
+            thread.start()
+            self._threads.append(thread)
+
+    def join(self):
+        """Wait until all submitted iterations are finished."""
+        for thread in self._threads:
+            self._tasks.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+        if self.timeout:
+            self._timeout_queue.put((None, None))
+            self._timeout_thread.join()
+
+
+class BatchedPipe(object):
+    """One-way channel which transfers objects from worker processes.
+
+    It is a replacement of multiprocessing.Queue for results and events of
+    iterations. Objects put by a worker process are buffered and sent by
+    a background thread as compact binary frames (a pickled list of
+    objects per frame) as soon as `batch_size` objects are collected or
+    `flush_interval` seconds after the first object of a frame is put. So
+    a pipe write and a pickle call are shared by many iterations instead
+    of being made for each of them.
+
+    The parent process waits for frames with select() (see fileno()) and
+    reads them with receive(). Buffered objects of a worker process are
+    sent on its exit.
+
+    put() blocks while a full frame waits to be sent, so a worker process
+    holds at most two frames (the one which is written to the pipe and
+    the next one). If the parent process stops reading frames (e.g. while
+    its result queue is full), the pipe is filled and the iterations of
+    worker processes are paused as well.
+    """
+
+    def __init__(self, batch_size=1000, flush_interval=0.01):
+        """Init the channel.
+
+        :param batch_size: the number of objects which are sent without
+            waiting for flush_interval
+        :param flush_interval: maximum time (in seconds) an object waits
+            for other ones before sending
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._reader, self._writer = multiprocessing.Pipe(duplex=False)
+        # NOTE: frames of different processes should not interleave
+        self._write_lock = multiprocessing.Lock()
+        self._reset()
+        mp_util.register_after_fork(self, BatchedPipe._reset)
+
+    def __getstate__(self):
+        return (self.batch_size, self.flush_interval, self._reader,
+                self._writer, self._write_lock)
+
+    def __setstate__(self, state):
+        (self.batch_size, self.flush_interval, self._reader,
+         self._writer, self._write_lock) = state
+        self._reset()
+
+    def _reset(self):
+        # NOTE: the buffer and the sender thread belong to a process, so
+        #   they are reset in a child one (as multiprocessing.Queue does)
+        self._buffer = []
+        self._closed = False
+        lock = threading.Lock()
+        self._not_empty = threading.Condition(lock)
+        self._not_full = threading.Condition(lock)
+        self._sender = None
+
+    def _start_sender(self):
+        self._sender = threading.Thread(target=self._send_frames)
+        self._sender.daemon = True
+        self._sender.start()
+        # NOTE: the process of a worker exits right after its target
+        #   function returns, so the rest of objects is sent by a finalizer
+        #   (multiprocessing.Queue flushes its buffer in the same way)
+        mp_util.Finalize(None, self.close, exitpriority=10)
+
+    def _send_frames(self):
+        while True:
+            with self._not_empty:
+                while not self._buffer and not self._closed:
+                    self._not_empty.wait()
+                if len(self._buffer) < self.batch_size and not self._closed:
+                    self._not_empty.wait(self.flush_interval)
+                objects, self._buffer = self._buffer, []
+                closed = self._closed
+                self._not_full.notify_all()
+            if objects:
+                frame = pickle.dumps(objects, pickle.HIGHEST_PROTOCOL)
+                with self._write_lock:
+                    self._writer.send_bytes(frame)
+            if closed:
+                return
+
+    def put(self, obj):
+        """Send the object to the parent process (in a worker process).
+
+        Blocks while the buffer holds a full frame which is not sent yet.
+        """
+        with self._not_empty:
+            if self._sender is None:
+                self._start_sender()
+            while len(self._buffer) >= self.batch_size:
+                self._not_full.wait()
+            self._buffer.append(obj)
+            if len(self._buffer) in (1, self.batch_size):
+                self._not_empty.notify()
+
+    def close(self):
+        """Send the buffered objects and close the pipe in this process."""
+        if self._sender is not None:
+            with self._not_empty:
+                self._closed = True
+                self._not_empty.notify()
+            self._sender.join()
+            self._sender = None
+        self._reader.close()
+        self._writer.close()
+
+    def fileno(self):
+        """Return the descriptor which is readable when a frame arrives."""
+        return self._reader.fileno()
+
+    def receive(self):
+        """Return objects of all the frames which are already arrived."""
+        objects = []
+        while self._reader.poll():
+            objects.extend(pickle.loads(self._reader.recv_bytes()))
+        return objects
+
+
+class ResultQueue(collections.deque):
+    """Queue of result batches sent by a runner to ResultConsumer.
+
+    Results are "pending" since a runner sends them and until a consumer
+    reports that they are stored (see release()). If a limit of pending
+    results is set, append() blocks the runner while the limit is exceeded,
+    so a slow storage of results pauses the load instead of accumulating
+    results in memory.
+    """
+
+    def __init__(self, batches=()):
+        super(ResultQueue, self).__init__(batches)
+        self.max_pending = None
+        self.pending = sum(len(batch) for batch in self)
+        self._changed = threading.Condition()
+
+    def set_limit(self, max_pending):
+        """Set the maximum number of pending results (None means no limit)."""
+        with self._changed:
+            self.max_pending = max_pending
+            self._changed.notify_all()
+
+    def append(self, batch):
+        with self._changed:
+            while self.max_pending and self.pending >= self.max_pending:
+                self._changed.wait()
+            super(ResultQueue, self).append(batch)
+            self.pending += len(batch)
+            self._changed.notify_all()
+
+    def release(self, count):
+        """Report that `count` results are stored by a consumer."""
+        with self._changed:
+            self.pending -= count
+            self._changed.notify_all()
+
+    def wait(self, timeout):
+        """Wait for a batch (at most `timeout` seconds).
+
+        :returns: True if there is a batch in the queue
+        """
+        with self._changed:
+            if not self:
+                self._changed.wait(timeout)
+            return bool(self)
+
+
+class ResultBatch(list):
+    """Batch of iteration results which are already checked by SLA.
+
+    Runners which are able to check SLA criteria somewhere else (e.g. on
+    remote workers) send results in such batches, so ResultConsumer merges
+    the attached SLA checker instead of checking each iteration again.
+    """
+
+    def __init__(self, results, sla_checker):
+        super(ResultBatch, self).__init__(results)
+        self.sla_checker = sla_checker
+
+
 @validation.add_default("jsonschema")
 @plugin.base()
 @six.add_metaclass(abc.ABCMeta)
@@ -137,7 +516,7 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
         """
         self.task = task
         self.config = config
-        self.result_queue = collections.deque()
+        self.result_queue = ResultQueue()
         self.event_queue = collections.deque()
         self.aborted = multiprocessing.Event()
         self.run_duration = 0
@@ -163,6 +542,9 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
 
         # NOTE(boris-42): processing @types decorators
         args = types.preprocess(name, context, args)
+        # NOTE: the context is frozen once, so iterations get views of it
+        #   instead of deep copies
+        context = rutils.LockedDict(context)
 
         with rutils.Timer() as timer:
             # TODO(boris-42): remove method_name argument, now it's always run
@@ -197,13 +579,51 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
 
         return process_pool
 
-    def _join_processes(self, process_pool, result_queue, event_queue):
+    JOIN_POLL_INTERVAL = 0.1
+
+    def _join_processes(self, process_pool, result_queue, event_queue,
+                        validate_results=True):
         """Join the processes in the pool and send their results to the queue.
 
+        multiprocessing.Queue objects are accepted as well, but they are
+        polled and transfer each object separately, so BatchedPipe should
+        be used instead.
+
         :param process_pool: pool of processes to join
-        :param result_queue: multiprocessing.Queue that receives the results
-        :param event_queue: multiprocessing.Queue that receives the events
+        :param result_queue: BatchedPipe that receives the results
+        :param event_queue: BatchedPipe that receives the events
+        :param validate_results: whether to check the schema of each result.
+            Results composed by _run_scenario_once() are valid by
+            construction, so runners which send only them can skip it
         """
+        if not (hasattr(result_queue, "receive")
+                and hasattr(event_queue, "receive")):
+            return self._poll_queues(process_pool, result_queue, event_queue)
+
+        while process_pool:
+            while process_pool and not process_pool[0].is_alive():
+                process_pool.popleft().join()
+
+            # NOTE: block until frames arrive instead of polling, the timeout
+            #   is only needed to notice finished processes
+            select.select([result_queue, event_queue], [], [],
+                          self.JOIN_POLL_INTERVAL)
+            self._receive(result_queue, event_queue, validate_results)
+
+        # processes send the rest of objects on exit
+        self._receive(result_queue, event_queue, validate_results)
+        self._flush_results()
+        result_queue.close()
+        event_queue.close()
+
+    def _receive(self, result_queue, event_queue, validate_results):
+        for event in event_queue.receive():
+            self.send_event(**event)
+        results = result_queue.receive()
+        if results:
+            self._send_results(results, validate=validate_results)
+
+    def _poll_queues(self, process_pool, result_queue, event_queue):
         while process_pool:
             while process_pool and not process_pool[0].is_alive():
                 process_pool.popleft().join()
@@ -224,7 +644,8 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
 
     def _flush_results(self):
         if self.result_batch:
-            sorted_batch = sorted(self.result_batch)
+            sorted_batch = sorted(self.result_batch,
+                                  key=lambda r: r["timestamp"])
             self.result_queue.append(sorted_batch)
             del self.result_batch[:]
 
@@ -254,7 +675,7 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
                        "proper_type": proper_type.__name__})
                 return False
 
-        actions_list = copy.deepcopy(result["atomic_actions"])
+        actions_list = list(result["atomic_actions"])
         for action in actions_list:
             for key in ("name", "started_at", "finished_at", "children"):
                 if key not in action:
@@ -316,21 +737,42 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
                        ScenarioRunnerResult schema, otherwise
                        ValidationError is raised.
         """
+        self._send_results([result])
 
-        if not self._result_has_valid_schema(result):
-            LOG.warning(
-                "Task %(task)s | Runner `%(runner)s` is trying to send "
-                "results in wrong format"
-                % {"task": self.task["uuid"], "runner": self.get_name()})
-            return
+    def _send_results(self, results, validate=True):
+        """Store several partial results to send them to consumer later.
 
-        self.result_batch.append(result)
+        Results which are received together (e.g. in a single frame from a
+        worker process) are sent to consumer in one batch.
 
-        if len(self.result_batch) >= self.batch_size:
-            sorted_batch = sorted(self.result_batch,
-                                  key=lambda r: result["timestamp"])
-            self.result_queue.append(sorted_batch)
-            del self.result_batch[:]
+        :param results: list of result dicts (see _send_result)
+        :param validate: whether to check the schema of each result
+        """
+        if not validate:
+            self.result_batch.extend(results)
+            results = ()
+        for result in results:
+            if not self._result_has_valid_schema(result):
+                LOG.warning(
+                    "Task %(task)s | Runner `%(runner)s` is trying to send "
+                    "results in wrong format"
+                    % {"task": self.task["uuid"], "runner": self.get_name()})
+                continue
+            self.result_batch.append(result)
+
+        if self.result_batch and len(self.result_batch) >= self.batch_size:
+            self._flush_results()
+
+    def _send_checked_results(self, results, sla_checker):
+        """Send a batch of results which are already checked by SLA.
+
+        :param results: list of results dicts
+        :param sla_checker: rally.task.sla.SLAChecker with all the results
+                            added
+        """
+        self._flush_results()
+        self.result_queue.append(ResultBatch(
+            sorted(results, key=lambda r: r["timestamp"]), sla_checker))
 
     def send_event(self, type, value=None):
         """Store event to send it to consumer later.
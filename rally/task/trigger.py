@@ -14,6 +14,7 @@
 #    under the License.
 
 import abc
+import math
 
 import six
 
@@ -40,12 +41,32 @@ class Trigger(plugin.Plugin, validation.ValidatablePluginMixin):
         self.config = self.context["trigger"]["args"]
         self.task = task
         self.hook_cls = hook_cls
+        # timestamp the next hook is expected to start at, it is set by
+        # HookExecutor before the trigger is notified of an event
+        self.scheduled_at = None
         self._runs = []
 
     @abc.abstractmethod
     def get_listening_event(self):
         """Returns event type to listen."""
 
+    def get_next_value(self, last_value=None):
+        """Returns the next value of the event to notify the trigger at.
+
+        HookExecutor notifies the trigger only of the values returned by
+        this method, so triggers which know their values in advance should
+        override it. By default the trigger is notified of each iteration
+        and of each second.
+
+        :param last_value: the value the trigger was notified of last time,
+            None if it was not notified yet
+        :returns: the value which is greater than last_value or None if the
+            trigger should not be notified anymore
+        """
+        if last_value is None:
+            return 1 if self.get_listening_event() == "iteration" else 0
+        return int(math.floor(last_value)) + 1
+
     def on_event(self, event_type, value=None):
         """Launch hook on specified event."""
         LOG.info(_("Hook %s is triggered for Task %s by %s=%s")
@@ -53,7 +74,7 @@ class Trigger(plugin.Plugin, validation.ValidatablePluginMixin):
                     event_type, value))
         hook = self.hook_cls(self.task, self.context.get("args", {}),
                              {"event_type": event_type, "value": value})
-        hook.run_async()
+        hook.run_async(scheduled_at=self.scheduled_at)
         self._runs.append(hook)
 
     def get_results(self):
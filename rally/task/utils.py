@@ -15,6 +15,8 @@
 
 import collections
 import itertools
+import os
+import threading
 import time
 import traceback
 
@@ -26,6 +28,7 @@ from rally.common.i18n import _
 from rally.common import logging
 from rally import consts
 from rally import exceptions
+from rally.task import atomic
 
 
 LOG = logging.getLogger(__name__)
@@ -92,6 +95,9 @@ def get_from_manager(error_statuses=None):
 
         return res
 
+    # NOTE: statuses of resources can be checked by list calls of managers
+    #   in the background, see StatusPoller
+    _get_from_manager.supports_batching = True
     return _get_from_manager
 
 
@@ -173,10 +179,204 @@ def wait_is_ready(resource, is_ready, update_resource=None,
                 resource_status=get_status(resource))
 
 
+class _Watch(object):
+    """A resource which is watched by StatusPoller."""
+
+    def __init__(self, resource, status, status_attr, check_interval):
+        self.resource_id = resource.id
+        self.status = status
+        self.status_attr = status_attr
+        self.check_interval = check_interval
+        self.started_at = time.time()
+        # NOTE: the time when the resource was listed with the status last
+        self.seen_at = None
+        self.event = threading.Event()
+
+
+class _PollGroup(object):
+    """Watches of resources which are listed by the same call."""
+
+    def __init__(self, manager, interval):
+        self.manager = manager
+        self.watches = set()
+        self.interval = interval
+        self.next_poll_at = time.time() + interval
+
+
+class StatusPoller(object):
+    """Polls statuses of resources for wait_for_status in the background.
+
+    Resources are grouped by types of their managers and keystone sessions
+    of clients (sessions are shared by clients of the same user, see
+    rally.osclients.SessionPool), and statuses of all the resources of
+    a group are got by one list call. A thread which waits for a resource
+    is woken when the listed status differs from the one it has seen or
+    when the resource disappears from the list, and then the thread gets
+    the resource itself. Resources which have never been listed (e.g. ones
+    which do not fit into the first page) are woken every check interval,
+    like without the poller.
+
+    Groups are polled with an adaptive interval. It starts from a fraction
+    of the smallest check interval of the watches of the group, grows while
+    nothing changes and never exceeds that check interval.
+    """
+
+    START_INTERVAL_RATIO = 0.2
+    BACKOFF_FACTOR = 1.5
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._lock = threading.Condition()
+        self._groups = {}
+        self._unlistable = set()
+        self._thread = None
+
+    def _check_pid(self):
+        # NOTE: the polling thread does not exist in forked processes and
+        #   the lock can be copied while held by it
+        if self._pid != os.getpid():
+            self._reset()
+
+    @staticmethod
+    def _get_group_key(manager):
+        client = getattr(getattr(manager, "api", None), "client", None)
+        session = getattr(client, "session", None)
+        return type(manager), session if session is not None else manager
+
+    def wait(self, resource, status, status_attr, check_interval, timeout):
+        """Wait until the status of the resource may have changed.
+
+        :param resource: the resource which has a manager
+        :param status: the current status of the resource
+        :param status_attr: the name of the status attribute of the resource
+        :param check_interval: the maximum interval between checks of
+            the resource
+        :param timeout: the maximum time to wait for
+        :returns: the time when the resource was listed with the status
+            last or None if it was not listed
+        """
+        self._check_pid()
+        if type(resource.manager) in self._unlistable:
+            time.sleep(min(check_interval, timeout))
+            return None
+
+        watch = _Watch(resource, status, status_attr, check_interval)
+        key = self._get_group_key(resource.manager)
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _PollGroup(
+                    resource.manager,
+                    check_interval * self.START_INTERVAL_RATIO)
+            elif group.interval > check_interval:
+                group.interval = check_interval
+                group.next_poll_at = min(group.next_poll_at,
+                                         watch.started_at + check_interval)
+            group.watches.add(watch)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+            self._lock.notify()
+        try:
+            watch.event.wait(timeout)
+        finally:
+            with self._lock:
+                group.watches.discard(watch)
+                if not group.watches and self._groups.get(key) is group:
+                    del self._groups[key]
+        return watch.seen_at
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._groups:
+                    self._thread = None
+                    return
+                now = time.time()
+                groups = [g for g in self._groups.values()
+                          if g.next_poll_at <= now]
+                if not groups:
+                    self._lock.wait(min(g.next_poll_at
+                                        for g in self._groups.values()) - now)
+                    continue
+                polls = [(g, list(g.watches)) for g in groups]
+            for group, watches in polls:
+                self._poll(group, watches)
+
+    def _poll(self, group, watches):
+        started_at = time.time()
+        try:
+            resources = dict((getattr(r, "id", None), r)
+                             for r in group.manager.list())
+        except Exception as e:
+            LOG.debug("Failed to list resources by %(manager)s, they are "
+                      "got one by one from now on: %(error)s"
+                      % {"manager": group.manager, "error": e})
+            with self._lock:
+                self._unlistable.add(type(group.manager))
+            for watch in watches:
+                watch.event.set()
+            return
+
+        changed = False
+        for watch in watches:
+            resource = resources.get(watch.resource_id)
+            if resource is None:
+                if watch.seen_at is not None:
+                    # NOTE: the resource has been deleted
+                    changed = True
+                elif started_at - watch.started_at < watch.check_interval:
+                    continue
+                watch.event.set()
+            elif get_status(resource, watch.status_attr) == watch.status:
+                watch.seen_at = started_at
+            else:
+                changed = True
+                watch.event.set()
+
+        with self._lock:
+            max_interval = min([w.check_interval for w in group.watches]
+                               or [group.interval])
+            if changed:
+                group.interval = max_interval * self.START_INTERVAL_RATIO
+            else:
+                group.interval = min(group.interval * self.BACKOFF_FACTOR,
+                                     max_interval)
+            group.next_poll_at = started_at + group.interval
+
+
+STATUS_POLLER = StatusPoller()
+
+
+def _is_batchable(resource, update_resource, id_attr):
+    return (getattr(update_resource, "supports_batching", False) is True
+            and id_attr == "id"
+            and hasattr(resource, "id")
+            and callable(getattr(getattr(resource, "manager", None),
+                                 "list", None)))
+
+
 def wait_for_status(resource, ready_statuses, failure_statuses=None,
                     status_attr="status", update_resource=None,
                     timeout=60, check_interval=1, check_deletion=False,
                     id_attr="id"):
+    """Wait for the resource to come into one of the ready statuses.
+
+    Resources which are got by get_from_manager are polled by STATUS_POLLER
+    in batches, other ones are got by update_resource every check_interval
+    seconds.
+
+    If the wait is called inside of an atomic action, the time between the
+    last check which saw the resource in a not ready status and the end
+    of the wait is added to it as the "wait_for_status.overhead" child.
+    The resource became ready somewhere within that time, so it is the
+    upper bound of the time which is added to the duration of the action
+    by polling.
+    """
 
     resource_repr = getattr(resource, "name", repr(resource))
     if not isinstance(ready_statuses, (set, list, tuple)):
@@ -208,7 +408,17 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
 
     latest_status = get_status(resource, status_attr)
     latest_status_update = start
+    batchable = _is_batchable(resource, update_resource, id_attr)
+    timer = atomic.get_active_timer()
+    pending_at = None
+
+    def report_overhead():
+        if timer is not None and pending_at is not None:
+            atomic.add_atomic_action(timer.instance,
+                                     "wait_for_status.overhead",
+                                     pending_at, time.time())
 
+    checked_at = start
     while True:
         try:
             if id_attr == "id":
@@ -217,6 +427,7 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
                 resource = update_resource(resource, id_attr=id_attr)
         except exceptions.GetResourceNotFound:
             if check_deletion:
+                report_overhead()
                 return
             else:
                 raise
@@ -235,6 +446,7 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
             latest_status_update = current_time
 
         if status in ready_statuses:
+            report_overhead()
             return resource
         if status in failure_statuses:
             raise exceptions.GetResourceErrorStatus(
@@ -242,8 +454,16 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
                 status=status,
                 fault="Status in failure list %s" % str(failure_statuses))
 
-        time.sleep(check_interval)
-        if time.time() - start > timeout:
+        pending_at = checked_at
+        if batchable:
+            seen_at = STATUS_POLLER.wait(
+                resource, status, status_attr, check_interval,
+                max(start + timeout - time.time(), 0))
+            pending_at = seen_at or pending_at
+        else:
+            time.sleep(check_interval)
+        checked_at = time.time()
+        if checked_at - start > timeout:
             raise exceptions.TimeoutException(
                 desired_status="('%s')" % "', '".join(ready_statuses),
                 resource_name=resource_repr,
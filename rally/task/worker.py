@@ -0,0 +1,384 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Worker service which executes iterations of distributed workloads.
+
+The coordinator (the `distributed` runner) splits iterations of a workload
+into ranges and stores them as jobs in the database. Workers registered in
+the worker registry take pending jobs one by one, execute the iterations
+and store the results together with an SLA checker back to the database.
+
+Jobs and results are pickled, so they are authenticated with HMAC using
+the `distributed_secret_key` option: anybody who is able to write to the
+database is not able to make workers or the coordinator unpickle arbitrary
+data without the key.
+"""
+
+import hashlib
+import hmac
+import os
+import socket
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_db import api as oslo_db_api
+from oslo_db import exception as db_exc
+from oslo_utils import encodeutils
+from six.moves import cPickle as pickle
+from six.moves import queue as Queue
+
+from rally.common import db
+from rally.common import logging
+from rally import consts
+from rally import exceptions
+from rally.task import runner
+from rally.task import scenario
+from rally.task import sla
+from rally.task import utils
+
+
+LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+CONF.import_opt("distributed_secret_key", "rally.task.engine")
+
+# NOTE: the protocol which is supported by both Python 2 and Python 3 is
+#   used, so workers and coordinator can run on different interpreters
+PICKLE_PROTOCOL = 2
+
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+def _get_secret_key():
+    if not CONF.distributed_secret_key:
+        raise exceptions.InvalidConfigException(
+            "The 'distributed_secret_key' option should be set to the same "
+            "value for Rally which starts tasks and for all the workers.")
+    return encodeutils.safe_encode(CONF.distributed_secret_key)
+
+
+def _dumps(obj):
+    key = _get_secret_key()
+    data = pickle.dumps(obj, PICKLE_PROTOCOL)
+    return hmac.new(key, data, hashlib.sha256).digest() + data
+
+
+def _loads(blob, job_uuid):
+    blob = bytes(blob)
+    digest, data = blob[:_DIGEST_SIZE], blob[_DIGEST_SIZE:]
+    expected = hmac.new(_get_secret_key(), data, hashlib.sha256).digest()
+    if not hmac.compare_digest(digest, expected):
+        raise exceptions.WorkerDataNotAuthenticated(job=job_uuid)
+    return pickle.loads(data)
+
+
+def dump_job(scenario_name, context, args, sla_config, concurrency, timeout):
+    """Serialize all the data which is required to execute iterations."""
+    return _dumps({"scenario_name": scenario_name,
+                   "context": context,
+                   "args": args,
+                   "sla": sla_config,
+                   "concurrency": concurrency,
+                   "timeout": timeout})
+
+
+def load_job(job):
+    """Deserialize the data which is required to execute iterations.
+
+    :param job: the job as it is returned by rally.common.db.worker_job_claim
+    :raises WorkerDataNotAuthenticated: if the data is not signed with
+        the configured key
+    """
+    return _loads(job["job"], job["uuid"])
+
+
+def dump_job_results(results, sla_checker):
+    """Serialize results of a job.
+
+    :param results: a list of iteration results
+    :param sla_checker: rally.task.sla.SLAChecker with all of them added or
+        None if the job is failed before its SLA config is loaded
+    """
+    return _dumps({"results": results, "sla": sla_checker})
+
+
+def load_job_results(job):
+    """Deserialize results of a job.
+
+    :param job: the job as it is returned by rally.common.db.worker_job_list
+        with results
+    :returns: a tuple with a list of iteration results and
+              rally.task.sla.SLAChecker with all of them added (or None)
+    :raises WorkerDataNotAuthenticated: if the results are not signed with
+        the configured key
+    """
+    results = _loads(job["results"], job["uuid"])
+    return results["results"], results["sla"]
+
+
+def get_failed_results(times, exc):
+    """Return results of iterations which are failed without being started.
+
+    :param times: the number of iterations
+    :param exc: the exception which prevents the iterations from starting
+    """
+    error = utils.format_exc(exc)
+    timestamp = time.time()
+    return [{"duration": 0.0, "idle_duration": 0.0, "timestamp": timestamp,
+             "error": error, "output": {"additive": [], "complete": []},
+             "atomic_actions": []} for i in range(times)]
+
+
+def get_default_hostname():
+    """Return a name which is unique for each worker process on a host."""
+    return "%s-%s" % (socket.gethostname(), os.getpid())
+
+
+class _EventQueue(object):
+    """Sink for iteration events.
+
+    The coordinator generates iteration events itself on receiving results,
+    so there is no need to transfer them from workers.
+    """
+
+    def put(self, event):
+        pass
+
+
+class _Job(object):
+    """Tracks iterations of a job which are executed by the worker."""
+
+    def __init__(self, job, data, cls):
+        self.uuid = job["uuid"]
+        self.first_iteration = job["first_iteration"]
+        self.times = job["times"]
+        self.workload_uuid = job["workload_uuid"]
+        self.data = data
+        self.cls = cls
+        self.results = Queue.Queue()
+        self.aborted = threading.Event()
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+        self._running = 0
+        self._dispatched = False
+
+    def iteration_started(self):
+        with self._lock:
+            self._running += 1
+
+    def iteration_finished(self):
+        with self._lock:
+            self._running -= 1
+            self._check_done()
+
+    def dispatched(self):
+        """Mark that no more iterations of the job are going to start."""
+        with self._lock:
+            self._dispatched = True
+            self._check_done()
+
+    def _check_done(self):
+        if self._dispatched and not self._running:
+            self.done.set()
+
+
+class Worker(object):
+    """Executes jobs of distributed workloads.
+
+    Iterations of all the jobs are executed by the same pool of threads (as
+    long as jobs have the same concurrency and timeout), so the next job is
+    claimed and started as soon as all the iterations of the current one
+    are started, while the results of the current job are stored by
+    a separate thread when all its iterations are finished.
+    """
+
+    def __init__(self, hostname=None, poll_interval=1.0):
+        """Worker constructor.
+
+        :param hostname: unique name of the worker in the worker registry
+        :param poll_interval: how often to look for new jobs and to report
+                              the worker as an alive one (in seconds)
+        """
+        self.hostname = hostname or get_default_hostname()
+        self.poll_interval = poll_interval
+        self.stopped = threading.Event()
+        self._pool = None
+        self._pool_config = None
+        self._watchers = []
+
+    def stop(self):
+        """Stop the worker after the current job."""
+        self.stopped.set()
+
+    def run(self, max_jobs=None):
+        """Register the worker and execute jobs until it is stopped.
+
+        :param max_jobs: stop the worker after executing such number of jobs
+        """
+        _get_secret_key()
+        db.register_worker({"hostname": self.hostname})
+        LOG.info("Worker %s is started." % self.hostname)
+        jobs_count = 0
+        try:
+            while not self.stopped.is_set():
+                try:
+                    job = db.worker_job_claim(self.hostname)
+                    if job is None:
+                        db.update_worker(self.hostname)
+                except db_exc.DBError as e:
+                    LOG.warning("Failed to look for new jobs: %s" % e)
+                    job = None
+                if job is None:
+                    self.stopped.wait(self.poll_interval)
+                    continue
+                self._execute(job)
+                jobs_count += 1
+                if max_jobs and jobs_count >= max_jobs:
+                    break
+        finally:
+            if self._pool is not None:
+                self._pool.join()
+                self._pool = None
+            for watcher in self._watchers:
+                watcher.join()
+            db.unregister_worker(self.hostname)
+            LOG.info("Worker %s is stopped." % self.hostname)
+
+    def _get_pool(self, concurrency, timeout):
+        if self._pool_config != (concurrency, timeout):
+            if self._pool is not None:
+                self._pool.join()
+            self._pool = runner.WorkerThreadPool(concurrency,
+                                                 timeout=timeout)
+            self._pool_config = (concurrency, timeout)
+        return self._pool
+
+    def _execute(self, job):
+        """Start the range of iterations.
+
+        The method returns as soon as all the iterations are started, the
+        results are stored by the thread which watches the job.
+        """
+        try:
+            data = load_job(job)
+            cls = scenario.Scenario.get(data["scenario_name"])
+        except Exception as e:
+            LOG.exception("Worker %(hostname)s | Job %(job)s can not be "
+                          "executed." % {"hostname": self.hostname,
+                                         "job": job["uuid"]})
+            self._store_results(job["uuid"],
+                                get_failed_results(job["times"], e), None)
+            return
+
+        LOG.info("Worker %(hostname)s | Job %(job)s: iterations %(first)s-"
+                 "%(last)s of workload %(workload)s." %
+                 {"hostname": self.hostname, "job": job["uuid"],
+                  "first": job["first_iteration"] + 1,
+                  "last": job["first_iteration"] + job["times"],
+                  "workload": job["workload_uuid"]})
+
+        worker_job = _Job(job, data, cls)
+        self._watchers = [w for w in self._watchers if w.is_alive()]
+        watcher = threading.Thread(target=self._watch_job,
+                                   args=(worker_job,))
+        watcher.start()
+        self._watchers.append(watcher)
+
+        pool = self._get_pool(data["concurrency"], data["timeout"])
+        event_queue = _EventQueue()
+        try:
+            for i in range(worker_job.first_iteration,
+                           worker_job.first_iteration + worker_job.times):
+                if worker_job.aborted.is_set():
+                    break
+                pool.wait_for_free_slot()
+                if worker_job.aborted.is_set():
+                    pool.release_slot()
+                    break
+                scenario_context = runner._get_scenario_context(
+                    i, data["context"])
+                worker_job.iteration_started()
+                pool.submit(runner._worker_thread, worker_job.results, cls,
+                            "run", scenario_context, data["args"],
+                            event_queue,
+                            on_done=worker_job.iteration_finished)
+        finally:
+            worker_job.dispatched()
+
+    def _watch_job(self, job):
+        """Report that the worker is alive and store results of the job.
+
+        The job is marked as aborted if it is aborted by the coordinator or
+        is handed to another worker.
+
+        :param job: _Job instance
+        """
+        while not job.done.wait(self.poll_interval):
+            try:
+                db.update_worker(self.hostname)
+            except Exception as e:
+                LOG.warning("Failed to report worker %(hostname)s as an "
+                            "alive one: %(error)s"
+                            % {"hostname": self.hostname, "error": e})
+            if job.aborted.is_set():
+                continue
+            try:
+                job_info = db.worker_job_get(job.uuid)
+            except exceptions.ResourceNotFound:
+                job_info = None
+            except db_exc.DBError as e:
+                LOG.warning("Failed to check the state of job %(job)s: "
+                            "%(error)s" % {"job": job.uuid, "error": e})
+                continue
+            if (job_info is None or job_info["hostname"] != self.hostname
+                    or job_info["status"] == consts.WorkerJobStatus.ABORTED):
+                LOG.info("Job %s is aborted." % job.uuid)
+                job.aborted.set()
+
+        job_results = []
+        while not job.results.empty():
+            job_results.append(job.results.get())
+        try:
+            sla_checker = sla.SLAChecker({"sla": job.data["sla"]})
+            for result in job_results:
+                sla_checker.add_iteration(result)
+        except Exception:
+            LOG.exception("Failed to check SLA of job %s, it is left to "
+                          "the coordinator." % job.uuid)
+            sla_checker = None
+        self._store_results(job.uuid, job_results, sla_checker)
+
+    def _store_results(self, job_uuid, results, sla_checker):
+        try:
+            stored = self._finish_job(job_uuid, results, sla_checker)
+        except Exception:
+            LOG.exception("Failed to store results of job %s." % job_uuid)
+            # NOTE: let another worker execute the job from scratch
+            try:
+                db.worker_job_release(job_uuid, self.hostname)
+            except Exception:
+                LOG.exception("Failed to release job %s." % job_uuid)
+            return
+        if not stored:
+            LOG.warning("Results of job %s are dropped since it is handed "
+                        "to another worker." % job_uuid)
+
+    @oslo_db_api.wrap_db_retry(
+        max_retries=10, retry_interval=0.1,
+        exception_checker=lambda e: isinstance(e, db_exc.DBError))
+    def _finish_job(self, job_uuid, results, sla_checker):
+        # NOTE: results are lost if they are not stored, so storing is
+        #   retried in case of concurrent access errors (e.g. SQLite locks)
+        return db.worker_job_finish(job_uuid, self.hostname,
+                                    dump_job_results(results, sla_checker))
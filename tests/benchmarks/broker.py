@@ -0,0 +1,91 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the broker of bulk operations.
+
+The publisher lists resources page by page (like SeekAndDestroy lists
+resources of each tenant) and consumers delete them one by one, each list
+and delete call takes the given time. The resources are deleted by the
+broker which consumes resources while they are listed and by the broker
+which lists all the resources first (as the broker did before). The time of
+the whole run is printed for both of them, and for the streaming broker
+limited by the given rate.
+
+Usage:
+
+    $ python -m tests.benchmarks.broker --pages 20 --page-size 50
+"""
+
+from __future__ import print_function
+
+import argparse
+import sys
+import time
+
+from rally.common import broker
+
+
+def run(pages, page_size, latency, workers, list_first=False,
+        rate_limiter=None):
+
+    def publish(queue):
+        listed = []
+        for page in range(pages):
+            time.sleep(latency)
+            listed.extend(range(page * page_size, (page + 1) * page_size))
+            if not list_first:
+                for resource in listed:
+                    queue.append(resource)
+                listed = []
+        for resource in listed:
+            queue.append(resource)
+
+    def consume(cache, resource):
+        time.sleep(latency)
+
+    started_at = time.time()
+    stats = broker.run(publish, consume, workers, rate_limiter=rate_limiter)
+    assert stats["consumed"] == pages * page_size
+    return time.time() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the time of bulk deletion of resources by the "
+                    "broker which streams them and the one which lists "
+                    "them first.")
+    parser.add_argument("--pages", type=int, default=20,
+                        help="number of pages of resources")
+    parser.add_argument("--page-size", type=int, default=50,
+                        help="number of resources in a page")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="duration of each API call")
+    parser.add_argument("--workers", type=int, default=20,
+                        help="number of consumers")
+    parser.add_argument("--rate", type=float, default=200,
+                        help="rate limit of deletions per second")
+    args = parser.parse_args()
+
+    steps = [("list first", {"list_first": True}),
+             ("streaming", {}),
+             ("streaming, %g/s" % args.rate,
+              {"rate_limiter": broker.TokenBucket(args.rate)})]
+    for name, kwargs in steps:
+        print("%-24s %8.2f s" % (name, run(args.pages, args.page_size,
+                                           args.latency, args.workers,
+                                           **kwargs)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the deletion of resources by the cleanup.
+
+SeekAndDestroy deletes the given number of resources of a fake service
+which disappear after a random delay. Each API call takes the given time.
+The resources are deleted by exterminate() (consumers send deletion
+requests and the DeletionWatcher confirms them in bulk) and by consumers
+which wait for deletion of each resource (as they did before the watcher
+was introduced). The time of the cleanup and the number of API calls are
+printed.
+
+Usage:
+
+    $ python -m tests.benchmarks.cleanup_deletion --resources 500
+"""
+
+from __future__ import print_function
+
+import argparse
+import collections
+import random
+import sys
+import threading
+import time
+
+from rally.common import broker
+from rally.plugins.openstack.cleanup import base
+from rally.plugins.openstack.cleanup import manager
+
+
+class Resource(object):
+
+    def __init__(self, id):
+        self.id = id
+        self.status = "ACTIVE"
+        self.deleted_at = None
+
+
+class Service(object):
+
+    def __init__(self, count, latency):
+        self.latency = latency
+        self.calls = collections.Counter()
+        self.resources = dict((i, Resource(i)) for i in range(count))
+        self._lock = threading.Lock()
+
+    def _call(self, name):
+        with self._lock:
+            self.calls[name] += 1
+        time.sleep(self.latency)
+
+    def _alive(self):
+        now = time.time()
+        return [r for r in list(self.resources.values())
+                if r.deleted_at is None or r.deleted_at > now]
+
+    def list(self):
+        self._call("list")
+        return self._alive()
+
+    def get(self, resource_id):
+        self._call("get")
+        resource = self.resources[resource_id]
+        if resource.deleted_at is not None and resource.deleted_at <= (
+                time.time()):
+            raise type("NotFound", (Exception,), {"code": 404})()
+        return resource
+
+    def delete(self, resource_id):
+        self._call("delete")
+        self.resources[resource_id].deleted_at = (
+            time.time() + random.uniform(1, 3))
+
+
+def run(count, latency, threads, watcher):
+    service = Service(count, latency)
+
+    @base.resource("benchmark", "resources", interval=1, threads=threads)
+    class BenchmarkResource(base.ResourceManager):
+        def _manager(self):
+            return service
+
+        def name(self):
+            return base.NoName(self._resource)
+
+    destroyer = manager.SeekAndDestroy(BenchmarkResource, {"id": "admin"},
+                                       None)
+    destroyer._get_cached_client = lambda user: user and "client"
+    started_at = time.time()
+    if watcher:
+        destroyer.exterminate()
+    else:
+        broker.run(destroyer._publisher, destroyer._consumer, threads)
+    assert not service._alive()
+    return time.time() - started_at, service.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the time of the cleanup and the number of API "
+                    "calls with and without the deletion watcher.")
+    parser.add_argument("--resources", type=int, default=500,
+                        help="number of resources to delete")
+    parser.add_argument("--latency", type=float, default=0.01,
+                        help="duration of an API call")
+    parser.add_argument("--threads", type=int, default=20,
+                        help="number of cleanup threads")
+    args = parser.parse_args()
+
+    print("%-12s %10s %8s %8s %8s" % ("", "time, s", "deletes", "gets",
+                                      "lists"))
+    for name, watcher in (("watcher", True), ("blocking", False)):
+        duration, calls = run(args.resources, args.latency, args.threads,
+                              watcher)
+        print("%-12s %10.2f %8d %8d %8d" % (name, duration, calls["delete"],
+                                            calls["get"], calls["list"]))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the startup time of the CLI.
+
+Each step is measured in a new interpreter, since modules which are already
+imported are not imported again. The HOME environment variable points to a
+temporary directory, so the manifest of plugins is created from scratch.
+The steps are:
+
+* importing the CLI (what read-only commands like `rally task list` do);
+* importing the CLI and loading all the plugins at once;
+* the same with lazy loading of plugins when there is no manifest yet (the
+  manifest is written at this step);
+* the same with lazy loading of plugins when the manifest exists.
+
+For the loading steps a couple of plugins are also looked up, like
+`rally task export` and `rally task start` do.
+
+Usage:
+
+    $ python -m tests.benchmarks.cli_startup --repeat 5
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+IMPORT_CLI = "import rally.cli.main"
+
+LOAD_PLUGINS = """
+import rally.cli.main
+from rally import plugins
+from rally.task import exporter
+from rally.task import scenario
+
+plugins.load(lazy=%s)
+exporter.TaskExporter.get("html")
+scenario.Scenario.get("Dummy.dummy")
+"""
+
+
+def measure(code, env, repeat):
+    spent = []
+    for i in range(repeat):
+        started_at = time.time()
+        subprocess.check_call([sys.executable, "-c", code], env=env,
+                              stderr=open(os.devnull, "w"))
+        spent.append(time.time() - started_at)
+    return min(spent)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the startup time of the CLI with loading of "
+                    "plugins at once and on demand.")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="number of runs of each step (the best one is "
+                             "printed)")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp()
+    env = dict(os.environ, HOME=home,
+               PYTHONPATH=os.pathsep.join(sys.path))
+    try:
+        steps = [("import CLI", IMPORT_CLI, args.repeat),
+                 ("load all plugins", LOAD_PLUGINS % False, args.repeat),
+                 ("lazy, no manifest", LOAD_PLUGINS % True, 1),
+                 ("lazy, with manifest", LOAD_PLUGINS % True, args.repeat)]
+        for name, code, repeat in steps:
+            print("%-24s %8.2f s" % (name, measure(code, env, repeat)))
+    finally:
+        shutil.rmtree(home)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
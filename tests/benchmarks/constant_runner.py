@@ -0,0 +1,104 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Micro-benchmark of the iterations dispatcher of the constant runner.
+
+It runs Dummy.dummy via a single constant runner worker process and prints
+CPU usage of the worker and the start latency of iterations, i.e. how long
+an iteration waits for dispatching after a concurrency slot is freed.
+
+Usage:
+
+    $ python -m tests.benchmarks.constant_runner --times 5000 \\
+        --concurrency 200 --sleep 0.05
+"""
+
+from __future__ import print_function
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+from six.moves import queue as Queue
+
+from rally.common import utils
+from rally.plugins.common.runners import constant
+from rally.plugins.common.scenarios.dummy import dummy
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(int(len(values) * percent / 100.0), len(values) - 1)]
+
+
+def run(times, concurrency, sleep):
+    result_queue = Queue.Queue()
+    context = {"task": {"uuid": "benchmark"}}
+
+    cpu_before = sum(os.times()[:2])
+    started_at = time.time()
+    constant._worker_process(
+        result_queue, utils.RAMInt(), 0, concurrency, times, context,
+        dummy.Dummy, "run", {"sleep": sleep}, Queue.Queue(),
+        multiprocessing.Event(),
+        info={"processes_to_start": 1, "processes_counter": 0})
+    wall_time = time.time() - started_at
+    cpu_time = sum(os.times()[:2]) - cpu_before
+
+    results = [result_queue.get() for i in range(result_queue.qsize())]
+    starts = sorted(r["timestamp"] for r in results)
+    finishes = sorted(r["timestamp"] + r["duration"] + r["idle_duration"]
+                      for r in results)
+    # the i-th iteration takes the slot released by the (i - concurrency)-th
+    # finished iteration
+    latencies = [starts[i] - finishes[i - concurrency]
+                 for i in range(concurrency, len(starts))]
+    return {"iterations": len(results),
+            "wall_time": wall_time,
+            "cpu_time": cpu_time,
+            "latencies": latencies}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure CPU usage and start latency jitter of the "
+                    "constant runner dispatcher.")
+    parser.add_argument("--times", type=int, default=2000,
+                        help="total number of iterations")
+    parser.add_argument("--concurrency", type=int, default=100,
+                        help="number of concurrent iterations")
+    parser.add_argument("--sleep", type=float, default=0.05,
+                        help="sleep argument of Dummy.dummy")
+    args = parser.parse_args()
+
+    stats = run(args.times, args.concurrency, args.sleep)
+    latencies = stats["latencies"] or [0]
+    mean = sum(latencies) / len(latencies)
+    stdev = (sum((x - mean) ** 2 for x in latencies) / len(latencies)) ** 0.5
+
+    print("iterations:          %d" % stats["iterations"])
+    print("wall time:           %.3f s" % stats["wall_time"])
+    print("worker CPU usage:    %.1f %%"
+          % (100.0 * stats["cpu_time"] / stats["wall_time"]))
+    print("start latency mean:  %.3f ms" % (mean * 1000))
+    print("start latency 95%%:   %.3f ms"
+          % (_percentile(latencies, 95) * 1000))
+    print("start latency max:   %.3f ms" % (max(latencies) * 1000))
+    print("start latency stdev: %.3f ms" % (stdev * 1000))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
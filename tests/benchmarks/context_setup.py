@@ -0,0 +1,84 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the setup and cleanup of contexts of a workload.
+
+Contexts are generated in groups of the given size, all contexts of a group
+have the same order. Setup and cleanup of each context sleep for the given
+time (like contexts which wait for the cloud do). The time of the setup and
+the cleanup of all contexts by ContextManager is printed for a few numbers
+of workers, one worker sets up contexts one by one (as ContextManager did
+before contexts were set up concurrently).
+
+Usage:
+
+    $ python -m tests.benchmarks.context_setup --groups 4 --group-size 3
+"""
+
+from __future__ import print_function
+
+import argparse
+import sys
+import time
+
+from rally.task import context
+
+
+def generate_contexts(groups, group_size, latency):
+    contexts = []
+    for i in range(groups * group_size):
+
+        def sleep(self):
+            time.sleep(latency)
+
+        cls = type("BenchmarkContext%d" % i, (context.Context,),
+                   {"setup": sleep, "cleanup": sleep})
+        contexts.append(context.configure(
+            name="benchmark_context_%d" % i, order=i // group_size)(cls))
+    return contexts
+
+
+def time_contexts(contexts, workers):
+    manager = context.ContextManager(
+        {"config": dict((ctx.get_name(), {}) for ctx in contexts)},
+        workers=workers)
+    started_at = time.time()
+    with manager:
+        pass
+    return time.time() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the time of the setup and the cleanup of "
+                    "contexts with different numbers of workers.")
+    parser.add_argument("--groups", type=int, default=4,
+                        help="number of different orders of contexts")
+    parser.add_argument("--group-size", type=int, default=3,
+                        help="number of contexts with the same order")
+    parser.add_argument("--latency", type=float, default=0.1,
+                        help="duration of the setup and the cleanup of "
+                             "each context")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                        help="numbers of workers of ContextManager")
+    args = parser.parse_args()
+
+    contexts = generate_contexts(args.groups, args.group_size, args.latency)
+    print("%8s %10s" % ("workers", "time, s"))
+    for workers in args.workers:
+        print("%8d %10.3f" % (workers, time_contexts(contexts, workers)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the scheduling of hooks.
+
+HookExecutor is created for the given numbers of periodic triggers of
+iterations with a no-op hook, each trigger fires once per the given number
+of iterations. The average time of an iteration event is printed for
+HookExecutor and for notification of every trigger of every event (as
+HookExecutor did before triggers were scheduled). Then periodic triggers
+of time with a sub-second step are run for a second and the average and
+maximum skew of the start of their hooks are printed.
+
+Usage:
+
+    $ python -m tests.benchmarks.hook_scheduler --triggers 10 100 1000
+"""
+
+from __future__ import print_function
+
+import argparse
+import sys
+import time
+
+from rally.plugins.common.trigger import periodic  # noqa
+from rally.task import hook
+
+
+@hook.configure(name="benchmark_noop_hook")
+class NoopHook(hook.Hook):
+
+    def run(self):
+        pass
+
+
+def make_config(count, unit, step):
+    return {"hooks": [
+        {"config": {"name": "benchmark_noop_hook", "args": {},
+                    "trigger": {"name": "periodic",
+                                "args": {"unit": unit, "step": step,
+                                         "end": step * 10}}}}
+        for i in range(count)]}
+
+
+def time_iterations(count, step, iterations, scan):
+    executor = hook.HookExecutor(make_config(count, "iteration", step),
+                                 {"uuid": "benchmark"})
+    started_at = time.time()
+    for i in range(1, iterations + 1):
+        if scan:
+            for trigger_obj in executor.triggers["iteration"]:
+                trigger_obj.on_event("iteration", i)
+        else:
+            executor.on_event("iteration", i)
+    duration = time.time() - started_at
+    executor.results()
+    return duration / iterations
+
+
+def measure_skew(count, step):
+    executor = hook.HookExecutor(make_config(count, "time", step),
+                                 {"uuid": "benchmark"})
+    executor.on_event("iteration", 1)
+    executor._timer_thread.join()
+    skews = [result["skew"] for trigger_results in executor.results()
+             for result in trigger_results["results"]]
+    return sum(skews) / len(skews), max(skews)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the cost of events of HookExecutor with and "
+                    "without scheduling of triggers and measure the skew "
+                    "of hooks of time triggers.")
+    parser.add_argument("--triggers", type=int, nargs="+",
+                        default=[10, 100, 1000],
+                        help="numbers of triggers")
+    parser.add_argument("--iterations", type=int, default=1000,
+                        help="number of iterations")
+    parser.add_argument("--step", type=int, default=100,
+                        help="step of periodic triggers of iterations")
+    parser.add_argument("--time-step", type=float, default=0.1,
+                        help="step of periodic triggers of time")
+    args = parser.parse_args()
+
+    print("%8s %14s %14s %14s %14s" % ("triggers", "scan, us",
+                                       "scheduled, us", "avg skew, ms",
+                                       "max skew, ms"))
+    for count in args.triggers:
+        scan = time_iterations(count, args.step, args.iterations, True)
+        scheduled = time_iterations(count, args.step, args.iterations,
+                                    False)
+        average, maximum = measure_skew(count, args.time_step)
+        print("%8d %14.1f %14.1f %14.2f %14.2f" % (
+            count, scan * 10 ** 6, scheduled * 10 ** 6, average * 10 ** 3,
+            maximum * 10 ** 3))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
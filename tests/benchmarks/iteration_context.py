@@ -0,0 +1,119 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the setup of contexts of iterations.
+
+Contexts which look like contexts created by the users and network context
+plugins are generated for a few numbers of users (two users per tenant).
+For each of them the average time of the setup of an iteration context is
+printed for the deep copy of the whole context (as runners did before) and
+for the copy-on-write view of the frozen context (as runners do now). The
+setup includes the choice of a user like OpenStackScenario does, so tenants
+are got from the context as well.
+
+Usage:
+
+    $ python -m tests.benchmarks.iteration_context --users 10 100 1000
+"""
+
+from __future__ import print_function
+
+import argparse
+import copy
+import sys
+import time
+
+from rally.common import utils
+from rally.plugins.openstack import credential
+from rally.task import runner
+
+
+def generate_context(users_count):
+    users = []
+    tenants = {}
+    for i in range(users_count):
+        tenant_id = "tenant_%d" % (i // 2)
+        user = {"id": "user_%d" % i, "tenant_id": tenant_id,
+                "keypair": {"name": "keypair_%d" % i},
+                "credential": credential.OpenStackCredential(
+                    "http://example.com:5000/v3", "user_%d" % i, "secret",
+                    tenant_name=tenant_id)}
+        users.append(user)
+        tenant = tenants.setdefault(
+            tenant_id, {"id": tenant_id, "name": tenant_id, "users": [],
+                        "networks": [{"id": "net_%s" % tenant_id,
+                                      "subnets": ["subnet_%s" % tenant_id],
+                                      "router_id": "router_%s" % tenant_id}]})
+        tenant["users"].append(user)
+    return {"owner_id": "workload", "scenario_name": "Dummy.openstack",
+            "scenario_namespace": "openstack", "task": None,
+            "admin": {"credential": credential.OpenStackCredential(
+                "http://example.com:5000/v3", "admin", "secret",
+                tenant_name="admin")},
+            "config": {"users": {"tenants": users_count // 2,
+                                 "users_per_tenant": 2},
+                       "network": {}},
+            "users": users, "tenants": tenants,
+            "user_choice_method": "round_robin"}
+
+
+def deepcopy_context(iteration, context_obj):
+    context_obj = copy.deepcopy(context_obj)
+    context_obj["iteration"] = iteration + 1
+    return context_obj
+
+
+def choose_user(context_obj):
+    iteration = context_obj["iteration"] - 1
+    tenant_id = "tenant_%d" % (iteration % len(context_obj["tenants"]))
+    tenant = context_obj["tenants"][tenant_id]
+    context_obj["user"] = tenant["users"][0]
+    context_obj["tenant"] = tenant
+
+
+def time_setup(get_context, context_obj, repeat):
+    started_at = time.time()
+    for i in range(repeat):
+        choose_user(get_context(i, context_obj))
+    return (time.time() - started_at) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the setup time of contexts of iterations "
+                    "created by deep copies and by copy-on-write views.")
+    parser.add_argument("--users", type=int, nargs="+",
+                        default=[10, 100, 1000],
+                        help="numbers of users in the context")
+    parser.add_argument("--repeat", type=int, default=100,
+                        help="number of iterations for each number of users")
+    args = parser.parse_args()
+
+    print("%8s %14s %14s %14s" % ("users", "freeze, ms", "deepcopy, us",
+                                  "view, us"))
+    for users_count in args.users:
+        context_obj = generate_context(users_count)
+        deepcopy_time = time_setup(deepcopy_context, context_obj, args.repeat)
+        started_at = time.time()
+        frozen = utils.LockedDict(context_obj)
+        freeze_time = time.time() - started_at
+        view_time = time_setup(runner._get_scenario_context, frozen,
+                               args.repeat)
+        print("%8d %14.2f %14.1f %14.1f" % (
+            users_count, freeze_time * 10 ** 3, deepcopy_time * 10 ** 6,
+            view_time * 10 ** 6))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of lookups of plugins by their names.
+
+All Rally plugins are loaded and the given number of extra scenario, context
+and SLA plugins is generated. Then plugins which are looked up while a
+workload is running are got from the index of plugins (as Plugin.get does)
+and by the scan of all subclasses (as Plugin.get did before the index was
+introduced). The time of loading plugins and the average time of a lookup
+are printed.
+
+Usage:
+
+    $ python -m tests.benchmarks.plugin_lookup --plugins 1000
+"""
+
+from __future__ import print_function
+
+import argparse
+import sys
+import time
+
+from rally.common.plugin import discover
+from rally.common.plugin import plugin
+from rally import plugins
+from rally.task import context
+from rally.task import hook
+from rally.task import runner
+from rally.task import scenario
+from rally.task import sla
+from rally.task import trigger
+
+LOOKUPS = [(scenario.Scenario, "Dummy.dummy", None),
+           (runner.ScenarioRunner, "constant", None),
+           (context.Context, "users", "openstack"),
+           (context.Context, "dummy_context", None),
+           (sla.SLA, "failure_rate", None),
+           (hook.Hook, "sys_call", None),
+           (trigger.Trigger, "event", None)]
+
+
+def scan_get_all(cls, name, platform=None):
+    return [p for p in discover.itersubclasses(cls)
+            if issubclass(p, plugin.Plugin)
+            and p._meta_is_inited(raise_exc=False)
+            and name == p.get_name()
+            and (not platform or platform == p.get_platform())]
+
+
+def generate_plugins(count):
+    bases = (scenario.Scenario, context.Context, sla.SLA)
+    # NOTE: plugins are returned to be kept alive, like plugins referenced
+    #   by their modules
+    return [plugin.configure(name="BenchmarkPlugin.plugin_%d" % i)(
+        type("BenchmarkPlugin%d" % i, (bases[i % len(bases)],), {}))
+        for i in range(count)]
+
+
+def time_lookups(get_all, repeat):
+    started_at = time.time()
+    for i in range(repeat):
+        for cls, name, platform in LOOKUPS:
+            assert len(get_all(cls, name, platform)) == 1
+    return (time.time() - started_at) / (repeat * len(LOOKUPS))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the time of lookups of plugins by the index "
+                    "and by the scan of subclasses.")
+    parser.add_argument("--plugins", type=int, default=1000,
+                        help="number of extra plugins to generate")
+    parser.add_argument("--repeat", type=int, default=1000,
+                        help="number of times each lookup is repeated")
+    args = parser.parse_args()
+
+    started_at = time.time()
+    plugins.load()
+    print("%-24s %10.3f s" % ("load plugins", time.time() - started_at))
+    started_at = time.time()
+    generated = generate_plugins(args.plugins)
+    print("%-24s %10.3f s" % ("generate plugins", time.time() - started_at))
+    print("%-24s %10d" % ("plugins generated", len(generated)))
+    print("%-24s %10d" % ("plugins loaded",
+                          len(plugin.Plugin.get_all(allow_hidden=True))))
+
+    index_time = time_lookups(
+        lambda cls, name, platform: cls.get_all(name=name, platform=platform,
+                                                allow_hidden=True),
+        args.repeat)
+    scan_time = time_lookups(scan_get_all, args.repeat)
+    print("%-24s %10.1f us" % ("lookup by index", index_time * 10 ** 6))
+    print("%-24s %10.1f us" % ("lookup by scan", scan_time * 10 ** 6))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
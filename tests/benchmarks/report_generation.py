@@ -0,0 +1,96 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of processing of a workload for the HTML report.
+
+Iteration results which look like results of a scenario with a few atomic
+actions (and some failed iterations) are generated in the same way as by
+tests.benchmarks.workload_data_storage. Then the time which
+rally.task.processing.plot._process_workload takes to feed all of them to
+the charts and to render the charts is printed, along with the time
+spent by each chart.
+
+Usage:
+
+    $ python -m tests.benchmarks.report_generation --iterations 500000
+"""
+
+from __future__ import print_function
+
+import argparse
+import collections
+import sys
+import time
+
+from rally.task.processing import charts
+from rally.task.processing import plot
+from tests.benchmarks import workload_data_storage
+
+
+def make_workload(results):
+    durations = charts.MainStatsTable(
+        {"total_iteration_count": len(results)})
+    for result in results:
+        durations.add_iteration(result)
+    started_at = results[0]["timestamp"]
+    return {"name": "Dummy.dummy", "description": "", "data": results,
+            "total_iteration_count": len(results),
+            "failed_iteration_count": len([r for r in results
+                                           if r["error"]]),
+            "statistics": {"durations": durations.to_dict()},
+            "min_duration": min(r["duration"] for r in results),
+            "max_duration": max(r["duration"] for r in results),
+            "load_duration": max(r["timestamp"] + r["duration"]
+                                 for r in results) - started_at,
+            "full_duration": 0, "start_time": started_at,
+            "created_at": "", "runner": {"type": "constant"}, "hooks": [],
+            "sla_results": {}, "pass_sla": True}
+
+
+def time_charts(workload):
+    spent = collections.OrderedDict()
+    for chart_cls in (charts.MainStackedAreaChart, charts.MainHistogramChart,
+                      charts.MainStatsTable, charts.LoadProfileChart,
+                      charts.ThroughputChart, charts.StartDelayStatsTable,
+                      charts.AtomicAvgChart, charts.AtomicStackedAreaChart,
+                      charts.AtomicHistogramChart):
+        started_at = time.time()
+        chart = chart_cls(workload)
+        for result in workload["data"]:
+            chart.add_iteration(result)
+        chart.render()
+        spent[chart_cls.__name__] = time.time() - started_at
+    return spent
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the time of processing of a workload for the "
+                    "HTML report.")
+    parser.add_argument("--iterations", type=int, default=100000,
+                        help="number of iteration results of the workload")
+    args = parser.parse_args()
+
+    workload = make_workload(
+        workload_data_storage.generate_results(args.iterations))
+
+    started_at = time.time()
+    plot._process_workload(workload, {}, 0)
+    print("%-24s %8.2f s" % ("_process_workload", time.time() - started_at))
+    for name, spent in time_charts(workload).items():
+        print("%-24s %8.2f s" % (name, spent))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the transport of iteration results to the runner process.
+
+It compares the former transport (a multiprocessing.Queue per results and
+events which is polled every 10ms and transfers each object separately)
+with rally.task.runner.BatchedPipe. Worker processes put pre-built results
+of Dummy.dummy iterations (and an event per iteration) as fast as they can,
+so the measured rate is the ceiling which the transport puts on a runner.
+
+Then it runs Dummy.dummy with `sleep: 0` via the constant runner with
+both transports to compare end-to-end rates with the 10x target. With the
+former transport ScenarioRunner._join_processes falls back to polling of
+the queues and checks the schema of each result, as it did before. The
+end-to-end rate is also bound by the cost of the iterations themselves
+(i.e. by the number of available CPUs).
+
+Usage:
+
+    $ python -m tests.benchmarks.result_transport --iterations 100000 \\
+        --processes 2
+"""
+
+from __future__ import print_function
+
+import argparse
+import collections
+import contextlib
+import multiprocessing
+import sys
+import time
+
+from rally.plugins.common.runners import constant
+from rally.plugins.common.scenarios.dummy import dummy
+from rally.task import runner
+
+
+TARGET_SPEEDUP = 10
+
+RESULT = {"duration": 0.0, "timestamp": 1500000000.0, "idle_duration": 0.0,
+          "error": [], "output": {"additive": [], "complete": []},
+          "atomic_actions": []}
+
+
+def _produce(result_queue, event_queue, iterations, info=None):
+    for i in range(iterations):
+        event_queue.put({"type": "iteration", "value": i + 1})
+        result_queue.put(dict(RESULT, timestamp=RESULT["timestamp"] + i))
+
+
+class _Runner(runner.ScenarioRunner):
+    def _run_scenario(self, cls, method_name, context, args):
+        pass
+
+
+def _join_queues(runner_obj, process_pool, result_queue, event_queue):
+    # the former implementation of ScenarioRunner._join_processes
+    while process_pool:
+        while process_pool and not process_pool[0].is_alive():
+            process_pool.popleft().join()
+
+        if result_queue.empty() and event_queue.empty():
+            time.sleep(0.01)
+
+        while not event_queue.empty():
+            runner_obj.send_event(**event_queue.get())
+
+        while not result_queue.empty():
+            runner_obj._send_result(result_queue.get())
+
+    runner_obj._flush_results()
+
+
+def run_transport(transport, iterations, processes):
+    runner_obj = _Runner({"uuid": "benchmark"}, {"type": "benchmark"})
+    if transport == "queue":
+        result_queue = multiprocessing.Queue()
+        event_queue = multiprocessing.Queue()
+    else:
+        result_queue = runner.BatchedPipe()
+        event_queue = runner.BatchedPipe()
+
+    started_at = time.time()
+    process_pool = collections.deque()
+    for i in range(processes):
+        process = multiprocessing.Process(
+            target=_produce,
+            args=(result_queue, event_queue, iterations // processes))
+        process.start()
+        process_pool.append(process)
+    if transport == "queue":
+        _join_queues(runner_obj, process_pool, result_queue, event_queue)
+    else:
+        runner_obj._join_processes(process_pool, result_queue, event_queue)
+    wall_time = time.time() - started_at
+
+    received = sum(len(batch) for batch in runner_obj.result_queue)
+    assert received == iterations // processes * processes, received
+    assert len(runner_obj.event_queue) == received
+    return received / wall_time
+
+
+@contextlib.contextmanager
+def _transport(transport):
+    batched_pipe = runner.BatchedPipe
+    if transport == "queue":
+        runner.BatchedPipe = multiprocessing.Queue
+    try:
+        yield
+    finally:
+        runner.BatchedPipe = batched_pipe
+
+
+def run_runner(transport, iterations, processes):
+    runner_obj = constant.ConstantScenarioRunner(
+        {"uuid": "benchmark"},
+        {"type": "constant", "times": iterations, "concurrency": processes,
+         "max_cpu_count": processes})
+    started_at = time.time()
+    with _transport(transport):
+        runner_obj._run_scenario(dummy.Dummy, "run",
+                                 {"task": {"uuid": "benchmark"}},
+                                 {"sleep": 0})
+    wall_time = time.time() - started_at
+
+    received = sum(len(batch) for batch in runner_obj.result_queue)
+    assert received == iterations, received
+    return received / wall_time
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure how many iteration results per second are "
+                    "transferred from worker processes to the runner.")
+    parser.add_argument("--iterations", type=int, default=100000,
+                        help="total number of iterations")
+    parser.add_argument("--processes", type=int, default=2,
+                        help="number of worker processes")
+    args = parser.parse_args()
+
+    print("transport only, %d processes:" % args.processes)
+    queue_rate = run_transport("queue", args.iterations, args.processes)
+    pipe_rate = run_transport("pipe", args.iterations, args.processes)
+    print("  multiprocessing.Queue:     %10.0f iterations/s" % queue_rate)
+    print("  BatchedPipe:               %10.0f iterations/s" % pipe_rate)
+    print("  speedup:                   %10.1fx" % (pipe_rate / queue_rate))
+
+    # NOTE: the runner doesn't start more processes than there are CPUs
+    print("constant runner, Dummy.dummy (sleep: 0), %d processes:"
+          % min(args.processes, multiprocessing.cpu_count()))
+    queue_rate = run_runner("queue", args.iterations, args.processes)
+    pipe_rate = run_runner("pipe", args.iterations, args.processes)
+    speedup = pipe_rate / queue_rate
+    print("  multiprocessing.Queue:     %10.0f iterations/s" % queue_rate)
+    print("  BatchedPipe:               %10.0f iterations/s" % pipe_rate)
+    print("  speedup:                   %10.1fx (target: %dx, %s)"
+          % (speedup, TARGET_SPEEDUP,
+             "met" if speedup >= TARGET_SPEEDUP else "not met"))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of waiting for statuses of resources.
+
+The given number of threads wait for resources of the same fake manager,
+which become active after random delays. Each call of the manager takes
+the given time. The threads wait by wait_for_status with the
+update_resource made by get_from_manager (so they are polled by
+STATUS_POLLER in batches) and with the same function which is not
+marked for batching (so each thread gets its resource every check
+interval, as before the poller was introduced). The number of API calls
+and the average delay between the moment a resource becomes active and
+the end of the wait are printed.
+
+Usage:
+
+    $ python -m tests.benchmarks.status_polling --resources 200
+"""
+
+from __future__ import print_function
+
+import argparse
+import collections
+import random
+import sys
+import threading
+import time
+
+from rally.task import utils
+
+
+class Resource(object):
+
+    def __init__(self, manager, id, active_at):
+        self.manager = manager
+        self.id = id
+        self.active_at = active_at
+
+    @property
+    def status(self):
+        return "ACTIVE" if time.time() >= self.active_at else "BUILD"
+
+
+class Manager(object):
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = collections.Counter()
+        self.resources = {}
+
+    def create(self, delay):
+        resource = Resource(self, len(self.resources), time.time() + delay)
+        self.resources[resource.id] = resource
+        return resource
+
+    def get(self, resource_id):
+        self.calls["get"] += 1
+        time.sleep(self.latency)
+        return self.resources[resource_id]
+
+    def list(self):
+        self.calls["list"] += 1
+        time.sleep(self.latency)
+        return list(self.resources.values())
+
+
+def run(count, update_resource, check_interval, latency):
+    manager = Manager(latency)
+    delays = []
+
+    def wait():
+        resource = manager.create(random.uniform(0.5, 3))
+        utils.wait_for_status(resource, ready_statuses=["ACTIVE"],
+                              update_resource=update_resource,
+                              check_interval=check_interval)
+        delays.append(time.time() - resource.active_at)
+
+    threads = [threading.Thread(target=wait) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return manager.calls, sum(delays) / len(delays)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the number of API calls and the detection "
+                    "delay of wait_for_status with and without batching.")
+    parser.add_argument("--resources", type=int, default=100,
+                        help="number of resources waited for concurrently")
+    parser.add_argument("--check-interval", type=float, default=1,
+                        help="check interval of wait_for_status")
+    parser.add_argument("--latency", type=float, default=0.01,
+                        help="duration of a call of the manager")
+    args = parser.parse_args()
+
+    batched = utils.get_from_manager()
+
+    def not_batched(resource):
+        return batched(resource)
+
+    print("%-12s %8s %8s %10s" % ("", "gets", "lists", "delay, s"))
+    for name, update_resource in (("batched", batched),
+                                  ("not batched", not_batched)):
+        calls, delay = run(args.resources, update_resource,
+                           args.check_interval, args.latency)
+        print("%-12s %8d %8d %10.3f" % (name, calls["get"], calls["list"],
+                                        delay))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
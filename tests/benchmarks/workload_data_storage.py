@@ -0,0 +1,154 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of codecs of stored workload data chunks.
+
+Iteration results which look like results of a scenario with a few atomic
+actions (and some failed iterations) are stored in a SQLite database with
+each codec from rally.common.db.sqlalchemy.chunk_codec and without any
+codec (as chunks were stored before codecs were introduced). For each of
+them the size of the database, the time of storing and the time of reading
+all the results of the workload are printed.
+
+Usage:
+
+    $ python -m tests.benchmarks.workload_data_storage --iterations 100000
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from oslo_config import cfg
+
+from rally.common import db
+from rally.common.db.sqlalchemy import chunk_codec
+from rally.common.db.sqlalchemy import models
+
+
+CONF = cfg.CONF
+
+
+def generate_results(iterations, seed=42):
+    rnd = random.Random(seed)
+    timestamp = 1500000000.0
+    results = []
+    for i in range(iterations):
+        started_at = timestamp
+        atomic_actions = []
+        for name in ("nova.boot_server", "nova.list_servers",
+                     "nova.delete_server"):
+            finished_at = started_at + rnd.uniform(0.1, 3.0)
+            atomic_actions.append({"name": name, "children": [],
+                                   "started_at": started_at,
+                                   "finished_at": finished_at})
+            started_at = finished_at
+        error = []
+        if rnd.random() < 0.05:
+            error = ["TimeoutException",
+                     "Rally tired waiting for Server s_rally_%08x to "
+                     "become ('ACTIVE') current status BUILD" % i,
+                     "Traceback (most recent call last):\n  ..."]
+        results.append({"timestamp": timestamp,
+                        "duration": started_at - timestamp,
+                        "idle_duration": 0.0,
+                        "error": error,
+                        "output": {"additive": [], "complete": []},
+                        "atomic_actions": atomic_actions})
+        timestamp += rnd.uniform(0.0, 0.5)
+    return results
+
+
+def _store_without_codec(task_uuid, workload_uuid, chunk_order, raw):
+    workload_data = models.WorkloadData(task_uuid=task_uuid,
+                                        workload_uuid=workload_uuid)
+    size = len(json.dumps({"raw": raw}))
+    workload_data.update({"chunk_order": chunk_order,
+                          "iteration_count": len(raw),
+                          "failed_iteration_count": 0,
+                          "chunk_data": {"raw": raw},
+                          "chunk_size": size,
+                          "compressed_chunk_size": size})
+    workload_data.save()
+
+
+def run(codec, results, chunk_size, tmp_dir):
+    db_path = os.path.join(tmp_dir, "%s.sqlite" % codec)
+    CONF.set_default("connection", "sqlite:///%s" % db_path,
+                     group="database")
+    db.engine_reset()
+    db.schema_create()
+
+    deployment = db.deployment_create({"name": codec})
+    task = db.task_create({"deployment_uuid": deployment["uuid"]})
+    subtask = db.subtask_create(task["uuid"], title="subtask")
+    workload = db.workload_create(
+        task["uuid"], subtask["uuid"], name="Dummy.dummy", description="",
+        position=0, runner={}, runner_type="constant", hooks=[], context={},
+        sla={}, args={}, context_execution={}, statistics={})
+
+    started_at = time.time()
+    for chunk_order, i in enumerate(range(0, len(results), chunk_size)):
+        chunk = results[i:i + chunk_size]
+        if codec == "without codec":
+            _store_without_codec(task["uuid"], workload["uuid"],
+                                 chunk_order, chunk)
+        else:
+            db.workload_data_create(task["uuid"], workload["uuid"],
+                                    chunk_order, {"raw": chunk}, codec=codec)
+    write_time = time.time() - started_at
+
+    started_at = time.time()
+    stored = db.api.get_impl()._task_workload_data_get_all(workload["uuid"])
+    read_time = time.time() - started_at
+    assert len(stored) == len(results)
+
+    db.engine_reset()
+    return os.path.getsize(db_path), write_time, read_time
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the size of the database and the time of "
+                    "storing and reading results with chunk codecs.")
+    parser.add_argument("--iterations", type=int, default=100000,
+                        help="number of iteration results of the workload")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="number of iterations per chunk")
+    args = parser.parse_args()
+
+    CONF([], project="rally")
+    results = generate_results(args.iterations)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        print("%-16s %12s %10s %10s" % ("codec", "DB size, KiB", "write, s",
+                                        "read, s"))
+        for codec in ["without codec"] + chunk_codec.CODECS:
+            size, write_time, read_time = run(codec, results,
+                                              args.chunk_size, tmp_dir)
+            print("%-16s %12d %10.2f %10.2f" % (codec, size // 1024,
+                                                write_time, read_time))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1021,6 +1021,15 @@ class TaskCommandsTestCase(test.TestCase):
             os.path.expanduser("~/.rally/globals"),
             ["RALLY_TASK=%s\n" % task_id])
 
+    def test_worker(self):
+        self.task.worker(self.fake_api, hostname="foo")
+        self.fake_api.task.run_worker.assert_called_once_with(hostname="foo")
+
+    def test_worker_interrupted(self):
+        self.fake_api.task.run_worker.side_effect = KeyboardInterrupt
+        self.task.worker(self.fake_api)
+        self.fake_api.task.run_worker.assert_called_once_with(hostname=None)
+
     def test_use_not_found(self):
         task_id = "ddc3f8ba-082a-496d-b18f-72cdf5c10a14"
         exc = exceptions.TaskNotFound(uuid=task_id)
@@ -17,11 +17,14 @@
 
 import copy
 import datetime as dt
+import json
 
 import mock
 from six import moves
 
 from rally.common import db
+from rally.common.db.sqlalchemy import chunk_codec
+from rally.common.db.sqlalchemy import models
 from rally import consts
 from rally import exceptions
 from tests.unit import test
@@ -508,6 +511,63 @@ class WorkloadTestCase(test.DBTestCase):
         self.assertEqual(self.task_uuid, workload["task_uuid"])
         self.assertEqual(self.subtask_uuid, workload["subtask_uuid"])
 
+    def test_workload_set_results_with_statistics(self):
+        workload = db.workload_create(self.task_uuid, self.subtask_uuid,
+                                      name="foo", description="descr",
+                                      position=0, args={},
+                                      context={}, sla={},
+                                      hooks=[], runner={},
+                                      runner_type="foo")
+        statistics = {"total_iteration_count": 3,
+                      "failed_iteration_count": 1,
+                      "min_duration": 0,
+                      "max_duration": 2,
+                      "durations": {"rows": [], "cols": []}}
+
+        with mock.patch.object(db.api.get_impl(),
+                               "_task_workload_data_get_all") as mock_get:
+            db.workload_set_results(workload_uuid=workload["uuid"],
+                                    subtask_uuid=self.subtask_uuid,
+                                    task_uuid=self.task_uuid,
+                                    load_duration=13,
+                                    full_duration=42,
+                                    start_time=33.33,
+                                    sla_results=[],
+                                    statistics=statistics)
+        self.assertFalse(mock_get.called)
+        workload = db.workload_get(workload["uuid"])
+        self.assertEqual(0, workload["min_duration"])
+        self.assertEqual(2, workload["max_duration"])
+        self.assertEqual(3, workload["total_iteration_count"])
+        self.assertEqual(1, workload["failed_iteration_count"])
+        self.assertEqual({"durations": {"rows": [], "cols": []}},
+                         workload["statistics"])
+        self.assertEqual({}, workload["context_execution"])
+
+    def test_workload_set_results_with_context_execution(self):
+        workload = db.workload_create(self.task_uuid, self.subtask_uuid,
+                                      name="foo", description="descr",
+                                      position=0, args={},
+                                      context={}, sla={},
+                                      hooks=[], runner={},
+                                      runner_type="foo")
+        context_execution = {
+            "users@openstack": {
+                "setup": {"started_at": 1, "finished_at": 2, "error": None},
+                "cleanup": {"started_at": 5, "finished_at": 6,
+                            "error": ["ValueError", "foo", "trace"]}}}
+
+        db.workload_set_results(workload_uuid=workload["uuid"],
+                                subtask_uuid=self.subtask_uuid,
+                                task_uuid=self.task_uuid,
+                                load_duration=13,
+                                full_duration=42,
+                                start_time=33.33,
+                                sla_results=[],
+                                context_execution=context_execution)
+        workload = db.workload_get(workload["uuid"])
+        self.assertEqual(context_execution, workload["context_execution"])
+
     def test_workload_set_results_empty_raw_data(self):
         workload = db.workload_create(self.task_uuid, self.subtask_uuid,
                                       name="foo", description="descr",
@@ -573,7 +633,12 @@ class WorkloadDataTestCase(test.DBTestCase):
                          workload_data["started_at"])
         self.assertEqual(dt.datetime.fromtimestamp(4),
                          workload_data["finished_at"])
-        self.assertEqual(data, workload_data["chunk_data"])
+        self.assertEqual(data["raw"],
+                         chunk_codec.decode(workload_data["chunk_data"]))
+        self.assertEqual(chunk_codec.encode(data["raw"])[1],
+                         workload_data["chunk_size"])
+        self.assertEqual(len(json.dumps(workload_data["chunk_data"])),
+                         workload_data["compressed_chunk_size"])
         self.assertEqual(self.task_uuid, workload_data["task_uuid"])
         self.assertEqual(self.workload_uuid, workload_data["workload_uuid"])
 
@@ -582,17 +647,42 @@ class WorkloadDataTestCase(test.DBTestCase):
         mock_time.return_value = 10
         data = {"raw": []}
         workload_data = db.workload_data_create(self.task_uuid,
-                                                self.workload_uuid, 0, data)
+                                                self.workload_uuid, 0, data,
+                                                codec="row+zlib")
+        self.assertEqual("row+zlib", workload_data["chunk_data"]["codec"])
         self.assertEqual(0, workload_data["iteration_count"])
         self.assertEqual(0, workload_data["failed_iteration_count"])
         self.assertEqual(dt.datetime.fromtimestamp(10),
                          workload_data["started_at"])
         self.assertEqual(dt.datetime.fromtimestamp(10),
                          workload_data["finished_at"])
-        self.assertEqual(data, workload_data["chunk_data"])
+        self.assertEqual(data["raw"],
+                         chunk_codec.decode(workload_data["chunk_data"]))
+        self.assertEqual(chunk_codec.encode(data["raw"], "row+zlib")[1],
+                         workload_data["chunk_size"])
+        self.assertEqual(len(json.dumps(workload_data["chunk_data"])),
+                         workload_data["compressed_chunk_size"])
         self.assertEqual(self.task_uuid, workload_data["task_uuid"])
         self.assertEqual(self.workload_uuid, workload_data["workload_uuid"])
 
+    def test_workload_data_get_all(self):
+        db.workload_data_create(self.task_uuid, self.workload_uuid, 0,
+                                {"raw": [{"duration": 1, "timestamp": 3}]})
+        wdata = db.workload_data_create(
+            self.task_uuid, self.workload_uuid, 1,
+            {"raw": [{"duration": 1, "timestamp": 2}]})
+        # chunk stored before chunks were encoded
+        (db.api.get_impl().model_query(models.WorkloadData)
+            .filter_by(uuid=wdata["uuid"])
+            .update({"chunk_data": {"raw": [{"duration": 1,
+                                             "timestamp": 1}]}}))
+
+        task = db.task_get(self.task_uuid, detailed=True)
+        self.assertEqual(
+            [{"duration": 1, "timestamp": 1},
+             {"duration": 1, "timestamp": 3}],
+            task["subtasks"][0]["workloads"][0]["data"])
+
 
 class DeploymentTestCase(test.DBTestCase):
     def test_deployment_create(self):
@@ -945,3 +1035,89 @@ class WorkerTestCase(test.DBTestCase):
 
     def test_update_worker_not_found(self):
         self.assertRaises(exceptions.WorkerNotFound, db.update_worker, "fake")
+
+
+class WorkerJobTestCase(test.DBTestCase):
+    def setUp(self):
+        super(WorkerJobTestCase, self).setUp()
+        self.jobs = [db.worker_job_create("w1", i, 10,
+                                          ("job%d" % i).encode("utf-8"))
+                     for i in (0, 10)]
+
+    def test_worker_job_create(self):
+        job = db.worker_job_get(self.jobs[0]["uuid"])
+        self.assertEqual("w1", job["workload_uuid"])
+        self.assertEqual(0, job["first_iteration"])
+        self.assertEqual(10, job["times"])
+        self.assertEqual(consts.WorkerJobStatus.PENDING, job["status"])
+        self.assertIsNone(job["hostname"])
+        self.assertNotIn("job", job)
+        self.assertNotIn("results", job)
+
+    def test_worker_job_get_not_found(self):
+        self.assertRaises(exceptions.ResourceNotFound,
+                          db.worker_job_get, "fake")
+
+    def test_worker_job_list(self):
+        db.worker_job_create("w2", 0, 10, b"job")
+        self.assertEqual([j["uuid"] for j in self.jobs],
+                         [j["uuid"] for j in db.worker_job_list("w1")])
+        self.assertEqual(
+            [], db.worker_job_list("w1", consts.WorkerJobStatus.FINISHED))
+
+    def test_worker_job_claim(self):
+        job = db.worker_job_claim("host1")
+        self.assertEqual(self.jobs[0]["uuid"], job["uuid"])
+        self.assertEqual(b"job0", job["job"])
+        self.assertEqual("host1", job["hostname"])
+        self.assertEqual(consts.WorkerJobStatus.RUNNING, job["status"])
+
+        job = db.worker_job_claim("host2")
+        self.assertEqual(self.jobs[1]["uuid"], job["uuid"])
+        self.assertIsNone(db.worker_job_claim("host3"))
+
+    def test_worker_job_release(self):
+        job = db.worker_job_claim("host1")
+        self.assertFalse(db.worker_job_release(job["uuid"], "host2"))
+        self.assertTrue(db.worker_job_release(job["uuid"], "host1"))
+
+        job = db.worker_job_get(job["uuid"])
+        self.assertEqual(consts.WorkerJobStatus.PENDING, job["status"])
+        self.assertIsNone(job["hostname"])
+        self.assertEqual(job["uuid"], db.worker_job_claim("host2")["uuid"])
+
+    def test_worker_job_finish(self):
+        job = db.worker_job_claim("host1")
+        self.assertFalse(db.worker_job_finish(job["uuid"], "host2", b"res"))
+        self.assertTrue(db.worker_job_finish(job["uuid"], "host1", b"res"))
+        self.assertFalse(db.worker_job_finish(self.jobs[1]["uuid"], "host1",
+                                              b"res"))
+
+        jobs = db.worker_job_list("w1", consts.WorkerJobStatus.FINISHED,
+                                  with_results=True)
+        self.assertEqual(1, len(jobs))
+        self.assertEqual(b"res", jobs[0]["results"])
+
+    def test_worker_jobs_abort(self):
+        job = db.worker_job_claim("host1")
+        db.worker_jobs_abort("w1")
+
+        jobs = db.worker_job_list("w1")
+        self.assertEqual([job["uuid"]], [j["uuid"] for j in jobs])
+        self.assertEqual(consts.WorkerJobStatus.ABORTED, jobs[0]["status"])
+        self.assertTrue(db.worker_job_finish(job["uuid"], "host1", b"res"))
+
+    def test_worker_job_delete(self):
+        db.worker_job_delete(self.jobs[0]["uuid"])
+        self.assertEqual([self.jobs[1]["uuid"]],
+                         [j["uuid"] for j in db.worker_job_list("w1")])
+        self.assertRaises(exceptions.ResourceNotFound,
+                          db.worker_job_delete, self.jobs[0]["uuid"])
+
+    def test_worker_jobs_delete(self):
+        other = db.worker_job_create("w2", 0, 10, b"job")
+        db.worker_job_claim("host1")
+        db.worker_jobs_delete("w1")
+        self.assertEqual([], db.worker_job_list("w1"))
+        self.assertEqual([other["uuid"]],
+                         [j["uuid"] for j in db.worker_job_list("w2")])
@@ -196,6 +196,10 @@ class MigrationTestCase(rtest.DBTestCase,
             self, mock_connection_schema_stamp):
         # drop all tables after a test run
         self.addCleanup(db.schema_cleanup)
+        # NOTE: the metadata is shared with all the tests which create DB
+        #   schema, so the removed table should be restored
+        self.addCleanup(six.moves.reload_module,
+                        rally.common.db.sqlalchemy.models)
 
         table = self.get_metadata().tables["workers"]
         self.get_metadata().remove(table)
@@ -1965,3 +1969,169 @@ class MigrationWalkTestCase(rtest.DBTestCase,
             conn.execute(
                 deployment_table.delete().where(
                     deployment_table.c.uuid == deployment_uuid))
+
+    def _check_7287df262dbc(self, engine, data):
+        self.assertColumnExists(engine, "worker_jobs", "workload_uuid")
+        self.assertIndexExists(engine, "worker_jobs",
+                               "worker_job_workload_uuid")
+
+        worker_jobs_table = db_utils.get_table(engine, "worker_jobs")
+        job_uuid = str(uuid.uuid4())
+        with engine.connect() as conn:
+            conn.execute(
+                worker_jobs_table.insert(),
+                [{"uuid": job_uuid,
+                  "workload_uuid": str(uuid.uuid4()),
+                  "status": consts.WorkerJobStatus.PENDING,
+                  "first_iteration": 0,
+                  "times": 10,
+                  "job": b"job"}])
+            job = conn.execute(worker_jobs_table.select().where(
+                worker_jobs_table.c.uuid == job_uuid)).fetchone()
+            self.assertEqual(b"job", job.job)
+            self.assertIsNone(job.results)
+            conn.execute(worker_jobs_table.delete().where(
+                worker_jobs_table.c.uuid == job_uuid))
+
+    def _pre_upgrade_a43700a813a5(self, engine):
+        deployment_table = db_utils.get_table(engine, "deployments")
+        task_table = db_utils.get_table(engine, "tasks")
+        subtask_table = db_utils.get_table(engine, "subtasks")
+        workload_table = db_utils.get_table(engine, "workloads")
+        wdata_table = db_utils.get_table(engine, "workloaddata")
+
+        self._a43700a813a5_deployment_uuid = str(uuid.uuid4())
+        self._a43700a813a5_task_uuid = str(uuid.uuid4())
+        self._a43700a813a5_subtask_uuid = str(uuid.uuid4())
+        self._a43700a813a5_workload_uuid = str(uuid.uuid4())
+        self._a43700a813a5_raw = [
+            {"timestamp": 1, "duration": 2, "idle_duration": 0,
+             "error": [], "output": {"additive": [], "complete": []},
+             "atomic_actions": [{"name": "foo", "started_at": 1,
+                                 "finished_at": 2, "children": []}]},
+            {"timestamp": 2, "duration": 3, "idle_duration": 0,
+             "error": ["KeyError", "foo", "trace"],
+             "output": {"additive": [], "complete": []},
+             "atomic_actions": []}]
+        self._a43700a813a5_encoded, _s, _cs = api.chunk_codec.encode(
+            self._a43700a813a5_raw[:1], "row+zlib")
+
+        with engine.connect() as conn:
+            conn.execute(
+                deployment_table.insert(),
+                [{
+                    "uuid": self._a43700a813a5_deployment_uuid,
+                    "name": str(uuid.uuid4()),
+                    "config": "{}",
+                    "enum_deployments_status": consts.DeployStatus.DEPLOY_INIT,
+                    "credentials": six.b(json.dumps([])),
+                    "users": six.b(json.dumps([]))
+                }]
+            )
+            conn.execute(
+                task_table.insert(),
+                [{
+                    "uuid": self._a43700a813a5_task_uuid,
+                    "created_at": timeutils.utcnow(),
+                    "updated_at": timeutils.utcnow(),
+                    "status": consts.TaskStatus.FINISHED,
+                    "validation_result": six.b(json.dumps({})),
+                    "deployment_uuid": self._a43700a813a5_deployment_uuid
+                }]
+            )
+            conn.execute(
+                subtask_table.insert(),
+                [{
+                    "uuid": self._a43700a813a5_subtask_uuid,
+                    "created_at": timeutils.utcnow(),
+                    "updated_at": timeutils.utcnow(),
+                    "task_uuid": self._a43700a813a5_task_uuid,
+                    "context": six.b(json.dumps([])),
+                    "sla": six.b(json.dumps([])),
+                    "run_in_parallel": False
+                }]
+            )
+            conn.execute(
+                workload_table.insert(),
+                [{
+                    "uuid": self._a43700a813a5_workload_uuid,
+                    "name": "foo",
+                    "task_uuid": self._a43700a813a5_task_uuid,
+                    "subtask_uuid": self._a43700a813a5_subtask_uuid,
+                    "created_at": timeutils.utcnow(),
+                    "updated_at": timeutils.utcnow(),
+                    "position": 0,
+                    "runner": "",
+                    "runner_type": "",
+                    "context": "",
+                    "context_execution": "",
+                    "statistics": "",
+                    "hooks": "",
+                    "sla": "",
+                    "sla_results": "",
+                    "args": "",
+                    "load_duration": 0,
+                    "pass_sla": True
+                }]
+            )
+            for chunk_order, chunk_data in enumerate(
+                    [{"raw": self._a43700a813a5_raw},
+                     self._a43700a813a5_encoded]):
+                conn.execute(
+                    wdata_table.insert(),
+                    [{
+                        "uuid": str(uuid.uuid4()),
+                        "created_at": timeutils.utcnow(),
+                        "updated_at": timeutils.utcnow(),
+                        "started_at": timeutils.utcnow(),
+                        "finished_at": timeutils.utcnow(),
+                        "task_uuid": self._a43700a813a5_task_uuid,
+                        "workload_uuid": self._a43700a813a5_workload_uuid,
+                        "chunk_order": chunk_order,
+                        "iteration_count": 0,
+                        "failed_iteration_count": 0,
+                        "chunk_size": 0,
+                        "compressed_chunk_size": 0,
+                        "chunk_data": json.dumps(chunk_data)
+                    }]
+                )
+
+    def _check_a43700a813a5(self, engine, data):
+        deployment_table = db_utils.get_table(engine, "deployments")
+        task_table = db_utils.get_table(engine, "tasks")
+        subtask_table = db_utils.get_table(engine, "subtasks")
+        workload_table = db_utils.get_table(engine, "workloads")
+        wdata_table = db_utils.get_table(engine, "workloaddata")
+
+        workload_uuid = self._a43700a813a5_workload_uuid
+        with engine.connect() as conn:
+            converted, untouched = conn.execute(wdata_table.select().where(
+                wdata_table.c.workload_uuid == workload_uuid).order_by(
+                wdata_table.c.chunk_order)).fetchall()
+
+            chunk_data = json.loads(converted.chunk_data)
+            self.assertEqual("columnar+zlib", chunk_data["codec"])
+            self.assertEqual(self._a43700a813a5_raw,
+                             api.chunk_codec.decode(chunk_data))
+            self.assertEqual(
+                api.chunk_codec.encode(self._a43700a813a5_raw,
+                                       "columnar+zlib")[1],
+                converted.chunk_size)
+            self.assertEqual(len(converted.chunk_data),
+                             converted.compressed_chunk_size)
+
+            self.assertEqual(self._a43700a813a5_encoded,
+                             json.loads(untouched.chunk_data))
+            self.assertEqual(0, untouched.chunk_size)
+
+            conn.execute(wdata_table.delete().where(
+                wdata_table.c.workload_uuid == workload_uuid))
+            conn.execute(workload_table.delete().where(
+                workload_table.c.uuid == workload_uuid))
+            conn.execute(subtask_table.delete().where(
+                subtask_table.c.uuid == self._a43700a813a5_subtask_uuid))
+            conn.execute(task_table.delete().where(
+                task_table.c.uuid == self._a43700a813a5_task_uuid))
+            conn.execute(deployment_table.delete().where(
+                deployment_table.c.uuid ==
+                self._a43700a813a5_deployment_uuid))
@@ -0,0 +1,79 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for codecs of workload data chunks"""
+
+import json
+
+import ddt
+import mock
+
+from rally.common.db.sqlalchemy import chunk_codec
+from rally import exceptions
+from tests.unit import test
+
+
+RAW = [{"timestamp": 1.5, "duration": 2.25, "idle_duration": 0.0,
+        "error": [], "output": {"additive": [], "complete": []},
+        "atomic_actions": [{"name": "foo", "started_at": 1.5,
+                            "finished_at": 2.5, "children": []}]},
+       {"timestamp": 2.5, "duration": 1, "error": ["Error", "msg", "tb"],
+        "atomic_actions": []},
+       {"timestamp": 3.5, "duration": 1, "scenario_output": {"data": {}}}]
+
+
+@ddt.ddt
+class ChunkCodecTestCase(test.TestCase):
+
+    @ddt.data(*chunk_codec.CODECS)
+    def test_encode_and_decode(self, codec):
+        chunk_data, size, compressed_size = chunk_codec.encode(RAW, codec)
+
+        self.assertEqual(codec, chunk_data["codec"])
+        self.assertEqual(len(json.dumps(chunk_data)), compressed_size)
+        if codec.startswith("row+"):
+            self.assertEqual(len(json.dumps(RAW, separators=(",", ":"))),
+                             size)
+        decoded = chunk_codec.decode(json.loads(json.dumps(chunk_data)))
+        self.assertEqual(RAW, decoded)
+        self.assertEqual(list(RAW[0]), list(decoded[0]))
+
+    @ddt.data(*chunk_codec.CODECS)
+    def test_encode_and_decode_empty(self, codec):
+        chunk_data, size, compressed_size = chunk_codec.encode([], codec)
+        self.assertEqual([], chunk_codec.decode(chunk_data))
+
+    def test_encode_with_default_codec(self):
+        chunk_data, size, compressed_size = chunk_codec.encode(RAW)
+        self.assertEqual(chunk_codec.DEFAULT_CODEC, chunk_data["codec"])
+
+    def test_encode_compresses(self):
+        raw = [dict(RAW[0], timestamp=i, duration=i / 7.0)
+               for i in range(1000)]
+        chunk_data, size, compressed_size = chunk_codec.encode(
+            raw, "columnar+zlib")
+        self.assertLess(compressed_size * 10, len(json.dumps(raw)))
+        self.assertLess(compressed_size, size)
+
+    def test_decode_raw(self):
+        self.assertEqual(RAW, chunk_codec.decode({"raw": RAW}))
+
+    @mock.patch.dict(chunk_codec.COMPRESSORS)
+    def test_decode_with_unavailable_compressor(self):
+        chunk_data, size, compressed_size = chunk_codec.encode(RAW,
+                                                               "row+zlib")
+        chunk_codec.COMPRESSORS.pop("zlib")
+        e = self.assertRaises(exceptions.RallyException,
+                              chunk_codec.decode, chunk_data)
+        self.assertIn("'zlib' compressor is not available", "%s" % e)
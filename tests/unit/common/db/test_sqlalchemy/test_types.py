@@ -157,3 +157,19 @@ class TimeStampTestCase(test.TestCase):
             1498561749.348996,
             types.TimeStamp().process_result_value(1498561749348996,
                                                    dialect=None))
+
+
+class LongBinaryTestCase(test.TestCase):
+    def test_load_dialect_impl(self):
+        dialect = mock.Mock()
+        dialect.name = "mysql"
+        t = types.LongBinary()
+        self.assertEqual(dialect.type_descriptor.return_value,
+                         t.load_dialect_impl(dialect))
+        dialect.type_descriptor.assert_called_once_with(
+            types.mysql_types.LONGBLOB)
+
+        dialect = mock.Mock()
+        dialect.name = "sqlite"
+        t.load_dialect_impl(dialect)
+        dialect.type_descriptor.assert_called_once_with(sa.LargeBinary)
@@ -370,10 +370,10 @@ class WorkloadTestCase(test.TestCase):
                                     runner={"type": "foo"}, context=None,
                                     sla=None, args=None, hooks=[])
 
-        workload.add_workload_data(0, {"data": "foo"})
+        workload.add_workload_data(0, {"data": "foo"}, codec="row+zlib")
         mock_workload_data_create.assert_called_once_with(
             self.workload["task_uuid"], self.workload["uuid"],
-            0, {"data": "foo"})
+            0, {"data": "foo"}, codec="row+zlib")
 
     @mock.patch("rally.common.objects.task.db.workload_set_results")
     @mock.patch("rally.common.objects.task.db.workload_create")
@@ -391,6 +391,7 @@ class WorkloadTestCase(test.TestCase):
         full_duration = 99
         start_time = 1231231277.22
         sla_results = []
+        statistics = {"total_iteration_count": 1}
         hooks = []
         workload = objects.Workload("uuid1", "uuid2", name=name,
                                     description=description, position=position,
@@ -399,14 +400,16 @@ class WorkloadTestCase(test.TestCase):
 
         workload.set_results(load_duration=load_duration,
                              full_duration=full_duration,
-                             start_time=start_time, sla_results=sla_results)
+                             start_time=start_time, sla_results=sla_results,
+                             statistics=statistics)
         mock_workload_set_results.assert_called_once_with(
             workload_uuid=self.workload["uuid"],
             subtask_uuid=self.workload["subtask_uuid"],
             task_uuid=self.workload["task_uuid"],
             load_duration=load_duration, full_duration=full_duration,
             start_time=start_time, sla_results=sla_results,
-            hooks_results=None)
+            hooks_results=None, statistics=statistics,
+            context_execution=None)
 
     def test_to_task(self):
         workload = {
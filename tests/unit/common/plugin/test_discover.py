@@ -13,8 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import sys
 import uuid
 
+import fixtures
 import mock
 
 from rally.common.plugin import discover
@@ -68,6 +71,92 @@ class IterSubclassesTestCase(test.TestCase):
 
         self.assertEqual([B, C], list(discover.itersubclasses(A)))
 
+    @mock.patch("%s.import_lazy_modules" % DISCOVER)
+    def test_itersubclasses_imports_lazy_modules(self,
+                                                 mock_import_lazy_modules):
+        class A(object):
+            pass
+
+        class B(A):
+            pass
+
+        self.assertEqual([B], list(discover.itersubclasses(A)))
+        mock_import_lazy_modules.assert_called_once_with()
+
+
+class LazyModulesTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LazyModulesTestCase, self).setUp()
+        self.useFixture(
+            fixtures.MockPatch("%s._LAZY_MODULES" % DISCOVER, []))
+        self.useFixture(
+            fixtures.MockPatch("%s._LAZY_MODULES_BY_NAME" % DISCOVER, {}))
+        self.useFixture(fixtures.MockPatchObject(sys, "modules",
+                                                 dict(sys.modules)))
+        self.mock_import_module = self.useFixture(fixtures.MockPatch(
+            "%s.importutils.import_module" % DISCOVER)).mock
+
+    def test_import_lazy_modules_by_plugin_name(self):
+        discover.add_lazy_modules(["foo", "bar", "rally"],
+                                  {"a": ["foo"], "b": ["foo", "bar"]})
+
+        discover.import_lazy_modules("a")
+        discover.import_lazy_modules("a")
+        discover.import_lazy_modules("unknown")
+        self.mock_import_module.assert_called_once_with("foo")
+        self.assertEqual(self.mock_import_module.return_value,
+                         sys.modules["foo"])
+
+        discover.import_lazy_modules("b")
+        self.assertEqual([mock.call("foo"), mock.call("bar")],
+                         self.mock_import_module.call_args_list)
+
+    def test_import_lazy_modules(self):
+        discover.add_lazy_modules(["foo", "bar"], {"a": ["foo"]})
+
+        discover.import_lazy_modules()
+        discover.import_lazy_modules()
+        discover.import_lazy_modules("a")
+
+        self.assertEqual([mock.call("foo"), mock.call("bar")],
+                         self.mock_import_module.call_args_list)
+
+
+class FindModulesTestCase(test.TestCase):
+
+    def test_find_modules_in_package(self):
+        modules = discover.find_modules_in_package(
+            "rally.plugins.common.scenarios.dummy")
+
+        self.assertIn("rally.plugins.common.scenarios.dummy.dummy",
+                      [name for name, path in modules])
+        for name, path in modules:
+            self.assertTrue(os.path.isfile(path))
+            self.assertTrue(path.endswith(
+                os.path.join(*name.split(".")) + ".py"))
+
+    @mock.patch("%s.pkgutil.walk_packages" % DISCOVER)
+    @mock.patch("%s.pkg_resources" % DISCOVER)
+    def test_find_modules_by_entry_point(self, mock_pkg_resources,
+                                         mock_walk_packages):
+        package = mock.Mock(__name__="foo", __path__=["/foo"])
+        entry_points = [mock.Mock(), mock.Mock()]
+        entry_points[0].name = "path"
+        entry_points[0].load.return_value = package
+        entry_points[0].dist.project_name = "foo-plugins"
+        entry_points[0].dist.version = "1.0"
+        entry_points[1].name = "other"
+        mock_pkg_resources.iter_entry_points.return_value = entry_points
+        mock_walk_packages.return_value = [(None, "foo.bar", False),
+                                           (None, "foo.baz", True)]
+
+        self.assertEqual(
+            [(package, "foo-plugins 1.0", ["foo.bar", "foo.baz"])],
+            discover.find_modules_by_entry_point())
+        mock_walk_packages.assert_called_once_with(["/foo"], prefix="foo.")
+        self.assertFalse(entry_points[1].load.called)
+
 
 class LoadExtraModulesTestCase(test.TestCase):
 
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import gc
+
 from rally.common.plugin import plugin
 from rally import exceptions
 from tests.unit import test
@@ -244,6 +246,46 @@ class PluginTestCase(test.TestCase):
 
         A.unregister()
 
+    def test_get_renamed(self):
+
+        @plugin.configure(name="test_plugin_to_rename")
+        class SomeTempPlugin(BasePlugin):
+            pass
+
+        self.addCleanup(SomeTempPlugin.unregister)
+        SomeTempPlugin._meta_set("name", "test_renamed_plugin")
+
+        self.assertEqual(SomeTempPlugin,
+                         BasePlugin.get("test_renamed_plugin"))
+        self.assertRaises(exceptions.PluginNotFound,
+                          BasePlugin.get, "test_plugin_to_rename")
+
+    def test_get_not_indexed(self):
+
+        class SomeTempPlugin(BasePlugin):
+            _meta = {"name": "test_not_indexed_plugin",
+                     "platform": "default"}
+
+        self.assertEqual([], BasePlugin._get_indexed(
+            "test_not_indexed_plugin"))
+        self.assertEqual(SomeTempPlugin,
+                         BasePlugin.get("test_not_indexed_plugin"))
+
+    def test_get_garbage_collected(self):
+
+        @plugin.configure(name="test_collected_plugin")
+        class SomeTempPlugin(BasePlugin):
+            pass
+
+        self.assertEqual([SomeTempPlugin],
+                         BasePlugin._get_indexed("test_collected_plugin"))
+        del SomeTempPlugin
+        gc.collect()
+
+        self.assertEqual([], BasePlugin._get_indexed("test_collected_plugin"))
+        self.assertRaises(exceptions.PluginNotFound,
+                          BasePlugin.get, "test_collected_plugin")
+
     def test_get_name(self):
         self.assertEqual("test_some_plugin", SomePlugin.get_name())
 
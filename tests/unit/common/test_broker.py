@@ -13,7 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import collections
+import threading
 
 import mock
 
@@ -21,25 +21,71 @@ from rally.common import broker
 from tests.unit import test
 
 
+class TokenBucketTestCase(test.TestCase):
+
+    @mock.patch("rally.common.broker.time")
+    def test_acquire(self, mock_time):
+        mock_time.time.return_value = 10
+        bucket = broker.TokenBucket(rate=2, burst=2)
+
+        bucket.acquire()
+        bucket.acquire()
+        self.assertFalse(mock_time.sleep.called)
+
+        def sleep(delay):
+            mock_time.time.return_value += delay
+
+        mock_time.sleep.side_effect = sleep
+        bucket.acquire()
+        mock_time.sleep.assert_called_once_with(0.5)
+
+        mock_time.time.return_value += 10
+        mock_time.sleep.reset_mock()
+        bucket.acquire()
+        bucket.acquire()
+        self.assertFalse(mock_time.sleep.called)
+
+    def test_get_rate_limiter(self):
+        self.assertIsNone(broker.get_rate_limiter("foo", 0))
+        self.assertIsNone(broker.get_rate_limiter("foo", None))
+
+        limiter = broker.get_rate_limiter("foo", 10)
+        self.assertIsInstance(limiter, broker.TokenBucket)
+        self.assertEqual(10, limiter.rate)
+        self.assertIs(limiter, broker.get_rate_limiter("foo", 10))
+        self.assertIsNot(limiter, broker.get_rate_limiter("bar", 10))
+
+
 class BrokerTestCase(test.TestCase):
 
+    def _get_queue(self, items, **kwargs):
+        queue = broker._JobQueue(**kwargs)
+        for item in items:
+            queue.append(item)
+        queue.finish_publishing()
+        return queue
+
     def test__publisher(self):
         mock_publish = mock.MagicMock()
-        queue = collections.deque()
+        queue = broker._JobQueue()
         broker._publisher(mock_publish, queue)
         mock_publish.assert_called_once_with(queue)
+        self.assertFalse(queue.publishing)
 
     def test__publisher_fails(self):
         mock_publish = mock.MagicMock(side_effect=Exception())
-        queue = collections.deque()
+        queue = broker._JobQueue()
         broker._publisher(mock_publish, queue)
+        self.assertFalse(queue.publishing)
 
     def test__consumer(self):
-        queue = collections.deque([1, 2, 3])
+        queue = self._get_queue([1, 2, 3])
         mock_consume = mock.MagicMock()
         broker._consumer(mock_consume, queue)
         self.assertEqual(3, mock_consume.call_count)
         self.assertEqual(0, len(queue))
+        self.assertEqual({"published": 3, "consumed": 3, "retried": 0,
+                          "failed": 0}, queue.stats)
 
     def test__consumer_cache(self):
         cache_keys_history = []
@@ -48,27 +94,63 @@ class BrokerTestCase(test.TestCase):
             cache[item] = True
             cache_keys_history.append(list(cache))
 
-        queue = collections.deque([1, 2, 3])
+        queue = self._get_queue([1, 2, 3])
         broker._consumer(consume, queue)
         self.assertEqual([[1], [1, 2], [1, 2, 3]], cache_keys_history)
 
     def test__consumer_fails(self):
-        queue = collections.deque([1, 2, 3])
+        queue = self._get_queue([1, 2, 3])
         mock_consume = mock.MagicMock(side_effect=Exception())
         broker._consumer(mock_consume, queue)
         self.assertEqual(0, len(queue))
+        self.assertEqual(3, queue.stats["failed"])
 
     @mock.patch("rally.common.broker.LOG")
     def test__consumer_indexerror(self, mock_log):
         consume = mock.Mock()
         consume.side_effect = IndexError()
-        queue = collections.deque([1, 2, 3])
+        queue = self._get_queue([1, 2, 3])
         broker._consumer(consume, queue)
         self.assertTrue(mock_log.warning.called)
         self.assertFalse(queue)
         expected = [mock.call({}, 1), mock.call({}, 2), mock.call({}, 3)]
         self.assertEqual(expected, consume.mock_calls)
 
+    @mock.patch("rally.common.broker.LOG")
+    def test__consumer_retries(self, mock_log):
+        consume = mock.Mock(side_effect=[Exception(), None, Exception(),
+                                         Exception(), Exception()])
+        queue = self._get_queue([1, 2], retries=2, retry_interval=0)
+        broker._consumer(consume, queue)
+        # NOTE: retries which are ready are consumed before new values
+        self.assertEqual([mock.call({}, 1), mock.call({}, 1),
+                          mock.call({}, 2), mock.call({}, 2),
+                          mock.call({}, 2)], consume.mock_calls)
+        self.assertEqual({"published": 2, "consumed": 1, "retried": 3,
+                          "failed": 1}, queue.stats)
+
+    @mock.patch("rally.common.broker.time")
+    def test__job_queue_retry_delay(self, mock_time):
+        mock_time.time.return_value = 10
+        queue = broker._JobQueue(retries=2, retry_interval=3)
+        queue.append("foo")
+        queue.finish_publishing()
+
+        attempt, job = queue.get()
+        queue.done(attempt, job, failed=True)
+        self.assertEqual([(13, mock.ANY, 1, "foo")], queue._delayed)
+
+        mock_time.time.return_value = 13
+        attempt, job = queue.get()
+        queue.done(attempt, job, failed=True)
+        self.assertEqual([(19, mock.ANY, 2, "foo")], queue._delayed)
+
+    def test__consumer_with_rate_limiter(self):
+        rate_limiter = mock.Mock()
+        queue = self._get_queue([1, 2, 3])
+        broker._consumer(mock.Mock(), queue, rate_limiter)
+        self.assertEqual(3, rate_limiter.acquire.call_count)
+
     def test_run(self):
 
         def publish(queue):
@@ -82,5 +164,21 @@ class BrokerTestCase(test.TestCase):
             consumed.add(item)
 
         consumer_count = 2
-        broker.run(publish, consume, consumer_count)
+        stats = broker.run(publish, consume, consumer_count)
         self.assertEqual(set([1, 2, 3]), consumed)
+        self.assertEqual({"published": 3, "consumed": 3, "retried": 0,
+                          "failed": 0}, stats)
+
+    def test_run_consumes_while_publishing(self):
+        consumed = threading.Event()
+
+        def publish(queue):
+            queue.append(1)
+            self.assertTrue(consumed.wait(10))
+            queue.append(2)
+
+        def consume(cache, item):
+            consumed.set()
+
+        stats = broker.run(publish, consume, 1)
+        self.assertEqual(2, stats["consumed"])
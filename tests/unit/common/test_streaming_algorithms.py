@@ -14,6 +14,7 @@
 #    under the License.
 
 import math
+import random
 
 import ddt
 import six
@@ -221,11 +222,15 @@ class PercentileComputationTestCase(test.TestCase):
         {"stream": "mixed50", "percent": 0.50, "expected": 51.89},
         {"stream": "mixed50", "percent": 0.90, "expected":
             82.81300000000002},
+        # NOTE: the stream is longer than exact_limit, so the results are
+        #   approximated by QuantileSketch (exact values are 25.03, 51.89
+        #   and 82.2)
         {"stream": "mixed5000", "percent": 0.25, "expected":
-            35.54600000000001},
-        {"stream": "mixed5000", "percent": 0.50, "expected": 48.351},
+            24.78049876990332},
+        {"stream": "mixed5000", "percent": 0.50, "expected":
+            51.939608676811304},
         {"stream": "mixed5000", "percent": 0.90, "expected":
-            66.05880000000437},
+            82.27744454924074},
         {"stream": "range5000", "percent": 0.25, "expected": 1249.75},
         {"stream": "range5000", "percent": 0.50, "expected": 2499.5},
         {"stream": "range5000", "percent": 0.90, "expected": 4499.1})
@@ -245,6 +250,197 @@ class PercentileComputationTestCase(test.TestCase):
         comp = algo.PercentileComputation(0.50, 100)
         self.assertIsNone(comp.result())
 
+    @ddt.data("mixed1", "mixed6", "mixed16", "mixed50", "range5000")
+    def test_add_and_result_unknown_length(self, stream):
+        for percent in (0.25, 0.5, 0.9):
+            comp = algo.PercentileComputation(percent=percent)
+            expected = algo.PercentileComputation(
+                percent=percent, length=len(getattr(self, stream)))
+            for value in getattr(self, stream):
+                comp.add(value)
+                expected.add(value)
+            self.assertEqual(expected.result(), comp.result())
+
+    def test_add_raises_unknown_length(self):
+        comp = algo.PercentileComputation(0.50)
+        self.assertRaises(TypeError, comp.add, "foo")
+        self.assertIsNone(comp.result())
+
+    def test_merge(self):
+        single = algo.PercentileComputation(0.90)
+        merged = algo.PercentileComputation(0.90)
+        other = algo.PercentileComputation(0.90)
+        for i, value in enumerate(self.mixed50):
+            single.add(value)
+            (merged if i % 2 else other).add(value)
+        merged.merge(other)
+        self.assertEqual(single.result(), merged.result())
+
+    def test_add_and_result_long_stream(self):
+        comp = algo.PercentileComputation(0.9)
+        comp.exact_limit = 100
+        for value in range(1, 1001):
+            comp.add(value)
+        self.assertIsNotNone(comp._sketch)
+        self.assertEqual([], comp._values)
+        self.assertLessEqual(abs(comp.result() - 900), 9)
+
+    @ddt.data((10, 20), (60, 20), (60, 60), (20, 60), (200, 300))
+    @ddt.unpack
+    def test_merge_long_streams(self, count, other_count):
+        single = algo.PercentileComputation(0.5)
+        comp = algo.PercentileComputation(0.5)
+        other = algo.PercentileComputation(0.5)
+        for c in (single, comp, other):
+            c.exact_limit = 100
+        for value in range(1, count + 1):
+            single.add(value)
+            comp.add(value)
+        for value in range(count + 1, count + other_count + 1):
+            single.add(value)
+            other.add(value)
+
+        comp.merge(other)
+
+        self.assertEqual(single.result(), comp.result())
+
+
+@ddt.ddt
+class AddManyTestCase(test.TestCase):
+
+    @ddt.data(algo.MeanComputation, algo.StdDevComputation,
+              algo.MinComputation, algo.MaxComputation,
+              algo.IncrementComputation, algo.DegradationComputation,
+              lambda: algo.PercentileComputation(0.9))
+    def test_add_many(self, computation_cls):
+        values = [random.Random(i).uniform(0.1, 10) for i in range(50)]
+        values += [3, 5, 7]
+        single = computation_cls()
+        comp = computation_cls()
+        for value in values:
+            single.add(value)
+        comp.add_many(values[:20])
+        comp.add_many([])
+        comp.add_many(values[20:])
+        self.assertEqual(single.result(), comp.result())
+
+    def test_percentile_add_many_long_stream(self):
+        single = algo.PercentileComputation(0.5)
+        comp = algo.PercentileComputation(0.5)
+        for c in (single, comp):
+            c.exact_limit = 100
+        values = list(range(-50, 300))
+        for value in values:
+            single.add(value)
+        for i in range(0, len(values), 30):
+            comp.add_many(values[i:i + 30])
+        self.assertEqual(single.result(), comp.result())
+
+    @ddt.data(algo.MinComputation, algo.MaxComputation,
+              lambda: algo.PercentileComputation(0.9))
+    def test_add_many_raises(self, computation_cls):
+        e = self.assertRaises(TypeError, computation_cls().add_many,
+                              [1, "foo"])
+        self.assertEqual("Non-numerical value: 'foo'", str(e))
+
+
+@ddt.ddt
+class QuantileSketchTestCase(test.TestCase):
+
+    def _generate(self, distribution, count, seed=42):
+        rnd = random.Random(seed)
+        generators = {
+            "uniform": lambda: rnd.uniform(0.1, 10),
+            "lognormal": lambda: rnd.lognormvariate(0, 2),
+            "exponential": lambda: rnd.expovariate(0.5),
+            # e.g. durations with a timeout of a few iterations
+            "bimodal": lambda: (rnd.gauss(1, 0.1) if rnd.random() < 0.9
+                                else rnd.gauss(300, 5)),
+            "mixed_signs": lambda: rnd.gauss(0, 100),
+            "with_zeros": lambda: rnd.choice([0, 0, rnd.uniform(0, 5)])}
+        return [generators[distribution]() for i in range(count)]
+
+    def _assert_accurate(self, sketch, values):
+        values = sorted(values)
+        self.assertEqual(len(values), sketch.count)
+        for q in (0, 0.01, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 0.999, 1):
+            exact = values[int(q * (len(values) - 1))]
+            error = abs(sketch.quantile(q) - exact)
+            self.assertLessEqual(
+                error, abs(exact) * sketch.relative_accuracy + 1e-12,
+                "Quantile %s: %s instead of %s" % (q, sketch.quantile(q),
+                                                   exact))
+
+    @ddt.data("uniform", "lognormal", "exponential", "bimodal",
+              "mixed_signs", "with_zeros")
+    def test_quantile(self, distribution):
+        values = self._generate(distribution, 100000)
+        sketch = algo.QuantileSketch()
+        for value in values:
+            sketch.add(value)
+
+        self._assert_accurate(sketch, values)
+        self.assertEqual(min(values), sketch.quantile(0))
+        self.assertEqual(max(values), sketch.quantile(1))
+        # the memory doesn't depend on the length of the stream
+        self.assertLess(len(sketch._positive.counts) +
+                        len(sketch._negative.counts), 2000)
+
+    @ddt.data("uniform", "lognormal", "mixed_signs")
+    def test_merge(self, distribution):
+        values = self._generate(distribution, 100000)
+        single = algo.QuantileSketch()
+        parts = [algo.QuantileSketch() for i in range(7)]
+        for i, value in enumerate(values):
+            single.add(value)
+            parts[i % len(parts)].add(value)
+
+        merged = algo.QuantileSketch()
+        for part in parts:
+            merged.merge(part)
+
+        self._assert_accurate(merged, values)
+        for q in (0.1, 0.5, 0.9, 0.95):
+            self.assertEqual(single.quantile(q), merged.quantile(q))
+
+    def test_merge_empty(self):
+        sketch = algo.QuantileSketch()
+        sketch.add(1)
+        sketch.merge(algo.QuantileSketch())
+        self.assertEqual(1, sketch.count)
+
+        empty = algo.QuantileSketch()
+        empty.merge(sketch)
+        self.assertEqual(1, empty.quantile(0.5))
+
+    def test_merge_with_another_accuracy(self):
+        sketch = algo.QuantileSketch(0.01)
+        self.assertRaises(ValueError, sketch.merge, algo.QuantileSketch(0.05))
+
+    def test_quantile_empty(self):
+        self.assertIsNone(algo.QuantileSketch().quantile(0.5))
+
+    def test_init_with_wrong_accuracy(self):
+        self.assertRaises(ValueError, algo.QuantileSketch, 0)
+        self.assertRaises(ValueError, algo.QuantileSketch, 1)
+
+    def test_collapse(self):
+        sketch = algo.QuantileSketch(max_buckets=100)
+        values = [10 ** (i / 100.0) for i in range(-1000, 1000)]
+        for value in values:
+            sketch.add(value)
+
+        self.assertEqual(100, len(sketch._positive.counts))
+        # the largest values are still accurate
+        values.sort()
+        for q in (0.99, 0.999):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertLessEqual(abs(sketch.quantile(q) - exact),
+                                 exact * sketch.relative_accuracy)
+        # the smallest ones are overestimated but not lost
+        self.assertEqual(len(values), sketch.count)
+        self.assertLess(values[1], sketch.quantile(0.01))
+
 
 class IncrementComputationTestCase(test.TestCase):
 
@@ -14,6 +14,8 @@
 
 from __future__ import print_function
 import collections
+import copy
+import pickle
 import string
 import sys
 import threading
@@ -21,7 +23,6 @@ import time
 
 import ddt
 import mock
-from six.moves import queue as Queue
 import testtools
 
 from rally.common import utils
@@ -460,38 +461,30 @@ class MergeTestCase(test.TestCase):
         self.assertEqual(expected_output, out)
 
 
-class TimeoutThreadTestCase(test.TestCase):
-    def test_timeout_thread(self):
-        """Create and kill thread by timeout.
+class TerminateThreadTestCase(test.TestCase):
+    def test_terminate_thread(self):
+        """Create and kill thread.
 
-        This single test covers 3 methods: terminate_thread, timeout_thread,
-        and interruptable_sleep.
+        This single test covers 2 methods: terminate_thread and
+        interruptable_sleep.
 
         This test is more like integrated then unit, but it is much better
         then unreadable 500 lines of mocking and checking.
         """
-        queue = Queue.Queue()
-        killer_thread = threading.Thread(
-            target=utils.timeout_thread,
-            args=(queue,),
-        )
         test_thread = threading.Thread(
             target=utils.interruptable_sleep,
             args=(30, 0.01),
         )
         test_thread.start()
         start_time = time.time()
-        queue.put((test_thread, start_time + 1))
-        killer_thread.start()
+        utils.terminate_thread(test_thread.ident)
         test_thread.join()
         end_time = time.time()
-        queue.put((None, None))
-        killer_thread.join()
         time_elapsed = end_time - start_time
         # NOTE(sskripnick): Killing thread with PyThreadState_SetAsyncExc
         # works with sinificant delay. Make sure this delay is less
         # than 10 seconds.
-        self.assertLess(time_elapsed, 11,
+        self.assertLess(time_elapsed, 10,
                         "Thread killed too late (%s seconds)" % time_elapsed)
 
 
@@ -558,6 +551,71 @@ class LockedDictTestCase(test.TestCase):
                          args)
         self.assertEqual({"memo": "foo_memo"}, kw)
 
+    def test_pickle(self):
+        d = utils.LockedDict(foo="bar", spam={"a": ["b", {"c": "d"}]})
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            loaded = pickle.loads(pickle.dumps(d, protocol))
+            self.assertEqual(d, loaded)
+            self.assertIsInstance(loaded, utils.LockedDict)
+            self.assertIsInstance(loaded["spam"]["a"][1], utils.LockedDict)
+            self.assertRaises(RuntimeError, loaded.clear)
+
+
+class CopyOnWriteDictTestCase(test.TestCase):
+
+    def setUp(self):
+        super(CopyOnWriteDictTestCase, self).setUp()
+        self.base = utils.LockedDict(foo="bar", spam={"a": {"b": "c"}},
+                                     eggs=[{"d": "e"}])
+        self.d = utils.CopyOnWriteDict(self.base, iteration=1)
+
+    def test_update(self):
+        self.assertEqual({"foo": "bar", "spam": {"a": {"b": "c"}},
+                          "eggs": ({"d": "e"},), "iteration": 1}, self.d)
+
+        self.d["foo"] = 42
+        self.d["spam"]["a"]["b"] = 24
+        self.d["spam"]["x"] = "y"
+        self.d.get("spam").setdefault("z", []).append(1)
+        del self.d["eggs"]
+
+        self.assertEqual({"foo": 42, "iteration": 1,
+                          "spam": {"a": {"b": 24}, "x": "y", "z": [1]}},
+                         self.d)
+        self.assertEqual({"foo": "bar", "spam": {"a": {"b": "c"}},
+                          "eggs": ({"d": "e"},)}, self.base)
+        self.assertIsInstance(self.d["spam"], utils.CopyOnWriteDict)
+        self.assertIsNone(self.d.get("eggs"))
+
+    def test_views_are_independent(self):
+        other = utils.CopyOnWriteDict(self.base, iteration=2)
+        self.d["spam"]["a"]["b"] = 24
+
+        self.assertEqual({"b": "c"}, other["spam"]["a"])
+        self.assertEqual(2, other["iteration"])
+
+    def test_values_and_items(self):
+        for key, value in self.d["spam"].items():
+            value["b"] = 24
+        for value in self.d["spam"].values():
+            value["f"] = "g"
+
+        self.assertEqual({"a": {"b": 24, "f": "g"}}, self.d["spam"])
+        self.assertEqual({"a": {"b": "c"}}, self.base["spam"])
+
+    def test_nested_tuples_are_read_only(self):
+        self.assertRaises(RuntimeError,
+                          self.d["eggs"][0].__setitem__, "d", "f")
+
+    def test___deepcopy__(self):
+        self.d["spam"]["x"] = "y"
+        copied = copy.deepcopy(self.d)
+
+        self.assertEqual(self.d, copied)
+        self.assertEqual(dict, type(copied))
+        self.assertEqual(dict, type(copied["spam"]))
+        self.assertEqual(dict, type(copied["spam"]["a"]))
+
 
 @ddt.ddt
 class FloatFormatterTestCase(test.TestCase):
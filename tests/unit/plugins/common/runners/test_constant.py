@@ -63,17 +63,10 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
         mock_runner._run_scenario_once.assert_called_once_with(
             "FOO", ("BAR", "QUUZ"))
 
-    @mock.patch(RUNNERS + "constant.time")
-    @mock.patch(RUNNERS + "constant.threading.Thread")
-    @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
     @mock.patch(RUNNERS + "constant.runner")
-    def test__worker_process(self, mock_runner, mock_queue, mock_thread,
-                             mock_time):
-
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
-        mock_thread.return_value = mock_thread_instance
-
+    def test__worker_process(self, mock_runner):
+        mock_pool = mock_runner.WorkerThreadPool.return_value
+        mock_queue = mock.MagicMock()
         mock_event = mock.MagicMock(
             is_set=mock.MagicMock(return_value=False))
 
@@ -91,22 +84,20 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                                  context, "Dummy", "dummy", (),
                                  mock_event_queue, mock_event, info)
 
-        self.assertEqual(times + 1, mock_thread.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.start.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.join.call_count)
-        # NOTE(rvasilets): `times` + 1 here because `times` the number of
-        # scenario repetition and one more need on "initialization" stage
-        # of the thread stuff.
+        mock_runner.WorkerThreadPool.assert_called_once_with(2, timeout=1)
+        # NOTE: `times` + 1 here because the last slot is
+        # acquired to find out that there is no more iterations to run
+        self.assertEqual(times + 1, mock_pool.wait_for_free_slot.call_count)
         self.assertEqual(times, mock_runner._get_scenario_context.call_count)
-
-        for i in range(times):
-            scenario_context = mock_runner._get_scenario_context(i, context)
-            call = mock.call(
-                args=(mock_queue, "Dummy", "dummy", scenario_context, (),
-                      mock_event_queue),
-                target=mock_runner._worker_thread,
-            )
-            self.assertIn(call, mock_thread.mock_calls)
+        self.assertEqual(
+            [mock.call(mock_runner._worker_thread, mock_queue, "Dummy",
+                       "dummy",
+                       mock_runner._get_scenario_context.return_value, (),
+                       mock_event_queue)] * times,
+            mock_pool.submit.call_args_list)
+        mock_runner._get_scenario_context.assert_has_calls(
+            [mock.call(i, context) for i in range(times)])
+        mock_pool.join.assert_called_once_with()
 
     @mock.patch(RUNNERS_BASE + "_run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
@@ -129,7 +120,8 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
 
         runner_obj._run_scenario(
             fakes.FakeScenario, "do_it", self.context, self.args)
-        self.assertEqual(self.config["times"], len(runner_obj.result_queue))
+        self.assertEqual(self.config["times"],
+                         sum(len(batch) for batch in runner_obj.result_queue))
         for result_batch in runner_obj.result_queue:
             for result in result_batch:
                 self.assertIsNotNone(result)
@@ -139,7 +131,8 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
 
         runner_obj._run_scenario(fakes.FakeScenario, "something_went_wrong",
                                  self.context, self.args)
-        self.assertEqual(self.config["times"], len(runner_obj.result_queue))
+        self.assertEqual(self.config["times"],
+                         sum(len(batch) for batch in runner_obj.result_queue))
         for result_batch in runner_obj.result_queue:
             for result in result_batch:
                 self.assertIsNotNone(result)
@@ -153,7 +146,7 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                                  self.args)
         self.assertEqual(0, len(runner_obj.result_queue))
 
-    @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
+    @mock.patch(RUNNERS + "constant.runner.BatchedPipe")
     @mock.patch(RUNNERS + "constant.multiprocessing.cpu_count")
     @mock.patch(RUNNERS + "constant.ConstantScenarioRunner._log_debug_info")
     @mock.patch(RUNNERS +
@@ -164,7 +157,7 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
             mock__join_processes,
             mock__create_process_pool,
             mock__log_debug_info,
-            mock_cpu_count, mock_queue):
+            mock_cpu_count, mock_batched_pipe):
 
         samples = [
             {
@@ -221,7 +214,7 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
             mock_cpu_count.reset_mock()
             mock__create_process_pool.reset_mock()
             mock__join_processes.reset_mock()
-            mock_queue.reset_mock()
+            mock_batched_pipe.reset_mock()
 
             mock_cpu_count.return_value = sample["real_cpu"]
 
@@ -247,7 +240,9 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
             self.assertIn(constant._worker_process, args)
             mock__join_processes.assert_called_once_with(
                 mock__create_process_pool.return_value,
-                mock_queue.return_value, mock_queue.return_value)
+                mock_batched_pipe.return_value,
+                mock_batched_pipe.return_value,
+                validate_results=False)
 
     def test_abort(self):
         runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
@@ -0,0 +1,342 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime as dt
+import os
+import tempfile
+import threading
+
+import ddt
+import fixtures
+import mock
+from oslo_config import fixture
+from oslo_utils import timeutils
+
+from rally.common import db
+from rally import consts
+from rally import exceptions
+from rally.plugins.common.runners import distributed
+from rally.task import runner
+from rally.task import sla
+from rally.task import worker
+from tests.unit import test
+
+
+RUNNERS = "rally.plugins.common.runners."
+
+
+@ddt.ddt
+class DistributedScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DistributedScenarioRunnerTestCase, self).setUp()
+        self.config = {"type": "distributed", "times": 10, "concurrency": 2,
+                       "iterations_per_job": 4}
+        self.context = {"task": {"uuid": "task_uuid"},
+                        "owner_id": "workload_uuid",
+                        "scenario_name": "Dummy.dummy"}
+        self.task = mock.MagicMock()
+        self.conf = self.useFixture(fixture.Config())
+        self.conf.config(distributed_secret_key="secret")
+
+    @ddt.data(({"type": "distributed", "times": 4, "concurrency": 2,
+                "timeout": 2, "iterations_per_job": 2,
+                "worker_timeout": 10}, True),
+              ({"type": "distributed", "iterations_per_job": 0}, False),
+              ({"type": "distributed", "foo": "bar"}, False))
+    @ddt.unpack
+    def test_validate(self, config, valid):
+        results = runner.ScenarioRunner.validate(
+            "distributed", None, None, config)
+        if valid:
+            self.assertEqual([], results)
+        else:
+            self.assertGreater(len(results), 0)
+
+    @mock.patch(RUNNERS + "distributed.worker.dump_job")
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__create_jobs(self, mock_db, mock_dump_job):
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+        runner_obj._create_jobs(self.context, {"a": 1})
+
+        mock_db.workload_get.assert_called_once_with("workload_uuid")
+        mock_dump_job.assert_called_once_with(
+            scenario_name="Dummy.dummy", context=self.context,
+            args={"a": 1}, sla_config=mock_db.workload_get.return_value["sla"],
+            concurrency=2, timeout=0)
+        self.assertEqual(
+            [mock.call("workload_uuid", 0, 4, mock_dump_job.return_value),
+             mock.call("workload_uuid", 4, 4, mock_dump_job.return_value),
+             mock.call("workload_uuid", 8, 2, mock_dump_job.return_value)],
+            mock_db.worker_job_create.call_args_list)
+        self.assertEqual(mock_db.workload_get.return_value["sla"],
+                         runner_obj._sla_config)
+
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__create_jobs_without_secret_key(self, mock_db):
+        self.conf.config(distributed_secret_key=None)
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+        self.assertRaises(exceptions.InvalidConfigException,
+                          runner_obj._create_jobs, self.context, {})
+        self.assertFalse(mock_db.worker_job_create.called)
+
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__release_jobs_of_dead_workers(self, mock_db):
+        now = timeutils.utcnow()
+        workers = {"alive": {"updated_at": now},
+                   "dead": {"updated_at": now - dt.timedelta(seconds=61)}}
+
+        def get_worker(hostname):
+            if hostname not in workers:
+                raise exceptions.WorkerNotFound(worker=hostname)
+            return workers[hostname]
+
+        mock_db.get_worker.side_effect = get_worker
+        running = consts.WorkerJobStatus.RUNNING
+        jobs = [{"uuid": "j1", "hostname": None,
+                 "status": consts.WorkerJobStatus.PENDING},
+                {"uuid": "j2", "hostname": "alive", "status": running},
+                {"uuid": "j3", "hostname": "alive", "status": running},
+                {"uuid": "j4", "hostname": "dead", "status": running},
+                {"uuid": "j5", "hostname": "dead",
+                 "status": consts.WorkerJobStatus.ABORTED},
+                {"uuid": "j6", "hostname": "unregistered", "status": running}]
+
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+        self.assertTrue(runner_obj._release_jobs_of_dead_workers(jobs))
+
+        self.assertEqual([mock.call("alive"), mock.call("dead"),
+                          mock.call("unregistered")],
+                         mock_db.get_worker.call_args_list)
+        self.assertEqual([mock.call("j4", "dead"),
+                          mock.call("j6", "unregistered")],
+                         mock_db.worker_job_release.call_args_list)
+        mock_db.worker_job_delete.assert_called_once_with("j5")
+
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__release_jobs_of_dead_workers_without_alive_ones(self, mock_db):
+        mock_db.get_worker.side_effect = exceptions.WorkerNotFound(
+            worker="foo")
+        jobs = [{"uuid": "j1", "hostname": None,
+                 "status": consts.WorkerJobStatus.PENDING},
+                {"uuid": "j2", "hostname": "foo",
+                 "status": consts.WorkerJobStatus.RUNNING}]
+
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+        self.assertFalse(runner_obj._release_jobs_of_dead_workers(jobs))
+        mock_db.worker_job_release.assert_called_once_with("j2", "foo")
+
+    @mock.patch(RUNNERS + "distributed.worker.load_job_results")
+    def test__load_job_results(self, mock_load_job_results):
+        sla_checker = mock.Mock()
+        mock_load_job_results.return_value = ([{"foo": "bar"}], sla_checker)
+        job = {"uuid": "job_uuid", "times": 1, "results": b"r"}
+
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+        self.assertEqual(([{"foo": "bar"}], sla_checker),
+                         runner_obj._load_job_results(job))
+        mock_load_job_results.assert_called_once_with(job)
+
+    @mock.patch(RUNNERS + "distributed.worker.load_job_results")
+    def test__load_job_results_without_sla_checker(self,
+                                                   mock_load_job_results):
+        results = [{"duration": 1, "error": []},
+                   {"duration": 1, "error": ["Exception", "", ""]}]
+        mock_load_job_results.return_value = (results, None)
+
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+        runner_obj._sla_config = {"failure_rate": {"max": 0}}
+        loaded, sla_checker = runner_obj._load_job_results(
+            {"uuid": "job_uuid", "times": 2, "results": b"r"})
+
+        self.assertEqual(results, loaded)
+        self.assertEqual(2, sla_checker.sla_criteria[0].total)
+        self.assertFalse(sla_checker.sla_criteria[0].success)
+
+    def test__load_job_results_not_authenticated(self):
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+        runner_obj._sla_config = {"failure_rate": {"max": 0}}
+        results, sla_checker = runner_obj._load_job_results(
+            {"uuid": "job_uuid", "times": 2, "results": b"foo"})
+
+        self.assertEqual(2, len(results))
+        for result in results:
+            self.assertEqual("WorkerDataNotAuthenticated", result["error"][0])
+        self.assertEqual(2, sla_checker.sla_criteria[0].total)
+
+    @mock.patch(RUNNERS + "distributed.worker.load_job_results")
+    @mock.patch(RUNNERS + "distributed.db")
+    @mock.patch(RUNNERS + "distributed.DistributedScenarioRunner."
+                "_release_jobs_of_dead_workers")
+    @mock.patch(RUNNERS + "distributed.DistributedScenarioRunner."
+                "_create_jobs")
+    def test__run_scenario(self, mock__create_jobs,
+                           mock__release_jobs_of_dead_workers, mock_db,
+                           mock_load_job_results):
+        results = [{"timestamp": 2}, {"timestamp": 1}]
+        sla_checker = mock.Mock()
+        mock_load_job_results.return_value = (results, sla_checker)
+        running_job = {"uuid": "j2", "hostname": "foo",
+                       "status": consts.WorkerJobStatus.RUNNING}
+        finished_jobs = [{"uuid": "j1", "results": "r1"},
+                         {"uuid": "j2", "results": "r2"}]
+        mock_db.worker_job_list.side_effect = [
+            [], [running_job],
+            [finished_jobs[0]], [running_job],
+            [finished_jobs[1]], []]
+
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+        runner_obj.aborted = mock.Mock()
+        runner_obj.aborted.is_set.return_value = False
+        runner_obj._run_scenario("cls", "run", self.context, {"a": 1})
+
+        mock__create_jobs.assert_called_once_with(self.context, {"a": 1})
+        self.assertEqual(
+            [mock.call([running_job])] * 2,
+            mock__release_jobs_of_dead_workers.call_args_list)
+        self.assertEqual([mock.call(job) for job in finished_jobs],
+                         mock_load_job_results.call_args_list)
+        self.assertEqual([mock.call("j1"), mock.call("j2")],
+                         mock_db.worker_job_delete.call_args_list)
+        self.assertEqual(2, len(runner_obj.result_queue))
+        for batch in runner_obj.result_queue:
+            self.assertIsInstance(batch, runner.ResultBatch)
+            self.assertEqual([{"timestamp": 1}, {"timestamp": 2}], batch)
+            self.assertEqual(sla_checker, batch.sla_checker)
+        self.assertEqual([{"type": "iteration", "value": i}
+                          for i in range(1, 5)],
+                         list(runner_obj.event_queue))
+        self.assertEqual([mock.call(runner_obj.POLL_INTERVAL)] * 2,
+                         runner_obj.aborted.wait.call_args_list)
+        self.assertFalse(mock_db.worker_jobs_abort.called)
+        mock_db.worker_jobs_delete.assert_called_once_with("workload_uuid")
+
+    @mock.patch(RUNNERS + "distributed.time.time")
+    @mock.patch(RUNNERS + "distributed.db")
+    @mock.patch(RUNNERS + "distributed.DistributedScenarioRunner."
+                "_release_jobs_of_dead_workers", return_value=False)
+    @mock.patch(RUNNERS + "distributed.DistributedScenarioRunner."
+                "_create_jobs")
+    def test__run_scenario_without_workers(
+            self, mock__create_jobs, mock__release_jobs_of_dead_workers,
+            mock_db, mock_time):
+        mock_time.side_effect = [0, 5, 11]
+        pending_job = {"uuid": "j1", "hostname": None,
+                       "status": consts.WorkerJobStatus.PENDING}
+        mock_db.worker_job_list.side_effect = [[], [pending_job]] * 2
+
+        self.config["worker_timeout"] = 10
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+        runner_obj.aborted = mock.Mock()
+        runner_obj.aborted.is_set.return_value = False
+        self.assertRaises(exceptions.WorkersNotAvailable,
+                          runner_obj._run_scenario,
+                          "cls", "run", self.context, {})
+
+        runner_obj.aborted.wait.assert_called_once_with(
+            runner_obj.POLL_INTERVAL)
+        mock_db.worker_jobs_delete.assert_called_once_with("workload_uuid")
+
+    @mock.patch(RUNNERS + "distributed.db")
+    @mock.patch(RUNNERS + "distributed.DistributedScenarioRunner."
+                "_create_jobs")
+    def test__run_scenario_aborted(self, mock__create_jobs, mock_db):
+        mock_db.worker_job_list.return_value = []
+
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+        runner_obj.abort()
+        runner_obj._run_scenario("cls", "run", self.context, {})
+
+        mock_db.worker_jobs_abort.assert_called_once_with("workload_uuid")
+        mock_db.worker_jobs_delete.assert_called_once_with("workload_uuid")
+        self.assertEqual(0, len(runner_obj.result_queue))
+
+    @mock.patch(RUNNERS + "distributed.db")
+    @mock.patch(RUNNERS + "distributed.DistributedScenarioRunner."
+                "_create_jobs", side_effect=RuntimeError)
+    def test__run_scenario_failed(self, mock__create_jobs, mock_db):
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+        self.assertRaises(RuntimeError, runner_obj._run_scenario,
+                          "cls", "run", self.context, {})
+        mock_db.worker_jobs_delete.assert_called_once_with("workload_uuid")
+
+
+class DistributedScenarioRunnerWithWorkersTestCase(test.TestCase):
+    """Run the coordinator and several workers against a shared DB."""
+
+    def setUp(self):
+        super(DistributedScenarioRunnerWithWorkersTestCase, self).setUp()
+        db_file = tempfile.NamedTemporaryFile(suffix=".sqlite", delete=False)
+        db_file.close()
+        self.addCleanup(os.remove, db_file.name)
+        self.useFixture(fixtures.EnvironmentVariable(
+            "RALLY_UNITTEST_DB_URL", "sqlite:///%s" % db_file.name))
+        self.useFixture(test.DatabaseFixture())
+        self.addCleanup(db.engine_reset)
+        self.useFixture(fixture.Config()).config(
+            distributed_secret_key="secret")
+
+        deployment = db.deployment_create({"name": "d"})
+        self.task = db.task_create({"deployment_uuid": deployment["uuid"]})
+        subtask = db.subtask_create(self.task["uuid"], title="subtask")
+        self.workload = db.workload_create(
+            self.task["uuid"], subtask["uuid"], name="Dummy.dummy",
+            description="", position=0, runner={"type": "distributed"},
+            runner_type="distributed", hooks=[], context={},
+            sla={"failure_rate": {"max": 0}}, args={}, context_execution={},
+            statistics={})
+
+    def test_run(self):
+        workers = [worker.Worker("worker-%d" % i, poll_interval=0.01)
+                   for i in range(3)]
+        threads = [threading.Thread(target=w.run) for w in workers]
+        for thread in threads:
+            thread.start()
+
+        runner_obj = distributed.DistributedScenarioRunner(
+            self.task, {"type": "distributed", "times": 20,
+                        "concurrency": 2, "iterations_per_job": 3})
+        runner_obj.POLL_INTERVAL = 0.01
+        try:
+            runner_obj.run("Dummy.dummy",
+                           {"task": self.task,
+                            "owner_id": self.workload["uuid"],
+                            "scenario_name": "Dummy.dummy"},
+                           {})
+        finally:
+            for w in workers:
+                w.stop()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(7, len(runner_obj.result_queue))
+        self.assertEqual(20, sum(len(b) for b in runner_obj.result_queue))
+        self.assertEqual(20, len(runner_obj.event_queue))
+        self.assertEqual([], db.worker_job_list(self.workload["uuid"]))
+
+        sla_checker = sla.SLAChecker({"sla": self.workload["sla"]})
+        for batch in runner_obj.result_queue:
+            self.assertTrue(sla_checker.merge(batch.sla_checker))
+        self.assertEqual(20, sla_checker.sla_criteria[0].total)
@@ -0,0 +1,252 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import itertools
+import textwrap
+import threading
+import time
+import unittest
+
+import ddt
+import mock
+import six
+
+from rally.common import utils as rutils
+from rally.plugins.common.runners import event_loop
+from rally.task import runner
+from rally.task import scenario
+from tests.unit import fakes
+from tests.unit import test
+
+
+asyncio = event_loop.asyncio
+
+
+class FakeSleepScenario(scenario.Scenario):
+
+    def run(self, sleep=0):
+        rutils.interruptable_sleep(sleep, 0.01)
+
+
+class FakeAbortingScenario(scenario.Scenario):
+
+    aborted = threading.Event()
+
+    def run(self):
+        self.aborted.set()
+        time.sleep(0.1)
+
+
+FakeAsyncScenario = None
+if asyncio:
+    # NOTE: `async def` is a syntax error in Python 2, so the coroutine
+    #   scenario is compiled only if the runner is available
+    namespace = {"asyncio": asyncio, "scenario": scenario}
+    six.exec_(textwrap.dedent("""
+        class FakeAsyncScenario(scenario.Scenario):
+
+            async def run(self, sleep=0, fail=False):
+                if fail:
+                    raise ValueError("fake error")
+                await asyncio.sleep(sleep)
+    """), namespace)
+    FakeAsyncScenario = namespace["FakeAsyncScenario"]
+
+
+@unittest.skipIf(asyncio is None, "asyncio is not available")
+@ddt.ddt
+class EventLoopScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(EventLoopScenarioRunnerTestCase, self).setUp()
+        self.config = {"times": 4, "concurrency": 2,
+                       "timeout": 2, "type": "event_loop",
+                       "max_cpu_count": 2}
+        self.context = fakes.FakeContext({"task": {"uuid": "uuid"}}).context
+        self.args = {"a": 1}
+        self.task = mock.MagicMock()
+
+    @ddt.data(({"times": 4, "concurrency": 2, "timeout": 2,
+                "type": "event_loop", "executor_threads": 1}, True),
+              ({"times": 4, "concurrency": 5,
+                "type": "event_loop"}, False),
+              ({"times": 4, "executor_threads": 0,
+                "type": "event_loop"}, False),
+              ({"foo": "bar"}, False))
+    @ddt.unpack
+    def test_validate(self, config, valid):
+        results = runner.ScenarioRunner.validate(
+            "event_loop", None, None, config)
+        if valid:
+            self.assertEqual([], results)
+        else:
+            self.assertGreater(len(results), 0)
+
+    def _run_worker_process(self, cls, method_name, args, times=4,
+                            concurrency=2, timeout=0, aborted=False,
+                            executor_threads=1):
+        results = []
+        events = []
+        mock_queue = mock.Mock(put=results.append)
+        mock_event_queue = mock.Mock(put=events.append)
+        if not isinstance(aborted, bool):
+            mock_aborted = aborted
+        else:
+            mock_aborted = mock.Mock(is_set=mock.Mock(return_value=aborted))
+
+        event_loop._worker_process(
+            mock_queue, itertools.count(), timeout, concurrency, times,
+            self.context, cls, method_name, args, mock_event_queue,
+            mock_aborted, executor_threads,
+            info={"processes_to_start": 1, "processes_counter": 0})
+        return results, events
+
+    def test__worker_process_sync_scenario(self):
+        results, events = self._run_worker_process(
+            fakes.FakeScenario, "do_it", {})
+
+        self.assertEqual(4, len(results))
+        self.assertEqual([1, 2, 3, 4], sorted(e["value"] for e in events))
+        for result in results:
+            self.assertEqual([], result["error"])
+
+    def test__worker_process_sync_scenario_timeout(self):
+        results, events = self._run_worker_process(
+            FakeSleepScenario, "run", {"sleep": 5}, times=1, concurrency=1,
+            timeout=0.05)
+
+        self.assertEqual(1, len(results))
+        # the thread is interrupted, so the iteration is really finished
+        self.assertLess(results[0]["duration"], 5)
+        self.assertEqual("ThreadTimeoutException", results[0]["error"][0])
+        self.assertIn("timestamp", results[0])
+
+    def test__worker_process_sync_scenario_timeout_of_started(self):
+        # the second iteration waits for the only thread longer than the
+        # timeout, but the timeout is counted since it is started
+        results, events = self._run_worker_process(
+            FakeSleepScenario, "run", {"sleep": 0.2}, times=2, concurrency=2,
+            timeout=0.3)
+
+        self.assertEqual(2, len(results))
+        for result in results:
+            self.assertEqual([], result["error"])
+
+    def test__worker_process_sync_scenario_aborted_while_queued(self):
+        FakeAbortingScenario.aborted.clear()
+        results, events = self._run_worker_process(
+            FakeAbortingScenario, "run", {}, times=4, concurrency=4,
+            aborted=FakeAbortingScenario.aborted)
+
+        # the iterations which are waiting for a free thread are cancelled
+        self.assertLess(len(results), 4)
+        self.assertEqual(len(results), len(events))
+        for result in results:
+            self.assertEqual([], result["error"])
+
+    def test__worker_process_async_scenario(self):
+        results, events = self._run_worker_process(
+            FakeAsyncScenario, "run", {"sleep": 0.1}, times=6, concurrency=6)
+
+        self.assertEqual(6, len(results))
+        self.assertEqual(list(range(1, 7)),
+                         sorted(e["value"] for e in events))
+        for result in results:
+            self.assertEqual([], result["error"])
+            self.assertGreaterEqual(result["duration"], 0.1)
+
+    def test__worker_process_async_scenario_runs_concurrently(self):
+        started_at = time.time()
+        results, events = self._run_worker_process(
+            FakeAsyncScenario, "run", {"sleep": 0.2}, times=50,
+            concurrency=50)
+
+        self.assertEqual(50, len(results))
+        self.assertLess(time.time() - started_at, 2)
+
+    def test__worker_process_async_scenario_error(self):
+        results, events = self._run_worker_process(
+            FakeAsyncScenario, "run", {"fail": True})
+
+        self.assertEqual(4, len(results))
+        for result in results:
+            self.assertEqual("ValueError", result["error"][0])
+            self.assertEqual("fake error", result["error"][1])
+
+    def test__worker_process_async_scenario_timeout(self):
+        results, events = self._run_worker_process(
+            FakeAsyncScenario, "run", {"sleep": 10}, times=1, concurrency=1,
+            timeout=0.01)
+
+        self.assertEqual(1, len(results))
+        self.assertEqual("ThreadTimeoutException", results[0]["error"][0])
+        self.assertLess(results[0]["duration"], 10)
+
+    def test__worker_process_async_scenario_wrong_args(self):
+        results, events = self._run_worker_process(
+            FakeAsyncScenario, "run", {"foo": "bar"}, times=1)
+
+        self.assertEqual(1, len(results))
+        self.assertEqual("TypeError", results[0]["error"][0])
+
+    def test__worker_process_raises(self):
+        def iteration_gen():
+            yield 0
+            raise ValueError()
+
+        self.assertRaises(
+            ValueError, event_loop._worker_process, mock.Mock(),
+            iteration_gen(), 0, 2, 4, self.context, fakes.FakeScenario,
+            "do_it", {}, mock.Mock(),
+            mock.Mock(is_set=mock.Mock(return_value=False)), 1, info={})
+
+    def test__worker_process_aborted(self):
+        results, events = self._run_worker_process(
+            fakes.FakeScenario, "do_it", {}, aborted=True)
+
+        self.assertEqual([], results)
+        self.assertEqual([], events)
+
+    def test__run_scenario(self):
+        runner_obj = event_loop.EventLoopScenarioRunner(self.task,
+                                                        self.config)
+
+        runner_obj._run_scenario(
+            fakes.FakeScenario, "do_it", self.context, self.args)
+        self.assertEqual(self.config["times"],
+                         sum(len(batch) for batch in runner_obj.result_queue))
+        for result_batch in runner_obj.result_queue:
+            for result in result_batch:
+                self.assertIsNotNone(result)
+
+    def test__run_scenario_async(self):
+        runner_obj = event_loop.EventLoopScenarioRunner(self.task,
+                                                        self.config)
+
+        runner_obj._run_scenario(
+            FakeAsyncScenario, "run", self.context, {"fail": True})
+        self.assertEqual(self.config["times"],
+                         sum(len(batch) for batch in runner_obj.result_queue))
+        for result_batch in runner_obj.result_queue:
+            for result in result_batch:
+                self.assertEqual("ValueError", result["error"][0])
+
+    def test__run_scenario_aborted(self):
+        runner_obj = event_loop.EventLoopScenarioRunner(self.task,
+                                                        self.config)
+
+        runner_obj.abort()
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                                 self.args)
+        self.assertEqual(0, len(runner_obj.result_queue))
@@ -146,29 +146,37 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         else:
             self.assertGreater(len(results), 0)
 
-    @mock.patch(RUNNERS + "rps.LOG")
+    @ddt.data(
+        {"rps_cfg": 2,
+         "expected": [0, 0.5, 1.0, 1.5, 2.0]},
+        {"rps_cfg": 0.5,
+         "expected": [0, 2.0, 4.0]},
+        {"rps_cfg": {"start": 1, "end": 3, "step": 1},
+         "expected": [0, 1.0, 1.5, 2.0, 2.0 + 1 / 3.0, 2.0 + 2 / 3.0, 3.0,
+                      3.0 + 1 / 3.0]},
+        {"rps_cfg": {"start": 1, "end": 2, "step": 1, "duration": 2},
+         "expected": [0, 1.0, 2.0, 2.5, 3.0, 3.5]},
+        {"rps_cfg": {"start": 2, "end": 5, "step": 2},
+         "expected": [0, 0.5, 1.0, 1.25, 1.5, 1.75, 2.0, 2.2]},
+        {"rps_cfg": {"start": 3, "end": 3, "step": 1},
+         "expected": [0, 1 / 3.0, 2 / 3.0, 1.0]}
+    )
+    @ddt.unpack
+    def test__get_schedule(self, rps_cfg, expected):
+        get_start_offset = rps._get_schedule(rps_cfg)
+        self.assertEqual(
+            [round(o, 6) for o in expected],
+            [round(get_start_offset(i), 6) for i in range(len(expected))])
+
     @mock.patch(RUNNERS + "rps.time")
-    @mock.patch(RUNNERS + "rps.threading.Thread")
-    @mock.patch(RUNNERS + "rps.multiprocessing.Queue")
     @mock.patch(RUNNERS + "rps.runner")
-    def test__worker_process(self, mock_runner, mock_queue, mock_thread,
-                             mock_time, mock_log):
-
-        def time_side():
-            time_side.last += 0.03
-            time_side.count += 1
-            return time_side.last
-        time_side.last = 0
-        time_side.count = 0
-
-        mock_time.time = time_side
-
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
-        mock_thread.return_value = mock_thread_instance
-
+    def test__worker_process(self, mock_runner, mock_time):
+        mock_time.time.return_value = 100.5
+        mock_pool = mock_runner.WorkerThreadPool.return_value
+        mock_queue = mock.MagicMock()
         mock_event = mock.MagicMock(
-            is_set=mock.MagicMock(return_value=False))
+            is_set=mock.MagicMock(return_value=False),
+            wait=mock.MagicMock(return_value=False))
 
         mock_event_queue = mock.MagicMock()
 
@@ -180,50 +188,66 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         context = {"users": [{"tenant_id": "t1", "credential": "c1",
                               "id": "uuid1"}]}
         info = {"processes_to_start": 1, "processes_counter": 1}
-        mock_runs_per_second = mock.MagicMock(return_value=10)
 
         rps._worker_process(mock_queue, fake_ram_int, 1, times,
                             max_concurrent, context, "Dummy", "dummy",
                             (), mock_event_queue, mock_event,
-                            mock_runs_per_second, 10, 1,
-                            info)
-
-        self.assertEqual(times, mock_log.debug.call_count)
-        self.assertEqual(times + 1, mock_thread.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.start.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.join.call_count)
-        # NOTE(rvasilets): `times` + 1 here because `times` the number of
-        # scenario repetition and one more need on "initialization" stage
-        # of the thread stuff.
-
-        self.assertEqual(1, mock_time.sleep.call_count)
-        self.assertEqual(2, mock_thread_instance.isAlive.call_count)
-        self.assertEqual(times * 4 - 1, mock_time.time.count)
-
-        self.assertEqual(times, mock_runner._get_scenario_context.call_count)
-
-        for i in range(times):
-            scenario_context = mock_runner._get_scenario_context(i, context)
-            call = mock.call(
-                args=(mock_queue, "Dummy", "dummy", scenario_context, (),
-                      mock_event_queue),
-                target=mock_runner._worker_thread,
-            )
-            self.assertIn(call, mock_thread.mock_calls)
+                            100, 2, 1, info)
+
+        mock_runner.WorkerThreadPool.assert_called_once_with(
+            max_concurrent, timeout=1)
+        self.assertEqual(times + 1, mock_pool.wait_for_free_slot.call_count)
+        # iterations #0 and #1 are late, #2 and #3 wait for scheduled time
+        self.assertEqual([mock.call(0.5), mock.call(1.0)],
+                         mock_event.wait.call_args_list)
+        self.assertEqual(
+            [mock.call(rps._worker_thread, mock_queue, "Dummy", "dummy",
+                       mock_runner._get_scenario_context.return_value, (),
+                       mock_event_queue, 100 + i * 0.5)
+             for i in range(times)],
+            mock_pool.submit.call_args_list)
+        mock_runner._get_scenario_context.assert_has_calls(
+            [mock.call(i, context) for i in range(times)])
+        mock_pool.join.assert_called_once_with()
+
+    @mock.patch(RUNNERS + "rps.time")
+    @mock.patch(RUNNERS + "rps.runner")
+    def test__worker_process_aborted_while_waiting(self, mock_runner,
+                                                   mock_time):
+        mock_time.time.return_value = 100
+        mock_pool = mock_runner.WorkerThreadPool.return_value
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False),
+            wait=mock.MagicMock(side_effect=[False, True]))
+
+        rps._worker_process(mock.MagicMock(), iter(range(10)), 0, 4, 3,
+                            {}, "Dummy", "dummy", (), mock.MagicMock(),
+                            mock_event, 100, 1, 1,
+                            {"processes_to_start": 1, "processes_counter": 1})
+
+        self.assertEqual(2, mock_event.wait.call_count)
+        self.assertEqual(2, mock_pool.submit.call_count)
+        mock_pool.join.assert_called_once_with()
 
     @mock.patch(RUNNERS + "rps.runner._run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
+        mock__run_scenario_once.return_value = {
+            "timestamp": 10.5, "duration": 2,
+            "output": {"additive": [{"title": "foo"}], "complete": []}}
         mock_queue = mock.MagicMock()
         mock_event_queue = mock.MagicMock()
         args = ("fake_cls", "fake_method_name", "fake_context_obj", {},
                 mock_event_queue)
 
-        runner._worker_thread(mock_queue, *args)
-
-        self.assertEqual(1, mock_queue.put.call_count)
+        rps._worker_thread(mock_queue, *(args + (10,)))
 
-        expected_calls = [mock.call(*args)]
-        self.assertEqual(expected_calls, mock__run_scenario_once.mock_calls)
+        mock__run_scenario_once.assert_called_once_with(*args)
+        result = mock__run_scenario_once.return_value
+        mock_queue.put.assert_called_once_with(result)
+        self.assertEqual(10, result["scheduled_at"])
+        # the output of the scenario is kept as is
+        self.assertEqual({"additive": [{"title": "foo"}], "complete": []},
+                         result["output"])
 
     @ddt.data(
         {
@@ -269,33 +293,36 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         },
     )
     @ddt.unpack
-    @mock.patch(RUNNERS + "rps.time.sleep")
-    def test__run_scenario(self, mock_sleep, config):
+    @mock.patch(RUNNERS + "rps._get_schedule",
+                return_value=lambda iteration: 0)
+    def test__run_scenario(self, mock__get_schedule, config):
         runner_obj = rps.RPSScenarioRunner(self.task, config)
 
         runner_obj._run_scenario(fakes.FakeScenario, "do_it",
                                  fakes.FakeContext({}).context, {})
 
-        self.assertEqual(config["times"], len(runner_obj.result_queue))
+        self.assertEqual(config["times"],
+                         sum(len(batch) for batch in runner_obj.result_queue))
 
         for result_batch in runner_obj.result_queue:
             for result in result_batch:
                 self.assertIsNotNone(result)
 
-    @mock.patch(RUNNERS + "rps.time.sleep")
-    def test__run_scenario_exception(self, mock_sleep):
+    @mock.patch(RUNNERS + "rps._get_schedule",
+                return_value=lambda iteration: 0)
+    def test__run_scenario_exception(self, mock__get_schedule):
         config = {"times": 4, "rps": 10}
         runner_obj = rps.RPSScenarioRunner(self.task, config)
 
         runner_obj._run_scenario(fakes.FakeScenario, "something_went_wrong",
                                  fakes.FakeContext({}).context, {})
-        self.assertEqual(config["times"], len(runner_obj.result_queue))
+        self.assertEqual(config["times"],
+                         sum(len(batch) for batch in runner_obj.result_queue))
         for result_batch in runner_obj.result_queue:
             for result in result_batch:
                 self.assertIsNotNone(result)
 
-    @mock.patch(RUNNERS + "rps.time.sleep")
-    def test__run_scenario_aborted(self, mock_sleep):
+    def test__run_scenario_aborted(self):
         config = {"times": 20, "rps": 20, "timeout": 5}
         runner_obj = rps.RPSScenarioRunner(self.task, config)
 
@@ -308,7 +335,7 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         for result in runner_obj.result_queue:
             self.assertIsNotNone(result)
 
-    @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
+    @mock.patch(RUNNERS + "rps.runner.BatchedPipe")
     @mock.patch(RUNNERS + "rps.multiprocessing.cpu_count")
     @mock.patch(RUNNERS + "rps.RPSScenarioRunner._log_debug_info")
     @mock.patch(RUNNERS +
@@ -316,7 +343,7 @@ class RPSScenarioRunnerTestCase(test.TestCase):
     @mock.patch(RUNNERS + "rps.RPSScenarioRunner._join_processes")
     def test_that_cpu_count_is_adjusted_properly(
             self, mock__join_processes, mock__create_process_pool,
-            mock__log_debug_info, mock_cpu_count, mock_queue):
+            mock__log_debug_info, mock_cpu_count, mock_batched_pipe):
 
         samples = [
             {
@@ -330,8 +357,6 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                     # min(max_cpu_used, times, max_concurrency))
                     "processes_to_start": 1,
                     "rps_per_worker": 20,
-                    "times_per_worker": 20,
-                    "times_overhead": 0,
                     "concurrency_per_worker": 10,
                     "concurrency_overhead": 0
                 }
@@ -344,8 +369,6 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                     "max_cpu_used": 3,
                     "processes_to_start": 3,
                     "rps_per_worker": 3,
-                    "times_per_worker": 6,
-                    "times_overhead": 2,
                     "concurrency_per_worker": 1,
                     "concurrency_overhead": 2
                 }
@@ -358,8 +381,6 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                     "max_cpu_used": 20,
                     "processes_to_start": 10,
                     "rps_per_worker": 2,
-                    "times_per_worker": 1,
-                    "times_overhead": 0,
                     "concurrency_per_worker": 1,
                     "concurrency_overhead": 2
                 }
@@ -372,8 +393,6 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                     "max_cpu_used": 20,
                     "processes_to_start": 10,
                     "rps_per_worker": 2,
-                    "times_per_worker": 2,
-                    "times_overhead": 0,
                     "concurrency_per_worker": 1,
                     "concurrency_overhead": 0
                 }
@@ -385,7 +404,7 @@ class RPSScenarioRunnerTestCase(test.TestCase):
             mock_cpu_count.reset_mock()
             mock__create_process_pool.reset_mock()
             mock__join_processes.reset_mock()
-            mock_queue.reset_mock()
+            mock_batched_pipe.reset_mock()
 
             mock_cpu_count.return_value = sample["real_cpu"]
 
@@ -400,8 +419,6 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                 timeout=0,
                 max_cpu_used=sample["expected"]["max_cpu_used"],
                 processes_to_start=sample["expected"]["processes_to_start"],
-                times_per_worker=sample["expected"]["times_per_worker"],
-                times_overhead=sample["expected"]["times_overhead"],
                 concurrency_per_worker=(
                     sample["expected"]["concurrency_per_worker"]),
                 concurrency_overhead=(
@@ -411,7 +428,9 @@ class RPSScenarioRunnerTestCase(test.TestCase):
             self.assertIn(rps._worker_process, args)
             mock__join_processes.assert_called_once_with(
                 mock__create_process_pool.return_value,
-                mock_queue.return_value, mock_queue.return_value)
+                mock_batched_pipe.return_value,
+                mock_batched_pipe.return_value,
+                validate_results=False)
 
     def test_abort(self):
         config = {"times": 4, "rps": 10}
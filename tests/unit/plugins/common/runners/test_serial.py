@@ -36,17 +36,15 @@ class SerialScenarioRunnerTestCase(test.TestCase):
         runner = serial.SerialScenarioRunner(mock.MagicMock(),
                                              {"times": times})
 
-        runner._run_scenario(fakes.FakeScenario, "do_it",
-                             fakes.FakeContext().context, {})
+        context = fakes.FakeContext().context
+        runner._run_scenario(fakes.FakeScenario, "do_it", context, {})
 
         self.assertEqual(times, len(runner.result_queue))
         results = list(runner.result_queue)
         self.assertEqual(expected_results, results)
         expected_calls = []
         for i in range(times):
-            ctxt = fakes.FakeContext().context
-            ctxt["iteration"] = i + 1
-            ctxt["task"] = mock.ANY
+            ctxt = dict(context, iteration=i + 1)
             expected_calls.append(
                 mock.call(fakes.FakeScenario, "do_it", ctxt, {},
                           deque_as_queue_inst)
@@ -58,8 +56,8 @@ class SerialScenarioRunnerTestCase(test.TestCase):
         runner = serial.SerialScenarioRunner(mock.MagicMock(),
                                              {"times": 5})
         runner.abort()
-        runner._run_scenario(fakes.FakeScenario, "do_it",
-                             fakes.FakeContext().context, {})
+        context = fakes.FakeContext().context
+        runner._run_scenario(fakes.FakeScenario, "do_it", context, {})
         self.assertEqual(0, len(runner.result_queue))
 
     def test_abort(self):
@@ -35,7 +35,7 @@ class EventTriggerTestCase(test.TestCase):
     @ddt.data((dict(unit="time", at=[0, 3, 5]), True),
               (dict(unit="time", at=[2, 2]), False),
               (dict(unit="time", at=[-1]), False),
-              (dict(unit="time", at=[1.5]), False),
+              (dict(unit="time", at=[1.5]), True),
               (dict(unit="time", at=[]), False),
               (dict(unit="time", wrong_prop=None), False),
               (dict(unit="time"), False),
@@ -67,3 +67,8 @@ class EventTriggerTestCase(test.TestCase):
     def test_on_event(self, value, should_call):
         self.trigger.on_event("iteration", value)
         self.assertEqual(should_call, self.hook_cls.called)
+
+    @ddt.data((None, 1), (0, 1), (1, 4), (2, 4), (4.5, 5), (5, None))
+    @ddt.unpack
+    def test_get_next_value(self, last_value, expected):
+        self.assertEqual(expected, self.trigger.get_next_value(last_value))
@@ -38,6 +38,7 @@ class PeriodicTriggerTestCase(test.TestCase):
               (dict(unit="time", step=1, start=-1), False),
               (dict(unit="time", step=1, start=0, end=1), True),
               (dict(unit="time", step=1, start=0, end=0), False),
+              (dict(unit="time", step=0.5, start=0.2, end=1.5), True),
               (dict(unit="time", wrong_prop=None), False),
               (dict(unit="time"), False),
               (dict(unit="iteration", step=1), True),
@@ -80,3 +81,33 @@ class PeriodicTriggerTestCase(test.TestCase):
             mock.MagicMock(), self.hook_cls)
         trigger.on_event("time", value)
         self.assertEqual(should_call, self.hook_cls.called)
+
+    @ddt.data((dict(unit="iteration", step=2), None, 1),
+              (dict(unit="iteration", step=2), 1, 3),
+              (dict(unit="iteration", step=2), 2, 3),
+              (dict(unit="iteration", step=3, start=4), 1, 4),
+              (dict(unit="iteration", step=3, start=4, end=7), 7, None),
+              (dict(unit="time", step=0.1), None, 0),
+              (dict(unit="time", step=0.1), 0.2, 0.3),
+              (dict(unit="time", step=0.1), 0.25, 0.3),
+              (dict(unit="time", step=5, start=2, end=12), 0.5, 2),
+              (dict(unit="time", step=5, start=2, end=12), 7, 12),
+              (dict(unit="time", step=5, start=2, end=12), 12, None))
+    @ddt.unpack
+    def test_get_next_value(self, config, last_value, expected):
+        trigger = periodic.PeriodicTrigger(
+            {"trigger": {"name": "periodic", "args": config}},
+            mock.MagicMock(), self.hook_cls)
+        self.assertEqual(expected, trigger.get_next_value(last_value))
+
+    @ddt.data((0.3, True), (0.35, False), (0.30000000000000004, False),
+              (1.5, True), (1.6, False))
+    @ddt.unpack
+    def test_on_event_sub_second(self, value, should_call):
+        trigger = periodic.PeriodicTrigger(
+            {"trigger": {"name": "periodic",
+                         "args": {"unit": "time", "step": 0.1,
+                                  "end": 1.5}}},
+            mock.MagicMock(), self.hook_cls)
+        trigger.on_event("time", value)
+        self.assertEqual(should_call, self.hook_cls.called)
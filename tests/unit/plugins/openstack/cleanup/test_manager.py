@@ -95,6 +95,22 @@ class SeekAndDestroyTestCase(test.TestCase):
         self.assertEqual(5, mock_log.warning.call_count)
         self.assertEqual(4, mock_log.exception.call_count)
 
+    def test__delete_single_resource_with_watcher(self):
+        mock_resource = mock.MagicMock(_max_attempts=3, _timeout=10,
+                                       _interval=0.01)
+        destroyer = manager.SeekAndDestroy(None, None, None)
+        destroyer._watcher = mock.Mock()
+
+        destroyer._delete_single_resource(mock_resource)
+
+        mock_resource.delete.assert_called_once_with()
+        self.assertFalse(mock_resource.is_deleted.called)
+        destroyer._watcher.add.assert_called_once_with(
+            mock_resource, {"uuid": mock_resource.id.return_value,
+                            "name": mock_resource.name.return_value,
+                            "service": mock_resource._service,
+                            "resource": mock_resource._resource})
+
     def _manager(self, list_side_effect, **kw):
         mock_mgr = mock.MagicMock()
         mock_mgr().list.side_effect = list_side_effect
@@ -283,17 +299,115 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock__delete_single_resource.assert_called_once_with(
             mock_mgr.return_value)
 
+    @mock.patch("%s.DeletionWatcher" % BASE)
     @mock.patch("%s.broker.run" % BASE)
-    def test_exterminate(self, mock_broker_run):
+    def test_exterminate(self, mock_broker_run, mock_deletion_watcher):
         manager_cls = mock.MagicMock(_threads=5)
         cleaner = manager.SeekAndDestroy(manager_cls, None, None)
         cleaner._publisher = mock.Mock()
         cleaner._consumer = mock.Mock()
+
+        def run(*args, **kwargs):
+            self.assertEqual(mock_deletion_watcher.return_value,
+                             cleaner._watcher)
+
+        mock_broker_run.side_effect = run
         cleaner.exterminate()
 
+        mock_deletion_watcher.return_value.start.assert_called_once_with()
+        mock_deletion_watcher.return_value.close.assert_called_once_with()
+        self.assertIsNone(cleaner._watcher)
+
         mock_broker_run.assert_called_once_with(cleaner._publisher,
                                                 cleaner._consumer,
-                                                consumers_count=5)
+                                                consumers_count=5,
+                                                rate_limiter=None)
+
+    @mock.patch("%s.CONF" % BASE)
+    @mock.patch("%s.broker" % BASE)
+    def test_exterminate_with_rate_limit(self, mock_broker, mock_conf):
+        mock_conf.cleanup.cleanup_rate_limits = {"nova": "10"}
+        manager_cls = mock.MagicMock(_threads=5, _service="nova")
+        cleaner = manager.SeekAndDestroy(manager_cls, None, None)
+        cleaner.exterminate()
+
+        mock_broker.get_rate_limiter.assert_called_once_with("nova", 10.0)
+        mock_broker.run.assert_called_once_with(
+            cleaner._publisher, cleaner._consumer, consumers_count=5,
+            rate_limiter=mock_broker.get_rate_limiter.return_value)
+
+
+class DeletionWatcherTestCase(test.TestCase):
+
+    def _get_manager_cls(self, raw_resources):
+
+        @base.resource("fake", "fake", max_attempts=3, timeout=10,
+                       interval=0)
+        class FakeResource(base.ResourceManager):
+            list = mock.Mock(side_effect=raw_resources)
+
+        return FakeResource
+
+    def test_close_with_bulk_check(self):
+        raw = [mock.Mock(id="id%d" % i, status="ACTIVE") for i in range(3)]
+        manager_cls = self._get_manager_cls(
+            [raw, [raw[1], mock.Mock(id="id2", status="DELETED")]])
+        watcher = manager.DeletionWatcher()
+        resources = []
+        for raw_resource in raw:
+            resource = manager_cls(resource=raw_resource, admin="admin",
+                                   user="user", tenant_uuid="tenant")
+            resource.is_deleted = mock.Mock(return_value=True)
+            resources.append(resource)
+            watcher.add(resource, {})
+
+        watcher.close()
+
+        self.assertEqual(2, manager_cls.list.call_count)
+        # NOTE: the last resource is checked alone
+        self.assertFalse(resources[0].is_deleted.called)
+        resources[1].is_deleted.assert_called_once_with()
+        self.assertFalse(resources[2].is_deleted.called)
+
+    @mock.patch("%s.LOG" % BASE)
+    def test_close_with_failed_bulk_check(self, mock_log):
+        manager_cls = self._get_manager_cls(Exception)
+        watcher = manager.DeletionWatcher()
+        resources = []
+        for is_deleted in ([False, True], [True]):
+            resource = manager_cls(resource=mock.Mock(id="id1"))
+            resource.is_deleted = mock.Mock(side_effect=is_deleted)
+            resources.append(resource)
+            watcher.add(resource, {})
+
+        watcher.close()
+
+        manager_cls.list.assert_called_once_with()
+        self.assertEqual(2, resources[0].is_deleted.call_count)
+        self.assertEqual(1, resources[1].is_deleted.call_count)
+        self.assertFalse(mock_log.warning.called)
+
+    @mock.patch("%s.LOG" % BASE)
+    def test_start(self, mock_log):
+        resources = [mock.MagicMock(_max_attempts=3, _timeout=10,
+                                    _interval=0.01) for i in range(3)]
+        for resource in resources:
+            resource.is_deleted.side_effect = [False, True]
+        timed_out = mock.MagicMock(_max_attempts=3, _timeout=0.02,
+                                   _interval=0.01)
+        timed_out.is_deleted.return_value = False
+        watcher = manager.DeletionWatcher()
+
+        watcher.start()
+        for resource in resources + [timed_out]:
+            watcher.add(resource, {"uuid": "foo", "service": "bar",
+                                   "resource": "baz"})
+        watcher.close()
+
+        for resource in resources:
+            self.assertEqual(2, resource.is_deleted.call_count)
+        self.assertTrue(timed_out.is_deleted.called)
+        self.assertEqual(1, mock_log.warning.call_count)
 
 
 class ResourceManagerTestCase(test.TestCase):
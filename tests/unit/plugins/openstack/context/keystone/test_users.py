@@ -370,6 +370,24 @@ class UserGeneratorForNewUsersTestCase(test.ScenarioTestCase):
             self.assertIn("id", user)
             self.assertIn("credential", user)
 
+    @mock.patch("%s.CONF" % CTX)
+    @mock.patch("%s.broker" % CTX)
+    def test__run_broker(self, mock_broker, mock_conf):
+        mock_conf.users_context.resource_management_rate_limit = 5
+        mock_conf.users_context.resource_management_retries = 2
+        user_generator = users.UserGenerator(self.context)
+        publish = mock.Mock()
+        consume = mock.Mock()
+
+        self.assertEqual(mock_broker.run.return_value,
+                         user_generator._run_broker(publish, consume))
+        mock_broker.get_rate_limiter.assert_called_once_with("keystone", 5)
+        mock_broker.run.assert_called_once_with(
+            publish, consume,
+            user_generator.config["resource_management_workers"],
+            rate_limiter=mock_broker.get_rate_limiter.return_value,
+            retries=2)
+
     @mock.patch("%s.identity" % CTX)
     def test__delete_tenants(self, mock_identity):
         user_generator = users.UserGenerator(self.context)
@@ -420,6 +438,9 @@ class UserGeneratorForNewUsersTestCase(test.ScenarioTestCase):
                              len(ctx.context["tenants"]))
 
             self.assertEqual("random", ctx.context["user_choice_method"])
+            index = ctx.context["user_selection_index"]
+            self.assertEqual("random", index.method)
+            self.assertIn(index.choose(1), range(self.users_num))
 
         # Cleanup (called by content manager)
         self.assertEqual(0, len(ctx.context["users"]))
@@ -291,7 +291,9 @@ class ShareNetworksTestCase(test.TestCase):
         ]
         mock_manila_scenario__create_share_network.assert_has_calls(
             expected_calls * (self.TENANTS_AMOUNT * networks_per_tenant))
-        mock_clients.assert_has_calls([mock.call(MOCK_USER_CREDENTIAL, {})
+        mock_clients.assert_has_calls([mock.call(MOCK_USER_CREDENTIAL, {},
+                                                 session_pool=mock.ANY,
+                                                 atomic_inst=mock.ANY)
                                       for i in range(self.TENANTS_AMOUNT)])
 
     @ddt.data(True, False)
@@ -329,7 +331,9 @@ class ShareNetworksTestCase(test.TestCase):
         expected_calls = [mock.call(**sn_args), mock.call().to_dict()]
         mock_manila_scenario__create_share_network.assert_has_calls(
             expected_calls * (self.TENANTS_AMOUNT * networks_per_tenant))
-        mock_clients.assert_has_calls([mock.call(MOCK_USER_CREDENTIAL, {})
+        mock_clients.assert_has_calls([mock.call(MOCK_USER_CREDENTIAL, {},
+                                                 session_pool=mock.ANY,
+                                                 atomic_inst=mock.ANY)
                                       for i in range(self.TENANTS_AMOUNT)])
 
     @mock.patch("rally.osclients.Clients")
@@ -354,7 +358,9 @@ class ShareNetworksTestCase(test.TestCase):
         expected_calls = [mock.call(), mock.call().to_dict()]
         mock_manila_scenario__create_share_network.assert_has_calls(
             expected_calls * self.TENANTS_AMOUNT)
-        mock_clients.assert_has_calls([mock.call(MOCK_USER_CREDENTIAL, {})
+        mock_clients.assert_has_calls([mock.call(MOCK_USER_CREDENTIAL, {},
+                                                 session_pool=mock.ANY,
+                                                 atomic_inst=mock.ANY)
                                       for i in range(self.TENANTS_AMOUNT)])
 
     @mock.patch("rally.osclients.Clients")
@@ -378,7 +384,9 @@ class ShareNetworksTestCase(test.TestCase):
         self.assertFalse(mock_manila_scenario__delete_share_network.called)
         self.assertEqual(2, mock_clients.call_count)
         for user in self.ctxt_use_existing["users"]:
-            self.assertIn(mock.call(user["credential"], {}),
+            self.assertIn(mock.call(user["credential"], {},
+                                    session_pool=mock.ANY,
+                                    atomic_inst=mock.ANY),
                           mock_clients.mock_calls)
 
     @mock.patch("rally.plugins.openstack.context.manila.manila_share_networks."
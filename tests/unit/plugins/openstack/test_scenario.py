@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
 import ddt
 import fixtures
 import mock
@@ -21,6 +23,8 @@ from rally.plugins.openstack import scenario as base_scenario
 from tests.unit import test
 
 
+SCN = "rally.plugins.openstack.scenario"
+
 CREDENTIAL_WITHOUT_HMAC = OpenStackCredential(
     "auth_url",
     "username",
@@ -51,7 +55,9 @@ class OpenStackScenarioTestCase(test.TestCase):
         scenario = base_scenario.OpenStackScenario(self.context)
         self.assertEqual(self.context, scenario.context)
         self.osclients.mock.assert_called_once_with(
-            self.context["admin"]["credential"], {})
+            self.context["admin"]["credential"], {},
+            session_pool=base_scenario.osclients.SESSION_POOL,
+            atomic_inst=scenario)
 
         scenario = base_scenario.OpenStackScenario(
             self.context, admin_clients="foobar")
@@ -75,7 +81,26 @@ class OpenStackScenarioTestCase(test.TestCase):
         self.assertEqual(self.context["tenants"]["foo"],
                          scenario.context["tenant"])
 
-        self.osclients.mock.assert_called_once_with(user["credential"], {})
+        self.osclients.mock.assert_called_once_with(
+            user["credential"], {},
+            session_pool=base_scenario.osclients.SESSION_POOL,
+            atomic_inst=scenario)
+
+    def test_init_without_shared_keystone_sessions(self):
+        self.context["admin"] = {"credential": mock.Mock()}
+        self.context["user"] = {"credential": mock.Mock()}
+
+        class Scenario(base_scenario.OpenStackScenario):
+            _share_keystone_sessions = False
+
+        scenario = Scenario(self.context)
+
+        self.assertEqual(
+            [mock.call(self.context["admin"]["credential"], {},
+                       session_pool=None, atomic_inst=scenario),
+             mock.call(self.context["user"]["credential"], {},
+                       session_pool=None, atomic_inst=scenario)],
+            self.osclients.mock.call_args_list)
 
     def test_init_clients(self):
         scenario = base_scenario.OpenStackScenario(self.context,
@@ -136,6 +161,22 @@ class OpenStackScenarioTestCase(test.TestCase):
         self.assertEqual(self.context["tenants"][tenant_id],
                          self.context["tenant"])
 
+    def test__choose_user_with_index(self):
+        self.context["users"] = [{"id": str(i), "tenant_id": "foo"}
+                                 for i in range(3)]
+        self.context["tenants"] = {"foo": {"name": "bar"}}
+        self.context["iteration"] = 3
+        index = mock.Mock()
+        index.choose.return_value = 1
+        self.context["user_selection_index"] = index
+
+        scenario = base_scenario.OpenStackScenario()
+        scenario._choose_user(self.context)
+
+        index.choose.assert_called_once_with(3)
+        self.assertEqual(self.context["users"][1], self.context["user"])
+        self.assertEqual({"name": "bar"}, self.context["tenant"])
+
     @ddt.data((1, "0", "bar"),
               (2, "0", "foo"),
               (3, "1", "bar"),
@@ -166,3 +207,80 @@ class OpenStackScenarioTestCase(test.TestCase):
         self.assertEqual(self.context["tenants"][tenant_id],
                          self.context["tenant"])
         self.assertEqual(expected_tenant_id, tenant_id)
+
+
+@ddt.ddt
+class UserSelectionIndexTestCase(test.TestCase):
+
+    def setUp(self):
+        super(UserSelectionIndexTestCase, self).setUp()
+        self.users = [{"id": "%s-%d" % (tid, i), "tenant_id": tid}
+                      for tid in ("foo", "bar") for i in range(2)]
+
+    def _choose(self, index, iterations):
+        return [self.users[index.choose(i)]["id"] for i in iterations]
+
+    def test_choose_random(self):
+        index = base_scenario.UserSelectionIndex(self.users, "random")
+        self.assertEqual(set(u["id"] for u in self.users),
+                         set(self._choose(index, [1] * 200)))
+
+    def test_choose_round_robin(self):
+        index = base_scenario.UserSelectionIndex(self.users, "round_robin")
+        self.assertEqual(["bar-0", "foo-0", "bar-1", "foo-1"] * 2,
+                         self._choose(index, range(1, 9)))
+
+    def test_choose_round_robin_with_different_numbers_of_users(self):
+        self.users.append({"id": "bar-2", "tenant_id": "bar"})
+        index = base_scenario.UserSelectionIndex(self.users, "round_robin")
+        self.assertEqual(["bar-0", "foo-0", "bar-1", "foo-1", "bar-2",
+                          "foo-0", "bar-0", "foo-1"],
+                         self._choose(index, range(1, 9)))
+
+    @ddt.data(([1], {"foo-0": 0.25, "foo-1": 0.25}),
+              ([3], {"foo-0": 0.375, "foo-1": 0.125}),
+              ([1, 3], {"foo-0": 0.125, "foo-1": 0.375}),
+              (None, {"foo-0": 0.25, "foo-1": 0.25}))
+    @ddt.unpack
+    def test__build_alias_table(self, weights, expected):
+        index = base_scenario.UserSelectionIndex(self.users, "weighted",
+                                                 weights)
+        probabilities = collections.defaultdict(float)
+        for probability, position, alias in index._alias_table:
+            probabilities[self.users[position]["id"]] += probability / 4
+            probabilities[self.users[alias]["id"]] += (1 - probability) / 4
+        for user_id, probability in expected.items():
+            self.assertAlmostEqual(probability, probabilities[user_id])
+            self.assertAlmostEqual(
+                probability,
+                probabilities[user_id.replace("foo", "bar")])
+
+    @mock.patch("%s.random.random" % SCN)
+    @mock.patch("%s.random.choice" % SCN)
+    def test_choose_weighted(self, mock_choice, mock_random):
+        index = base_scenario.UserSelectionIndex(self.users, "weighted")
+        mock_choice.return_value = (0.5, 1, 2)
+
+        mock_random.return_value = 0.4
+        self.assertEqual(1, index.choose(1))
+        mock_random.return_value = 0.6
+        self.assertEqual(2, index.choose(1))
+        mock_choice.assert_called_with(index._alias_table)
+
+    @mock.patch("%s.os.getpid" % SCN)
+    def test_choose_sticky(self, mock_getpid):
+        index = base_scenario.UserSelectionIndex(self.users, "sticky")
+        mock_getpid.return_value = 1
+        position = index.choose(1)
+        self.assertEqual([position] * 5,
+                         [index.choose(i) for i in range(2, 7)])
+
+        positions = set()
+        for pid in range(100):
+            mock_getpid.return_value = pid
+            positions.add(index.choose(1))
+        self.assertEqual(set(range(4)), positions)
+
+    def test_immutable(self):
+        index = base_scenario.UserSelectionIndex(self.users, "random")
+        self.assertRaises(AttributeError, setattr, index, "method", "foo")
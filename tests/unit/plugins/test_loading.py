@@ -0,0 +1,195 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import sys
+
+import fixtures
+import mock
+
+from rally import plugins
+from tests.unit import test
+
+
+PLUGINS = "rally.plugins"
+
+
+class LoadTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LoadTestCase, self).setUp()
+        self.manifest_path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, "rally",
+            "plugins_manifest.json")
+        self.useFixture(fixtures.MockPatch("%s.MANIFEST_PATH" % PLUGINS,
+                                           self.manifest_path))
+        self.useFixture(fixtures.MockPatch("%s.PLUGINS_LOADED" % PLUGINS,
+                                           False))
+        self.mock_discover = self.useFixture(
+            fixtures.MockPatch("%s.discover" % PLUGINS)).mock
+        self.mock_find_modules = self.useFixture(fixtures.MockPatch(
+            "%s._find_modules" % PLUGINS,
+            return_value=(["foo", "bar"], "key"))).mock
+        self.mock_load_modules = self.useFixture(
+            fixtures.MockPatch("%s._load_modules" % PLUGINS)).mock
+        self.useFixture(fixtures.MockPatchObject(
+            sys, "modules", dict(sys.modules, foo=None, bar=None)))
+
+        class FakePlugin(object):
+            __module__ = "foo"
+
+            @classmethod
+            def get_name(cls):
+                return "fake_plugin"
+
+        self.mock_get_all = self.useFixture(fixtures.MockPatch(
+            "%s.plugin.Plugin.get_all" % PLUGINS,
+            return_value=[FakePlugin, mock.Mock(__module__="elsewhere")])).mock
+
+    def _read_manifest(self):
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def test_load(self):
+        plugins.load()
+
+        self.mock_load_modules.assert_called_once_with()
+        self.assertFalse(self.mock_find_modules.called)
+        self.assertFalse(os.path.exists(self.manifest_path))
+        self.assertEqual(
+            [mock.call("/opt/rally/plugins/"),
+             mock.call(os.path.expanduser("~/.rally/plugins/"))],
+            self.mock_discover.load_plugins.call_args_list)
+        self.assertTrue(plugins.PLUGINS_LOADED)
+
+    def test_load_lazy_writes_manifest(self):
+        plugins.load(lazy=True)
+
+        self.mock_load_modules.assert_called_once_with()
+        self.mock_get_all.assert_called_once_with(allow_hidden=True)
+        self.assertEqual({"key": "key", "modules": ["bar", "foo"],
+                          "plugins": {"fake_plugin": ["foo"]}},
+                         self._read_manifest())
+        self.assertFalse(self.mock_discover.add_lazy_modules.called)
+        self.assertEqual(2, self.mock_discover.load_plugins.call_count)
+
+    def test_load_lazy_reads_manifest(self):
+        plugins.load(lazy=True)
+        plugins.PLUGINS_LOADED = False
+        self.mock_load_modules.reset_mock()
+
+        plugins.load(lazy=True)
+
+        self.assertFalse(self.mock_load_modules.called)
+        self.mock_discover.add_lazy_modules.assert_called_once_with(
+            ["bar", "foo"], {"fake_plugin": ["foo"]})
+        self.assertEqual(4, self.mock_discover.load_plugins.call_count)
+
+    def test_load_lazy_with_changed_modules(self):
+        plugins.load(lazy=True)
+        plugins.PLUGINS_LOADED = False
+        self.mock_find_modules.return_value = (["foo"], "new_key")
+
+        plugins.load(lazy=True)
+
+        self.assertEqual(2, self.mock_load_modules.call_count)
+        self.assertFalse(self.mock_discover.add_lazy_modules.called)
+        self.assertEqual("new_key", self._read_manifest()["key"])
+
+    def test_load_lazy_with_broken_manifest(self):
+        os.makedirs(os.path.dirname(self.manifest_path))
+        with open(self.manifest_path, "w") as f:
+            f.write("{")
+
+        plugins.load(lazy=True)
+
+        self.mock_load_modules.assert_called_once_with()
+        self.assertEqual("key", self._read_manifest()["key"])
+
+    def test_load_lazy_with_not_loaded_modules(self):
+        self.mock_find_modules.return_value = (["foo", "missing"], "key")
+
+        plugins.load(lazy=True)
+
+        self.mock_load_modules.assert_called_once_with()
+        self.assertFalse(os.path.exists(self.manifest_path))
+
+    def test_load_lazy_failed_to_find_modules(self):
+        self.mock_find_modules.side_effect = ValueError
+
+        plugins.load(lazy=True)
+
+        self.mock_load_modules.assert_called_once_with()
+        self.assertFalse(os.path.exists(self.manifest_path))
+
+    @mock.patch("%s.os.rename" % PLUGINS, side_effect=OSError)
+    def test_load_lazy_failed_to_write_manifest(self, mock_rename):
+        plugins.load(lazy=True)
+
+        self.mock_load_modules.assert_called_once_with()
+        self.assertTrue(plugins.PLUGINS_LOADED)
+
+    def test_load_after_lazy_load(self):
+        plugins.load(lazy=True)
+        plugins.load(lazy=True)
+        self.assertFalse(self.mock_discover.import_lazy_modules.called)
+
+        plugins.load()
+
+        self.mock_discover.import_lazy_modules.assert_called_once_with()
+        self.mock_load_modules.assert_called_once_with()
+
+
+class FindModulesTestCase(test.TestCase):
+
+    @mock.patch("%s.discover.find_modules_by_entry_point" % PLUGINS,
+                return_value=[])
+    def test__find_modules(self, mock_find_modules_by_entry_point):
+        modules, key = plugins._find_modules()
+
+        self.assertIn("rally.plugins.common.scenarios.dummy.dummy", modules)
+        self.assertEqual(key, plugins._find_modules()[1])
+
+    @mock.patch("%s.discover.find_modules_by_entry_point" % PLUGINS,
+                return_value=[])
+    @mock.patch("%s.discover.find_modules_in_package" % PLUGINS)
+    def test__find_modules_changed(self, mock_find_modules_in_package,
+                                   mock_find_modules_by_entry_point):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            "foo.py")
+        with open(path, "w") as f:
+            f.write("")
+        os.utime(path, (1000, 1000))
+        mock_find_modules_in_package.return_value = [("foo", path)]
+        key = plugins._find_modules()[1]
+
+        os.utime(path, (2000, 2000))
+        self.assertNotEqual(key, plugins._find_modules()[1])
+
+    @mock.patch("%s.discover.find_modules_in_package" % PLUGINS,
+                return_value=[])
+    @mock.patch("%s.discover.find_modules_by_entry_point" % PLUGINS)
+    def test__find_modules_by_entry_point(
+            self, mock_find_modules_by_entry_point,
+            mock_find_modules_in_package):
+        package = mock.Mock(__path__=[os.path.dirname(__file__)])
+        mock_find_modules_by_entry_point.return_value = [
+            (package, "foo 1.0", ["foo.bar"])]
+        modules, key = plugins._find_modules()
+        self.assertEqual(["foo.bar"], modules)
+
+        mock_find_modules_by_entry_point.return_value = [
+            (package, "foo 1.1", ["foo.bar"])]
+        self.assertNotEqual(key, plugins._find_modules()[1])
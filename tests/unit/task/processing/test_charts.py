@@ -100,6 +100,23 @@ class ChartTestCase(test.TestCase):
         self.assertEqual(["a", "b", "c"],
                          chart._get_atomic_names())
 
+    def test__get_atomic_durations(self):
+        chart = self.Chart(self.wload_info)
+        atomic_actions = [
+            {"name": "a", "started_at": 1, "finished_at": 3.5,
+             "children": [{"name": "d", "started_at": 1, "finished_at": 2,
+                           "children": []}]},
+            {"name": "b", "started_at": 3.5, "finished_at": 4,
+             "children": []},
+            {"name": "a", "started_at": 4, "finished_at": 4.25,
+             "children": []}]
+        self.assertEqual([("a", 2.75), ("b", 0.5), ("c", 0)],
+                         chart._get_atomic_durations(atomic_actions))
+        self.assertEqual(
+            chart._fix_atomic_actions(
+                charts.atomic.merge_atomic_actions(atomic_actions)),
+            chart._get_atomic_durations(atomic_actions))
+
 
 class MainStackedAreaChartTestCase(test.TestCase):
 
@@ -341,6 +358,70 @@ class LoadProfileChartTestCase(test.TestCase):
         self.assertEqual(expected, chart.render())
 
 
+@ddt.ddt
+class ThroughputChartTestCase(test.TestCase):
+
+    @ddt.data(
+        {"info": {"total_iteration_count": 7,
+                  "data": [{"timestamp": 10.0}]},
+         "timestamps": [10.0, 10.2, 10.9, 11.0, 11.5, 13.1, 13.99],
+         "kwargs": {},
+         "expected": [("started iterations",
+                       [(0, 3), (1, 2), (2, 0), (3, 2)])]},
+        {"info": {"total_iteration_count": 2,
+                  "data": [],
+                  "start_time": 0.0},
+         "timestamps": [0.5, 1.5],
+         "kwargs": {"name": "Custom name"},
+         "expected": [("Custom name", [(0, 1), (1, 1)])]},
+        {"info": {"total_iteration_count": 0,
+                  "data": [],
+                  "start_time": 0.0},
+         "timestamps": [],
+         "kwargs": {},
+         "expected": []})
+    @ddt.unpack
+    def test_add_iteration_and_render(self, info, timestamps, kwargs,
+                                      expected):
+        chart = charts.ThroughputChart(info, **kwargs)
+        self.assertIsInstance(chart, charts.Chart)
+        for ts in timestamps:
+            chart.add_iteration({"timestamp": ts})
+        self.assertEqual(expected, chart.render())
+
+
+class StartDelayStatsTableTestCase(test.TestCase):
+
+    def test_add_iteration_and_render(self):
+        table = charts.StartDelayStatsTable({"total_iteration_count": 4})
+        self.assertIsInstance(table, charts.Table)
+        for ts, scheduled_at, duration, idle_duration in (
+                (10.5, 10.0, 2.0, 0.0), (11.0, 11.0, 1.0, 0.5),
+                (12.0, 11.5, 3.0, 1.0)):
+            table.add_iteration({"timestamp": ts,
+                                 "scheduled_at": scheduled_at,
+                                 "duration": duration,
+                                 "idle_duration": idle_duration})
+        # iterations of other runners are skipped
+        table.add_iteration({"timestamp": 13.0, "duration": 1.0,
+                             "idle_duration": 0.0})
+
+        self.assertEqual(
+            {"cols": ["Action", "Min (sec)", "Median (sec)", "90%ile (sec)",
+                      "95%ile (sec)", "Max (sec)", "Avg (sec)", "Count"],
+             "rows": [["start delay", 0.0, 0.5, 0.5, 0.5, 0.5, 0.333, 3],
+                      ["duration from scheduled start", 1.5, 2.5, 4.1,
+                       4.3, 4.5, 2.833, 3]],
+             "styles": {}},
+            table.render())
+
+    def test_render_empty(self):
+        table = charts.StartDelayStatsTable({"total_iteration_count": 2})
+        table.add_iteration({"timestamp": 13.0, "duration": 1.0,
+                             "idle_duration": 0.0})
+        self.assertEqual([], table.render()["rows"])
+
+
 @ddt.ddt
 class HistogramChartTestCase(test.TestCase):
 
@@ -376,6 +457,21 @@ class HistogramChartTestCase(test.TestCase):
                       {"id": 2, "name": "Rice Rule"}]}
         self.assertEqual(expected, chart.render())
 
+    def test_add_iteration_on_bounds_of_bins(self):
+        chart = self.HistogramChart({"total_iteration_count": 3})
+        # a value on the bound of bins is counted by the lower bin, a value
+        # which is greater than the max one is not counted at all
+        [chart.add_iteration({"foo": x}) for x in ({"bar": 0},
+                                                   {"bar": None},
+                                                   {"bar": 3.2},
+                                                   {"bar": 3.2000001},
+                                                   {"bar": 4.2000001})]
+        self.assertEqual([{"x": 2.7, "y": 2}, {"x": 4.2, "y": 2}],
+                         chart.render()["data"][0][0]["values"])
+        self.assertEqual([{"x": 2.2, "y": 2}, {"x": 3.2, "y": 1},
+                          {"x": 4.2, "y": 1}],
+                         chart.render()["data"][1][0]["values"])
+
     @ddt.data(
         {"base_size": 2, "min_value": 1, "max_value": 4,
          "expected": [{"bins": 2, "view": "Square Root Choice",
@@ -738,6 +834,21 @@ class MainStatsTableTestCase(test.TestCase):
                     "styles": expected_styles}
         self.assertEqual(expected, table.render())
 
+    def test_add_iteration_by_batches(self):
+        data = [generate_iteration(i % 7 + 0.5, i % 3 == 0,
+                                   ("foo", i % 5 + 0.1), ("bar", i / 10.0))
+                for i in range(25)]
+        table = charts.MainStatsTable({"total_iteration_count": 25})
+        table._BATCH_SIZE = 4
+        single = charts.MainStatsTable({"total_iteration_count": 25})
+        single._BATCH_SIZE = 1
+        for itr in data:
+            table.add_iteration(itr)
+            single.add_iteration(itr)
+
+        self.assertEqual(single.render(), table.render())
+        self.assertEqual(single.to_dict(), table.to_dict())
+
     def test_to_dict(self):
         table = charts.MainStatsTable({"total_iteration_count": 4})
         data = [generate_iteration(1.6, True, ("foo", 1.2)),
@@ -37,6 +37,8 @@ class PlotTestCase(test.TestCase):
                 (mock_charts.OutputStackedAreaDeprecatedChart,
                  "output_stacked"),
                 (mock_charts.LoadProfileChart, "load_profile"),
+                (mock_charts.ThroughputChart, "throughput"),
+                (mock_charts.StartDelayStatsTable, "start_delay"),
                 (mock_charts.MainHistogramChart, "main_histogram"),
                 (mock_charts.AtomicHistogramChart, "atomic_histogram"),
                 (mock_charts.AtomicAvgChart, "atomic_avg")]:
@@ -77,6 +79,8 @@ class PlotTestCase(test.TestCase):
                             "pie": [("success", 10), ("errors", 0)]},
              "iterations_count": 10, "errors": [],
              "load_profile": "load_profile",
+             "throughput": "throughput",
+             "start_delay": "start_delay",
              "additive_output": [],
              "complete_output": [[], [], [], [], [], [], [], [], [], []],
              "has_output": False,
@@ -0,0 +1,80 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally.task.processing import charts
+from rally.task.processing import statistics
+from tests.unit import test
+
+
+def generate_iterations(count):
+    iterations = []
+    for i in range(count):
+        duration = (i * 7) % 13 + 0.5
+        iterations.append({
+            "timestamp": i, "duration": duration, "idle_duration": 0,
+            "error": ["Error", "msg", "trace"] if i % 5 == 0 else [],
+            "output": {"additive": [], "complete": []},
+            "atomic_actions": [{"name": "foo", "children": [],
+                                "started_at": i,
+                                "finished_at": i + duration}]})
+    return iterations
+
+
+class WorkloadStatisticsTestCase(test.TestCase):
+
+    def test_to_dict_empty(self):
+        stats = statistics.WorkloadStatistics()
+        result = stats.to_dict()
+        self.assertEqual(0, result["total_iteration_count"])
+        self.assertEqual(0, result["failed_iteration_count"])
+        self.assertIsNone(result["min_duration"])
+        self.assertIsNone(result["max_duration"])
+        self.assertEqual(
+            charts.MainStatsTable({"total_iteration_count": 0}).to_dict(),
+            result["durations"])
+
+    @mock.patch("rally.task.processing.statistics.charts.MainStatsTable")
+    def test_add_iteration(self, mock_main_stats_table):
+        stats = statistics.WorkloadStatistics(3)
+        mock_main_stats_table.assert_called_once_with(
+            {"total_iteration_count": 3})
+        iterations = [{"duration": 3, "error": []},
+                      {"duration": 1, "error": ["Error"]},
+                      {"error": []}]
+        for itr in iterations:
+            stats.add_iteration(itr)
+
+        self.assertEqual(
+            [mock.call(itr) for itr in iterations],
+            mock_main_stats_table.return_value.add_iteration.call_args_list)
+        self.assertEqual(
+            {"total_iteration_count": 3,
+             "failed_iteration_count": 1,
+             "min_duration": 0,
+             "max_duration": 3,
+             "durations":
+                 mock_main_stats_table.return_value.to_dict.return_value},
+            stats.to_dict())
+
+    def test_incremental_equals_known_length(self):
+        iterations = generate_iterations(500)
+        incremental = statistics.WorkloadStatistics()
+        reread = statistics.WorkloadStatistics(len(iterations))
+        for itr in iterations:
+            incremental.add_iteration(itr)
+            reread.add_iteration(itr)
+
+        self.assertEqual(reread.to_dict(), incremental.to_dict())
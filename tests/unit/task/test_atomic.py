@@ -52,6 +52,35 @@ class AtomicActionTestCase(test.TestCase):
         self.assertEqual(expected,
                          inst.atomic_actions())
 
+    def test_get_active_timer(self):
+        inst = atomic.ActionTimerMixin()
+        self.assertIsNone(atomic.get_active_timer())
+
+        timer = atomic.ActionTimer(inst, "test")
+        inner_timer = atomic.ActionTimer(inst, "some")
+        with timer:
+            self.assertIs(timer, atomic.get_active_timer())
+            with inner_timer:
+                self.assertIs(inner_timer, atomic.get_active_timer())
+            self.assertIs(timer, atomic.get_active_timer())
+
+        self.assertIsNone(atomic.get_active_timer())
+
+    @mock.patch("time.time", side_effect=[1, 10])
+    def test_add_atomic_action(self, mock_time):
+        inst = atomic.ActionTimerMixin()
+        atomic.add_atomic_action(inst, "first", 0, 1)
+        with atomic.ActionTimer(inst, "test"):
+            atomic.add_atomic_action(inst, "some", 3, 5)
+
+        self.assertEqual(
+            [{"name": "first", "started_at": 0, "finished_at": 1,
+              "children": []},
+             {"name": "test", "started_at": 1, "finished_at": 10,
+              "children": [{"name": "some", "started_at": 3,
+                            "finished_at": 5, "children": []}]}],
+            inst.atomic_actions())
+
     @mock.patch("time.time", side_effect=[1, 3])
     def test_action_timer_context_with_exception(self, mock_time):
         inst = atomic.ActionTimerMixin()
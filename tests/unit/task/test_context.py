@@ -14,6 +14,8 @@
 #    under the License.
 
 import collections
+import threading
+
 import ddt
 import mock
 
@@ -166,6 +168,124 @@ class ContextManagerTestCase(test.TestCase):
         foo_context.setup.assert_called_once_with()
         bar_context.setup.assert_called_once_with()
 
+    def _get_fake_context(self, name, order, depends_on=None, calls=None,
+                          **kwargs):
+        ctx = mock.Mock(**kwargs)
+        ctx.get_name.return_value = name
+        ctx.get_platform.return_value = "foo"
+        ctx.get_order.return_value = order
+        ctx.get_dependencies.return_value = depends_on
+        if calls is not None:
+            ctx.setup.side_effect = lambda: calls.append(("setup", name))
+            ctx.cleanup.side_effect = lambda: calls.append(("cleanup", name))
+        return ctx
+
+    def test_get_dependencies(self):
+        ctxlst = [self._get_fake_context("a", 1),
+                  self._get_fake_context("b", 2),
+                  self._get_fake_context("c", 2),
+                  self._get_fake_context("d", 3, depends_on=["a", "e"]),
+                  self._get_fake_context("e", 4),
+                  self._get_fake_context("f", 5, depends_on=())]
+
+        self.assertEqual(
+            [set(), {0}, {0}, {0}, {0, 1, 2, 3}, set()],
+            context.ContextManager._get_dependencies(ctxlst))
+
+    @mock.patch("rally.task.context.ContextManager._get_sorted_context_lst")
+    def test_setup_and_cleanup_in_order(self, mock__get_sorted_context_lst):
+        calls = []
+        mock__get_sorted_context_lst.return_value = [
+            self._get_fake_context(name, order, calls=calls)
+            for name, order in (("a", 1), ("b", 2), ("c", 2), ("d", 3))]
+
+        manager = context.ContextManager({"config": {}})
+        manager.setup()
+        manager.cleanup()
+
+        self.assertEqual([("setup", "a"), ("setup", "b"), ("setup", "c"),
+                          ("setup", "d"), ("cleanup", "d"), ("cleanup", "c"),
+                          ("cleanup", "b"), ("cleanup", "a")], calls)
+        self.assertEqual(["a@foo", "b@foo", "c@foo", "d@foo"],
+                         sorted(manager.execution))
+        for name in ("a@foo", "d@foo"):
+            for method in ("setup", "cleanup"):
+                record = manager.execution[name][method]
+                self.assertIsNone(record["error"])
+                self.assertLessEqual(record["started_at"],
+                                     record["finished_at"])
+
+    @mock.patch("rally.task.context.ContextManager._get_sorted_context_lst")
+    def test_setup_and_cleanup_concurrently(self,
+                                            mock__get_sorted_context_lst):
+        # NOTE: each of contexts with the same order waits for the other
+        #   one, so they are done only if they run at the same time
+        events = {"setup": [threading.Event(), threading.Event()],
+                  "cleanup": [threading.Event(), threading.Event()]}
+        calls = []
+
+        def wait_for_other(method, i):
+            events[method][i].set()
+            self.assertTrue(events[method][1 - i].wait(10))
+            calls.append((method, i))
+
+        ctxlst = [self._get_fake_context("a", 1, calls=calls)]
+        for i in range(2):
+            ctxlst.append(self._get_fake_context(
+                "b%d" % i, 2,
+                setup=mock.Mock(side_effect=lambda i=i: wait_for_other(
+                    "setup", i)),
+                cleanup=mock.Mock(side_effect=lambda i=i: wait_for_other(
+                    "cleanup", i))))
+        ctxlst.append(self._get_fake_context("c", 3, calls=calls))
+        mock__get_sorted_context_lst.return_value = ctxlst
+
+        manager = context.ContextManager({"config": {}}, workers=4)
+        manager.setup()
+        manager.cleanup()
+
+        self.assertEqual(("setup", "a"), calls[0])
+        self.assertEqual({("setup", 0), ("setup", 1)}, set(calls[1:3]))
+        self.assertEqual([("setup", "c"), ("cleanup", "c")], calls[3:5])
+        self.assertEqual({("cleanup", 0), ("cleanup", 1)}, set(calls[5:7]))
+        self.assertEqual(("cleanup", "a"), calls[7])
+
+    @mock.patch("rally.task.context.ContextManager._get_sorted_context_lst")
+    def test_setup_fails(self, mock__get_sorted_context_lst):
+        calls = []
+        ctxlst = [self._get_fake_context(name, order, calls=calls)
+                  for name, order in (("a", 1), ("b", 2), ("c", 3))]
+        ctxlst[1].setup.side_effect = ValueError("bar")
+        mock__get_sorted_context_lst.return_value = ctxlst
+
+        manager = context.ContextManager({"config": {}}, workers=4)
+        self.assertRaises(ValueError, manager.setup)
+        manager.cleanup()
+
+        self.assertFalse(ctxlst[2].setup.called)
+        self.assertFalse(ctxlst[2].cleanup.called)
+        self.assertEqual([("setup", "a"), ("cleanup", "b"), ("cleanup", "a")],
+                         calls)
+        self.assertEqual(["ValueError", "bar"],
+                         manager.execution["b@foo"]["setup"]["error"][:2])
+
+    @mock.patch("rally.task.context.LOG")
+    @mock.patch("rally.task.context.ContextManager._get_sorted_context_lst")
+    def test_cleanup_fails(self, mock__get_sorted_context_lst, mock_log):
+        calls = []
+        ctxlst = [self._get_fake_context(name, order, calls=calls)
+                  for name, order in (("a", 1), ("b", 2))]
+        ctxlst[1].cleanup.side_effect = ValueError("bar")
+        mock__get_sorted_context_lst.return_value = ctxlst
+
+        manager = context.ContextManager({"config": {}}, workers=4)
+        manager.cleanup()
+
+        self.assertEqual([("cleanup", "a")], calls)
+        self.assertTrue(mock_log.error.called)
+        self.assertEqual(["ValueError", "bar"],
+                         manager.execution["b@foo"]["cleanup"]["error"][:2])
+
     @mock.patch("rally.task.context.Context.get_all")
     @mock.patch("rally.task.context.Context.get")
     def test_get_sorted_context_lst(self, mock_context_get,
@@ -17,6 +17,7 @@
 
 import collections
 import threading
+import time
 
 import mock
 
@@ -25,6 +26,7 @@ from rally.common import validation
 from rally import consts
 from rally import exceptions
 from rally.task import engine
+from rally.task import runner as rrunner
 from tests.unit import fakes
 from tests.unit import test
 
@@ -642,6 +644,13 @@ class TaskEngineTestCase(test.TestCase):
 
 class ResultConsumerTestCase(test.TestCase):
 
+    def setUp(self):
+        super(ResultConsumerTestCase, self).setUp()
+        # NOTE: results in these tests contain only fields which are used
+        #   by the consumer itself
+        self.mock_workload_statistics = mock.patch(
+            "rally.task.engine.statistics.WorkloadStatistics").start()
+
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
     @mock.patch("rally.task.sla.SLAChecker")
@@ -662,7 +671,7 @@ class ResultConsumerTestCase(test.TestCase):
             [{"duration": 2, "timestamp": 2}]
         ]
 
-        runner.result_queue = collections.deque(results)
+        runner.result_queue = rrunner.ResultQueue(results)
         runner.event_queue = collections.deque()
         with engine.ResultConsumer(workload_cfg, task, subtask, workload,
                                    runner, False) as consumer_obj:
@@ -698,7 +707,7 @@ class ResultConsumerTestCase(test.TestCase):
         runner = mock.MagicMock()
 
         results = []
-        runner.result_queue = collections.deque(results)
+        runner.result_queue = rrunner.ResultQueue(results)
         runner.event_queue = collections.deque()
         with engine.ResultConsumer(
                 workload_cfg, task, subtask, workload, runner, False):
@@ -707,7 +716,46 @@ class ResultConsumerTestCase(test.TestCase):
         self.assertFalse(workload.add_workload_data.called)
         workload.set_results.assert_called_once_with(
             full_duration=1, sla_results=mock_sla_results, load_duration=0,
-            start_time=None)
+            start_time=None,
+            statistics=self.mock_workload_statistics.return_value
+            .to_dict.return_value)
+
+    @mock.patch("rally.task.hook.HookExecutor")
+    @mock.patch("rally.task.engine.LOG")
+    @mock.patch("rally.task.engine.time.time")
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_with_context_execution(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status, mock_time, mock_log, mock_hook_executor):
+        mock_time.side_effect = [0, 1]
+        mock_sla_instance = mock.MagicMock()
+        mock_sla_results = mock.MagicMock()
+        mock_sla_checker.return_value = mock_sla_instance
+        mock_sla_instance.results.return_value = mock_sla_results
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        workload_cfg = {"fake": 2, "hooks": []}
+        task = mock.MagicMock()
+        subtask = mock.Mock(spec=objects.Subtask)
+        workload = mock.Mock(spec=objects.Workload)
+        runner = mock.MagicMock()
+
+        results = []
+        runner.result_queue = rrunner.ResultQueue(results)
+        runner.event_queue = collections.deque()
+        context_manager = mock.Mock(execution={"users@openstack": {}})
+        with engine.ResultConsumer(
+                workload_cfg, task, subtask, workload, runner, False,
+                context_manager=context_manager):
+            pass
+
+        self.assertFalse(workload.add_workload_data.called)
+        workload.set_results.assert_called_once_with(
+            full_duration=1, sla_results=mock_sla_results, load_duration=0,
+            start_time=None, context_execution={"users@openstack": {}},
+            statistics=self.mock_workload_statistics.return_value
+            .to_dict.return_value)
 
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
@@ -725,7 +773,7 @@ class ResultConsumerTestCase(test.TestCase):
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
 
-        runner.result_queue = collections.deque(
+        runner.result_queue = rrunner.ResultQueue(
             [[{"duration": 1, "timestamp": 1},
               {"duration": 2, "timestamp": 2}]] * 4)
 
@@ -737,6 +785,42 @@ class ResultConsumerTestCase(test.TestCase):
         task.update_status.assert_called_once_with(
             consts.TaskStatus.SOFT_ABORTING)
 
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_checked_results(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_sla_instance = mock.MagicMock()
+        mock_sla_checker.return_value = mock_sla_instance
+        mock_sla_instance.merge.side_effect = [True, False]
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        workload_cfg = {"fake": 2, "hooks": []}
+        task = mock.MagicMock()
+        subtask = mock.Mock(spec=objects.Subtask)
+        workload = mock.Mock(spec=objects.Workload)
+        runner = mock.MagicMock()
+        checkers = [mock.Mock(), mock.Mock()]
+
+        runner.result_queue = rrunner.ResultQueue([
+            rrunner.ResultBatch([{"duration": 1, "timestamp": 3},
+                                 {"duration": 1, "timestamp": 4}],
+                                checkers[0]),
+            rrunner.ResultBatch([{"duration": 2, "timestamp": 2}],
+                                checkers[1])])
+        runner.event_queue = collections.deque()
+        with engine.ResultConsumer(workload_cfg, task, subtask, workload,
+                                   runner, True) as consumer_obj:
+            pass
+
+        self.assertFalse(mock_sla_instance.add_iteration.called)
+        self.assertEqual([mock.call(checkers[0]), mock.call(checkers[1])],
+                         mock_sla_instance.merge.call_args_list)
+        mock_sla_instance.set_aborted_on_sla.assert_called_once_with()
+        runner.abort.assert_called_once_with()
+        self.assertEqual(2, consumer_obj.load_started_at)
+        self.assertEqual(5, consumer_obj.load_finished_at)
+
     @mock.patch("rally.task.hook.HookExecutor")
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.threading.Thread")
@@ -746,7 +830,7 @@ class ResultConsumerTestCase(test.TestCase):
                                             mock_event, mock_thread,
                                             mock_task_get_status,
                                             mock_hook_executor):
-        runner = mock.MagicMock(result_queue=False)
+        runner = mock.MagicMock()
 
         is_done = mock.MagicMock()
         is_done.isSet.side_effect = (False, True)
@@ -784,7 +868,7 @@ class ResultConsumerTestCase(test.TestCase):
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque(
+        runner.result_queue = rrunner.ResultQueue(
             [[{"duration": 1, "timestamp": 4}]] * 4)
         runner.event_queue = collections.deque()
 
@@ -808,7 +892,7 @@ class ResultConsumerTestCase(test.TestCase):
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque([1])
+        runner.result_queue = rrunner.ResultQueue()
         runner.event_queue = collections.deque()
         exc = MyException()
         try:
@@ -829,6 +913,7 @@ class ResultConsumerTestCase(test.TestCase):
             self, mock_sla_checker, mock_result_consumer_wait_and_abort,
             mock_task_get_status, mock_conf):
         mock_conf.raw_result_chunk_size = 2
+        mock_conf.raw_result_max_pending_chunks = 1
         mock_sla_instance = mock.MagicMock()
         mock_sla_checker.return_value = mock_sla_instance
         mock_task_get_status.return_value = consts.TaskStatus.RUNNING
@@ -848,7 +933,7 @@ class ResultConsumerTestCase(test.TestCase):
             [{"duration": 7, "timestamp": 1}],
         ]
 
-        runner.result_queue = collections.deque(results)
+        runner.result_queue = rrunner.ResultQueue(results)
         runner.event_queue = collections.deque()
         with engine.ResultConsumer(workload_cfg, task, subtask, workload,
                                    runner, False) as consumer_obj:
@@ -868,12 +953,141 @@ class ResultConsumerTestCase(test.TestCase):
 
         workload.add_workload_data.assert_has_calls([
             mock.call(0, {"raw": [{"duration": 2, "timestamp": 2},
-                                  {"duration": 1, "timestamp": 3}]}),
+                                  {"duration": 1, "timestamp": 3}]},
+                      codec=mock_conf.raw_result_chunk_codec),
             mock.call(1, {"raw": [{"duration": 4, "timestamp": 2},
-                                  {"duration": 3, "timestamp": 3}]}),
+                                  {"duration": 3, "timestamp": 3}]},
+                      codec=mock_conf.raw_result_chunk_codec),
             mock.call(2, {"raw": [{"duration": 6, "timestamp": 2},
-                                  {"duration": 5, "timestamp": 3}]}),
-            mock.call(3, {"raw": [{"duration": 7, "timestamp": 1}]})])
+                                  {"duration": 5, "timestamp": 3}]},
+                      codec=mock_conf.raw_result_chunk_codec),
+            mock.call(3, {"raw": [{"duration": 7, "timestamp": 1}]},
+                      codec=mock_conf.raw_result_chunk_codec)])
+
+    @mock.patch("rally.task.engine.CONF")
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_with_slow_writer(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status, mock_conf):
+        mock_conf.raw_result_chunk_size = 2
+        mock_conf.raw_result_max_pending_chunks = 1
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        workload_cfg = {"fake": 2, "hooks": []}
+        task = mock.MagicMock(spec=objects.Task)
+        subtask = mock.Mock(spec=objects.Subtask)
+        workload = mock.Mock(spec=objects.Workload)
+        runner = mock.MagicMock()
+        runner.result_queue = rrunner.ResultQueue()
+        runner.event_queue = collections.deque()
+        stored = threading.Event()
+        workload.add_workload_data.side_effect = (
+            lambda *args, **kwargs: stored.wait())
+
+        with engine.ResultConsumer(workload_cfg, task, subtask, workload,
+                                   runner, False):
+            for i in range(4):
+                runner.result_queue.append(
+                    [{"duration": 1, "timestamp": i}])
+            # the 1st chunk is stored, the 2nd one is filled, so the
+            # runner waits for the writer
+            sender = threading.Thread(
+                target=runner.result_queue.append,
+                args=([{"duration": 1, "timestamp": 4}],))
+            sender.start()
+            sender.join(0.1)
+            self.assertTrue(sender.is_alive())
+            # while SLA is checked for all the received results
+            add_iteration = mock_sla_checker.return_value.add_iteration
+            for i in range(500):
+                if add_iteration.call_count == 4:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(4, add_iteration.call_count)
+
+            stored.set()
+            sender.join()
+
+        self.assertEqual(
+            [mock.call(0, {"raw": [{"duration": 1, "timestamp": 0},
+                                   {"duration": 1, "timestamp": 1}]},
+                       codec=mock_conf.raw_result_chunk_codec),
+             mock.call(1, {"raw": [{"duration": 1, "timestamp": 2},
+                                   {"duration": 1, "timestamp": 3}]},
+                       codec=mock_conf.raw_result_chunk_codec),
+             mock.call(2, {"raw": [{"duration": 1, "timestamp": 4}]},
+                       codec=mock_conf.raw_result_chunk_codec)],
+            workload.add_workload_data.call_args_list)
+        self.assertEqual(1, runner.result_queue.pending)
+        self.assertIsNone(runner.result_queue.max_pending)
+
+    @mock.patch("rally.task.engine.CONF")
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_with_storage_failure(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status, mock_conf):
+        mock_conf.raw_result_chunk_size = 1
+        mock_conf.raw_result_max_pending_chunks = 1
+        mock_sla_instance = mock_sla_checker.return_value
+        mock_sla_instance.unexpected_failure = None
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        workload_cfg = {"fake": 2, "hooks": []}
+        task = mock.MagicMock(spec=objects.Task)
+        subtask = mock.Mock(spec=objects.Subtask)
+        workload = mock.Mock(spec=objects.Workload)
+        exc = MyException()
+        workload.add_workload_data.side_effect = [None, exc, MyException()]
+        runner = mock.MagicMock()
+        runner.result_queue = rrunner.ResultQueue(
+            [[{"duration": 1, "timestamp": i}] for i in range(3)])
+        runner.event_queue = collections.deque()
+
+        with engine.ResultConsumer(workload_cfg, task, subtask, workload,
+                                   runner, False) as consumer_obj:
+            pass
+
+        # all the chunks are handled and the first failure is reported
+        self.assertEqual(3, workload.add_workload_data.call_count)
+        self.assertEqual(3, consumer_obj.workload_data_count)
+        self.assertEqual(0, runner.result_queue.pending)
+        runner.abort.assert_called_once_with()
+        mock_sla_instance.set_unexpected_failure.assert_called_once_with(exc)
+        self.assertEqual(
+            mock_sla_instance.results.return_value,
+            workload.set_results.call_args[1]["sla_results"])
+
+    @mock.patch("rally.task.engine.CONF")
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_with_failure_of_last_chunk(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status, mock_conf):
+        mock_conf.raw_result_chunk_size = 2
+        mock_conf.raw_result_max_pending_chunks = 1
+        mock_sla_instance = mock_sla_checker.return_value
+        mock_sla_instance.unexpected_failure = None
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        workload_cfg = {"fake": 2, "hooks": []}
+        task = mock.MagicMock(spec=objects.Task)
+        subtask = mock.Mock(spec=objects.Subtask)
+        workload = mock.Mock(spec=objects.Workload)
+        exc = MyException()
+        workload.add_workload_data.side_effect = exc
+        runner = mock.MagicMock()
+        runner.result_queue = rrunner.ResultQueue(
+            [[{"duration": 1, "timestamp": 1}]])
+        runner.event_queue = collections.deque()
+
+        with engine.ResultConsumer(workload_cfg, task, subtask, workload,
+                                   runner, False):
+            pass
+
+        mock_sla_instance.set_unexpected_failure.assert_called_once_with(exc)
+        self.assertTrue(workload.set_results.called)
 
     @mock.patch("rally.task.engine.LOG")
     @mock.patch("rally.task.hook.HookExecutor")
@@ -901,7 +1115,7 @@ class ResultConsumerTestCase(test.TestCase):
             {"type": "iteration", "value": 2},
             {"type": "iteration", "value": 3}
         ]
-        runner.result_queue = collections.deque()
+        runner.result_queue = rrunner.ResultQueue()
         runner.event_queue = collections.deque(events)
 
         consumer_obj = engine.ResultConsumer(workload_cfg, task, subtask,
@@ -929,7 +1143,9 @@ class ResultConsumerTestCase(test.TestCase):
             load_duration=0,
             sla_results=mock_sla_results,
             hooks_results=mock_hook_results,
-            start_time=None)
+            start_time=None,
+            statistics=self.mock_workload_statistics.return_value
+            .to_dict.return_value)
 
     @mock.patch("rally.task.engine.threading.Thread")
     @mock.patch("rally.task.engine.threading.Event")
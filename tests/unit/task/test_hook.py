@@ -73,9 +73,10 @@ class HookExecutorTestCase(test.TestCase):
         }
         self.task = mock.MagicMock()
 
+    @mock.patch("rally.task.hook.time.time", return_value=-2)
     @mock.patch("rally.task.hook.HookExecutor._timer_method")
     @mock.patch("rally.common.utils.Timer", side_effect=fakes.FakeTimer)
-    def test_results(self, mock_timer, mock__timer_method):
+    def test_results(self, mock_timer, mock__timer_method, mock_time):
         hook_executor = hook.HookExecutor(self.conf, self.task)
         hook_executor.on_event(event_type="iteration", value=1)
 
@@ -84,14 +85,17 @@ class HookExecutorTestCase(test.TestCase):
               "results": [{
                   "triggered_by": {"event_type": "iteration", "value": 1},
                   "started_at": fakes.FakeTimer().timestamp(),
+                  "skew": 2,
                   "finished_at": fakes.FakeTimer().finish_timestamp(),
                   "status": consts.HookStatus.SUCCESS}],
               "summary": {consts.HookStatus.SUCCESS: 1}}],
             hook_executor.results())
 
+    @mock.patch("rally.task.hook.time.time", return_value=-2)
     @mock.patch("rally.task.hook.HookExecutor._timer_method")
     @mock.patch("rally.common.utils.Timer", side_effect=fakes.FakeTimer)
-    def test_result_optional(self, mock_timer, mock__timer_method):
+    def test_result_optional(self, mock_timer, mock__timer_method,
+                             mock_time):
         hook_args = self.conf["hooks"][0]["config"]["args"]
         hook_args["error"] = ["Exception", "Description", "Traceback"]
         hook_args["output"] = {"additive": None, "complete": None}
@@ -104,6 +108,7 @@ class HookExecutorTestCase(test.TestCase):
               "results": [{
                   "triggered_by": {"event_type": "iteration", "value": 1},
                   "started_at": fakes.FakeTimer().timestamp(),
+                  "skew": 2,
                   "finished_at": fakes.FakeTimer().finish_timestamp(),
                   "error": {"details": "Traceback", "etype": "Exception",
                             "msg": "Description"},
@@ -119,11 +124,12 @@ class HookExecutorTestCase(test.TestCase):
                            "summary": {}}],
                          hook_executor.results())
 
+    @mock.patch("rally.task.hook.time.time", return_value=-2)
     @mock.patch("rally.task.hook.HookExecutor._timer_method")
     @mock.patch.object(DummyHook, "run", side_effect=Exception("My err msg"))
     @mock.patch("rally.common.utils.Timer", side_effect=fakes.FakeTimer)
     def test_failed_result(self, mock_timer, mock_dummy_hook_run,
-                           mock__timer_method):
+                           mock__timer_method, mock_time):
         hook_executor = hook.HookExecutor(self.conf, self.task)
         hook_executor.on_event(event_type="iteration", value=1)
 
@@ -131,6 +137,7 @@ class HookExecutorTestCase(test.TestCase):
             [{"config": self.conf["hooks"][0]["config"],
               "results": [{
                   "triggered_by": {"event_type": "iteration", "value": 1},
+                  "skew": 2,
                   "error": {"etype": "Exception",
                             "msg": mock.ANY, "details": mock.ANY},
                   "started_at": fakes.FakeTimer().timestamp(),
@@ -163,13 +170,19 @@ class HookExecutorTestCase(test.TestCase):
             "name": "periodic", "args": {"unit": "time", "step": 2}}
         hook_executor = hook.HookExecutor(self.conf, self.task)
 
-        for i in range(1, 7):
+        for i in range(7):
             hook_executor.on_event(event_type="time", value=i)
 
         self.assertEqual(
             [{
                 "config": self.conf["hooks"][0]["config"],
                 "results":[
+                    {
+                        "triggered_by": {"event_type": "time", "value": 0},
+                        "started_at": fakes.FakeTimer().timestamp(),
+                        "finished_at": fakes.FakeTimer().finish_timestamp(),
+                        "status": consts.HookStatus.SUCCESS
+                    },
                     {
                         "triggered_by": {"event_type": "time", "value": 2},
                         "started_at": fakes.FakeTimer().timestamp(),
@@ -189,44 +202,99 @@ class HookExecutorTestCase(test.TestCase):
                         "status": consts.HookStatus.SUCCESS
                     }
                 ],
-                "summary": {consts.HookStatus.SUCCESS: 3}
+                "summary": {consts.HookStatus.SUCCESS: 4}
             }],
             hook_executor.results())
 
-    @mock.patch("rally.common.utils.Stopwatch", autospec=True)
-    @mock.patch("rally.common.utils.Timer", side_effect=fakes.FakeTimer)
-    def test_timer_thread(self, mock_timer, mock_stopwatch):
-        trigger_args = self.conf["hooks"][0]["config"]["trigger"]["args"]
-        trigger_args["unit"] = "time"
+    def test_timer_thread(self):
+        self.conf["hooks"][0]["config"]["trigger"] = {
+            "name": "periodic",
+            "args": {"unit": "time", "step": 0.01, "end": 0.03}}
         hook_executor = hook.HookExecutor(self.conf, self.task)
 
-        def stop_timer(sec):
-            if sec == 3:
-                hook_executor._timer_stop_event.set()
+        hook_executor.on_event(event_type="iteration", value=1)
+        hook_executor._timer_thread.join(5)
+        self.assertFalse(hook_executor._timer_thread.is_alive())
 
-        stopwatch_inst = mock_stopwatch.return_value
-        stopwatch_inst.sleep.side_effect = stop_timer
+        results = hook_executor.results()[0]
+        self.assertEqual({consts.HookStatus.SUCCESS: 4}, results["summary"])
+        self.assertEqual(
+            [{"event_type": "time", "value": value}
+             for value in (0, 0.01, 0.02, 0.03)],
+            [result["triggered_by"] for result in results["results"]])
+        for result in results["results"]:
+            self.assertTrue(0 <= result["skew"] < 1)
+            self.assertEqual(result["started_at"] - result["skew"],
+                             hook_executor._timer_started_at +
+                             result["triggered_by"]["value"])
+
+    def test_timer_thread_stopped(self):
+        self.conf["hooks"][0]["config"]["trigger"] = {
+            "name": "periodic", "args": {"unit": "time", "step": 60}}
+        hook_executor = hook.HookExecutor(self.conf, self.task)
 
         hook_executor.on_event(event_type="iteration", value=1)
-        self.assertTrue(hook_executor._timer_stop_event.wait(1))
+        results = hook_executor.results()[0]
 
-        self.assertEqual(
-            [{"config": self.conf["hooks"][0]["config"],
-              "results": [{
-                  "triggered_by": {"event_type": "time", "value": 1},
-                  "started_at": fakes.FakeTimer().timestamp(),
-                  "finished_at": fakes.FakeTimer().finish_timestamp(),
-                  "status": consts.HookStatus.SUCCESS}],
-              "summary": {consts.HookStatus.SUCCESS: 1}
-              }],
-            hook_executor.results())
+        self.assertFalse(hook_executor._timer_thread.is_alive())
+        self.assertEqual([0], [result["triggered_by"]["value"]
+                               for result in results["results"]])
+
+    @mock.patch("rally.common.utils.Timer", side_effect=fakes.FakeTimer)
+    def test_time_triggers_order(self, mock_timer):
+        self.conf["hooks"] = [
+            {"config": {"name": "dummy_hook",
+                        "args": {"status": consts.HookStatus.SUCCESS},
+                        "trigger": {"name": "event",
+                                    "args": {"unit": "time", "at": at}}}}
+            for at in ([0.5, 3], [1, 2.5], [4])]
+        hook_executor = hook.HookExecutor(self.conf, self.task)
 
-        stopwatch_inst.start.assert_called_once_with()
-        stopwatch_inst.sleep.assert_has_calls([
-            mock.call(1),
-            mock.call(2),
-            mock.call(3),
-        ])
+        for trigger_obj in hook_executor.triggers["time"]:
+            trigger_obj.on_event = mock.Mock()
+        on_event = mock.Mock()
+        on_event.attach_mock(hook_executor.triggers["time"][0].on_event, "a")
+        on_event.attach_mock(hook_executor.triggers["time"][1].on_event, "b")
+        on_event.attach_mock(hook_executor.triggers["time"][2].on_event, "c")
+
+        hook_executor.on_event(event_type="time", value=0.7)
+        hook_executor.on_event(event_type="time", value=3.2)
+
+        self.assertEqual([mock.call.a("time", 0.5), mock.call.b("time", 1),
+                          mock.call.b("time", 2.5), mock.call.a("time", 3)],
+                         on_event.mock_calls)
+        self.assertEqual([(4, 3, hook_executor.triggers["time"][2])],
+                         hook_executor._timers)
+
+    @mock.patch("rally.common.utils.Timer", side_effect=fakes.FakeTimer)
+    def test_iterations_out_of_order(self, mock_timer):
+        self.conf["hooks"][0]["config"]["trigger"] = {
+            "name": "periodic", "args": {"unit": "iteration", "step": 2}}
+        hook_executor = hook.HookExecutor(self.conf, self.task)
+        trigger_obj = hook_executor.triggers["iteration"][0]
+        trigger_obj.on_event = mock.Mock()
+
+        for value in (2, 3, 4, 5, 1, 8, 6, 7):
+            hook_executor.on_event(event_type="iteration", value=value)
+
+        self.assertEqual([mock.call("iteration", value)
+                          for value in (1, 3, 5, 7)],
+                         trigger_obj.on_event.call_args_list)
+        self.assertEqual({9: [trigger_obj]}, hook_executor._iterations)
+        self.assertEqual(8, hook_executor._iterations_passed)
+        self.assertEqual(set(), hook_executor._iterations_seen)
+
+    def test_other_events(self):
+        self.conf["hooks"][0]["config"]["trigger"] = {
+            "name": "event", "args": {"unit": "iteration", "at": [1]}}
+        trigger_obj = mock.Mock()
+        hook_executor = hook.HookExecutor(self.conf, self.task)
+        hook_executor.triggers["custom"].append(trigger_obj)
+
+        hook_executor.on_event(event_type="custom", value="foo")
+
+        trigger_obj.on_event.assert_called_once_with("custom", "foo")
+        self.assertIsNotNone(trigger_obj.scheduled_at)
 
 
 @ddt.ddt
@@ -256,6 +324,21 @@ class HookTestCase(test.TestCase):
              "triggered_by": triggered_by,
              "status": consts.HookStatus.SUCCESS}, dummy_hook.result())
 
+    @mock.patch("rally.common.utils.Timer", side_effect=fakes.FakeTimer)
+    def test_run_async(self, mock_timer):
+        task = mock.MagicMock()
+        triggered_by = {"event_type": "time", "value": 2}
+        dummy_hook = DummyHook(task, {"status": consts.HookStatus.SUCCESS},
+                               triggered_by)
+        dummy_hook.run_async(scheduled_at=-0.5)
+
+        self.assertEqual(
+            {"started_at": fakes.FakeTimer().timestamp(),
+             "finished_at": fakes.FakeTimer().finish_timestamp(),
+             "skew": 0.5,
+             "triggered_by": triggered_by,
+             "status": consts.HookStatus.SUCCESS}, dummy_hook.result())
+
     def test_result_not_started(self):
         task = mock.MagicMock()
         triggered_by = {"event_type": "iteration", "value": 1}
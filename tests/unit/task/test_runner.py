@@ -15,10 +15,13 @@
 
 import collections
 import multiprocessing
+import threading
 
 import ddt
 import mock
 
+from rally.common import utils as rutils
+from rally import exceptions
 from rally.plugins.common.runners import serial
 from rally.task import runner
 from tests.unit import fakes
@@ -51,6 +54,37 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
         result = runner._get_scenario_context(13, context_obj)
         self.assertEqual({"foo": "bar", "iteration": 14}, result)
 
+    def test_get_scenario_context_is_isolated(self):
+        context_obj = rutils.LockedDict(
+            {"users": [{"id": "u1"}], "tenants": {"t1": {"name": "foo"}}})
+        first = runner._get_scenario_context(0, context_obj)
+        second = runner._get_scenario_context(1, context_obj)
+
+        first["user"] = first["users"][0]
+        first["tenants"]["t1"]["name"] = "bar"
+
+        self.assertEqual(1, first["iteration"])
+        self.assertEqual(2, second["iteration"])
+        self.assertNotIn("user", second)
+        self.assertEqual({"name": "foo"}, second["tenants"]["t1"])
+        self.assertEqual({"users": ({"id": "u1"},),
+                          "tenants": {"t1": {"name": "foo"}}}, context_obj)
+
+    @mock.patch(BASE + "copy.deepcopy")
+    def test__copy_scenario_kwargs_with_scalars(self, mock_deepcopy):
+        kwargs = {"a": 1, "b": "foo", "c": None, "d": 1.5, "e": True}
+        result = runner._copy_scenario_kwargs(kwargs)
+        self.assertEqual(kwargs, result)
+        self.assertIsNot(kwargs, result)
+        self.assertFalse(mock_deepcopy.called)
+
+    def test__copy_scenario_kwargs(self):
+        kwargs = {"a": 1, "b": {"c": [1, 2]}}
+        result = runner._copy_scenario_kwargs(kwargs)
+        self.assertEqual(kwargs, result)
+        self.assertIsNot(kwargs["b"], result["b"])
+        self.assertIsNot(kwargs["b"]["c"], result["b"]["c"])
+
     def test_run_scenario_once_internal_logic(self):
         context = runner._get_scenario_context(
             12, fakes.FakeContext({}).context)
@@ -129,6 +163,270 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
                          ["Exception", "Something went wrong"])
 
 
+class WorkerThreadPoolTestCase(test.TestCase):
+
+    def test_submit_and_join(self):
+        pool = runner.WorkerThreadPool(3)
+        results = []
+        for i in range(10):
+            pool.wait_for_free_slot()
+            pool.submit(results.append, i)
+        pool.join()
+
+        self.assertEqual(list(range(10)), sorted(results))
+        self.assertEqual([], pool._threads)
+
+    def test_threads_are_reused(self):
+        pool = runner.WorkerThreadPool(2)
+        idents = set()
+
+        def remember_thread():
+            idents.add(threading.current_thread().ident)
+
+        for i in range(20):
+            pool.wait_for_free_slot()
+            pool.submit(remember_thread)
+        threads = list(pool._threads)
+        pool.join()
+
+        self.assertEqual(2, len(threads))
+        self.assertTrue(idents.issubset(set(t.ident for t in threads)))
+
+    def test_wait_for_free_slot_is_woken_by_finished_iteration(self):
+        pool = runner.WorkerThreadPool(1)
+        finish = threading.Event()
+
+        pool.wait_for_free_slot()
+        pool.submit(finish.wait)
+        threading.Timer(0.1, finish.set).start()
+        # the only slot is busy, so the call blocks until the event is set
+        pool.wait_for_free_slot()
+        self.assertTrue(finish.is_set())
+        pool.submit(lambda: None)
+        pool.join()
+
+    def test_submit_with_on_done(self):
+        pool = runner.WorkerThreadPool(2, timeout=0.1)
+        done = []
+
+        def iteration(sleep):
+            rutils.interruptable_sleep(sleep, 0.01)
+
+        for sleep in (0, 5):
+            pool.wait_for_free_slot()
+            pool.submit(iteration, sleep,
+                        on_done=lambda sleep=sleep: done.append(sleep))
+        pool.join()
+
+        # the callback is called for timed out iterations too
+        self.assertEqual([0, 5], done)
+
+    def test_release_slot(self):
+        pool = runner.WorkerThreadPool(1)
+        pool.wait_for_free_slot()
+        pool.release_slot()
+        # the slot is free again, so the call doesn't block
+        pool.wait_for_free_slot()
+        pool.submit(lambda: None)
+        pool.join()
+
+    def test_timeout(self):
+        pool = runner.WorkerThreadPool(1, timeout=0.1)
+        results = []
+
+        def iteration(sleep):
+            try:
+                rutils.interruptable_sleep(sleep, 0.01)
+                results.append("finished")
+            except exceptions.ThreadTimeoutException:
+                results.append("timed out")
+
+        pool.wait_for_free_slot()
+        pool.submit(iteration, 5)
+        pool.wait_for_free_slot()
+        pool.submit(iteration, 0)
+        pool.join()
+
+        self.assertEqual(["timed out", "finished"], results)
+
+    @mock.patch(BASE + "LOG")
+    def test_timeout_exception_outside_of_iteration(self, mock_log):
+        # NOTE: the exception of a timed out iteration is delivered once
+        #   more while it is logged, i.e. outside of the iteration itself
+        mock_log.warning.side_effect = exceptions.ThreadTimeoutException
+        pool = runner.WorkerThreadPool(1)
+        results = []
+
+        def iteration():
+            results.append("timed out")
+            raise exceptions.ThreadTimeoutException()
+
+        pool.wait_for_free_slot()
+        pool.submit(iteration)
+        waiter = threading.Thread(target=pool.wait_for_free_slot)
+        waiter.start()
+        waiter.join(5)
+        # the slot of the iteration is released
+        self.assertFalse(waiter.is_alive())
+        pool.submit(results.append, "finished")
+        threads = list(pool._threads)
+        pool.join()
+
+        self.assertEqual(["timed out", "finished"], results)
+        self.assertEqual(1, len(threads))
+
+
+def _put_objects(channel, objects, info=None):
+    for obj in objects:
+        channel.put(obj)
+
+
+class BatchedPipeTestCase(test.TestCase):
+
+    def test_put_sends_full_frame(self):
+        channel = runner.BatchedPipe(batch_size=3, flush_interval=60)
+        self.addCleanup(channel.close)
+        for i in range(3):
+            channel.put(i)
+
+        # the frame is sent without waiting for flush_interval
+        self.assertTrue(channel._reader.poll(5))
+        self.assertEqual([0, 1, 2], channel.receive())
+        self.assertEqual([], channel.receive())
+
+    def test_put_blocks_while_frame_is_not_sent(self):
+        channel = runner.BatchedPipe(batch_size=2, flush_interval=60)
+        self.addCleanup(channel.close)
+        writer = channel._writer
+        channel._writer = mock.Mock()
+        written = threading.Event()
+        channel._writer.send_bytes.side_effect = lambda frame: (
+            written.wait(), writer.send_bytes(frame))
+
+        # the 1st frame is written, the 2nd one is buffered
+        for i in range(4):
+            channel.put(i)
+        putter = threading.Thread(target=channel.put, args=(4,))
+        putter.start()
+        putter.join(0.1)
+        self.assertTrue(putter.is_alive())
+
+        written.set()
+        putter.join()
+        channel._writer = writer
+        received = []
+        while len(received) < 4 and channel._reader.poll(5):
+            received.extend(channel.receive())
+        self.assertEqual([0, 1, 2, 3], received)
+        self.assertEqual([4], channel._buffer)
+
+    def test_put_flushes_by_interval(self):
+        channel = runner.BatchedPipe(batch_size=100, flush_interval=0.01)
+        self.addCleanup(channel.close)
+        channel.put("foo")
+
+        self.assertTrue(channel._reader.poll(5))
+        self.assertEqual(["foo"], channel.receive())
+
+    def test_close(self):
+        channel = runner.BatchedPipe(batch_size=100, flush_interval=10)
+        channel.put("foo")
+        channel.put("bar")
+        reader = channel._reader
+        channel._reader = mock.Mock()
+        sender = channel._sender
+
+        channel.close()
+
+        self.assertFalse(sender.is_alive())
+        self.assertIsNone(channel._sender)
+        self.assertEqual(["foo", "bar"],
+                         runner.pickle.loads(reader.recv_bytes()))
+        channel._reader.close.assert_called_once_with()
+        reader.close()
+
+    def test_objects_of_processes(self):
+        channel = runner.BatchedPipe(batch_size=10, flush_interval=10)
+        self.addCleanup(channel.close)
+        processes = [multiprocessing.Process(target=_put_objects,
+                                             args=(channel, range(i, 25, 2)))
+                     for i in range(2)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        # the rest of objects is sent on exit of processes
+        self.assertEqual(list(range(25)), sorted(channel.receive()))
+
+    def test_put_from_threads(self):
+        channel = runner.BatchedPipe(batch_size=10, flush_interval=0.01)
+        self.addCleanup(channel.close)
+        threads = [threading.Thread(target=_put_objects,
+                                    args=(channel, range(i, 100, 4)))
+                   for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        received = []
+        while len(received) < 100 and channel._reader.poll(5):
+            received.extend(channel.receive())
+        self.assertEqual(list(range(100)), sorted(received))
+
+
+class ResultQueueTestCase(test.TestCase):
+
+    def test_append_and_release(self):
+        queue = runner.ResultQueue([[1, 2]])
+        queue.append([3])
+
+        self.assertEqual(collections.deque([[1, 2], [3]]), queue)
+        self.assertEqual(3, queue.pending)
+        queue.popleft()
+        self.assertEqual(3, queue.pending)
+        queue.release(2)
+        self.assertEqual(1, queue.pending)
+
+    def test_append_waits_for_release(self):
+        queue = runner.ResultQueue()
+        queue.set_limit(2)
+        queue.append([1, 2])
+        appended = threading.Event()
+
+        def append():
+            queue.append([3])
+            appended.set()
+
+        thread = threading.Thread(target=append)
+        thread.start()
+        self.assertFalse(appended.wait(0.1))
+
+        queue.release(1)
+        thread.join()
+        self.assertEqual(2, queue.pending)
+        self.assertEqual(collections.deque([[1, 2], [3]]), queue)
+
+    def test_set_limit_wakes_appending(self):
+        queue = runner.ResultQueue()
+        queue.set_limit(1)
+        queue.append([1])
+        thread = threading.Thread(target=queue.append, args=([2],))
+        thread.start()
+
+        queue.set_limit(None)
+        thread.join()
+        self.assertEqual(2, queue.pending)
+
+    def test_wait(self):
+        queue = runner.ResultQueue()
+        self.assertFalse(queue.wait(0))
+
+        threading.Timer(0.05, queue.append, args=([1],)).start()
+        self.assertTrue(queue.wait(5))
+
+
 @ddt.ddt
 class ScenarioRunnerTestCase(test.TestCase):
 
@@ -181,15 +479,18 @@ class ScenarioRunnerTestCase(test.TestCase):
         for process in process_pool:
             self.assertIsInstance(process, multiprocessing.Process)
 
-    @mock.patch(BASE + "ScenarioRunner._send_result")
-    def test__join_processes(self, mock_scenario_runner__send_result):
-        process = mock.MagicMock(is_alive=mock.MagicMock(return_value=False))
-        processes = 10
-        process_pool = collections.deque([process] * processes)
-        mock_result_queue = mock.MagicMock(
-            empty=mock.MagicMock(return_value=True))
-        mock_event_queue = mock.MagicMock(
-            empty=mock.MagicMock(return_value=True))
+    @mock.patch(BASE + "select.select")
+    @mock.patch(BASE + "ScenarioRunner._send_results")
+    def test__join_processes(self, mock_scenario_runner__send_results,
+                             mock_select):
+        process = mock.MagicMock()
+        process.is_alive.side_effect = [True, False, False]
+        process_pool = collections.deque([process, process])
+        mock_result_queue = mock.MagicMock()
+        mock_result_queue.receive.side_effect = [["r1", "r2"], [], ["r3"]]
+        mock_event_queue = mock.MagicMock()
+        mock_event_queue.receive.side_effect = [
+            [{"type": "iteration", "value": 1}], [], []]
 
         runner_obj = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -198,8 +499,74 @@ class ScenarioRunnerTestCase(test.TestCase):
         runner_obj._join_processes(
             process_pool, mock_result_queue, mock_event_queue)
 
-        self.assertEqual(processes, process.join.call_count)
+        self.assertEqual(2, process.join.call_count)
+        self.assertEqual(
+            [mock.call([mock_result_queue, mock_event_queue], [], [],
+                       runner_obj.JOIN_POLL_INTERVAL)] * 2,
+            mock_select.call_args_list)
+        self.assertEqual([mock.call(["r1", "r2"], validate=True),
+                          mock.call(["r3"], validate=True)],
+                         mock_scenario_runner__send_results.call_args_list)
+        self.assertEqual([{"type": "iteration", "value": 1}],
+                         list(runner_obj.event_queue))
         mock_result_queue.close.assert_called_once_with()
+        mock_event_queue.close.assert_called_once_with()
+
+    @mock.patch(BASE + "time.sleep")
+    @mock.patch(BASE + "ScenarioRunner._send_result")
+    def test__join_processes_with_multiprocessing_queues(
+            self, mock_scenario_runner__send_result, mock_sleep):
+        process = mock.MagicMock()
+        process.is_alive.side_effect = [True, False]
+        process_pool = collections.deque([process])
+        results = []
+        events = []
+        mock_result_queue = mock.MagicMock(spec=["empty", "get", "close"])
+        mock_result_queue.empty.side_effect = lambda: not results
+        mock_result_queue.get.side_effect = results.pop
+        mock_event_queue = mock.MagicMock(spec=["empty", "get", "close"])
+        mock_event_queue.empty.side_effect = lambda: not events
+        mock_event_queue.get.side_effect = events.pop
+        # objects arrive while the runner sleeps for the first time
+        mock_sleep.side_effect = lambda t: mock_sleep.call_count == 1 and (
+            results.append("r1"),
+            events.append({"type": "iteration", "value": 1}))
+
+        runner_obj = serial.SerialScenarioRunner(mock.MagicMock(),
+                                                 mock.MagicMock())
+        runner_obj._join_processes(process_pool, mock_result_queue,
+                                   mock_event_queue)
+
+        process.join.assert_called_once_with()
+        mock_sleep.assert_called_with(0.01)
+        mock_scenario_runner__send_result.assert_called_once_with("r1")
+        self.assertEqual([{"type": "iteration", "value": 1}],
+                         list(runner_obj.event_queue))
+        mock_result_queue.close.assert_called_once_with()
+        mock_event_queue.close.assert_called_once_with()
+
+    def test__join_processes_with_batched_pipes(self):
+        result_queue = runner.BatchedPipe()
+        event_queue = runner.BatchedPipe()
+        results = [{"timestamp": i} for i in range(30)]
+        process_pool = runner.ScenarioRunner._create_process_pool(
+            3, _put_objects,
+            iter([(result_queue, results[i::3]) for i in range(3)]))
+        runner_obj = serial.SerialScenarioRunner({"uuid": "task_uuid"}, {})
+        runner_obj._result_has_valid_schema = mock.Mock()
+
+        runner_obj._join_processes(process_pool, result_queue, event_queue,
+                                   validate_results=False)
+
+        self.assertFalse(runner_obj._result_has_valid_schema.called)
+
+        self.assertEqual(results,
+                         sorted((r for batch in runner_obj.result_queue
+                                 for r in batch),
+                                key=lambda r: r["timestamp"]))
+        for batch in runner_obj.result_queue:
+            self.assertEqual(sorted(batch, key=lambda r: r["timestamp"]),
+                             batch)
 
     def _get_runner(self, task="mock_me", config="mock_me", batch_size=0):
         class ScenarioRunner(runner.ScenarioRunner):
@@ -338,6 +705,44 @@ class ScenarioRunnerTestCase(test.TestCase):
         self.assertEqual([], runner_.result_batch)
         self.assertEqual(collections.deque([[result]]), runner_.result_queue)
 
+    def test__send_results_without_validation(self):
+        runner_ = self._get_runner(task={"uuid": "foo_uuid"}, batch_size=3)
+        runner_._result_has_valid_schema = mock.Mock()
+
+        runner_._send_results([{"timestamp": 2}, {"timestamp": 0}],
+                              validate=False)
+        self.assertEqual([{"timestamp": 2}, {"timestamp": 0}],
+                         runner_.result_batch)
+        self.assertFalse(runner_._result_has_valid_schema.called)
+
+    def test__send_results(self):
+        runner_ = self._get_runner(task={"uuid": "foo_uuid"}, batch_size=3)
+        runner_._result_has_valid_schema = mock.Mock(
+            side_effect=lambda r: r["timestamp"] != 0)
+
+        runner_._send_results([{"timestamp": 2}, {"timestamp": 0}])
+        self.assertEqual([{"timestamp": 2}], runner_.result_batch)
+        self.assertEqual(0, len(runner_.result_queue))
+
+        runner_._send_results([{"timestamp": 3}, {"timestamp": 1}])
+        self.assertEqual([], runner_.result_batch)
+        self.assertEqual(
+            collections.deque([[{"timestamp": 1}, {"timestamp": 2},
+                                {"timestamp": 3}]]),
+            runner_.result_queue)
+
+    def test__send_checked_results(self):
+        runner_ = self._get_runner(task={"uuid": "foo_uuid"})
+        sla_checker = mock.Mock()
+        runner_._send_checked_results(
+            [{"timestamp": 2}, {"timestamp": 1}], sla_checker)
+
+        self.assertEqual(1, len(runner_.result_queue))
+        batch = runner_.result_queue[0]
+        self.assertIsInstance(batch, runner.ResultBatch)
+        self.assertEqual([{"timestamp": 1}, {"timestamp": 2}], batch)
+        self.assertEqual(sla_checker, batch.sla_checker)
+
     @mock.patch("rally.task.runner.LOG")
     def test__send_result_with_invalid_schema(self, mock_log):
         runner_ = self._get_runner(task={"uuid": "foo_uuid"})
@@ -64,6 +64,7 @@ class TriggerTestCase(test.TestCase):
         task = mock.MagicMock()
         hook_cls = mock.MagicMock(__name__="fake")
         dummy_trigger = DummyTrigger(cfg, task, hook_cls)
+        dummy_trigger.scheduled_at = 42
         for i in range(0, 20):
             dummy_trigger.on_event("fake", i)
 
@@ -71,8 +72,8 @@ class TriggerTestCase(test.TestCase):
             [mock.call(task, {}, {"event_type": "fake", "value": i})
              for i in right_values],
             hook_cls.call_args_list)
-        self.assertEqual(len(right_values),
-                         hook_cls.return_value.run_async.call_count)
+        self.assertEqual([mock.call(scheduled_at=42)] * len(right_values),
+                         hook_cls.return_value.run_async.call_args_list)
         hook_status = hook_cls.return_value.result.return_value["status"]
         self.assertEqual(
             {"config": cfg,
@@ -80,3 +81,14 @@ class TriggerTestCase(test.TestCase):
                 len(right_values),
              "summary": {hook_status: len(right_values)}},
             dummy_trigger.get_results())
+
+    @ddt.data(("dummy", None, 0), ("dummy", 0, 1), ("dummy", 2.5, 3),
+              ("iteration", None, 1), ("iteration", 1, 2))
+    @ddt.unpack
+    def test_get_next_value(self, event_type, last_value, expected):
+        dummy_trigger = DummyTrigger({"trigger": {"args": [1]}},
+                                     mock.MagicMock(), mock.MagicMock())
+        with mock.patch.object(dummy_trigger, "get_listening_event",
+                               return_value=event_type):
+            self.assertEqual(expected,
+                             dummy_trigger.get_next_value(last_value))
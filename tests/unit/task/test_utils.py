@@ -22,6 +22,7 @@ import mock
 import six
 
 from rally import exceptions
+from rally.task import atomic
 from rally.task import utils
 from tests.unit import fakes
 from tests.unit import test
@@ -528,6 +529,160 @@ class WaitForStatusTestCase(test.TestCase):
                           resource=res, ready_statuses=["ready"],
                           update_resource=upd, timeout=2, id_attr="uuid")
 
+    @mock.patch("rally.task.utils.STATUS_POLLER")
+    def test_wait_batched(self, mock_status_poller):
+        get_from_manager = utils.get_from_manager()
+        manager = fakes.FakeManager()
+        res = manager._cache(fakes.FakeResource(manager=manager,
+                                                status="BUILD"))
+        inst = atomic.ActionTimerMixin()
+
+        def wait(resource, status, status_attr, check_interval, timeout):
+            self.assertEqual(("BUILD", "status", 3), (status, status_attr,
+                                                      check_interval))
+            self.assertTrue(0 < timeout <= 10)
+            resource.status = "ACTIVE"
+            return 42
+
+        mock_status_poller.wait.side_effect = wait
+        with atomic.ActionTimer(inst, "test"):
+            self.assertEqual(res, utils.wait_for_status(
+                res, ready_statuses=["active"],
+                update_resource=get_from_manager, timeout=10,
+                check_interval=3))
+
+        self.assertEqual(1, mock_status_poller.wait.call_count)
+        overhead = inst.atomic_actions()[0]["children"][0]
+        self.assertEqual("wait_for_status.overhead", overhead["name"])
+        self.assertEqual(42, overhead["started_at"])
+
+    @mock.patch("rally.task.utils.time.sleep")
+    @mock.patch("rally.task.utils.STATUS_POLLER")
+    def test_wait_not_batched(self, mock_status_poller, mock_sleep):
+        res = fakes.FakeResource(manager=fakes.FakeManager(), status="BUILD")
+        upd = mock.Mock(side_effect=[res, fakes.FakeResource(status="ACTIVE")])
+        inst = atomic.ActionTimerMixin()
+
+        with atomic.ActionTimer(inst, "test"):
+            utils.wait_for_status(res, ready_statuses=["active"],
+                                  update_resource=upd, check_interval=3)
+
+        mock_sleep.assert_called_once_with(3)
+        self.assertFalse(mock_status_poller.wait.called)
+        self.assertEqual(["wait_for_status.overhead"],
+                         [a["name"]
+                          for a in inst.atomic_actions()[0]["children"]])
+
+
+class StatusPollerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(StatusPollerTestCase, self).setUp()
+        self.poller = utils.StatusPoller()
+        self.manager = fakes.FakeManager()
+        self.resources = [
+            self.manager._cache(fakes.FakeResource(manager=self.manager,
+                                                   status="BUILD"))
+            for i in range(3)]
+
+    def _watch(self, resource, status="BUILD", check_interval=10):
+        return utils._Watch(resource, status, "status", check_interval)
+
+    def _poll(self, watches):
+        group = utils._PollGroup(self.manager, 1)
+        group.watches.update(watches)
+        self.poller._poll(group, watches)
+        return group
+
+    def test__poll(self):
+        same, changed = [self._watch(r) for r in self.resources[:2]]
+        self.resources[1].status = "ACTIVE"
+
+        group = self._poll([same, changed])
+
+        self.assertFalse(same.event.is_set())
+        self.assertIsNotNone(same.seen_at)
+        self.assertTrue(changed.event.is_set())
+        self.assertEqual(2, group.interval)
+
+    def test__poll_backoff(self):
+        watches = [self._watch(r, check_interval=4) for r in self.resources]
+
+        group = self._poll(watches)
+        self.assertEqual(1.5, group.interval)
+        self.poller._poll(group, watches)
+        self.assertEqual(2.25, group.interval)
+        for i in range(3):
+            self.poller._poll(group, watches)
+        self.assertEqual(4, group.interval)
+        self.assertFalse(any(w.event.is_set() for w in watches))
+
+    def test__poll_not_listed(self):
+        listed, not_listed, deleted = [self._watch(r)
+                                       for r in self.resources]
+        listed.seen_at = deleted.seen_at = 1
+        self.manager.delete(not_listed.resource_id)
+        self.manager.delete(deleted.resource_id)
+
+        group = self._poll([listed, not_listed, deleted])
+        self.assertFalse(listed.event.is_set())
+        self.assertFalse(not_listed.event.is_set())
+        self.assertTrue(deleted.event.is_set())
+        self.assertEqual(2, group.interval)
+
+        not_listed.started_at -= 10
+        self._poll([not_listed])
+        self.assertTrue(not_listed.event.is_set())
+
+    def test__poll_failed(self):
+        watches = [self._watch(r) for r in self.resources]
+        self.manager.list = mock.Mock(side_effect=TypeError)
+
+        self._poll(watches)
+
+        self.assertTrue(all(w.event.is_set() for w in watches))
+        self.assertEqual({fakes.FakeManager}, self.poller._unlistable)
+
+    @mock.patch("rally.task.utils.time.sleep")
+    def test_wait_unlistable(self, mock_sleep):
+        self.poller._unlistable.add(fakes.FakeManager)
+
+        self.assertIsNone(self.poller.wait(self.resources[0], "BUILD",
+                                           "status", 3, 10))
+
+        mock_sleep.assert_called_once_with(3)
+        self.assertEqual({}, self.poller._groups)
+
+    def test_wait(self):
+        self.resources[0].status = "ACTIVE"
+
+        self.assertIsNone(self.poller.wait(self.resources[0], "BUILD",
+                                           "status", 0.01, 10))
+        self.assertEqual({}, self.poller._groups)
+
+    def test_wait_timeout(self):
+        self.assertIsNotNone(self.poller.wait(self.resources[0], "BUILD",
+                                              "status", 0.01, 0.1))
+        self.assertEqual({}, self.poller._groups)
+
+    def test_wait_after_fork(self):
+        self.poller._pid = -1
+        self.poller._groups["foo"] = "bar"
+
+        self.poller.wait(self.resources[0], "BUILD", "status", 0.01, 0.01)
+
+        self.assertEqual({}, self.poller._groups)
+
+    def test__get_group_key(self):
+        session = mock.Mock()
+        manager = mock.Mock()
+        manager.api.client.session = session
+        self.assertEqual((type(manager), session),
+                         self.poller._get_group_key(manager))
+
+        self.assertEqual((fakes.FakeManager, self.manager),
+                         self.poller._get_group_key(self.manager))
+
 
 @ddt.ddt
 class WrapperForAtomicActionsTestCase(test.TestCase):
@@ -0,0 +1,293 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for the worker of distributed workloads."""
+
+import os
+import tempfile
+
+import fixtures
+import mock
+from oslo_config import fixture
+
+from rally.common import db
+from rally import consts
+from rally import exceptions
+from rally.task import sla
+from rally.task import worker
+from tests.unit import test
+
+
+class WorkerDataTestCase(test.TestCase):
+
+    def setUp(self):
+        super(WorkerDataTestCase, self).setUp()
+        self.conf = self.useFixture(fixture.Config())
+        self.conf.config(distributed_secret_key="secret")
+
+    def test_dump_and_load_job(self):
+        blob = worker.dump_job("Dummy.dummy", {"foo": "bar"}, {"a": 1},
+                               {"failure_rate": {"max": 0}}, 2, 3)
+        self.assertEqual(
+            {"scenario_name": "Dummy.dummy", "context": {"foo": "bar"},
+             "args": {"a": 1}, "sla": {"failure_rate": {"max": 0}},
+             "concurrency": 2, "timeout": 3},
+            worker.load_job({"uuid": "job_uuid", "job": blob}))
+
+    def test_dump_and_load_job_results(self):
+        blob = worker.dump_job_results([{"foo": "bar"}], None)
+        self.assertEqual(([{"foo": "bar"}], None),
+                         worker.load_job_results({"uuid": "job_uuid",
+                                                  "results": blob}))
+
+    def test_load_job_with_another_key(self):
+        blob = worker.dump_job("Dummy.dummy", {}, {}, {}, 1, 0)
+        self.conf.config(distributed_secret_key="another secret")
+        self.assertRaises(exceptions.WorkerDataNotAuthenticated,
+                          worker.load_job, {"uuid": "job_uuid", "job": blob})
+
+    def test_load_job_tampered(self):
+        blob = worker.dump_job("Dummy.dummy", {}, {}, {}, 1, 0)
+        tampered = blob[:-1] + (b"\x00" if blob[-1:] != b"\x00" else b"\x01")
+        self.assertRaises(exceptions.WorkerDataNotAuthenticated,
+                          worker.load_job,
+                          {"uuid": "job_uuid", "job": tampered})
+
+    def test_without_key(self):
+        self.conf.config(distributed_secret_key=None)
+        self.assertRaises(exceptions.InvalidConfigException,
+                          worker.dump_job, "Dummy.dummy", {}, {}, {}, 1, 0)
+
+    def test_get_failed_results(self):
+        results = worker.get_failed_results(2, ValueError("foo"))
+        self.assertEqual(2, len(results))
+        for result in results:
+            self.assertEqual(["ValueError", "foo"], result["error"][:2])
+            self.assertEqual(0.0, result["duration"])
+
+
+class WorkerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(WorkerTestCase, self).setUp()
+        # NOTE: workers access the DB from several threads, so an in-memory
+        #   database (which is separate for each connection) can't be used
+        db_file = tempfile.NamedTemporaryFile(suffix=".sqlite", delete=False)
+        db_file.close()
+        self.addCleanup(os.remove, db_file.name)
+        self.useFixture(fixtures.EnvironmentVariable(
+            "RALLY_UNITTEST_DB_URL", "sqlite:///%s" % db_file.name))
+        self.useFixture(test.DatabaseFixture())
+        self.addCleanup(db.engine_reset)
+        self.conf = self.useFixture(fixture.Config())
+        self.conf.config(distributed_secret_key="secret")
+
+        self.context = {"task": {"uuid": "task_uuid"}}
+        self.sla_config = {"failure_rate": {"max": 0}}
+
+    def _create_job(self, first_iteration=0, times=3, args=None,
+                    concurrency=2):
+        return db.worker_job_create(
+            "workload_uuid", first_iteration, times,
+            worker.dump_job("Dummy.dummy", self.context, args or {},
+                            self.sla_config, concurrency=concurrency,
+                            timeout=0))
+
+    def _get_results(self, job_uuid):
+        job = db.worker_job_get(job_uuid)
+        self.assertEqual(consts.WorkerJobStatus.FINISHED, job["status"])
+        job = [j for j in db.worker_job_list("workload_uuid",
+                                             with_results=True)
+               if j["uuid"] == job_uuid][0]
+        return worker.load_job_results(job)
+
+    @mock.patch("rally.task.worker.os.getpid", return_value=42)
+    @mock.patch("rally.task.worker.socket.gethostname", return_value="host")
+    def test_get_default_hostname(self, mock_gethostname, mock_getpid):
+        self.assertEqual("host-42", worker.get_default_hostname())
+        self.assertEqual("host-42", worker.Worker().hostname)
+        self.assertEqual("foo", worker.Worker("foo").hostname)
+
+    def test_run(self):
+        jobs = [self._create_job(0, 3), self._create_job(3, 2)]
+        worker.Worker("foo", poll_interval=0.01).run(max_jobs=2)
+
+        finished = db.worker_job_list("workload_uuid",
+                                      consts.WorkerJobStatus.FINISHED,
+                                      with_results=True)
+        self.assertEqual([j["uuid"] for j in jobs],
+                         [j["uuid"] for j in finished])
+        for job, expected_count in zip(finished, (3, 2)):
+            self.assertEqual("foo", job["hostname"])
+            results, sla_checker = worker.load_job_results(job)
+            self.assertEqual(expected_count, len(results))
+            for result in results:
+                self.assertEqual([], result["error"])
+
+            self.assertIsInstance(sla_checker, sla.SLAChecker)
+            self.assertEqual(self.sla_config, sla_checker.config["sla"])
+            self.assertTrue(sla_checker.sla_criteria[0].success)
+            self.assertEqual(expected_count,
+                             sla_checker.sla_criteria[0].total)
+
+        self.assertRaises(exceptions.WorkerNotFound, db.get_worker, "foo")
+
+    def test_run_without_key(self):
+        self.conf.config(distributed_secret_key=None)
+        self.assertRaises(exceptions.InvalidConfigException,
+                          worker.Worker("foo").run)
+        self.assertRaises(exceptions.WorkerNotFound, db.get_worker, "foo")
+
+    @mock.patch("rally.task.worker.db")
+    def test_run_without_jobs(self, mock_db):
+        worker_obj = worker.Worker("foo", poll_interval=0)
+        mock_db.worker_job_claim.side_effect = (
+            lambda hostname: worker_obj.stop())
+
+        worker_obj.run()
+
+        mock_db.register_worker.assert_called_once_with({"hostname": "foo"})
+        mock_db.worker_job_claim.assert_called_once_with("foo")
+        mock_db.update_worker.assert_called_once_with("foo")
+        mock_db.unregister_worker.assert_called_once_with("foo")
+
+    @mock.patch("rally.task.worker.runner.WorkerThreadPool")
+    def test_run_reuses_pool(self, mock_worker_thread_pool):
+        self._create_job(0, 1)
+        self._create_job(1, 1)
+        self._create_job(2, 1, concurrency=3)
+
+        with mock.patch("rally.task.worker.Worker._watch_job"):
+            worker.Worker("foo", poll_interval=0.01).run(max_jobs=3)
+
+        # the pool is re-created only for a job with another concurrency
+        self.assertEqual([mock.call(2, timeout=0), mock.call(3, timeout=0)],
+                         mock_worker_thread_pool.call_args_list)
+        self.assertEqual(2,
+                         mock_worker_thread_pool.return_value.join.call_count)
+
+    def test__execute_aborted(self):
+        self._create_job(0, 100, args={"sleep": 0.05}, concurrency=1)
+        db.register_worker({"hostname": "foo"})
+        job = db.worker_job_claim("foo")
+        db.worker_jobs_abort("workload_uuid")
+
+        worker_obj = worker.Worker("foo", poll_interval=0.01)
+        worker_obj._execute(job)
+        worker_obj._pool.join()
+        worker_obj._watchers[0].join()
+
+        # partial results are stored and the rest of iterations is skipped
+        results, sla_checker = self._get_results(job["uuid"])
+        self.assertLess(len(results), 100)
+        self.assertEqual(len(results), sla_checker.sla_criteria[0].total)
+
+    def test__execute_invalid_job(self):
+        db.worker_job_create("workload_uuid", 0, 2, b"foo")
+        job = db.worker_job_claim("foo")
+
+        worker_obj = worker.Worker("foo", poll_interval=0.01)
+        worker_obj._execute(job)
+
+        self.assertEqual([], worker_obj._watchers)
+        results, sla_checker = self._get_results(job["uuid"])
+        self.assertIsNone(sla_checker)
+        self.assertEqual(2, len(results))
+        self.assertEqual("WorkerDataNotAuthenticated", results[0]["error"][0])
+
+    def test__execute_unknown_scenario(self):
+        db.worker_job_create(
+            "workload_uuid", 0, 1,
+            worker.dump_job("Foo.bar", {}, {}, {}, concurrency=1, timeout=0))
+        job = db.worker_job_claim("foo")
+
+        worker.Worker("foo")._execute(job)
+
+        results, sla_checker = self._get_results(job["uuid"])
+        self.assertEqual(1, len(results))
+        self.assertEqual("PluginNotFound", results[0]["error"][0])
+
+    def test__execute_job_is_handed_to_other_worker(self):
+        self._create_job(0, 1)
+        job = db.worker_job_claim("foo")
+        db.worker_job_release(job["uuid"], "foo")
+
+        worker_obj = worker.Worker("foo", poll_interval=0.01)
+        worker_obj._execute(job)
+        worker_obj._pool.join()
+        worker_obj._watchers[0].join()
+
+        job = db.worker_job_get(job["uuid"])
+        self.assertEqual(consts.WorkerJobStatus.PENDING, job["status"])
+
+    def _get_job_state(self, done_after=0):
+        self._create_job(0, 1)
+        db.register_worker({"hostname": "foo"})
+        job = db.worker_job_claim("foo")
+        job_state = worker._Job(job, {"sla": self.sla_config}, None)
+        job_state.done = mock.Mock()
+        job_state.done.wait.side_effect = [False] * done_after + [True]
+        return job, job_state
+
+    def test__watch_job(self):
+        job, job_state = self._get_job_state(done_after=2)
+        job_state.results.put({"error": [], "duration": 1})
+
+        worker.Worker("foo")._watch_job(job_state)
+
+        self.assertFalse(job_state.aborted.is_set())
+        self.assertEqual(3, job_state.done.wait.call_count)
+        results, sla_checker = self._get_results(job["uuid"])
+        self.assertEqual([{"error": [], "duration": 1}], results)
+        self.assertEqual(1, sla_checker.sla_criteria[0].total)
+
+    def test__watch_job_deleted(self):
+        job, job_state = self._get_job_state(done_after=1)
+        db.worker_job_delete(job["uuid"])
+
+        worker.Worker("foo")._watch_job(job_state)
+
+        self.assertTrue(job_state.aborted.is_set())
+
+    @mock.patch("rally.task.worker.Worker._finish_job")
+    def test__watch_job_failed_to_store_results(self, mock_worker__finish_job):
+        mock_worker__finish_job.side_effect = RuntimeError
+        job, job_state = self._get_job_state()
+
+        worker.Worker("foo")._watch_job(job_state)
+
+        # the job is handed to other workers
+        job = db.worker_job_get(job["uuid"])
+        self.assertEqual(consts.WorkerJobStatus.PENDING, job["status"])
+
+
+class JobTestCase(test.TestCase):
+
+    def test_done(self):
+        job = worker._Job({"uuid": "job_uuid", "first_iteration": 0,
+                           "times": 2, "workload_uuid": "w"}, {}, None)
+        job.iteration_started()
+        job.iteration_started()
+        job.iteration_finished()
+        self.assertFalse(job.done.is_set())
+        job.dispatched()
+        self.assertFalse(job.done.is_set())
+        job.iteration_finished()
+        self.assertTrue(job.done.is_set())
+
+    def test_done_without_iterations(self):
+        job = worker._Job({"uuid": "job_uuid", "first_iteration": 0,
+                           "times": 2, "workload_uuid": "w"}, {}, None)
+        job.dispatched()
+        self.assertTrue(job.done.is_set())
@@ -22,6 +22,7 @@ from oslo_config import fixture
 from oslotest import base
 
 from rally.common import db
+from rally import osclients
 from rally import plugins
 from rally.task import utils as tutils
 from tests.unit import fakes
@@ -33,7 +34,9 @@ class DatabaseFixture(fixture.Config):
         super(DatabaseFixture, self).setUp()
         db_url = os.environ.get("RALLY_UNITTEST_DB_URL", "sqlite://")
         db.engine_reset()
-        self.conf.set_default("connection", db_url, group="database")
+        # NOTE: an override is used, so the connection set by other tests
+        #   (e.g. migration ones) doesn't leak here
+        self.conf.set_override("connection", db_url, group="database")
         db.schema_cleanup()
         db.schema_create()
 
@@ -44,6 +47,9 @@ class TestCase(base.BaseTestCase):
     def setUp(self):
         super(TestCase, self).setUp()
         self.addCleanup(mock.patch.stopall)
+        # NOTE: keystone sessions (or mocks of them) must not be shared
+        #   between tests via the process-wide pool
+        self.addCleanup(osclients.SESSION_POOL.clear)
         plugins.load()
 
     def _test_atomic_action_timer(self, atomic_actions, name):
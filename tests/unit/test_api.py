@@ -332,6 +332,12 @@ class TaskAPITestCase(test.TestCase):
         fake_deployment.update_status.assert_called_once_with(
             consts.DeployStatus.DEPLOY_INCONSISTENT)
 
+    @mock.patch("rally.api.worker.Worker")
+    def test_run_worker(self, mock_worker):
+        self.task_inst.run_worker(hostname="foo", max_jobs=2)
+        mock_worker.assert_called_once_with(hostname="foo")
+        mock_worker.return_value.run.assert_called_once_with(max_jobs=2)
+
     @ddt.data(True, False)
     @mock.patch("rally.api.time")
     @mock.patch("rally.api.objects.Task")
@@ -514,7 +520,7 @@ class TaskAPITestCase(test.TestCase):
             consts.SubtaskStatus.FINISHED)
         work_load = sub_task.add_workload.return_value
         work_load.add_workload_data.assert_called_once_with(
-            0, {"raw": workload["data"]})
+            0, {"raw": workload["data"]}, codec="columnar+zlib")
         work_load.set_results.assert_called_once_with(
             full_duration=workload["full_duration"],
             load_duration=workload["load_duration"],
@@ -576,8 +582,10 @@ class TaskAPITestCase(test.TestCase):
             consts.SubtaskStatus.FINISHED)
         work_load = sub_task.add_workload.return_value
         self.assertEqual(
-            [mock.call(0, {"raw": [{"timestamp": 1}, {"timestamp": 2}]}),
-             mock.call(1, {"raw": [{"timestamp": 3}]})],
+            [mock.call(0, {"raw": [{"timestamp": 1}, {"timestamp": 2}]},
+                       codec=mock_conf.raw_result_chunk_codec),
+             mock.call(1, {"raw": [{"timestamp": 3}]},
+                       codec=mock_conf.raw_result_chunk_codec)],
             work_load.add_workload_data.call_args_list)
         work_load.set_results.assert_called_once_with(
             full_duration=workload["full_duration"],
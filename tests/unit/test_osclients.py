@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import ddt
 import mock
 from oslo_config import cfg
@@ -21,6 +23,7 @@ from rally import consts
 from rally import exceptions
 from rally import osclients
 from rally.plugins.openstack import credential as oscredential
+from rally.task import atomic
 from tests.unit import fakes
 from tests.unit import test
 
@@ -314,6 +317,124 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
         mock_log_exception.assert_called_once_with(mock.ANY)
         mock_is_debug.assert_called_once_with()
 
+    def test_get_session_from_pool(self):
+        pool = osclients.SessionPool()
+        keystone = osclients.Keystone(self.credential, {"keystone": {
+            "version": 3}}, {}, session_pool=pool)
+        keystone._create_session = mock.Mock(return_value=("sess", "plugin"))
+
+        self.assertEqual(("sess", "plugin"), keystone.get_session())
+        other = osclients.Keystone(self.credential, {"keystone": {
+            "version": 3}}, {}, session_pool=pool)
+        other._create_session = mock.Mock()
+        self.assertEqual(("sess", "plugin"), other.get_session())
+        self.assertEqual(("sess", "plugin"), other.get_session("3"))
+
+        keystone._create_session.assert_called_once_with("3")
+        self.assertFalse(other._create_session.called)
+
+    def test_get_session_from_pool_with_atomic_inst(self):
+        scenario = atomic.ActionTimerMixin()
+        keystone = osclients.Keystone(
+            self.credential, {}, {}, session_pool=osclients.SessionPool(),
+            atomic_inst=scenario)
+        keystone._create_session = mock.Mock(return_value=("sess", "plugin"))
+
+        keystone.get_session()
+        keystone.get_session()
+
+        self.assertEqual(["keystone.create_session"],
+                         [a["name"] for a in scenario.atomic_actions()])
+
+    @ddt.data({"auth_ref": None, "authenticated": True},
+              {"auth_ref": False, "authenticated": False},
+              {"auth_ref": True, "authenticated": True})
+    @ddt.unpack
+    @mock.patch("rally.osclients.Keystone.get_session")
+    def test_auth_ref_with_atomic_inst(self, mock_keystone_get_session,
+                                       auth_ref, authenticated):
+        plugin = mock.Mock(MIN_TOKEN_LIFE_SECONDS=120)
+        if auth_ref is None:
+            plugin.auth_ref = None
+        else:
+            plugin.auth_ref.will_expire_soon.return_value = auth_ref
+        mock_keystone_get_session.return_value = ("sess", plugin)
+        scenario = atomic.ActionTimerMixin()
+        keystone = osclients.Keystone(self.credential, {}, {},
+                                      atomic_inst=scenario)
+
+        self.assertEqual(plugin.get_access.return_value, keystone.auth_ref)
+
+        plugin.get_access.assert_called_once_with("sess")
+        self.assertEqual(["keystone.authenticate"] if authenticated else [],
+                         [a["name"] for a in scenario.atomic_actions()])
+        if auth_ref is not None:
+            plugin.auth_ref.will_expire_soon.assert_called_once_with(120)
+
+
+class SessionPoolTestCase(test.TestCase):
+
+    def test_get(self):
+        pool = osclients.SessionPool()
+        create = mock.Mock(side_effect=[("s1", "p1"), ("s2", "p2")])
+
+        self.assertEqual(("s1", "p1"), pool.get("foo", create))
+        self.assertEqual(("s1", "p1"), pool.get("foo", create))
+        self.assertEqual(("s2", "p2"), pool.get("bar", create))
+        self.assertEqual(2, create.call_count)
+
+    def test_get_creates_once_for_concurrent_threads(self):
+        pool = osclients.SessionPool()
+        created = threading.Event()
+
+        def create():
+            created.wait(1)
+            return object()
+
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(pool.get("foo", create)))
+            for i in range(5)]
+        for thread in threads:
+            thread.start()
+        created.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(5, len(results))
+        self.assertEqual(1, len(set(id(r) for r in results)))
+
+    def test_get_failed(self):
+        pool = osclients.SessionPool()
+        create = mock.Mock(side_effect=[ValueError, ("s", "p")])
+
+        self.assertRaises(ValueError, pool.get, "foo", create)
+        self.assertEqual(("s", "p"), pool.get("foo", create))
+
+    def test_get_drops_oldest(self):
+        pool = osclients.SessionPool(max_size=2)
+        for key in ("a", "b", "c"):
+            pool.get(key, lambda: key)
+
+        self.assertEqual("new", pool.get("a", lambda: "new"))
+        self.assertEqual("c", pool.get("c", lambda: "new"))
+
+    @mock.patch("rally.osclients.os.getpid")
+    def test_get_after_fork(self, mock_getpid):
+        mock_getpid.return_value = 1
+        pool = osclients.SessionPool()
+        pool.get("foo", lambda: "parent")
+
+        mock_getpid.return_value = 2
+        self.assertEqual("child", pool.get("foo", lambda: "child"))
+        self.assertEqual("child", pool.get("foo", lambda: "another"))
+
+    def test_clear(self):
+        pool = osclients.SessionPool()
+        pool.get("foo", lambda: "old")
+        pool.clear()
+        self.assertEqual("new", pool.get("foo", lambda: "new"))
+
 
 @ddt.ddt
 class OSClientsTestCase(test.TestCase):